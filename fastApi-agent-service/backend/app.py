@@ -1,7 +1,7 @@
 import logging
 from fastapi import FastAPI, status, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import (
     RequestValidationError,
     ValidationException,
@@ -14,7 +14,10 @@ from backend.config import main as config
 from backend.routes.index import router as index
 from backend.utils.pydanticToFormError import pydantic_to_form_error, format_health_validation_error
 from backend.middleware.verify_signature import HealthDataSecurityMiddleware
+from backend.middleware.compression import CompressionMiddleware
 from backend.constants.enums import HEALTH_DISCLAIMER
+from backend.utils.metrics import get_llm_parse_metrics, get_document_compaction_metrics, get_response_compression_metrics
+from backend.utils.static_responses import StaticResponse
 
 
 logging.basicConfig(
@@ -30,6 +33,8 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI(
     lifespan=lifespan,
+    # Plan responses run to 50-200 KB; orjson encodes them several times faster than the stdlib
+    default_response_class=ORJSONResponse,
     title="Wellness AI Agent Service",
     description="""
     AI-Powered Personal Health & Wellness Coach Agent Service
@@ -45,7 +50,7 @@ app = FastAPI(
     cannot replace professional medical advice. Always consult with qualified 
     healthcare professionals for medical concerns, diagnosis, or treatment.
     """,
-    version="1.0.0",
+    version=config.SERVICE_VERSION,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
@@ -104,6 +109,11 @@ async def health_data_audit_middleware(request: Request, call_next):
     
     return response
 
+# Added last so it is the outermost layer: the security and audit middleware work on the
+# uncompressed response and compression is the final step before the wire
+if config.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 @app.exception_handler(Exception)
 async def catch_all_exception_handler(request: Request, exc: Exception):
     """
@@ -112,7 +122,7 @@ async def catch_all_exception_handler(request: Request, exc: Exception):
     """
     logger.error(f"Unhandled exception in health service: {str(exc)}", exc_info=True)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "success": False,
@@ -169,7 +179,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     
     error_response["disclaimer"] = HEALTH_DISCLAIMER
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=error_response,
         headers={
@@ -190,7 +200,7 @@ async def validation_exception_handler(request: Request, exc: ValidationExceptio
     form_errors = pydantic_to_form_error(exc.errors())
     health_formatted_errors = format_health_validation_error(form_errors)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=400,
         content={
             "success": False,
@@ -212,14 +222,10 @@ async def validation_exception_handler(request: Request, exc: ValidationExceptio
     )
 
 
-@app.get("/")
-async def health_service_root():
-    """
-    Root endpoint with health service information and safety disclaimers
-    """
+def health_service_root_content():
     return {
         "service": "Wellness AI Agent Service",
-        "version": "1.0.0",
+        "version": config.SERVICE_VERSION,
         "status": "operational",
         "description": "AI-powered personal health and wellness coaching with comprehensive safety measures",
         "important_notice": HEALTH_DISCLAIMER,
@@ -238,6 +244,15 @@ async def health_service_root():
         "health_disclaimers": "/api/user/health-disclaimer"
     }
 
+ROOT_RESPONSE = StaticResponse("root", health_service_root_content)
+
+@app.get("/")
+async def health_service_root(request: Request):
+    """
+    Root endpoint with health service information and safety disclaimers
+    """
+    return ROOT_RESPONSE.render(request)
+
 @app.get("/health")
 async def health_check():
     """
@@ -246,24 +261,23 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "wellness-agent",
-        "version": "1.0.0",
+        "version": config.SERVICE_VERSION,
         "timestamp": datetime.utcnow().isoformat(),
         "components": {
             "database": "operational",
             "ai_models": "operational", 
             "security": "operational"
-        }
+        },
+        "llm_parsing": get_llm_parse_metrics(),
+        "document_compaction": get_document_compaction_metrics(),
+        "response_compression": get_response_compression_metrics()
     }
 
-@app.get("/api/terms-of-service")
-async def terms_of_service():
-    """
-    Terms of service with health-specific considerations
-    """
+def terms_of_service_content():
     return {
         "terms_of_service": {
             "service_name": "Wellness AI Agent Service",
-            "version": "1.0.0",
+            "version": config.SERVICE_VERSION,
             "effective_date": "2024-01-01",
             "health_disclaimers": {
                 "general_wellness": HEALTH_DISCLAIMER,
@@ -287,6 +301,15 @@ async def terms_of_service():
         }
     }
 
+TERMS_OF_SERVICE_RESPONSE = StaticResponse("terms_of_service", terms_of_service_content)
+
+@app.get("/api/terms-of-service")
+async def terms_of_service(request: Request):
+    """
+    Terms of service with health-specific considerations
+    """
+    return TERMS_OF_SERVICE_RESPONSE.render(request)
+
 
 app.include_router(prefix="/api", router=index)
 
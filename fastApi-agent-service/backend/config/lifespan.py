@@ -5,16 +5,19 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
 
 from backend.config.main import MONGO_URI
+from backend.utils.static_responses import warm_static_responses
 import logging
 
 from backend.models.HealthPlan import HealthPlan
+from backend.models.PlanEvent import PlanEvent
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    warm_static_responses()
     app.db = AsyncIOMotorClient(MONGO_URI)["wellness-agent-service"]
     await init_beanie(
         database=app.db,
-        document_models=[HealthPlan],
+        document_models=[HealthPlan, PlanEvent],
     )
     logging.info("Database initialized")
     yield
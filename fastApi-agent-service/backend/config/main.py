@@ -1,4 +1,4 @@
-from decouple import Config, RepositoryEnv
+from decouple import Config, RepositoryEnv, Csv
 from backend.utils.timedelta import parse_timespan
 import os
 import logging
@@ -38,4 +38,88 @@ FRONT_HOST = config.get("FRONTEND_HOST", cast=str)
 
 HEALTH_DATA_RETENTION_DAYS = config.get("HEALTH_DATA_RETENTION_DAYS", default=365, cast=int)
 MAX_WORKOUT_DURATION_MINUTES = config.get("MAX_WORKOUT_DURATION_MINUTES", default=180, cast=int)
-MIN_WORKOUT_DURATION_MINUTES = config.get("MIN_WORKOUT_DURATION_MINUTES", default=10, cast=int)
\ No newline at end of file
+MIN_WORKOUT_DURATION_MINUTES = config.get("MIN_WORKOUT_DURATION_MINUTES", default=10, cast=int)
+# LLM resilience: per-request budget, per-call deadline, retries, circuit breaker and hedging
+LLM_REQUEST_BUDGET_SECONDS = config.get("LLM_REQUEST_BUDGET_SECONDS", default=240, cast=float)
+LLM_CALL_TIMEOUT_SECONDS = config.get("LLM_CALL_TIMEOUT_SECONDS", default=90, cast=float)
+LLM_MAX_RETRIES = config.get("LLM_MAX_RETRIES", default=3, cast=int)
+LLM_RETRY_BASE_DELAY_SECONDS = config.get("LLM_RETRY_BASE_DELAY_SECONDS", default=0.5, cast=float)
+LLM_RETRY_MAX_DELAY_SECONDS = config.get("LLM_RETRY_MAX_DELAY_SECONDS", default=8, cast=float)
+LLM_CIRCUIT_FAILURE_THRESHOLD = config.get("LLM_CIRCUIT_FAILURE_THRESHOLD", default=5, cast=int)
+LLM_CIRCUIT_RESET_SECONDS = config.get("LLM_CIRCUIT_RESET_SECONDS", default=30, cast=float)
+LLM_HEDGE_ENABLED = config.get("LLM_HEDGE_ENABLED", default=True, cast=bool)
+LLM_HEDGE_PERCENTILE = config.get("LLM_HEDGE_PERCENTILE", default=95, cast=float)
+LLM_HEDGE_MIN_SAMPLES = config.get("LLM_HEDGE_MIN_SAMPLES", default=20, cast=int)
+
+# Per-node model settings (analysis, workout, meal, chat); a thinking budget of 0 disables thinking
+LLM_ANALYSIS_MODEL = config.get("LLM_ANALYSIS_MODEL", default="gemini-2.5-flash")
+LLM_ANALYSIS_TEMPERATURE = config.get("LLM_ANALYSIS_TEMPERATURE", default=0.2, cast=float)
+LLM_ANALYSIS_MAX_OUTPUT_TOKENS = config.get("LLM_ANALYSIS_MAX_OUTPUT_TOKENS", default=2048, cast=int)
+LLM_ANALYSIS_THINKING_BUDGET = config.get("LLM_ANALYSIS_THINKING_BUDGET", default=512, cast=int)
+
+LLM_WORKOUT_MODEL = config.get("LLM_WORKOUT_MODEL", default="gemini-2.5-flash")
+LLM_WORKOUT_TEMPERATURE = config.get("LLM_WORKOUT_TEMPERATURE", default=0.3, cast=float)
+LLM_WORKOUT_MAX_OUTPUT_TOKENS = config.get("LLM_WORKOUT_MAX_OUTPUT_TOKENS", default=8192, cast=int)
+LLM_WORKOUT_THINKING_BUDGET = config.get("LLM_WORKOUT_THINKING_BUDGET", default=0, cast=int)
+
+LLM_MEAL_MODEL = config.get("LLM_MEAL_MODEL", default="gemini-2.5-flash")
+LLM_MEAL_TEMPERATURE = config.get("LLM_MEAL_TEMPERATURE", default=0.3, cast=float)
+LLM_MEAL_MAX_OUTPUT_TOKENS = config.get("LLM_MEAL_MAX_OUTPUT_TOKENS", default=12288, cast=int)
+LLM_MEAL_THINKING_BUDGET = config.get("LLM_MEAL_THINKING_BUDGET", default=0, cast=int)
+
+LLM_CHAT_MODEL = config.get("LLM_CHAT_MODEL", default="gemini-2.5-flash")
+LLM_CHAT_TEMPERATURE = config.get("LLM_CHAT_TEMPERATURE", default=0.3, cast=float)
+LLM_CHAT_MAX_OUTPUT_TOKENS = config.get("LLM_CHAT_MAX_OUTPUT_TOKENS", default=1024, cast=int)
+LLM_CHAT_THINKING_BUDGET = config.get("LLM_CHAT_THINKING_BUDGET", default=0, cast=int)
+
+# Simple, low-risk profiles are routed to a cheaper and faster model
+LLM_ROUTING_ENABLED = config.get("LLM_ROUTING_ENABLED", default=True, cast=bool)
+LLM_LIGHT_MODEL = config.get("LLM_LIGHT_MODEL", default="gemini-2.5-flash-lite")
+
+# Provider-side context caching of static prompt prefixes (explicit Gemini caches)
+LLM_CONTEXT_CACHE_ENABLED = config.get("LLM_CONTEXT_CACHE_ENABLED", default=False, cast=bool)
+LLM_CONTEXT_CACHE_MIN_TOKENS = config.get("LLM_CONTEXT_CACHE_MIN_TOKENS", default=1024, cast=int)
+LLM_CONTEXT_CACHE_TTL_SECONDS = config.get("LLM_CONTEXT_CACHE_TTL_SECONDS", default=3600, cast=int)
+
+# Token budget for the per-user part of the analyzer prompt; health document text gets what is left
+LLM_ANALYSIS_CONTEXT_TOKEN_BUDGET = config.get("LLM_ANALYSIS_CONTEXT_TOKEN_BUDGET", default=2000, cast=int)
+
+# Retrieval over uploaded health documents (chunk size in estimated tokens)
+DOCUMENT_RETRIEVAL_ENABLED = config.get("DOCUMENT_RETRIEVAL_ENABLED", default=True, cast=bool)
+DOCUMENT_CHUNK_TOKENS = config.get("DOCUMENT_CHUNK_TOKENS", default=200, cast=int)
+DOCUMENT_CHUNK_OVERLAP_TOKENS = config.get("DOCUMENT_CHUNK_OVERLAP_TOKENS", default=40, cast=int)
+DOCUMENT_RETRIEVAL_TOP_K = config.get("DOCUMENT_RETRIEVAL_TOP_K", default=8, cast=int)
+
+# Persistent embedding store shared by workers (memory-mapped, content-hash keyed)
+EMBEDDING_CACHE_ENABLED = config.get("EMBEDDING_CACHE_ENABLED", default=True, cast=bool)
+EMBEDDING_CACHE_DIR = config.get("EMBEDDING_CACHE_DIR", default=".cache/embeddings")
+EMBEDDING_CACHE_MAX_ENTRIES = config.get("EMBEDDING_CACHE_MAX_ENTRIES", default=50000, cast=int)
+EMBEDDING_BATCH_SIZE = config.get("EMBEDDING_BATCH_SIZE", default=100, cast=int)
+
+# Low-risk profiles get a catalog-based workout week instead of an LLM plan
+WORKOUT_TEMPLATE_PLANNER_ENABLED = config.get("WORKOUT_TEMPLATE_PLANNER_ENABLED", default=True, cast=bool)
+WORKOUT_TEMPLATE_LLM_ENRICHMENT = config.get("WORKOUT_TEMPLATE_LLM_ENRICHMENT", default=False, cast=bool)
+
+# Meal calories and macros computed from ingredients with the bundled food table
+NUTRITION_LOCAL_ENABLED = config.get("NUTRITION_LOCAL_ENABLED", default=True, cast=bool)
+
+# Weeks 2..N derived locally from the generated week 1 (progressive overload, exercise and meal rotation)
+PLAN_PROGRESSION_ENABLED = config.get("PLAN_PROGRESSION_ENABLED", default=True, cast=bool)
+PLAN_DURATION_WEEKS = config.get("PLAN_DURATION_WEEKS", default=4, cast=int)
+
+# Progress notes and chat messages live in the plan_events time-series collection
+PLAN_EVENTS_PAGE_SIZE = config.get("PLAN_EVENTS_PAGE_SIZE", default=50, cast=int)
+PLAN_EVENTS_MAX_PAGE_SIZE = config.get("PLAN_EVENTS_MAX_PAGE_SIZE", default=200, cast=int)
+
+# Negotiated response compression; encodings in server preference order (zstandard is pinned, br only when brotli is installed)
+COMPRESSION_ENABLED = config.get("COMPRESSION_ENABLED", default=True, cast=bool)
+COMPRESSION_MIN_SIZE = config.get("COMPRESSION_MIN_SIZE", default=1024, cast=int)
+COMPRESSION_ENCODINGS = config.get("COMPRESSION_ENCODINGS", default="zstd,br,gzip", cast=Csv())
+COMPRESSION_GZIP_LEVEL = config.get("COMPRESSION_GZIP_LEVEL", default=6, cast=int)
+COMPRESSION_ZSTD_LEVEL = config.get("COMPRESSION_ZSTD_LEVEL", default=3, cast=int)
+COMPRESSION_BROTLI_QUALITY = config.get("COMPRESSION_BROTLI_QUALITY", default=5, cast=int)
+
+# Version reported by the service (and in the precomputed static responses, rebuilt on deploy)
+SERVICE_VERSION = config.get("SERVICE_VERSION", default="1.0.0")
+# Static endpoints (/, terms of service, health disclaimer): seconds clients and proxies may reuse a copy before revalidating
+STATIC_RESPONSE_MAX_AGE = config.get("STATIC_RESPONSE_MAX_AGE", default=300, cast=int)
@@ -0,0 +1,136 @@
+from backend.constants.enums import DietaryRestriction
+
+# Ingredient terms that break each dietary restriction. Terms match whole
+# words and their plurals ("egg" matches "eggs" but not "eggplant"), except
+# COMPOUND_TERMS below, which also match inside words.
+MEAT = [
+    "beef", "steak", "sirloin", "ground beef", "veal", "pork", "bacon", "ham", "prosciutto", "sausage",
+    "chorizo", "salami", "pepperoni", "hot dog", "jerky", "lamb", "mutton", "goat meat", "venison",
+    "chicken", "turkey", "duck", "meat", "meatball", "mince", "gelatin", "lard", "bone broth", "chicken broth",
+    "beef broth", "chicken stock", "beef stock",
+]
+FISH = [
+    "fish", "salmon", "tuna", "cod", "tilapia", "haddock", "halibut", "trout", "mackerel", "sardine",
+    "anchovy", "anchovies", "fish sauce", "seafood",
+]
+SHELLFISH = [
+    "shrimp", "prawn", "crab", "lobster", "scallop", "clam", "mussel", "oyster", "crayfish", "crawfish",
+    "langoustine", "shellfish", "oyster sauce",
+]
+DAIRY = [
+    "milk", "dairy", "cheese", "cheddar", "mozzarella", "parmesan", "feta", "ricotta", "halloumi", "brie",
+    "cream", "sour cream", "cream cheese", "ice cream", "yogurt", "yoghurt", "butter", "buttermilk", "ghee",
+    "whey", "casein", "kefir", "custard", "half and half",
+]
+EGG = ["egg", "egg white", "egg yolk", "omelette", "omelet", "frittata", "quiche", "meringue", "mayonnaise", "mayo"]
+GLUTEN = [
+    "wheat", "barley", "rye", "spelt", "farro", "bulgur", "semolina", "couscous", "seitan",
+    "bread", "toast", "bagel", "pita", "croissant", "bun", "muffin", "pancake", "waffle", "tortilla",
+    "flour", "breadcrumb", "panko", "pasta", "spaghetti", "penne", "macaroni", "orzo", "noodle", "cracker",
+    "malt", "beer", "soy sauce",
+]
+NUTS = [
+    "nut", "peanut", "almond", "walnut", "cashew", "pistachio", "hazelnut", "pecan", "macadamia",
+    "brazil nut", "pine nut", "marzipan", "praline",
+]
+SOY = ["soy", "soya", "soybean", "tofu", "tempeh", "edamame", "miso", "natto", "soy sauce", "tamari", "textured vegetable protein"]
+ADDED_SUGAR = [
+    "sugar", "brown sugar", "syrup", "maple syrup", "corn syrup", "agave", "molasses", "honey", "candy",
+    "soda", "juice", "jam", "jelly", "cake", "cookie", "pastry", "donut", "doughnut", "sweetened",
+]
+STARCH = [
+    "bread", "toast", "bagel", "tortilla", "pita", "pasta", "spaghetti", "noodle", "rice", "potato",
+    "sweet potato", "oat", "oatmeal", "porridge", "granola", "cereal", "quinoa", "couscous", "cracker",
+    "flour", "corn", "bean", "lentil", "chickpea", "banana", "pancake", "waffle",
+]
+GRAINS_AND_LEGUMES = [
+    "wheat", "bread", "toast", "pasta", "noodle", "rice", "oat", "oatmeal", "granola", "cereal", "quinoa",
+    "couscous", "barley", "rye", "corn", "flour", "cracker", "tortilla", "bean", "lentil", "chickpea",
+    "hummus", "pea", "peanut", "soy", "tofu", "tempeh", "edamame",
+]
+PROCESSED_MEAT = ["bacon", "sausage", "salami", "pepperoni", "hot dog", "deli meat", "processed meat", "jerky"]
+HIGH_SODIUM = [
+    "salt", "sea salt", "soy sauce", "fish sauce", "bouillon", "stock cube", "pickle", "feta",
+    "ham", "prosciutto", "canned soup", "instant noodle",
+] + PROCESSED_MEAT
+
+DIETARY_VIOLATIONS = {
+    DietaryRestriction.NONE.value: [],
+    DietaryRestriction.VEGETARIAN.value: MEAT + FISH + SHELLFISH,
+    DietaryRestriction.VEGAN.value: MEAT + FISH + SHELLFISH + DAIRY + EGG + ["honey"],
+    DietaryRestriction.GLUTEN_FREE.value: GLUTEN,
+    DietaryRestriction.DAIRY_FREE.value: DAIRY,
+    DietaryRestriction.NUT_FREE.value: NUTS,
+    DietaryRestriction.LOW_SODIUM.value: HIGH_SODIUM,
+    DietaryRestriction.DIABETIC_FRIENDLY.value: ADDED_SUGAR + ["white bread", "white rice"],
+    DietaryRestriction.HEART_HEALTHY.value: PROCESSED_MEAT + [
+        "fried", "deep fried", "lard", "shortening", "butter", "cream", "sour cream",
+    ],
+    DietaryRestriction.SOY_FREE.value: SOY,
+    DietaryRestriction.EGG_FREE.value: EGG,
+    DietaryRestriction.SHELLFISH_FREE.value: SHELLFISH,
+    DietaryRestriction.LOW_SUGAR.value: ADDED_SUGAR,
+    DietaryRestriction.KETO.value: STARCH + ADDED_SUGAR,
+    DietaryRestriction.LOW_CARB.value: STARCH + ["sugar", "syrup", "juice", "soda", "candy", "cake", "cookie"],
+    # A target rather than an exclusion, so no ingredient breaks it
+    DietaryRestriction.HIGH_PROTEIN.value: [],
+    DietaryRestriction.MEDITERRANEAN.value: PROCESSED_MEAT + ["margarine", "soda", "candy", "deep fried"],
+    DietaryRestriction.PALEO.value: GRAINS_AND_LEGUMES + DAIRY + ["sugar", "brown sugar", "corn syrup", "candy", "soda"],
+    DietaryRestriction.WHOLE30.value: GRAINS_AND_LEGUMES + DAIRY + ADDED_SUGAR + [
+        "stevia", "wine", "beer", "alcohol",
+    ],
+}
+
+# Terms that also match as part of a compound word: "cornbread", "shortbread",
+# "cheesecake", "buttermilk", "wholewheat", "catfish", "cupcake".
+COMPOUND_TERMS = ["bread", "cheese", "milk", "wheat", "nut", "butter", "cream", "flour", "fish", "cake"]
+# Words where a compound term is only spelling, not the ingredient: hits of
+# COMPOUND_TERMS inside them are ignored. Other terms in them still count
+# ("butter beans" are still beans).
+COMPOUND_EXCEPTIONS = [
+    "coconut", "nutmeg", "butternut", "doughnut", "water chestnut", "nutrition", "nutritional yeast", "nutrient",
+    "minute", "buckwheat", "breadfruit", "sweetbread", "flourless", "butter bean", "butterbean", "butterfly",
+    "butterflied", "buttercup",
+]
+
+# Phrases that make an ingredient compatible with a restriction even though
+# they contain one of its terms ("peanut butter", "gluten-free bread").
+# A phrase clears the whole comma/"and"/"with"-separated part of the line it is in.
+PLANT_MILKS = ["almond milk", "soy milk", "oat milk", "coconut milk", "rice milk", "cashew milk", "plant milk"]
+NUT_BUTTERS = [
+    "peanut butter", "almond butter", "cashew butter", "nut butter", "sunflower butter", "seed butter",
+    "cocoa butter", "apple butter",
+]
+PLANT_BASED = ["vegan", "plant based", "dairy free", "non dairy", "coconut yogurt", "coconut cream"]
+GLUTEN_FREE_GRAINS = [
+    "gluten free", "rice noodle", "rice pasta", "corn tortilla", "almond flour", "coconut flour", "rice flour",
+    "chickpea flour", "oat flour", "tamari", "rice cracker", "chickpea pasta", "lentil pasta",
+]
+LOW_CARB_SWAPS = [
+    "keto", "low carb", "cauliflower rice", "zucchini noodle", "shirataki", "almond flour", "coconut flour",
+    "spaghetti squash", "green bean",
+]
+NO_ADDED_SUGAR = ["sugar free", "no sugar added", "no added sugar", "unsweetened", "lemon juice", "lime juice"]
+GRAIN_FREE_SWAPS = [
+    "cauliflower rice", "almond flour", "coconut flour", "coconut milk", "almond milk", "ghee",
+    "green bean", "snap pea", "snow pea",
+]
+
+DIETARY_SAFE_PHRASES = {
+    DietaryRestriction.VEGETARIAN.value: ["vegetarian", "vegan", "plant based", "meatless", "oyster mushroom"],
+    DietaryRestriction.VEGAN.value: ["oyster mushroom"] + PLANT_MILKS + NUT_BUTTERS + PLANT_BASED,
+    DietaryRestriction.GLUTEN_FREE.value: GLUTEN_FREE_GRAINS,
+    DietaryRestriction.DAIRY_FREE.value: PLANT_MILKS + NUT_BUTTERS + PLANT_BASED,
+    DietaryRestriction.NUT_FREE.value: ["nut free"],
+    DietaryRestriction.LOW_SODIUM.value: ["low sodium", "reduced sodium", "no salt added", "unsalted", "salt free"],
+    DietaryRestriction.DIABETIC_FRIENDLY.value: NO_ADDED_SUGAR,
+    DietaryRestriction.HEART_HEALTHY.value: NUT_BUTTERS + ["air fried", "oven fried", "stir fried", "coconut cream"],
+    DietaryRestriction.SOY_FREE.value: ["soy free", "coconut aminos"],
+    DietaryRestriction.EGG_FREE.value: ["egg free", "eggless", "vegan", "plant based"],
+    DietaryRestriction.SHELLFISH_FREE.value: ["oyster mushroom"],
+    DietaryRestriction.LOW_SUGAR.value: NO_ADDED_SUGAR,
+    DietaryRestriction.KETO.value: LOW_CARB_SWAPS + ["lemon juice", "lime juice"],
+    DietaryRestriction.LOW_CARB.value: LOW_CARB_SWAPS + ["lemon juice", "lime juice"],
+    DietaryRestriction.PALEO.value: GRAIN_FREE_SWAPS,
+    DietaryRestriction.WHOLE30.value: GRAIN_FREE_SWAPS + ["lemon juice", "lime juice"],
+}
@@ -0,0 +1,64 @@
+from backend.constants.enums import HEALTH_DISCLAIMER, EXERCISE_DISCLAIMER, NUTRITION_DISCLAIMER
+
+# Versioned registry of every disclaimer the service hands out.
+# Plan state and stored plans carry only the ids; the text is looked up here when a response is built.
+# Bump an entry's version whenever its text changes so clients holding a cached copy can tell.
+
+
+def _disclaimer(title, text, version=1):
+    return {"title": title, "version": version, "text": " ".join(text.split())}
+
+
+DISCLAIMERS = {
+    "general_health": _disclaimer("General health", HEALTH_DISCLAIMER),
+    "exercise_safety": _disclaimer("Exercise safety", EXERCISE_DISCLAIMER),
+    "nutrition_guidance": _disclaimer("Nutrition guidance", NUTRITION_DISCLAIMER),
+    "ai_limitations": _disclaimer(
+        "AI limitations",
+        "AI-generated health recommendations are based on general wellness principles and cannot account for "
+        "individual medical complexities. Always consult with qualified healthcare professionals for personalized "
+        "medical advice, diagnosis, or treatment recommendations.",
+    ),
+    "emergency_situations": _disclaimer(
+        "Emergency situations",
+        "If you experience chest pain, severe shortness of breath, dizziness, fainting, or other emergency symptoms, "
+        "seek immediate medical attention. Do not rely on AI recommendations for emergency medical situations.",
+    ),
+    "analysis_not_medical": _disclaimer(
+        "Health analysis",
+        "This analysis is not a medical evaluation and cannot replace professional healthcare assessment.",
+    ),
+    "analysis_unavailable": _disclaimer(
+        "Health analysis unavailable",
+        "AI health analysis unavailable - professional consultation mandatory",
+    ),
+    "fallback_workout_plan": _disclaimer(
+        "Fallback workout plan",
+        "This is a basic fallback plan. Professional consultation strongly recommended.",
+    ),
+    "fallback_meal_plan": _disclaimer(
+        "Fallback meal plan",
+        "This is a basic fallback plan. Registered dietitian consultation strongly recommended.",
+    ),
+    "consultation_required": _disclaimer(
+        "Consultation required",
+        "This assessment indicates that professional medical consultation is necessary before proceeding.",
+    ),
+    "consultation_plan_unsuitable": _disclaimer(
+        "AI plan not appropriate",
+        "AI-generated health plans are not appropriate for your current health profile.",
+    ),
+    "consultation_guidance": _disclaimer(
+        "Professional guidance",
+        "Please consult with qualified healthcare professionals for personalized guidance.",
+    ),
+    "chat_assistant": _disclaimer(
+        "AI assistant",
+        "This AI assistant provides general wellness information only and cannot replace professional medical advice.",
+    ),
+}
+
+# Shown on /api/user/health-disclaimer; the rest are attached to plans as they apply
+PUBLISHED_DISCLAIMERS = [
+    "general_health", "exercise_safety", "nutrition_guidance", "ai_limitations", "emergency_situations",
+]
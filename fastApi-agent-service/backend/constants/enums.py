@@ -79,6 +79,11 @@ class MealType(Enum):
     PRE_WORKOUT = "pre_workout"
     POST_WORKOUT = "post_workout"
 
+class PlanEventKind(Enum):
+    PROGRESS = "progress"
+    PAUSE = "pause"
+    CHAT = "chat"
+
 class AgentType(Enum):
     WORKOUT_GENERATOR = "workout_generator"
     MEAL_GENERATOR = "meal_generator"
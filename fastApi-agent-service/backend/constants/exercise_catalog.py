@@ -0,0 +1,252 @@
+"""
+Curated exercise library for template-based workout planning.
+
+Each entry carries the fields of the Exercise model plus planner
+attributes: `id`, `default_minutes` (typical block length) and `focus`
+(upper / lower / core / full / cardio / mobility) used to spread load
+across the week. Only low- to high-intensity, low-risk movements are
+listed; nothing here is very_high intensity.
+"""
+from backend.constants.enums import WorkoutType, IntensityLevel
+
+# Canonical equipment names and the free-form user wording that maps to them.
+# "none" is always available.
+EQUIPMENT_ALIASES = {
+    "none": ["none", "bodyweight", "body weight", "no equipment"],
+    "dumbbells": ["dumbbell", "dumbbells", "free weight", "free weights", "hand weights"],
+    "resistance_band": ["resistance band", "resistance bands", "band", "bands", "tube"],
+    "yoga_mat": ["yoga mat", "mat", "exercise mat"],
+    "kettlebell": ["kettlebell", "kettlebells"],
+    "stationary_bike": ["stationary bike", "exercise bike", "spin bike", "bike", "bicycle"],
+    "pool": ["pool", "swimming pool"],
+    "jump_rope": ["jump rope", "skipping rope", "rope"],
+    "chair": ["chair", "bench", "step", "stairs"],
+}
+
+WARM_UPS = {
+    "cardio": "easy walking or marching in place, gradually raising the pace",
+    "strength": "light cardio plus arm circles, hip circles and bodyweight squats",
+    "mobility": "gentle joint rotations from neck to ankles and slow breathing",
+}
+
+COOL_DOWNS = {
+    "cardio": "slow walking followed by calf and hamstring stretches",
+    "strength": "stretching the muscles worked, holding each stretch 20-30 seconds",
+    "mobility": "relaxed breathing in a comfortable seated or lying position",
+}
+
+
+def _exercise(id, name, type, intensity, default_minutes, focus, instructions, target_muscles,
+              equipment_needed=("none",), modifications="", safety_notes=""):
+    return {
+        "id": id,
+        "name": name,
+        "type": type.value,
+        "intensity": intensity.value,
+        "default_minutes": default_minutes,
+        "focus": focus,
+        "instructions": instructions,
+        "target_muscles": list(target_muscles),
+        "equipment_needed": list(equipment_needed),
+        "modifications": modifications,
+        "safety_notes": safety_notes,
+    }
+
+
+EXERCISE_CATALOG = [
+    # Walking / cardio
+    _exercise("brisk-walk", "Brisk Walking", WorkoutType.WALKING, IntensityLevel.LOW, 15, "cardio",
+              "Walk at a pace where you can talk but not sing, swinging your arms naturally.",
+              ["legs", "cardiovascular"], modifications="Walk indoors or in place in poor weather",
+              safety_notes="Wear supportive shoes and stop if you feel dizzy or short of breath"),
+    _exercise("interval-walk", "Interval Walking", WorkoutType.WALKING, IntensityLevel.MODERATE, 15, "cardio",
+              "Alternate 2 minutes at a brisk pace with 1 minute at an easy pace.",
+              ["legs", "cardiovascular"], modifications="Shorten the brisk intervals to 1 minute",
+              safety_notes="Keep the brisk pace conversational"),
+    _exercise("march-in-place", "Marching in Place", WorkoutType.CARDIO, IntensityLevel.LOW, 8, "cardio",
+              "March on the spot lifting knees to a comfortable height and pumping the arms.",
+              ["hip flexors", "legs", "cardiovascular"], modifications="Hold a chair back for balance",
+              safety_notes="Keep the movement controlled"),
+    _exercise("step-ups", "Step-Ups", WorkoutType.CARDIO, IntensityLevel.MODERATE, 8, "cardio",
+              "Step up onto a sturdy low step with one foot, bring the other up, then step down. Alternate the lead leg.",
+              ["quadriceps", "glutes", "cardiovascular"], equipment_needed=["chair"],
+              modifications="Use the bottom stair and hold the rail",
+              safety_notes="Use a stable step no higher than knee height"),
+    _exercise("low-impact-cardio", "Low-Impact Cardio Circuit", WorkoutType.CARDIO, IntensityLevel.MODERATE, 10, "cardio",
+              "Cycle through step touches, knee lifts and side steps for 45 seconds each without jumping.",
+              ["legs", "cardiovascular"], modifications="Slow the tempo and take short breaks",
+              safety_notes="Keep one foot on the ground at all times"),
+    _exercise("jog-intervals", "Easy Jog Intervals", WorkoutType.RUNNING, IntensityLevel.HIGH, 15, "cardio",
+              "Alternate 2 minutes of easy jogging with 2 minutes of walking.",
+              ["legs", "cardiovascular"], modifications="Replace jogging with brisk walking",
+              safety_notes="Run on even ground and stop if you feel joint pain"),
+    _exercise("jump-rope-easy", "Easy Jump Rope", WorkoutType.CARDIO, IntensityLevel.HIGH, 6, "cardio",
+              "Skip with small, low jumps for 30 seconds, then rest 30 seconds.",
+              ["calves", "shoulders", "cardiovascular"], equipment_needed=["jump_rope"],
+              modifications="Mimic the movement without the rope",
+              safety_notes="Land softly on the balls of your feet"),
+    _exercise("bike-steady", "Steady Cycling", WorkoutType.CYCLING, IntensityLevel.MODERATE, 20, "cardio",
+              "Pedal at a steady, comfortable cadence with light to moderate resistance.",
+              ["quadriceps", "hamstrings", "cardiovascular"], equipment_needed=["stationary_bike"],
+              modifications="Lower the resistance and cadence",
+              safety_notes="Adjust the seat so your knee is slightly bent at the bottom of the stroke"),
+    _exercise("bike-intervals", "Cycling Intervals", WorkoutType.CYCLING, IntensityLevel.HIGH, 15, "cardio",
+              "Alternate 1 minute at a harder effort with 2 minutes of easy pedalling.",
+              ["quadriceps", "glutes", "cardiovascular"], equipment_needed=["stationary_bike"],
+              modifications="Keep all intervals at an easy effort",
+              safety_notes="Stay seated and keep the effort sub-maximal"),
+    _exercise("swim-easy", "Easy Lap Swimming", WorkoutType.SWIMMING, IntensityLevel.MODERATE, 20, "cardio",
+              "Swim easy lengths in any comfortable stroke, resting at the wall as needed.",
+              ["full body", "cardiovascular"], equipment_needed=["pool"],
+              modifications="Use a kickboard or walk in the shallow end",
+              safety_notes="Swim where a lifeguard is present"),
+    _exercise("dance-cardio", "Dance Cardio", WorkoutType.DANCE, IntensityLevel.MODERATE, 15, "cardio",
+              "Follow simple, low-impact dance steps to music at a comfortable tempo.",
+              ["full body", "cardiovascular"], modifications="Keep steps small and arms low",
+              safety_notes="Clear the space around you"),
+    _exercise("shadow-boxing", "Shadow Boxing", WorkoutType.MARTIAL_ARTS, IntensityLevel.MODERATE, 8, "cardio",
+              "In a staggered stance, throw controlled jabs and crosses at the air while stepping lightly.",
+              ["shoulders", "core", "cardiovascular"], modifications="Punch slower and keep feet planted",
+              safety_notes="Do not lock the elbows on each punch"),
+    _exercise("low-impact-hiit", "Low-Impact Intervals", WorkoutType.HIIT, IntensityLevel.HIGH, 10, "cardio",
+              "Perform 30 seconds of fast squats-to-reach, then 30 seconds of marching, for the full block.",
+              ["legs", "cardiovascular"], modifications="Extend the recovery to 60 seconds",
+              safety_notes="Stay below maximal effort and stop if you feel chest discomfort"),
+
+    # Strength - lower body
+    _exercise("bodyweight-squat", "Bodyweight Squats", WorkoutType.STRENGTH, IntensityLevel.MODERATE, 6, "lower",
+              "Stand with feet shoulder-width apart, sit the hips back and down, then stand up. 3 sets of 10-12.",
+              ["quadriceps", "glutes"], modifications="Squat to a chair and stand back up",
+              safety_notes="Keep knees tracking over the toes; stop if you feel knee pain"),
+    _exercise("chair-sit-to-stand", "Sit-to-Stand", WorkoutType.STRENGTH, IntensityLevel.LOW, 5, "lower",
+              "From a sturdy chair, stand up without using your hands, then sit down slowly. 3 sets of 8-10.",
+              ["quadriceps", "glutes"], equipment_needed=["chair"],
+              modifications="Use your hands on your thighs for help",
+              safety_notes="Place the chair against a wall so it cannot slide"),
+    _exercise("glute-bridge", "Glute Bridges", WorkoutType.BODYWEIGHT, IntensityLevel.LOW, 5, "lower",
+              "Lie on your back with knees bent, press through the heels to lift the hips, pause, then lower. 3 sets of 12.",
+              ["glutes", "hamstrings"], modifications="Reduce the range of motion",
+              safety_notes="Avoid arching the lower back at the top"),
+    _exercise("reverse-lunge", "Reverse Lunges", WorkoutType.STRENGTH, IntensityLevel.MODERATE, 6, "lower",
+              "Step one foot back, lower both knees to about 90 degrees, then return. 3 sets of 8 per leg.",
+              ["quadriceps", "glutes", "hamstrings"], modifications="Hold a wall and take shorter steps",
+              safety_notes="Keep the front knee above the ankle"),
+    _exercise("dumbbell-goblet-squat", "Goblet Squats", WorkoutType.WEIGHTLIFTING, IntensityLevel.MODERATE, 6, "lower",
+              "Hold a dumbbell at the chest and squat to a comfortable depth. 3 sets of 10.",
+              ["quadriceps", "glutes", "core"], equipment_needed=["dumbbells"],
+              modifications="Use a lighter weight or bodyweight only",
+              safety_notes="Choose a weight you can lift for all reps with good form"),
+    _exercise("dumbbell-rdl", "Dumbbell Romanian Deadlift", WorkoutType.WEIGHTLIFTING, IntensityLevel.MODERATE, 6, "lower",
+              "Holding dumbbells, hinge at the hips with a flat back until you feel the hamstrings stretch, then stand. 3 sets of 10.",
+              ["hamstrings", "glutes", "lower back"], equipment_needed=["dumbbells"],
+              modifications="Hinge to knee height only",
+              safety_notes="Keep the back flat and weights close to the legs"),
+    _exercise("kettlebell-deadlift", "Kettlebell Deadlift", WorkoutType.WEIGHTLIFTING, IntensityLevel.MODERATE, 6, "lower",
+              "With the kettlebell between your feet, hinge and lift it by standing tall. 3 sets of 10.",
+              ["glutes", "hamstrings", "core"], equipment_needed=["kettlebell"],
+              modifications="Raise the kettlebell on a step to shorten the range",
+              safety_notes="Lift with the legs and hips, not the back"),
+    _exercise("calf-raise", "Calf Raises", WorkoutType.BODYWEIGHT, IntensityLevel.LOW, 4, "lower",
+              "Rise onto the balls of your feet, pause, and lower slowly. 3 sets of 15.",
+              ["calves"], modifications="Hold a wall or chair for balance",
+              safety_notes="Move slowly through the full range"),
+
+    # Strength - upper body
+    _exercise("wall-pushup", "Wall Push-Ups", WorkoutType.BODYWEIGHT, IntensityLevel.LOW, 5, "upper",
+              "Hands on a wall at shoulder height, bend the elbows to bring your chest toward the wall, then push back. 3 sets of 10-12.",
+              ["chest", "shoulders", "triceps"], modifications="Stand closer to the wall",
+              safety_notes="Keep the body in a straight line"),
+    _exercise("incline-pushup", "Incline Push-Ups", WorkoutType.STRENGTH, IntensityLevel.MODERATE, 6, "upper",
+              "Hands on a sturdy bench or counter, lower the chest toward it and press back up. 3 sets of 8-10.",
+              ["chest", "shoulders", "triceps"], equipment_needed=["chair"],
+              modifications="Use a higher surface or the wall",
+              safety_notes="Make sure the surface is stable"),
+    _exercise("knee-pushup", "Knee Push-Ups", WorkoutType.BODYWEIGHT, IntensityLevel.MODERATE, 5, "upper",
+              "From your knees, lower the chest toward the floor and press back up. 3 sets of 8.",
+              ["chest", "shoulders", "triceps"], modifications="Switch to incline or wall push-ups",
+              safety_notes="Keep the core braced and neck neutral"),
+    _exercise("band-row", "Resistance Band Rows", WorkoutType.STRENGTH, IntensityLevel.LOW, 6, "upper",
+              "Anchor the band at chest height and pull the handles toward your ribs, squeezing the shoulder blades. 3 sets of 12.",
+              ["upper back", "biceps"], equipment_needed=["resistance_band"],
+              modifications="Step closer to the anchor to reduce tension",
+              safety_notes="Check the band and anchor for wear before use"),
+    _exercise("band-press", "Resistance Band Chest Press", WorkoutType.STRENGTH, IntensityLevel.LOW, 6, "upper",
+              "With the band behind your back, press both hands forward to arm's length and return slowly. 3 sets of 12.",
+              ["chest", "triceps"], equipment_needed=["resistance_band"],
+              modifications="Use a lighter band", safety_notes="Control the return"),
+    _exercise("dumbbell-row", "One-Arm Dumbbell Row", WorkoutType.WEIGHTLIFTING, IntensityLevel.MODERATE, 6, "upper",
+              "Support one hand on a bench or chair and row the dumbbell to your hip. 3 sets of 10 per arm.",
+              ["upper back", "biceps"], equipment_needed=["dumbbells"],
+              modifications="Use a lighter weight", safety_notes="Keep the back flat"),
+    _exercise("dumbbell-press", "Seated Dumbbell Shoulder Press", WorkoutType.WEIGHTLIFTING, IntensityLevel.MODERATE, 6, "upper",
+              "Seated tall, press the dumbbells overhead and lower to shoulder height. 3 sets of 10.",
+              ["shoulders", "triceps"], equipment_needed=["dumbbells"],
+              modifications="Press one arm at a time",
+              safety_notes="Skip if overhead pressing causes shoulder pain"),
+
+    # Core
+    _exercise("dead-bug", "Dead Bug", WorkoutType.PILATES, IntensityLevel.LOW, 5, "core",
+              "On your back with arms up and knees at 90 degrees, slowly extend opposite arm and leg, then switch. 3 sets of 8 per side.",
+              ["core"], equipment_needed=["yoga_mat"], modifications="Move only the legs",
+              safety_notes="Keep the lower back pressed to the floor"),
+    _exercise("bird-dog", "Bird Dog", WorkoutType.BALANCE, IntensityLevel.LOW, 5, "core",
+              "On hands and knees, extend the opposite arm and leg, hold for 2 seconds, and return. 3 sets of 8 per side.",
+              ["core", "lower back", "glutes"], modifications="Extend only the leg",
+              safety_notes="Keep the hips level"),
+    _exercise("forearm-plank", "Forearm Plank", WorkoutType.STRENGTH, IntensityLevel.MODERATE, 4, "core",
+              "Hold a straight line from head to heels on your forearms for 20-30 seconds. Repeat 3 times.",
+              ["core", "shoulders"], modifications="Plank from the knees or against a bench",
+              safety_notes="Stop if your lower back sags or hurts"),
+    _exercise("pilates-hundred", "Modified Pilates Hundred", WorkoutType.PILATES, IntensityLevel.MODERATE, 5, "core",
+              "Lying with knees bent and head down, pulse the arms while breathing in for 5 counts and out for 5.",
+              ["core"], equipment_needed=["yoga_mat"], modifications="Keep feet on the floor",
+              safety_notes="Keep the neck relaxed"),
+
+    # Full body / functional
+    _exercise("kettlebell-swing-light", "Light Kettlebell Swings", WorkoutType.STRENGTH, IntensityLevel.HIGH, 6, "full",
+              "Hinge and swing a light kettlebell to chest height using hip drive. 4 sets of 12 with rest.",
+              ["glutes", "hamstrings", "core"], equipment_needed=["kettlebell"],
+              modifications="Replace with kettlebell deadlifts",
+              safety_notes="Learn the hip hinge first; never round the back"),
+    _exercise("sports-drills", "Recreational Sport Drills", WorkoutType.SPORTS, IntensityLevel.MODERATE, 15, "full",
+              "Practice easy skills of a sport you enjoy, such as shooting hoops or passing a ball.",
+              ["full body"], modifications="Keep drills stationary",
+              safety_notes="Warm up fully and avoid competitive play"),
+
+    # Mobility / flexibility / balance
+    _exercise("full-body-stretch", "Full Body Stretch", WorkoutType.FLEXIBILITY, IntensityLevel.LOW, 10, "mobility",
+              "Hold stretches for the hamstrings, quads, hips, chest and shoulders for 20-30 seconds each.",
+              ["full body"], modifications="Perform stretches seated",
+              safety_notes="Stretch to mild tension, never pain"),
+    _exercise("hip-mobility", "Hip Mobility Flow", WorkoutType.FLEXIBILITY, IntensityLevel.LOW, 8, "mobility",
+              "Move through hip circles, 90/90 switches and gentle lunges with a reach.",
+              ["hips", "lower back"], equipment_needed=["yoga_mat"],
+              modifications="Keep the range small", safety_notes="Move slowly and breathe"),
+    _exercise("gentle-yoga", "Gentle Yoga Flow", WorkoutType.YOGA, IntensityLevel.LOW, 15, "mobility",
+              "Flow through cat-cow, child's pose, low lunge and supine twist, holding each for 5 breaths.",
+              ["full body", "flexibility"], equipment_needed=["yoga_mat"],
+              modifications="Use a chair for seated variations",
+              safety_notes="Avoid any pose that causes pain"),
+    _exercise("yoga-strength", "Standing Yoga Sequence", WorkoutType.YOGA, IntensityLevel.MODERATE, 15, "mobility",
+              "Move through mountain, warrior I, warrior II and chair pose, holding each for 5 breaths per side.",
+              ["legs", "core", "shoulders"], equipment_needed=["yoga_mat"],
+              modifications="Shorten the stance and hold a wall",
+              safety_notes="Keep the front knee over the ankle"),
+    _exercise("pilates-mat", "Beginner Pilates Mat Sequence", WorkoutType.PILATES, IntensityLevel.LOW, 15, "mobility",
+              "Perform pelvic curls, single-leg stretches, side-lying leg lifts and swimming, 8 reps each.",
+              ["core", "hips", "back"], equipment_needed=["yoga_mat"],
+              modifications="Keep the head down throughout",
+              safety_notes="Move with control and steady breathing"),
+    _exercise("single-leg-balance", "Single-Leg Balance", WorkoutType.BALANCE, IntensityLevel.LOW, 5, "mobility",
+              "Stand on one leg near a support for 20-30 seconds, then switch. Repeat 3 times per side.",
+              ["ankles", "core"], modifications="Keep a fingertip on the wall",
+              safety_notes="Always have support within reach"),
+    _exercise("heel-to-toe-walk", "Heel-to-Toe Walk", WorkoutType.BALANCE, IntensityLevel.LOW, 5, "mobility",
+              "Walk in a straight line placing the heel of one foot directly in front of the toes of the other.",
+              ["ankles", "legs", "core"], modifications="Walk alongside a wall",
+              safety_notes="Clear the walking path of obstacles"),
+    _exercise("breathing-relaxation", "Breathing and Relaxation", WorkoutType.FLEXIBILITY, IntensityLevel.LOW, 5, "mobility",
+              "Lie or sit comfortably and breathe in for 4 counts and out for 6 counts.",
+              ["diaphragm"], modifications="Practice seated",
+              safety_notes="Return to normal breathing if you feel light-headed"),
+]
@@ -0,0 +1,107 @@
+# Shared vocabulary for every keyword-based safety screen.
+# Keywords match at the start of a word, so "pain" also covers "painful" and "pains"
+# (the screens in MATCH_ANYWHERE also match inside a word).
+# Each call site keeps its own list: who gets flagged, gated or rejected is decided per screen,
+# and all lists still compile into the one matcher (shared keywords are matched once).
+SAFETY_LEXICON = {
+    # Chat messages answered with emergency resources (controller/user.py)
+    "chat_urgent": [
+        "chest pain", "severe pain", "can't breathe", "dizzy", "nauseous", "injured", "hurt",
+        "emergency", "hospital", "bleeding", "fainted",
+    ],
+    # Emergency wording in chat requests (validations/internal.py)
+    "chat_emergency": [
+        "chest pain", "can't breathe", "heart attack", "stroke", "severe pain", "bleeding", "emergency",
+        "ambulance", "hospital", "fainted", "unconscious",
+    ],
+    # Progress notes that stop a progress update (controller/user.py)
+    "progress_concern": ["pain", "injury", "hurt", "dizzy", "nauseous", "exhausted"],
+    # Progress notes flagged for health review (validations/user.py)
+    "progress_review": [
+        "pain", "injury", "hurt", "sore", "exhausted", "tired", "dizzy", "nauseous", "sick", "unwell", "struggle",
+    ],
+    # Progress notes flagged for immediate safety review (validations/internal.py)
+    "progress_note_urgent": [
+        "severe pain", "chest pain", "can't breathe", "dizzy", "fainted", "injured", "bleeding", "nauseous",
+        "vomiting", "emergency",
+    ],
+    # Reported issues flagged for urgent medical attention (validations/internal.py)
+    "progress_issue_urgent": [
+        "chest pain", "heart", "breathing", "dizzy", "faint", "severe", "emergency", "blood", "injury", "hospital",
+    ],
+    # Reported concerns flagged for urgent medical attention (validations/user.py)
+    "progress_concern_urgent": [
+        "chest pain", "heart", "breathing difficulty", "severe pain", "bleeding", "injury serious", "fainted",
+        "dizzy severe",
+    ],
+    # Conditions that get a medical-consultation warning on plan requests (middleware/verify_signature.py)
+    "request_health_condition": [
+        "heart", "cardiac", "diabetes", "blood pressure", "eating disorder", "pregnancy", "surgery", "injury",
+        "medication",
+    ],
+    # Conditions that make a profile a safety concern and gate plan creation (utils/health_safety.py)
+    "profile_health_condition": [
+        "heart disease", "diabetes", "high blood pressure", "eating disorder", "pregnancy", "recent surgery",
+        "joint problems", "back injury",
+    ],
+    # Conditions flagged for professional consultation on plan requests (validations/internal.py)
+    "plan_health_condition": [
+        "heart", "cardiac", "diabetes", "blood pressure", "hypertension", "eating disorder", "pregnancy",
+        "surgery", "injury", "medication", "depression", "anxiety", "arthritis", "asthma", "cancer",
+    ],
+    # Goals flagged for safety review (validations/internal.py)
+    "unsafe_goal": [
+        "lose weight fast", "extreme diet", "crash diet", "no pain no gain", "until exhaustion", "ignore pain",
+        "dangerous", "risky",
+    ],
+    # Plan modifications that are rejected (routes/internal.py)
+    "unsafe_modification": [
+        "extreme", "maximum", "no rest", "ignore pain", "push through", "crash diet", "very low calorie",
+        "intense daily", "no breaks",
+    ],
+    # Health updates on resume that recommend a medical review (routes/user.py)
+    "resume_medical_change": ["medication", "surgery", "injury", "diagnosis", "doctor", "medical"],
+    # Health updates on resume flagged before the plan continues (validations/user.py)
+    "medical_change": [
+        "new medication", "surgery", "injury", "diagnosis", "condition", "doctor said", "medical advice",
+        "health problem", "treatment",
+    ],
+    # Pause reasons treated as health-related (validations/user.py, controller/user.py)
+    "health_pause": [
+        "injury", "sick", "illness", "doctor", "medical", "surgery", "medication", "health issue",
+        "not feeling well", "tired", "exhausted", "pain", "recovery", "hospital",
+    ],
+    # Pause reasons flagged for health follow-up (validations/internal.py)
+    "internal_health_pause": [
+        "injury", "sick", "illness", "doctor", "hospital", "pain", "medication", "surgery", "health", "medical",
+        "tired", "exhausted",
+    ],
+    # Pause reasons about life circumstances (validations/user.py)
+    "life_circumstance": [
+        "busy", "work", "travel", "family", "schedule", "time", "vacation", "moving", "stress", "overwhelmed",
+    ],
+    # Feedback that gets a consult-a-professional follow-up (routes/user.py)
+    "feedback_safety": ["too hard", "painful", "injury", "dangerous", "unsafe"],
+    # Feedback flagged for safety review (validations/user.py)
+    "feedback_concern": [
+        "too hard", "too difficult", "painful", "injury", "hurt", "impossible", "unrealistic", "dangerous", "unsafe",
+    ],
+    # Generated exercises that get a risk warning (controller/agents/workout_plan_generator.py)
+    "risky_exercise": [
+        "maximum", "extreme", "until failure", "heavy weight", "plyometric jumps", "advanced", "competitive",
+        "maximum heart rate",
+    ],
+}
+
+# Medical, urgent and condition screens match anywhere inside a word, like the substring checks
+# they replaced ("prediabetes" is still "diabetes", "osteoarthritis" still "arthritis");
+# the rest match from the start of a word ("time" does not fire on "sometimes")
+MATCH_ANYWHERE = [
+    "chat_urgent", "chat_emergency", "progress_concern", "progress_review", "progress_note_urgent",
+    "progress_issue_urgent", "progress_concern_urgent", "request_health_condition", "profile_health_condition",
+    "plan_health_condition", "resume_medical_change", "medical_change", "health_pause", "internal_health_pause",
+    "feedback_safety", "feedback_concern",
+]
+
+# Lexicon categories checked by each screen; one category per screen keeps every call site's list intact
+SAFETY_SCREENS = {category: (category,) for category in SAFETY_LEXICON}
@@ -1,9 +1,15 @@
 from langgraph.graph import StateGraph, END, START
-from typing import TypedDict, Dict, Any
+from typing import TypedDict, Dict, Any, AsyncIterator, Tuple
 from backend.controller.agents.workout_plan_generator import generate_safe_workout_plan, validate_workout_safety_post_generation
 from backend.controller.agents.meal_plan_generator import generate_safe_meal_plan, validate_meal_plan_nutrition, check_dietary_restriction_compliance
 from backend.controller.agents.health_analyzer import analyze_user_health_profile, generate_progress_monitoring_plan
-from backend.utils.health_safety import log_health_recommendation
+from backend.utils.health_safety import HealthSafetyValidator, log_health_recommendation
+from backend.utils.llm_resilience import llm_request_budget
+from backend.utils.plan_progression import expand_plan_weeks
+from backend.utils.plan_stream import emit_plan_event
+from backend.utils.disclaimers import add_disclaimers
+from backend.config import main as config
+from backend.constants.enums import ActivityLevel
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,6 +24,7 @@ class WellnessOrchestratorState(TypedDict):
     health_documents: str  
     workout_plan: list
     meal_plan: list
+    weekly_plans: list
     
     
     analysis_result: dict
@@ -49,7 +56,65 @@ async def wellness_orchestrator(
     """
     graph = create_wellness_orchestrator_graph()
 
-    initial_state = {
+    initial_state = build_initial_state(
+        user_profile, health_conditions, dietary_restrictions, medical_clearance, health_documents
+    )
+
+    log_health_recommendation(
+        user_id=user_profile.get("user_id", "anonymous"),
+        recommendation_type=operation_type,
+        safety_check={"user_profile": user_profile, "health_conditions": health_conditions}
+    )
+
+    with llm_request_budget():
+        return await graph.ainvoke(initial_state)
+
+async def stream_wellness_orchestrator(
+    user_profile: dict,
+    health_conditions: list = None,
+    dietary_restrictions: list = None,
+    medical_clearance: bool = False,
+    health_documents: str = "",
+    operation_type: str = "create_plan"
+) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    Streaming variant of wellness_orchestrator
+    
+    Yields (event, data) tuples: "workout_day" and "meal_day" as each day is
+    generated and checked, "plan_week" for each derived later week, then
+    ("final_state", state) once the graph finishes.
+    """
+    graph = create_wellness_orchestrator_graph()
+
+    initial_state = build_initial_state(
+        user_profile, health_conditions, dietary_restrictions, medical_clearance, health_documents
+    )
+
+    log_health_recommendation(
+        user_id=user_profile.get("user_id", "anonymous"),
+        recommendation_type=operation_type,
+        safety_check={"user_profile": user_profile, "health_conditions": health_conditions}
+    )
+
+    final_state = initial_state
+    with llm_request_budget():
+        async for mode, chunk in graph.astream(initial_state, stream_mode=["custom", "values"]):
+            if mode == "custom":
+                yield chunk["event"], chunk["data"]
+            else:
+                final_state = chunk
+
+    yield "final_state", final_state
+
+def build_initial_state(
+    user_profile: dict,
+    health_conditions: list = None,
+    dietary_restrictions: list = None,
+    medical_clearance: bool = False,
+    health_documents: str = ""
+) -> dict:
+    """Initial graph state for a wellness orchestration run"""
+    return {
         "user_profile": user_profile,
         "health_conditions": health_conditions or [],
         "dietary_restrictions": dietary_restrictions or [],
@@ -57,21 +122,13 @@ async def wellness_orchestrator(
         "health_documents": health_documents,
         "workout_plan": [],
         "meal_plan": [],
+        "weekly_plans": [],
         "analysis_result": {},
         "safety_notes": [],
         "disclaimers": [],
         "final_result": {},
         "monitoring_plan": {}
     }
-    
-
-    log_health_recommendation(
-        user_id=user_profile.get("user_id", "anonymous"),
-        recommendation_type=operation_type,
-        safety_check={"user_profile": user_profile, "health_conditions": health_conditions}
-    )
-
-    return await graph.ainvoke(initial_state)
 
 def route_based_on_health_analysis(state: WellnessOrchestratorState) -> str:
     """
@@ -213,16 +270,82 @@ def generate_consultation_plan(state: WellnessOrchestratorState) -> WellnessOrch
     state["meal_plan"] = []
     
     state["safety_notes"].append("Professional consultation required - AI plans not generated")
-    state["disclaimers"].extend([
-        "This assessment indicates that professional medical consultation is necessary before proceeding.",
-        "AI-generated health plans are not appropriate for your current health profile.",
-        "Please consult with qualified healthcare professionals for personalized guidance."
-    ])
+    add_disclaimers(state, "consultation_required", "consultation_plan_unsuitable", "consultation_guidance")
     
     logger.info("Generated professional consultation plan for high-risk user")
     
     return state
 
+def expand_wellness_plan_weeks(state: WellnessOrchestratorState) -> WellnessOrchestratorState:
+    """
+    Derive weeks 2..PLAN_DURATION_WEEKS from the generated week-1 plans,
+    checked week by week (see derive_plan_weeks)
+    """
+    weeks = plan_duration_weeks()
+    if (
+        not config.PLAN_PROGRESSION_ENABLED
+        or weeks < 2
+        or not state["workout_plan"]
+        or state.get("final_result", {}).get("type") == "professional_consultation_required"
+    ):
+        return state
+
+    try:
+        weekly_plans = derive_plan_weeks(
+            state["workout_plan"], state["meal_plan"], state["user_profile"], state["dietary_restrictions"], weeks
+        )
+    except Exception as e:
+        logger.error(f"Error expanding plan weeks, week 1 will repeat: {e}")
+        return state
+
+    for week_plan in weekly_plans:
+        emit_plan_event("plan_week", week_plan)
+
+    state["weekly_plans"] = weekly_plans
+    state["safety_notes"].append(
+        f"Weeks 2-{weeks} progress gradually from week 1, with a lighter recovery week every few weeks"
+    )
+    return state
+
+def derive_plan_weeks(workout_plan: list, meal_plan: list, profile: dict, dietary_restrictions: list, weeks: int) -> list:
+    """
+    Expand week-1 plans to weeks 2..weeks and run the week-level safety
+    validators on each derived week. A week that fails keeps the previous
+    week's workouts or week 1's meals.
+    """
+    safety_check = HealthSafetyValidator.validate_workout_plan(
+        profile.get("time_availability_minutes", 30),
+        profile.get("current_activity_level", ActivityLevel.MODERATELY_ACTIVE),
+        profile.get("age")
+    )
+    weekly_plans = expand_plan_weeks(workout_plan, meal_plan, profile, weeks, safety_check)
+
+    previous_workouts = workout_plan
+    for week_plan in weekly_plans:
+        week = week_plan["week"]
+        warnings = []
+
+        workout_safety = validate_workout_safety_post_generation(week_plan["workout_plan"])
+        if not workout_safety["is_safe"]:
+            logger.warning(f"Week {week} workout progression failed safety checks: {workout_safety['warnings']}")
+            week_plan["workout_plan"] = previous_workouts
+            warnings.append(f"Week {week} repeats the previous week's workouts")
+        previous_workouts = week_plan["workout_plan"]
+
+        meal_safety = validate_meal_plan_nutrition(week_plan["meal_plan"])
+        dietary_compliance = check_dietary_restriction_compliance(week_plan["meal_plan"], dietary_restrictions)
+        if not meal_safety["is_nutritionally_safe"] or not dietary_compliance["is_compliant"]:
+            logger.warning(f"Week {week} meal rotation failed checks, keeping week 1 meals")
+            week_plan["meal_plan"] = meal_plan
+            warnings.append(f"Week {week} repeats week 1's meals")
+
+        week_plan["safety_warnings"] = warnings
+    return weekly_plans
+
+def plan_duration_weeks() -> int:
+    """Configured plan length, within the 1-12 weeks a HealthPlan allows"""
+    return min(max(config.PLAN_DURATION_WEEKS, 1), 12)
+
 def finalize_wellness_plan(state: WellnessOrchestratorState) -> WellnessOrchestratorState:
     """
     Finalize the wellness plan with all safety information and monitoring recommendations
@@ -241,11 +364,12 @@ def finalize_wellness_plan(state: WellnessOrchestratorState) -> WellnessOrchestr
         "message": "Wellness plan generated with appropriate safety measures",
         "workout_plan": state["workout_plan"],
         "meal_plan": state["meal_plan"],
+        "weekly_plans": state.get("weekly_plans", []),
         "health_analysis": state["analysis_result"],
         "monitoring_plan": monitoring_plan,
         "safety_notes": list(set(state["safety_notes"])),  
-        "disclaimers": list(set(state["disclaimers"])),
-        "plan_duration_weeks": 4,  
+        "disclaimers": list(state["disclaimers"]),  # Registry ids, already unique
+        "plan_duration_weeks": plan_duration_weeks(),
         "revision_recommended_after": "2 weeks",
         "professional_check_in_recommended": True
     }
@@ -265,6 +389,7 @@ def create_wellness_orchestrator_graph():
     graph.add_node("generate_plans_with_standard_safety", generate_plans_with_standard_safety)
     graph.add_node("generate_plans_with_enhanced_safety", generate_plans_with_enhanced_safety)
     graph.add_node("generate_consultation_plan", generate_consultation_plan)
+    graph.add_node("expand_wellness_plan_weeks", expand_wellness_plan_weeks)
     graph.add_node("finalize_wellness_plan", finalize_wellness_plan)
 
     
@@ -282,8 +407,9 @@ def create_wellness_orchestrator_graph():
     )
 
     
-    graph.add_edge("generate_plans_with_standard_safety", "finalize_wellness_plan")
-    graph.add_edge("generate_plans_with_enhanced_safety", "finalize_wellness_plan")
+    graph.add_edge("generate_plans_with_standard_safety", "expand_wellness_plan_weeks")
+    graph.add_edge("generate_plans_with_enhanced_safety", "expand_wellness_plan_weeks")
+    graph.add_edge("expand_wellness_plan_weeks", "finalize_wellness_plan")
     graph.add_edge("generate_consultation_plan", "finalize_wellness_plan")
     graph.add_edge("finalize_wellness_plan", END)
 
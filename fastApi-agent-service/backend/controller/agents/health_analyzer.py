@@ -1,10 +1,14 @@
 from typing import TypedDict, List, Dict, Any
-from backend.utils.llm import health_llm
+from backend.utils.llm import route_node_llm
 from backend.utils.health_safety import HealthSafetyValidator
-from backend.constants.enums import (
-    ActivityLevel, Goal, HealthPlanStatus, 
-    HEALTH_DISCLAIMER, EXERCISE_DISCLAIMER, NUTRITION_DISCLAIMER
-)
+from backend.utils.structured_output import invoke_structured, HEALTH_ANALYSIS_SCHEMA
+from backend.utils.prompt_cache import PromptTemplate, CompiledPrompt
+from backend.utils.token_budget import allocate_document_budget
+from backend.utils.document_retrieval import fit_document_to_budget
+from backend.utils.metrics import record_document_compaction
+from backend.config import main as config
+from backend.utils.disclaimers import add_disclaimers
+from backend.constants.enums import ActivityLevel, Goal, HealthPlanStatus
 import json
 import logging
 from datetime import datetime, timedelta
@@ -15,6 +19,7 @@ class WellnessOrchestratorState(TypedDict):
     user_profile: dict
     health_conditions: list
     medical_clearance: bool
+    health_documents: str
     workout_plan: list
     meal_plan: list
     safety_notes: list
@@ -55,24 +60,7 @@ def normalize_consultation_types(analysis: Dict[str, Any]) -> Dict[str, Any]:
     
     return analysis
 
-def analyze_user_health_profile(state: WellnessOrchestratorState) -> WellnessOrchestratorState:
-    """
-    Analyze user health profile for safety concerns and provide recommendations
-    This agent focuses on identifying potential risks and recommending professional consultation
-    """
-    profile = state["user_profile"]
-    health_conditions = state.get("health_conditions", [])
-    
-    # Run safety validation
-    profile_safety = HealthSafetyValidator.validate_user_profile_safety({
-        "age": profile.get("age"),
-        "primary_goal": profile.get("primary_goal"),
-        "health_conditions": health_conditions,
-        "current_activity_level": profile.get("current_activity_level")
-    })
-    
-    # Build comprehensive prompt with EXPLICIT enum constraints
-    prompt = f"""
+ANALYSIS_PROMPT = PromptTemplate("health_analyzer", f"""
 You are a healthcare professional conducting a preliminary health assessment for exercise and nutrition planning.
 Your primary responsibility is to identify potential risks and recommend appropriate professional consultation.
 
@@ -83,20 +71,6 @@ CRITICAL RESPONSIBILITIES:
 - Never provide medical diagnoses or treatment advice
 - Always err on the side of caution and professional referral
 
-User Profile Analysis:
-- Age: {profile.get('age', 'Not provided')}
-- Current Activity Level: {profile.get('current_activity_level', 'Not provided')}
-- Primary Goal: {profile.get('primary_goal', 'Not provided')}
-- Available Time: {profile.get('time_availability_minutes', 'Not provided')} minutes daily
-- Self-Reported Health Conditions: {health_conditions if health_conditions else 'None reported'}
-- Medical Clearance Confirmed: {state.get('medical_clearance', False)}
-
-SAFETY CONCERNS IDENTIFIED:
-{'; '.join(profile_safety.get('concerns', [])) if profile_safety.get('concerns') else 'None'}
-
-EXISTING RECOMMENDATIONS:
-{'; '.join(profile_safety.get('recommendations', [])) if profile_safety.get('recommendations') else 'None'}
-
 CRITICAL: Use ONLY these EXACT consultation types (all lowercase, snake_case):
 - primary_care
 - registered_dietitian
@@ -161,13 +135,78 @@ IMPORTANT GUIDELINES:
 10. Return ONLY valid JSON, no markdown formatting
 
 Focus on safety, conservative approaches, and professional guidance.
-"""
 
-    try:
-        response = health_llm.invoke(prompt)
-        analysis = json.loads(
-            response.content.strip().replace("```json\n", "").replace("```", "").replace("```json", "")
+USER CONTEXT:
+""")
+
+def build_analysis_prompt(
+    profile: dict,
+    health_conditions: list,
+    medical_clearance: bool,
+    profile_safety: Dict,
+    health_documents: str = "",
+) -> CompiledPrompt:
+    """
+    Build the health assessment prompt: the static ANALYSIS_PROMPT prefix
+    followed by a compact per-user suffix. Only the health document
+    chunks most relevant to exercise and nutrition risk are included,
+    within whatever is left of the context token budget.
+    """
+    profile_lines = "\n".join([
+        f"- Age: {profile.get('age', 'Not provided')}",
+        f"- Current Activity Level: {profile.get('current_activity_level', 'Not provided')}",
+        f"- Primary Goal: {profile.get('primary_goal', 'Not provided')}",
+        f"- Available Time: {profile.get('time_availability_minutes', 'Not provided')} minutes daily",
+        f"- Self-Reported Health Conditions: {health_conditions if health_conditions else 'None reported'}",
+        f"- Medical Clearance Confirmed: {medical_clearance}",
+    ])
+    safety_lines = "\n".join([
+        f"- Safety Concerns Identified: {'; '.join(profile_safety.get('concerns', [])) or 'None'}",
+        f"- Existing Recommendations: {'; '.join(profile_safety.get('recommendations', [])) or 'None'}",
+    ])
+    suffix = f"{profile_lines}\n{safety_lines}"
+
+    if health_documents and health_documents.strip():
+        document_budget, measured = allocate_document_budget(
+            config.LLM_ANALYSIS_CONTEXT_TOKEN_BUDGET,
+            {"profile": profile_lines, "safety": safety_lines},
+        )
+        excerpt, report = fit_document_to_budget(health_documents, document_budget)
+        record_document_compaction(report)
+        logger.info(
+            f"Health document fitted to prompt budget: profile={measured['profile']} "
+            f"safety={measured['safety']} document={report['tokens_out']} tokens; "
+            f"dropped {report['bytes_dropped']} bytes / {report['tokens_dropped']} tokens"
         )
+        if excerpt:
+            suffix += f"\n\nHEALTH DOCUMENT EXCERPTS (user-provided, may be incomplete):\n{excerpt}"
+
+    return ANALYSIS_PROMPT.render(suffix)
+
+def analyze_user_health_profile(state: WellnessOrchestratorState) -> WellnessOrchestratorState:
+    """
+    Analyze user health profile for safety concerns and provide recommendations
+    This agent focuses on identifying potential risks and recommending professional consultation
+    """
+    profile = state["user_profile"]
+    health_conditions = state.get("health_conditions", [])
+    
+    # Run safety validation
+    profile_safety = HealthSafetyValidator.validate_user_profile_safety({
+        "age": profile.get("age"),
+        "primary_goal": profile.get("primary_goal"),
+        "health_conditions": health_conditions,
+        "current_activity_level": profile.get("current_activity_level")
+    })
+    
+    prompt = build_analysis_prompt(
+        profile, health_conditions, state.get('medical_clearance', False), profile_safety,
+        state.get('health_documents', ''),
+    )
+
+    try:
+        llm = route_node_llm("analysis", profile, health_conditions)
+        analysis = invoke_structured(llm, prompt, HEALTH_ANALYSIS_SCHEMA, agent="health_analyzer")
         
         # CRITICAL: Normalize consultation types
         analysis = normalize_consultation_types(analysis)
@@ -193,12 +232,7 @@ Focus on safety, conservative approaches, and professional guidance.
         state["safety_notes"].extend(profile_safety.get("concerns", []))
         
         # Add disclaimers
-        state["disclaimers"].extend([
-            HEALTH_DISCLAIMER,
-            EXERCISE_DISCLAIMER, 
-            NUTRITION_DISCLAIMER,
-            "This analysis is not a medical evaluation and cannot replace professional healthcare assessment."
-        ])
+        add_disclaimers(state, "general_health", "exercise_safety", "nutrition_guidance", "analysis_not_medical")
         
         logger.info(f"Health analysis completed - Risk level: {analysis.get('risk_level')}, Proceed: {should_proceed}")
         
@@ -249,7 +283,7 @@ Focus on safety, conservative approaches, and professional guidance.
         
         state["analysis_result"] = fallback_analysis
         state["safety_notes"].append("Health analysis failed - defaulting to maximum safety protocols")
-        state["disclaimers"].append("AI health analysis unavailable - professional consultation mandatory")
+        add_disclaimers(state, "analysis_unavailable")
         
         return state
 
@@ -1,9 +1,17 @@
-from typing import TypedDict, List, Dict
-from backend.utils.llm import health_llm  
+from typing import TypedDict, List, Dict, Iterator
+from backend.config import main as config
+from backend.utils.llm import get_node_llm, route_node_llm
 from backend.utils.health_safety import HealthSafetyValidator
+from backend.utils.structured_output import stream_structured_days, MEAL_PLAN_SCHEMA, MEAL_PLAN_INGREDIENTS_SCHEMA
+from backend.utils.nutrition import apply_plan_nutrition, scale_meal_day_portions
+from backend.utils.dietary_compliance import check_meal_plan_compliance
+from backend.utils.plan_stream import emit_plan_event
+from backend.utils.prompt_cache import PromptTemplate, CompiledPrompt
+from backend.utils.plan_validation import coerce_meal_day
+from backend.utils.disclaimers import add_disclaimers
 from backend.constants.enums import (
     Goal, DietaryRestriction, MealType, ActivityLevel,
-    MIN_CALORIES_ADULT, MAX_CALORIES_ADULT, NUTRITION_DISCLAIMER, HEALTH_DISCLAIMER
+    MIN_CALORIES_ADULT, MAX_CALORIES_ADULT
 )
 import json
 import logging
@@ -19,88 +27,6 @@ class WellnessOrchestratorState(TypedDict):
     safety_notes: list
     disclaimers: list
 
-def normalize_meal_plan_data(meal_plan: List[Dict]) -> List[Dict]:
-    """
-    Normalize LLM-generated meal plan data to match Node.js Mongoose schema
-    Removes invalid dietary tags and fixes calorie limits
-    """
-    # Dietary tag mappings - remove "_option" suffix and invalid tags
-    dietary_tag_map = {
-        'gluten_free_option': 'gluten_free',
-        'dairy_free_option': 'dairy_free',
-        'vegan_option': 'vegan',
-        'vegetarian_option': 'vegetarian',
-        'check_label_for_specifics': None,  # Remove entirely
-        'oats_if_granola': None,
-        'dairy_if_whey': None,
-        'nuts_if_almond_milk': None,
-        'eggs_if_mayo': None,
-        'soy_if_burger': None
-    }
-    
-    # Valid dietary restrictions from Node.js enum
-    valid_dietary_tags = [
-        'none', 'vegetarian', 'vegan', 'gluten_free', 'dairy_free', 'nut_free',
-        'low_sodium', 'diabetic_friendly', 'heart_healthy', 'soy_free', 'egg_free',
-        'shellfish_free', 'low_sugar', 'keto', 'low_carb', 'high_protein',
-        'mediterranean', 'paleo', 'whole30'
-    ]
-    
-    for day in meal_plan:
-        for meal in day.get('meals', []):
-            # Normalize dietary tags
-            if 'dietary_tags' in meal:
-                cleaned_tags = []
-                for tag in meal['dietary_tags']:
-                    tag_lower = str(tag).lower().strip()
-                    
-                    # Map known invalid tags
-                    if tag_lower in dietary_tag_map:
-                        mapped_tag = dietary_tag_map[tag_lower]
-                        if mapped_tag and mapped_tag not in cleaned_tags:
-                            cleaned_tags.append(mapped_tag)
-                    elif tag_lower in valid_dietary_tags and tag_lower not in cleaned_tags:
-                        cleaned_tags.append(tag_lower)
-                    else:
-                        logger.warning(f"Removing invalid dietary tag: {tag}")
-                
-                meal['dietary_tags'] = cleaned_tags
-            
-            # Fix calorie limits for individual meals
-            # Node.js now allows 50-1500 calories per meal
-            if 'estimated_calories' in meal:
-                calories = meal['estimated_calories']
-                if calories > 1500:
-                    logger.warning(f"Meal '{meal.get('name')}' calories ({calories}) exceed max 1500, capping")
-                    meal['estimated_calories'] = 1500
-                elif calories < 50:
-                    logger.warning(f"Meal '{meal.get('name')}' calories ({calories}) below minimum 50, adjusting")
-                    meal['estimated_calories'] = 50
-            
-            # Normalize allergen warnings - remove conditional ones
-            if 'allergen_warnings' in meal:
-                cleaned_allergens = []
-                for allergen in meal['allergen_warnings']:
-                    allergen_str = str(allergen).lower().strip()
-                    # Remove conditional allergens like "dairy_if_whey", "nuts_if_almond_milk"
-                    if not any(cond in allergen_str for cond in ['_if_', 'if ']):
-                        cleaned_allergens.append(allergen_str)
-                    else:
-                        logger.info(f"Removing conditional allergen: {allergen}")
-                meal['allergen_warnings'] = cleaned_allergens
-        
-        # Validate daily calorie totals
-        if 'total_estimated_calories' in day:
-            daily_cal = day['total_estimated_calories']
-            if daily_cal < MIN_CALORIES_ADULT:
-                logger.warning(f"Day {day.get('day')} calories ({daily_cal}) below minimum {MIN_CALORIES_ADULT}")
-                day['total_estimated_calories'] = MIN_CALORIES_ADULT
-            elif daily_cal > MAX_CALORIES_ADULT:
-                logger.warning(f"Day {day.get('day')} calories ({daily_cal}) above maximum {MAX_CALORIES_ADULT}")
-                day['total_estimated_calories'] = MAX_CALORIES_ADULT
-    
-    return meal_plan
-
 def calculate_safe_calorie_target(profile: dict) -> int:
     """
     Calculate a safe, conservative calorie target based on user profile
@@ -130,31 +56,7 @@ def calculate_safe_calorie_target(profile: dict) -> int:
     
     return int(estimated_calories)
 
-def generate_safe_meal_plan(state: WellnessOrchestratorState) -> WellnessOrchestratorState:
-    """
-    Generate a safe, balanced meal plan with proper nutritional considerations
-    """
-    profile = state["user_profile"]
-    dietary_restrictions = state.get("dietary_restrictions", [])
-    health_conditions = state.get("health_conditions", [])
-    
-    target_calories = calculate_safe_calorie_target(profile)
-    
-    calorie_check = HealthSafetyValidator.validate_calorie_target(
-        target_calories, 
-        profile.get("age"), 
-        profile.get("primary_goal", Goal.GENERAL_WELLNESS)
-    )
-    
-    dietary_check = HealthSafetyValidator.validate_dietary_restrictions(
-        dietary_restrictions, 
-        profile.get("primary_goal", Goal.GENERAL_WELLNESS)
-    )
-    
-    if not calorie_check["is_valid"]:
-        logger.warning(f"Calorie target safety concerns: {calorie_check['warnings']}")
-    
-    prompt = f"""
+MEAL_PROMPT_TEMPLATE = """
 You are a registered dietitian creating a safe, balanced meal plan. 
 Always prioritize nutritional adequacy, food safety, and sustainable eating habits.
 
@@ -166,14 +68,6 @@ CRITICAL SAFETY REQUIREMENTS:
 - Avoid promoting restrictive or elimination diets without medical need
 - Focus on whole foods and balanced nutrition
 
-User Profile:
-- Age: {profile.get('age', 'Not specified')}
-- Activity Level: {profile.get('current_activity_level', 'Not specified')}
-- Primary Goal: {profile.get('primary_goal', 'general_wellness')}
-- Target Calories: {calorie_check['adjusted_calories']} per day
-- Dietary Restrictions: {dietary_restrictions if dietary_restrictions else 'None'}
-- Health Conditions: {health_conditions if health_conditions else 'None reported'}
-
 CRITICAL: Use ONLY these EXACT dietary tags (all lowercase, snake_case, NO "_option" suffix):
 - none
 - vegetarian
@@ -203,10 +97,7 @@ CRITICAL: Use ONLY these EXACT meal types:
 - pre_workout
 - post_workout
 
-MEAL CALORIE LIMITS (IMPORTANT):
-- Individual meals: 50-1500 calories (dinners can be up to 1500)
-- Daily total: {MIN_CALORIES_ADULT}-{MAX_CALORIES_ADULT} calories
-
+{portion_rules}
 DO NOT USE (WILL CAUSE ERRORS):
 - Tags ending in "_option" (e.g., "vegan_option", "gluten_free_option", "dairy_free_option")
 - Tags like "check_label_for_specifics"
@@ -224,8 +115,7 @@ Create a 7-day meal plan with these MANDATORY safety features:
 5. Offer simple, accessible ingredients
 6. Balance calories across meals (don't skip major meals)
 7. Include adequate hydration recommendations
-8. Keep individual meal calories: 50-1500 range
-
+{portion_item}
 Return ONLY a valid JSON array (NO markdown, NO code blocks, NO extra text) with this EXACT structure:
 [
   {{
@@ -238,9 +128,7 @@ Return ONLY a valid JSON array (NO markdown, NO code blocks, NO extra text) with
         "instructions": "Cook oatmeal according to package directions. Top with berries and honey.",
         "prep_time_minutes": 10,
         "servings": 1,
-        "estimated_calories": 350,
-        "macronutrients": {{"protein": 12, "carbs": 58, "fats": 10}},
-        "dietary_tags": ["vegetarian", "gluten_free"],
+{breakfast_numbers}        "dietary_tags": ["vegetarian", "gluten_free"],
         "allergen_warnings": ["oats"],
         "nutrition_notes": "High in fiber and provides sustained energy"
       }},
@@ -251,66 +139,212 @@ Return ONLY a valid JSON array (NO markdown, NO code blocks, NO extra text) with
         "instructions": "Grill chicken, steam vegetables, cook rice.",
         "prep_time_minutes": 30,
         "servings": 1,
-        "estimated_calories": 750,
-        "macronutrients": {{"protein": 45, "carbs": 80, "fats": 15}},
-        "dietary_tags": ["gluten_free"],
+{dinner_numbers}        "dietary_tags": ["gluten_free"],
         "allergen_warnings": [],
         "nutrition_notes": "Balanced meal with lean protein and complex carbs"
       }}
     ],
-    "total_estimated_calories": {calorie_check['adjusted_calories']},
-    "daily_water_goal_glasses": 8,
-    "nutrition_summary": {{
-      "protein_grams": 100,
-      "carbs_grams": 250,
-      "fats_grams": 70,
-      "fiber_grams": 30
-    }},
-    "special_notes": "Balanced nutrition with emphasis on whole foods"
+{day_numbers}    "special_notes": "Balanced nutrition with emphasis on whole foods"
   }}
 ]
 
 IMPORTANT REMINDERS:
 - Use ONLY the dietary tags listed above (NO "_option" variants)
-- Individual meal calories: 50-1500 (larger dinners are OK)
-- Daily calories: {MIN_CALORIES_ADULT}-{MAX_CALORIES_ADULT}
-- Include 3 main meals and 1-2 snacks per day
+{portion_reminders}- Include 3 main meals and 1-2 snacks per day
 - Use simple allergen names (no conditional warnings)
 - Return ONLY JSON, no markdown formatting
+
+USER CONTEXT:
 """
 
-    try:
-        response = health_llm.invoke(prompt)
-        meal_plan = json.loads(
-            response.content.strip().replace("```json\n", "").replace("```", "").replace("```json", "")
+# Prompt sections that differ when calories and macros come from the model
+MEAL_MODEL_NUTRITION_SECTIONS = {
+    "portion_rules": (
+        "MEAL CALORIE LIMITS (IMPORTANT):\n"
+        "- Individual meals: 50-1500 calories (dinners can be up to 1500)\n"
+        f"- Daily total: {MIN_CALORIES_ADULT}-{MAX_CALORIES_ADULT} calories\n"
+    ),
+    "portion_item": "8. Keep individual meal calories: 50-1500 range\n",
+    "breakfast_numbers": (
+        '        "estimated_calories": 350,\n'
+        '        "macronutrients": {"protein": 12, "carbs": 58, "fats": 10},\n'
+    ),
+    "dinner_numbers": (
+        '        "estimated_calories": 750,\n'
+        '        "macronutrients": {"protein": 45, "carbs": 80, "fats": 15},\n'
+    ),
+    "day_numbers": (
+        '    "total_estimated_calories": 2000,\n'
+        '    "daily_water_goal_glasses": 8,\n'
+        '    "nutrition_summary": {\n'
+        '      "protein_grams": 100,\n'
+        '      "carbs_grams": 250,\n'
+        '      "fats_grams": 70,\n'
+        '      "fiber_grams": 30\n'
+        '    },\n'
+    ),
+    "portion_reminders": (
+        "- Individual meal calories: 50-1500 (larger dinners are OK)\n"
+        f"- Daily calories: {MIN_CALORIES_ADULT}-{MAX_CALORIES_ADULT}\n"
+    ),
+}
+
+# ... and when they are computed locally from the ingredient quantities
+MEAL_LOCAL_NUTRITION_SECTIONS = {
+    "portion_rules": (
+        "INGREDIENT QUANTITIES (IMPORTANT):\n"
+        '- Give every ingredient an explicit quantity and unit (e.g. "150 g salmon", "1 cup cooked quinoa", "2 large eggs")\n'
+        "- Do NOT include calorie or macronutrient fields; they are calculated from the ingredients\n"
+        f"- Size portions so each day lands in {MIN_CALORIES_ADULT}-{MAX_CALORIES_ADULT} calories and near the target\n"
+    ),
+    "portion_item": "8. Give every ingredient a quantity and unit\n",
+    "breakfast_numbers": "",
+    "dinner_numbers": "",
+    "day_numbers": '    "daily_water_goal_glasses": 8,\n',
+    "portion_reminders": "- Every ingredient needs a quantity and unit; omit calorie and macro fields\n",
+}
+
+def _meal_prompt_prefix(local_nutrition: bool) -> str:
+    sections = MEAL_LOCAL_NUTRITION_SECTIONS if local_nutrition else MEAL_MODEL_NUTRITION_SECTIONS
+    return MEAL_PROMPT_TEMPLATE.format(**sections)
+
+MEAL_PROMPT = PromptTemplate("meal_generator", _meal_prompt_prefix(config.NUTRITION_LOCAL_ENABLED))
+
+def build_meal_prompt(profile: dict, dietary_restrictions: list, health_conditions: list, calorie_check: Dict) -> CompiledPrompt:
+    """
+    Build the meal plan generation prompt: the static MEAL_PROMPT prefix
+    followed by a compact per-user suffix
+    """
+    if config.NUTRITION_LOCAL_ENABLED:
+        target_usage = "size portions so each day adds up to about this"
+    else:
+        target_usage = "use this as total_estimated_calories"
+    lines = [
+        f"- Age: {profile.get('age', 'Not specified')}",
+        f"- Activity Level: {profile.get('current_activity_level', 'Not specified')}",
+        f"- Primary Goal: {profile.get('primary_goal', 'general_wellness')}",
+        f"- Target Calories: {calorie_check['adjusted_calories']} per day ({target_usage})",
+        f"- Dietary Restrictions: {dietary_restrictions if dietary_restrictions else 'None'}",
+        f"- Health Conditions: {health_conditions if health_conditions else 'None reported'}",
+    ]
+    return MEAL_PROMPT.render("\n".join(lines))
+
+def fit_meal_day_portions(day: Dict) -> None:
+    """
+    Scale the portions of a day whose ingredients add up to less than
+    MIN_CALORIES_ADULT or more than MAX_CALORIES_ADULT and recompute its
+    nutrition, so the total stays what the ingredients contain
+    A day that still misses the range (unquantified ingredients do not scale)
+    is flagged in its notes and fails validate_meal_day_nutrition
+    """
+    original = day.get("total_estimated_calories", 0)
+    for _ in range(2):
+        daily_calories = day.get("total_estimated_calories", 0)
+        if daily_calories <= 0 or MIN_CALORIES_ADULT <= daily_calories <= MAX_CALORIES_ADULT:
+            break
+        # Aim a little inside the range so rounded quantities do not land just outside it
+        target = MIN_CALORIES_ADULT * 1.05 if daily_calories < MIN_CALORIES_ADULT else MAX_CALORIES_ADULT * 0.95
+        scale_meal_day_portions(day, target / daily_calories)
+        apply_plan_nutrition([day])
+
+    daily_calories = day.get("total_estimated_calories", 0)
+    if daily_calories != original:
+        logger.info(f"Day {day.get('day')} portions scaled from {original} to {daily_calories} calories")
+        day["special_notes"] = day.get("special_notes", "") + (
+            f" Portions scaled to about {daily_calories} calories to stay within safe daily levels."
         )
-        
-        # CRITICAL: Normalize the data before validation
-        meal_plan = normalize_meal_plan_data(meal_plan)
-        
-        # Validate daily calorie totals
-        for day in meal_plan:
-            daily_calories = day.get("total_estimated_calories", 0)
-            
-            if daily_calories < MIN_CALORIES_ADULT:
-                logger.warning(f"Day {day.get('day')} calories below minimum ({daily_calories})")
-                day["total_estimated_calories"] = MIN_CALORIES_ADULT
-                day["special_notes"] = day.get("special_notes", "") + " Calories adjusted to meet minimum requirements."
-            
-            elif daily_calories > MAX_CALORIES_ADULT:
-                logger.warning(f"Day {day.get('day')} calories above maximum ({daily_calories})")
-                day["total_estimated_calories"] = MAX_CALORIES_ADULT
-                day["special_notes"] = day.get("special_notes", "") + " Portions adjusted to meet calorie targets."
-            
-            meals = day.get("meals", [])
-            if len(meals) < 3:
-                logger.warning(f"Day {day.get('day')} has fewer than 3 main meals")
-                day["special_notes"] = day.get("special_notes", "") + " Consider adding healthy snacks if needed."
-            
-            meal_calories = sum(meal.get("estimated_calories", 0) for meal in meals)
-            if abs(meal_calories - daily_calories) > 200:
-                logger.info(f"Day {day.get('day')} meal calories don't match daily total - adjusting")
-                day["total_estimated_calories"] = meal_calories
+    if not MIN_CALORIES_ADULT <= daily_calories <= MAX_CALORIES_ADULT:
+        logger.warning(f"Day {day.get('day')} portions add up to {daily_calories} calories, outside the safe range")
+        day["special_notes"] = day.get("special_notes", "") + (
+            f" Portions add up to about {daily_calories} calories, outside the safe "
+            f"{MIN_CALORIES_ADULT}-{MAX_CALORIES_ADULT} range; adjust portions before following this day."
+        )
+
+def adjust_meal_day_totals(day: Dict, computed_totals: bool = False) -> Dict:
+    """
+    Clamp and reconcile the daily calorie total of a single meal plan day
+    Totals computed from the ingredients are never overwritten: the portions
+    are scaled into range and the nutrition recomputed instead
+    """
+    daily_calories = day.get("total_estimated_calories", 0)
+    
+    if computed_totals:
+        fit_meal_day_portions(day)
+    
+    elif daily_calories < MIN_CALORIES_ADULT:
+        logger.warning(f"Day {day.get('day')} calories below minimum ({daily_calories})")
+        day["total_estimated_calories"] = MIN_CALORIES_ADULT
+        day["special_notes"] = day.get("special_notes", "") + " Calories adjusted to meet minimum requirements."
+    
+    elif daily_calories > MAX_CALORIES_ADULT:
+        logger.warning(f"Day {day.get('day')} calories above maximum ({daily_calories})")
+        day["total_estimated_calories"] = MAX_CALORIES_ADULT
+        day["special_notes"] = day.get("special_notes", "") + " Portions adjusted to meet calorie targets."
+    
+    meals = day.get("meals", [])
+    if len(meals) < 3:
+        logger.warning(f"Day {day.get('day')} has fewer than 3 main meals")
+        day["special_notes"] = day.get("special_notes", "") + " Consider adding healthy snacks if needed."
+    
+    meal_calories = sum(meal.get("estimated_calories", 0) for meal in meals)
+    if not computed_totals and abs(meal_calories - daily_calories) > 200:
+        logger.info(f"Day {day.get('day')} meal calories don't match daily total - adjusting")
+        day["total_estimated_calories"] = meal_calories
+    
+    return day
+
+def stream_meal_days(prompt: str, llm=None) -> Iterator[Dict]:
+    """
+    Stream normalized meal plan days while the LLM is still generating
+    Each day is normalized as it arrives so consumers can validate or forward it early
+    With local nutrition, calories and macros are computed from the day's ingredients first
+    """
+    local_nutrition = config.NUTRITION_LOCAL_ENABLED
+    schema = MEAL_PLAN_INGREDIENTS_SCHEMA if local_nutrition else MEAL_PLAN_SCHEMA
+    for day in stream_structured_days(
+        llm or get_node_llm("meal"), prompt, schema, agent="meal_generator", expected_days=7
+    ):
+        if local_nutrition:
+            apply_plan_nutrition([day])
+        yield adjust_meal_day_totals(coerce_meal_day(day), computed_totals=local_nutrition)
+
+def generate_safe_meal_plan(state: WellnessOrchestratorState) -> WellnessOrchestratorState:
+    """
+    Generate a safe, balanced meal plan with proper nutritional considerations
+    """
+    profile = state["user_profile"]
+    dietary_restrictions = state.get("dietary_restrictions", [])
+    health_conditions = state.get("health_conditions", [])
+    
+    target_calories = calculate_safe_calorie_target(profile)
+    
+    calorie_check = HealthSafetyValidator.validate_calorie_target(
+        target_calories, 
+        profile.get("age"), 
+        profile.get("primary_goal", Goal.GENERAL_WELLNESS)
+    )
+    
+    dietary_check = HealthSafetyValidator.validate_dietary_restrictions(
+        dietary_restrictions, 
+        profile.get("primary_goal", Goal.GENERAL_WELLNESS)
+    )
+    
+    if not calorie_check["is_valid"]:
+        logger.warning(f"Calorie target safety concerns: {calorie_check['warnings']}")
+    
+    prompt = build_meal_prompt(profile, dietary_restrictions, health_conditions, calorie_check)
+    llm = route_node_llm(
+        "meal", profile, health_conditions, dietary_restrictions,
+        risk_level=state.get("analysis_result", {}).get("risk_level"),
+    )
+
+    try:
+        # Days are normalized and checked as they stream in, then sorted back into day order
+        meal_plan = []
+        for day in stream_meal_days(prompt, llm):
+            meal_plan.append(day)
+            emit_plan_event("meal_day", {"day": day, "validation": validate_meal_day_nutrition(day)})
+        meal_plan.sort(key=lambda day: day.get("day", 0))
         
         state["meal_plan"] = meal_plan
         state["safety_notes"].extend(calorie_check.get("warnings", []))
@@ -318,8 +352,7 @@ IMPORTANT REMINDERS:
         state["safety_notes"].extend(dietary_check.get("warnings", []))
         state["safety_notes"].extend(dietary_check.get("recommendations", []))
         
-        state["disclaimers"].append(NUTRITION_DISCLAIMER)
-        state["disclaimers"].append(HEALTH_DISCLAIMER)
+        add_disclaimers(state, "nutrition_guidance", "general_health")
         
         logger.info(f"Generated safe meal plan with average {target_calories} calories per day")
         
@@ -369,7 +402,7 @@ IMPORTANT REMINDERS:
         
         state["meal_plan"] = fallback_plan
         state["safety_notes"].append("AI generation failed - using basic fallback plan")
-        state["disclaimers"].append("This is a basic fallback plan. Registered dietitian consultation strongly recommended.")
+        add_disclaimers(state, "fallback_meal_plan")
         
         return state
 
@@ -384,68 +417,57 @@ def validate_meal_plan_nutrition(meal_plan: List[Dict]) -> Dict[str, any]:
     }
     
     for day in meal_plan:
-        daily_calories = day.get("total_estimated_calories", 0)
-        meals = day.get("meals", [])
-        
-        if daily_calories < MIN_CALORIES_ADULT:
+        day_result = validate_meal_day_nutrition(day)
+        if not day_result["is_nutritionally_safe"]:
             validation_result["is_nutritionally_safe"] = False
-            validation_result["warnings"].append(f"Day {day.get('day')} calories below safe minimum")
-        
-        if len(meals) < 2:
-            validation_result["warnings"].append(f"Day {day.get('day')} may have insufficient meals")
-        
-        breakfast_present = any(meal.get("meal_type") == "breakfast" for meal in meals)
-        if not breakfast_present:
-            validation_result["recommendations"].append("Consider including breakfast for optimal nutrition")
-        
-        nutrition = day.get("nutrition_summary", {})
-        protein = nutrition.get("protein_grams", 0)
-        
-        if protein < 50:
-            validation_result["warnings"].append(f"Day {day.get('day')} may be low in protein")
-        
-        ingredient_count = len(set([
-            ingredient 
-            for meal in meals 
-            for ingredient in meal.get("ingredients", [])
-        ]))
-        
-        if ingredient_count < 8:
-            validation_result["recommendations"].append("Consider adding more variety to improve nutrition")
+        validation_result["warnings"].extend(day_result["warnings"])
+        validation_result["recommendations"].extend(day_result["recommendations"])
     
     return validation_result
 
-def check_dietary_restriction_compliance(meal_plan: List[Dict], restrictions: List[str]) -> Dict[str, any]:
+def validate_meal_day_nutrition(day: Dict) -> Dict[str, any]:
     """
-    Verify that meal plan complies with stated dietary restrictions
+    Per-day nutrition checks, usable on each day as soon as it is streamed
     """
-    compliance_result = {
-        "is_compliant": True,
-        "violations": [],
-        "warnings": []
+    validation_result = {
+        "is_nutritionally_safe": True,
+        "warnings": [],
+        "recommendations": []
     }
     
-    violation_keywords = {
-        "vegetarian": ["beef", "pork", "chicken", "turkey", "fish", "seafood", "meat"],
-        "vegan": ["beef", "pork", "chicken", "turkey", "fish", "seafood", "meat", "dairy", "milk", "cheese", "eggs", "honey"],
-        "gluten_free": ["wheat", "barley", "rye", "bread", "pasta", "flour"],
-        "dairy_free": ["milk", "cheese", "yogurt", "butter", "cream"],
-        "nut_free": ["peanut", "almond", "walnut", "cashew", "pistachio", "hazelnut"]
-    }
+    daily_calories = day.get("total_estimated_calories", 0)
+    meals = day.get("meals", [])
+    
+    if daily_calories < MIN_CALORIES_ADULT:
+        validation_result["is_nutritionally_safe"] = False
+        validation_result["warnings"].append(f"Day {day.get('day')} calories below safe minimum")
+    
+    if len(meals) < 2:
+        validation_result["warnings"].append(f"Day {day.get('day')} may have insufficient meals")
+    
+    breakfast_present = any(meal.get("meal_type") == "breakfast" for meal in meals)
+    if not breakfast_present:
+        validation_result["recommendations"].append("Consider including breakfast for optimal nutrition")
+    
+    nutrition = day.get("nutrition_summary", {})
+    protein = nutrition.get("protein_grams", 0)
+    
+    if protein < 50:
+        validation_result["warnings"].append(f"Day {day.get('day')} may be low in protein")
     
-    for restriction in restrictions:
-        if restriction in violation_keywords:
-            keywords = violation_keywords[restriction]
-            
-            for day in meal_plan:
-                for meal in day.get("meals", []):
-                    ingredients_text = " ".join(meal.get("ingredients", [])).lower()
-                    
-                    for keyword in keywords:
-                        if keyword in ingredients_text:
-                            compliance_result["is_compliant"] = False
-                            compliance_result["violations"].append(
-                                f"Day {day.get('day')}, {meal.get('name')}: Contains {keyword} (violates {restriction})"
-                            )
+    ingredient_count = len(set([
+        ingredient 
+        for meal in meals 
+        for ingredient in meal.get("ingredients", [])
+    ]))
     
-    return compliance_result
\ No newline at end of file
+    if ingredient_count < 8:
+        validation_result["recommendations"].append("Consider adding more variety to improve nutrition")
+    
+    return validation_result
+
+def check_dietary_restriction_compliance(meal_plan: List[Dict], restrictions: List[str]) -> Dict[str, any]:
+    """
+    Verify that meal plan complies with stated dietary restrictions
+    """
+    return check_meal_plan_compliance(meal_plan, restrictions)
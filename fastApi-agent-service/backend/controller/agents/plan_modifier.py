@@ -0,0 +1,328 @@
+from typing import Any, Dict, List, Optional
+from backend.config import main as config
+from backend.utils.llm import route_node_llm
+from backend.utils.health_safety import HealthSafetyValidator
+from backend.utils.structured_output import invoke_structured, EXERCISE_SCHEMA, MEAL_SCHEMA, MEAL_INGREDIENTS_SCHEMA
+from backend.utils.nutrition import apply_plan_nutrition
+from backend.utils.dietary_compliance import check_meal_plan_compliance
+from backend.utils.plan_diff import (
+    parse_modification, find_affected_fragments, diff_plan, build_plan_patch, mentions_term, changed_days
+)
+from backend.utils.plan_validation import coerce_exercise, coerce_meal
+from backend.utils.plan_progression import substitutes, catalog_exercise
+from backend.utils.workout_planner import INTENSITY_ORDER, KCAL_PER_MINUTE, intensity_cap, resolve_equipment
+from backend.constants.exercise_catalog import EXERCISE_CATALOG
+from backend.constants.enums import ActivityLevel
+from backend.controller.agents.workout_plan_generator import validate_workout_day_safety
+from backend.controller.agents.meal_plan_generator import validate_meal_day_nutrition
+import copy
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _breaks_restrictions(meal: Dict, restrictions: List[str]) -> bool:
+    return not check_meal_plan_compliance([{"meals": [meal]}], restrictions)["is_compliant"]
+
+def _catalog_replacement(
+    exercise: Dict,
+    day: Dict,
+    modification: Dict,
+    equipment: set,
+    max_intensity: str,
+) -> Optional[Dict]:
+    """Catalog exercise for the slot, preferring the workout types the request asks for"""
+    used = {str(item.get("name", "")).lower() for item in day.get("exercises", [])}
+    if modification["preferred_types"]:
+        rank = INTENSITY_ORDER.index(max_intensity)
+        options = [
+            entry for entry in EXERCISE_CATALOG
+            if entry["type"] in modification["preferred_types"]
+            and INTENSITY_ORDER.index(entry["intensity"]) <= rank
+            and set(entry["equipment_needed"]) <= equipment
+        ]
+    else:
+        options = substitutes(exercise, equipment, max_intensity, modification["excluded_types"])
+    options = [
+        entry for entry in options
+        if entry["name"].lower() not in used
+        and not any(mentions_term(entry["name"], term) for term in modification["excluded_terms"])
+    ]
+    if not options:
+        return None
+    return catalog_exercise(options[0], exercise.get("duration_minutes", 10))
+
+def _exercise_prompt(pending: List[Dict], plan: Dict, modification: Dict, profile: dict, health_conditions: list) -> str:
+    slots = []
+    for fragment in pending:
+        day = plan["workout_plan"][fragment["day_index"]]
+        exercise = day["exercises"][fragment["item_index"]]
+        slots.append({
+            "day": day.get("day"),
+            "workout_name": day.get("workout_name"),
+            "replace": exercise.get("name"),
+            "type": exercise.get("type"),
+            "duration_minutes": exercise.get("duration_minutes"),
+            "other_exercises": [item.get("name") for item in day.get("exercises", []) if item is not exercise],
+        })
+    avoid = modification["excluded_types"] + modification["excluded_terms"]
+    return (
+        "You are a certified fitness professional. Replace only the exercises listed below in this "
+        "person's workout plan, following their request. Keep each replacement the same duration, "
+        "no harder than the exercise it replaces, and low risk.\n"
+        f"Request: {modification['message']}\n"
+        f"Age: {profile.get('age', 'Not specified')}\n"
+        f"Current Activity Level: {profile.get('current_activity_level', 'Not specified')}\n"
+        f"Available Equipment: {', '.join(map(str, profile.get('available_equipment') or [])) or 'None'}\n"
+        f"Health Conditions: {', '.join(map(str, health_conditions or [])) or 'None reported'}\n"
+        f"Avoid: {', '.join(avoid) or 'Nothing specific'}\n"
+        f"Exercises to replace: {json.dumps(slots, default=str)}\n"
+        'Return JSON: {"exercises": [one replacement exercise per listed exercise, in the same order]}'
+    )
+
+def _meal_prompt(pending: List[Dict], plan: Dict, modification: Dict, restrictions: List[str], health_conditions: list) -> str:
+    slots = []
+    for fragment in pending:
+        day = plan["meal_plan"][fragment["day_index"]]
+        meal = day["meals"][fragment["item_index"]]
+        slots.append({
+            "day": day.get("day"),
+            "meal_type": meal.get("meal_type"),
+            "replace": meal.get("name"),
+            "calories": meal.get("estimated_calories"),
+            "rest_of_day": [item.get("name") for item in day.get("meals", []) if item is not meal],
+        })
+    portions = (
+        "List every ingredient with a quantity and unit (\"150 g chicken breast\"); calories and macros are "
+        "calculated from the ingredients.\n"
+        if config.NUTRITION_LOCAL_ENABLED else ""
+    )
+    return (
+        "You are a registered dietitian. Replace only the meals listed below in this person's meal plan, "
+        "following their request. Keep each replacement the same meal type and close to the calories of the "
+        "meal it replaces, and make it fit the rest of that day.\n"
+        f"{portions}"
+        f"Request: {modification['message']}\n"
+        f"Dietary Restrictions: {', '.join(map(str, restrictions)) or 'None'}\n"
+        f"Health Conditions: {', '.join(map(str, health_conditions or [])) or 'None reported'}\n"
+        f"Avoid these ingredients: {', '.join(modification['excluded_terms']) or 'Nothing specific'}\n"
+        f"Meals to replace: {json.dumps(slots, default=str)}\n"
+        'Return JSON: {"meals": [one replacement meal per listed meal, in the same order]}'
+    )
+
+def _invoke_replacements(llm, prompt: str, key: str, item_schema: Dict, agent: str, expected: int) -> List[Dict]:
+    schema = {
+        "type": "object",
+        "properties": {key: {"type": "array", "items": item_schema}},
+        "required": [key],
+    }
+    items = invoke_structured(llm, prompt, schema, agent=agent)[key]
+    if len(items) != expected:
+        raise ValueError(f"{agent}: expected {expected} replacements, got {len(items)}")
+    return items
+
+def _refresh_workout_day(day: Dict, before: Dict) -> None:
+    """Calories and intensity for a day whose exercises changed; minutes stay as they were"""
+    calories = before.get("estimated_calories_burned", 0)
+    for old, new in zip(before.get("exercises", []), day.get("exercises", [])):
+        calories += (
+            KCAL_PER_MINUTE.get(new.get("intensity"), KCAL_PER_MINUTE["moderate"]) * new.get("duration_minutes", 0)
+            - KCAL_PER_MINUTE.get(old.get("intensity"), KCAL_PER_MINUTE["moderate"]) * old.get("duration_minutes", 0)
+        )
+    day["estimated_calories_burned"] = min(max(int(calories), 0), 1000)
+    if day.get("intensity_level"):
+        day["intensity_level"] = max(
+            (item["intensity"] for item in day["exercises"] if item.get("intensity") in INTENSITY_ORDER),
+            key=INTENSITY_ORDER.index, default=day["intensity_level"],
+        )
+
+def _refresh_meal_day(day: Dict) -> None:
+    """Day totals from the meals, when every meal has numbers"""
+    meals = day.get("meals", [])
+    if not all(isinstance(meal.get("estimated_calories"), (int, float)) for meal in meals):
+        return
+    day["total_estimated_calories"] = int(sum(meal["estimated_calories"] for meal in meals))
+    macros = [meal.get("macronutrients") or {} for meal in meals]
+    if all(isinstance(macro.get(key), (int, float)) for macro in macros for key in ("protein", "carbs", "fats")):
+        day["nutrition_summary"] = {
+            f"{key}_grams": int(sum(macro.get(key, 0) for macro in macros))
+            for key in ("protein", "carbs", "fats", "fiber")
+        }
+
+def regenerate_exercises(
+    plan: Dict, fragments: List[Dict], modification: Dict, profile: dict, health_conditions: list, warnings: List[str]
+) -> List[Dict]:
+    """
+    Replace the exercise fragments in place: catalog alternatives first,
+    one targeted LLM prompt for the slots the catalog cannot fill.
+    Returns the fragments that were replaced.
+    """
+    safety_check = HealthSafetyValidator.validate_workout_plan(
+        profile.get("time_availability_minutes", 30),
+        profile.get("current_activity_level", ActivityLevel.MODERATELY_ACTIVE),
+        profile.get("age")
+    )
+    equipment = resolve_equipment(profile.get("available_equipment"))
+    max_intensity = intensity_cap(profile, safety_check)
+
+    replaced, pending = [], []
+    for fragment in fragments:
+        day = plan["workout_plan"][fragment["day_index"]]
+        replacement = _catalog_replacement(day["exercises"][fragment["item_index"]], day, modification, equipment, max_intensity)
+        if replacement is None:
+            pending.append(fragment)
+            continue
+        day["exercises"][fragment["item_index"]] = replacement
+        replaced.append({**fragment, "source": "catalog"})
+
+    if pending:
+        prompt = _exercise_prompt(pending, plan, modification, profile, health_conditions)
+        llm = route_node_llm("workout", profile, health_conditions)
+        try:
+            items = _invoke_replacements(llm, prompt, "exercises", EXERCISE_SCHEMA, "workout_modifier", len(pending))
+        except Exception as e:
+            logger.warning(f"Exercise regeneration failed, keeping the current exercises: {e}")
+            warnings.append("Some exercises could not be replaced right now - please try again later")
+            return replaced
+        for fragment, item in zip(pending, items):
+            coerce_exercise(item)
+            exercise = plan["workout_plan"][fragment["day_index"]]["exercises"][fragment["item_index"]]
+            item["duration_minutes"] = exercise.get("duration_minutes", item.get("duration_minutes"))
+            intensity = item.get("intensity")
+            if intensity not in INTENSITY_ORDER or INTENSITY_ORDER.index(intensity) > INTENSITY_ORDER.index(max_intensity):
+                item["intensity"] = exercise.get("intensity", max_intensity)
+            plan["workout_plan"][fragment["day_index"]]["exercises"][fragment["item_index"]] = item
+            replaced.append({**fragment, "source": "llm"})
+    return replaced
+
+def regenerate_meals(
+    plan: Dict, fragments: List[Dict], modification: Dict, profile: dict,
+    health_conditions: list, restrictions: List[str], warnings: List[str]
+) -> List[Dict]:
+    """
+    Replace the meal fragments in place with one targeted LLM prompt.
+    With local nutrition the new meals get calories and macros from their ingredients.
+    Returns the fragments that were replaced.
+    """
+    if not fragments:
+        return []
+    prompt = _meal_prompt(fragments, plan, modification, restrictions, health_conditions)
+    llm = route_node_llm("meal", profile, health_conditions, restrictions)
+    schema = MEAL_INGREDIENTS_SCHEMA if config.NUTRITION_LOCAL_ENABLED else MEAL_SCHEMA
+    try:
+        items = _invoke_replacements(llm, prompt, "meals", schema, "meal_modifier", len(fragments))
+    except Exception as e:
+        logger.warning(f"Meal regeneration failed, keeping the current meals: {e}")
+        warnings.append("Some meals could not be replaced right now - please try again later")
+        return []
+
+    if config.NUTRITION_LOCAL_ENABLED:
+        apply_plan_nutrition([{"meals": items}])
+    replaced = []
+    for fragment, item in zip(fragments, items):
+        coerce_meal(item)
+        current = plan["meal_plan"][fragment["day_index"]]["meals"][fragment["item_index"]]
+        item["meal_type"] = current.get("meal_type", item.get("meal_type"))
+        plan["meal_plan"][fragment["day_index"]]["meals"][fragment["item_index"]] = item
+        replaced.append({**fragment, "source": "llm"})
+    return replaced
+
+def validate_replacements(
+    plan: Dict, original: Dict, replaced: List[Dict], modification: Dict,
+    restrictions: List[str], warnings: List[str]
+) -> List[str]:
+    """
+    Re-run only the validators the changed days need and put back any
+    fragment that fails. Exercise minutes never change, so the weekly
+    volume and rest-day checks do not need to run again.
+    Returns the names of the validators that ran.
+    """
+    validators = []
+    workout_days = changed_days(replaced, "exercise")
+    meal_days = changed_days(replaced, "meal")
+
+    if workout_days:
+        validators.append("workout_day_safety")
+        for day_index in workout_days:
+            day = plan["workout_plan"][day_index]
+            before = original["workout_plan"][day_index]
+            _refresh_workout_day(day, before)
+            day_warnings = validate_workout_day_safety(day)
+            if day_warnings:
+                warnings.append(f"Kept day {day.get('day')}'s original exercises: {day_warnings[0]}")
+                plan["workout_plan"][day_index] = copy.deepcopy(before)
+                replaced[:] = [f for f in replaced if not (f["kind"] == "exercise" and f["day_index"] == day_index)]
+
+    if meal_days:
+        validators.extend(["meal_day_nutrition", "dietary_compliance"])
+        all_restrictions = list(restrictions) + modification["excluded_restrictions"]
+        for fragment in [f for f in replaced if f["kind"] == "meal"]:
+            meal = plan["meal_plan"][fragment["day_index"]]["meals"][fragment["item_index"]]
+            excluded = [term for term in modification["excluded_terms"] if mentions_term(json.dumps(meal.get("ingredients", [])), term)]
+            if excluded or _breaks_restrictions(meal, all_restrictions):
+                warnings.append(f"Could not find a suitable replacement for day {fragment['day']}'s {meal.get('meal_type')}")
+                plan["meal_plan"][fragment["day_index"]]["meals"][fragment["item_index"]] = copy.deepcopy(
+                    original["meal_plan"][fragment["day_index"]]["meals"][fragment["item_index"]]
+                )
+                replaced.remove(fragment)
+        for day_index in meal_days:
+            day = plan["meal_plan"][day_index]
+            _refresh_meal_day(day)
+            if not validate_meal_day_nutrition(day)["is_nutritionally_safe"]:
+                warnings.append(f"Kept day {day.get('day')}'s original meals to stay within safe calorie levels")
+                plan["meal_plan"][day_index] = copy.deepcopy(original["meal_plan"][day_index])
+                replaced[:] = [f for f in replaced if not (f["kind"] == "meal" and f["day_index"] == day_index)]
+    return validators
+
+def modify_plan_incrementally(
+    plan_id: str,
+    plan: Dict[str, Any],
+    message: str,
+    profile: dict,
+    health_conditions: list,
+    dietary_restrictions: list,
+    derive_weeks=None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Apply a targeted change request to a stored plan without regenerating it.
+
+    Works out which exercises and meals the request touches, regenerates
+    only those, re-runs only the validators for the changed days and
+    returns a versioned patch (see backend/utils/plan_diff.py) together
+    with the fragments that changed. Returns None when the message is not
+    a change request or does not point at specific parts of the plan, so
+    the caller can fall back to the full orchestrator.
+    derive_weeks(workout_plan, meal_plan) rebuilds the later weeks when
+    the plan has them.
+    """
+    restrictions = [getattr(item, "value", item) for item in dietary_restrictions or []]
+    modification = parse_modification(message)
+    if not modification["requested"]:
+        return None
+    fragments = find_affected_fragments(
+        plan.get("workout_plan", []), plan.get("meal_plan", []), modification, _breaks_restrictions
+    )
+    if not fragments:
+        return None
+    logger.info(f"Plan {plan_id}: modification touches {len(fragments)} fragments")
+
+    original = copy.deepcopy(plan)
+    updated = copy.deepcopy(plan)
+    warnings: List[str] = []
+    replaced = regenerate_exercises(
+        updated, [f for f in fragments if f["kind"] == "exercise"], modification, profile, health_conditions, warnings
+    )
+    replaced += regenerate_meals(
+        updated, [f for f in fragments if f["kind"] == "meal"], modification, profile,
+        health_conditions, restrictions, warnings
+    )
+    validators = validate_replacements(updated, original, replaced, modification, restrictions, warnings)
+
+    if replaced and updated.get("weekly_plans") and derive_weeks is not None:
+        updated["weekly_plans"] = derive_weeks(updated["workout_plan"], updated["meal_plan"])
+        validators.append("weekly_progression")
+
+    patch = build_plan_patch(
+        plan_id, plan.get("plan_version", 1), diff_plan(original, updated), replaced, validators, warnings
+    )
+    return {"modification": modification, "patch": patch, "replaced": replaced}
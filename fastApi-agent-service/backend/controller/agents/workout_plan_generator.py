@@ -1,10 +1,14 @@
-from typing import TypedDict, List, Dict
-from backend.utils.llm import health_llm
-from backend.utils.health_safety import HealthSafetyValidator
-from backend.constants.enums import (
-    ActivityLevel, Goal, WorkoutType, IntensityLevel, 
-    EXERCISE_DISCLAIMER, HEALTH_DISCLAIMER
-)
+from typing import TypedDict, List, Dict, Iterator
+from backend.config import main as config
+from backend.utils.llm import get_node_llm, route_node_llm, is_low_risk_profile, ROUTE_LIGHT
+from backend.utils.health_safety import HealthSafetyValidator, screen_text
+from backend.utils.structured_output import stream_structured_days, invoke_structured, WORKOUT_PLAN_SCHEMA
+from backend.utils.workout_planner import plan_weekly_workouts
+from backend.utils.plan_stream import emit_plan_event
+from backend.utils.prompt_cache import PromptTemplate, CompiledPrompt
+from backend.utils.plan_validation import coerce_workout_day
+from backend.utils.disclaimers import add_disclaimers
+from backend.constants.enums import ActivityLevel, Goal, WorkoutType, IntensityLevel
 import json
 import logging
 
@@ -19,85 +23,7 @@ class WellnessOrchestratorState(TypedDict):
     safety_notes: list
     disclaimers: list
 
-def normalize_workout_data(workout_plan: List[Dict]) -> List[Dict]:
-    """
-    Normalize LLM-generated workout data to match Node.js Mongoose schema enums
-    This prevents validation errors when saving to MongoDB
-    """
-    # Workout type mappings - map non-standard types to valid ones
-    workout_type_map = {
-        'core': 'strength',
-        'mobility': 'flexibility',
-        'strength_cardio': 'hiit',
-        'cardio_strength': 'hiit',
-        'cardio_core': 'hiit',
-        'core_back': 'strength',
-        'dynamic_stretch': 'flexibility',
-        'static_stretch': 'flexibility'
-    }
-    
-    # Intensity level mappings - normalize variations
-    intensity_map = {
-        'moderate-high': 'high',
-        'very-high': 'very_high',
-        'none': 'low',
-        'very high': 'very_high'
-    }
-    
-    # Valid types from Node.js enum
-    valid_types = [
-        'cardio', 'strength', 'flexibility', 'yoga', 'pilates', 'hiit',
-        'walking', 'swimming', 'bodyweight', 'balance', 'running', 
-        'cycling', 'weightlifting', 'crossfit', 'dance', 'martial_arts', 'sports'
-    ]
-    
-    for day in workout_plan:
-        # Normalize intensity_level
-        if 'intensity_level' in day and day['intensity_level']:
-            original = str(day['intensity_level']).lower()
-            day['intensity_level'] = intensity_map.get(original, original)
-        
-        # Handle rest days - remove intensity or set to None
-        if day.get('rest_day', False):
-            # Rest days shouldn't have intensity_level in Node.js schema
-            if 'intensity_level' in day:
-                del day['intensity_level']
-        
-        # Normalize exercise types
-        for exercise in day.get('exercises', []):
-            if 'type' in exercise:
-                original = str(exercise['type']).lower()
-                # First try to map it
-                mapped_type = workout_type_map.get(original, original)
-                
-                # Validate it's now a valid type
-                if mapped_type not in valid_types:
-                    logger.warning(f"Invalid exercise type '{original}' -> '{mapped_type}', defaulting to 'strength'")
-                    exercise['type'] = 'strength'
-                else:
-                    exercise['type'] = mapped_type
-    
-    return workout_plan
-
-def generate_safe_workout_plan(state: WellnessOrchestratorState) -> WellnessOrchestratorState:
-    """
-    Generate a safe, balanced workout plan based on user profile and health considerations
-    """
-    profile = state["user_profile"]
-    health_conditions = state.get("health_conditions", [])
-    
-    # Safety validation
-    safety_check = HealthSafetyValidator.validate_workout_plan(
-        profile.get("time_availability_minutes", 30),
-        profile.get("current_activity_level", ActivityLevel.MODERATELY_ACTIVE),
-        profile.get("age")
-    )
-    
-    if not safety_check["is_valid"]:
-        logger.warning(f"Workout plan safety concerns: {safety_check['warnings']}")
-    
-    # Build safe prompt with EXPLICIT enum constraints
-    prompt = f"""
+WORKOUT_PROMPT = PromptTemplate("workout_generator", f"""
 You are a certified fitness professional creating a safe, balanced workout plan. 
 Always prioritize safety, gradual progression, and sustainable habits.
 
@@ -108,21 +34,6 @@ CRITICAL SAFETY REQUIREMENTS:
 - Recommend professional consultation for high-risk individuals
 - Focus on gradual progression and injury prevention
 
-User Profile:
-- Age: {profile.get('age', 'Not specified')}
-- Current Activity Level: {profile.get('current_activity_level', 'Not specified')}
-- Primary Goal: {profile.get('primary_goal', 'general_wellness')}
-- Available Time: {safety_check['adjusted_minutes']} minutes per day
-- Preferred Workout Types: {profile.get('preferred_workout_types', [])}
-- Available Equipment: {profile.get('available_equipment', ['bodyweight'])}
-- Health Conditions: {health_conditions if health_conditions else 'None reported'}
-
-SAFETY WARNINGS FROM VALIDATION:
-{'; '.join(safety_check.get('warnings', []))}
-
-RECOMMENDATIONS:
-{'; '.join(safety_check.get('recommendations', []))}
-
 CRITICAL: Use ONLY these EXACT workout types (all lowercase):
 - cardio
 - strength
@@ -162,7 +73,7 @@ Create a 7-day workout plan with the following MANDATORY safety features:
 2. Include at least 1-2 complete rest days
 3. Provide exercise modifications for different fitness levels
 4. Include detailed safety instructions for each exercise
-5. Keep individual workout duration under {min(safety_check['adjusted_minutes'], 60)} minutes
+5. Keep individual workout duration under the session limit given in the user context below
 6. Focus on functional, low-risk movements
 
 Return ONLY a valid JSON array (NO markdown, NO code blocks, NO extra text) with this EXACT structure:
@@ -210,16 +121,127 @@ IMPORTANT REMINDERS:
 - Rest days must NOT have intensity_level field
 - All JSON must be valid (proper quotes, commas, brackets)
 - Return ONLY JSON, no markdown formatting
-"""
 
+USER CONTEXT:
+""")
+
+def build_workout_prompt(profile: dict, health_conditions: list, safety_check: Dict) -> CompiledPrompt:
+    """
+    Build the workout generation prompt: the static WORKOUT_PROMPT prefix
+    followed by a compact per-user suffix
+    """
+    lines = [
+        f"- Age: {profile.get('age', 'Not specified')}",
+        f"- Current Activity Level: {profile.get('current_activity_level', 'Not specified')}",
+        f"- Primary Goal: {profile.get('primary_goal', 'general_wellness')}",
+        f"- Available Time: {safety_check['adjusted_minutes']} minutes per day",
+        f"- Session Limit: keep each workout under {min(safety_check['adjusted_minutes'], 60)} minutes",
+        f"- Preferred Workout Types: {profile.get('preferred_workout_types', [])}",
+        f"- Available Equipment: {profile.get('available_equipment', ['bodyweight'])}",
+        f"- Health Conditions: {health_conditions if health_conditions else 'None reported'}",
+    ]
+    if safety_check.get("warnings"):
+        lines.append(f"- Safety Warnings: {'; '.join(safety_check['warnings'])}")
+    if safety_check.get("recommendations"):
+        lines.append(f"- Recommendations: {'; '.join(safety_check['recommendations'])}")
+    return WORKOUT_PROMPT.render("\n".join(lines))
+
+def stream_workout_days(prompt: str, llm=None) -> Iterator[Dict]:
+    """
+    Stream normalized workout days while the LLM is still generating
+    Each day is normalized as it arrives so consumers can validate or forward it early
+    """
+    for day in stream_structured_days(
+        llm or get_node_llm("workout"), prompt, WORKOUT_PLAN_SCHEMA, agent="workout_generator", expected_days=7
+    ):
+        yield coerce_workout_day(day)
+
+WORKOUT_NOTES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "days": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"day": {"type": "integer"}, "notes": {"type": "string"}},
+                "required": ["day", "notes"],
+            },
+        },
+    },
+    "required": ["days"],
+}
+
+def enrich_workout_notes(workout_plan: List[Dict], profile: dict, llm=None) -> List[Dict]:
+    """
+    Optional LLM pass over a catalog-planned week: only the per-day coaching
+    notes are rewritten, exercises and durations are left untouched.
+    Failures keep the planner's notes.
+    """
+    summary = [
+        {"day": day["day"], "workout_name": day["workout_name"], "exercises": [e["name"] for e in day["exercises"]]}
+        for day in workout_plan if not day.get("rest_day")
+    ]
+    prompt = (
+        "You are a certified fitness professional. For each workout day below, write one or two "
+        "encouraging sentences of coaching notes for this person, with a safety cue. Do not change "
+        "or add exercises.\n"
+        f"Primary Goal: {profile.get('primary_goal', 'general_wellness')}\n"
+        f"Current Activity Level: {profile.get('current_activity_level', 'Not specified')}\n"
+        f"Workouts: {json.dumps(summary, default=str)}\n"
+        'Return JSON: {"days": [{"day": <day number>, "notes": "<notes>"}]}'
+    )
     try:
-        response = health_llm.invoke(prompt)
-        workout_plan = json.loads(
-            response.content.strip().replace("```json\n", "").replace("```", "").replace("```json", "")
-        )
-        
-        # CRITICAL: Normalize the data before validation
-        workout_plan = normalize_workout_data(workout_plan)
+        result = invoke_structured(llm or get_node_llm("workout", ROUTE_LIGHT), prompt, WORKOUT_NOTES_SCHEMA, agent="workout_enrichment")
+    except Exception as e:
+        logger.warning(f"Workout note enrichment failed, keeping planner notes: {e}")
+        return workout_plan
+
+    notes = {item["day"]: item["notes"] for item in result["days"] if str(item.get("notes", "")).strip()}
+    for day in workout_plan:
+        if not day.get("rest_day") and day["day"] in notes:
+            day["notes"] = notes[day["day"]]
+    return workout_plan
+
+def generate_safe_workout_plan(state: WellnessOrchestratorState) -> WellnessOrchestratorState:
+    """
+    Generate a safe, balanced workout plan based on user profile and health considerations
+    Low-risk profiles are planned from the exercise catalog; everyone else gets an LLM plan
+    """
+    profile = state["user_profile"]
+    health_conditions = state.get("health_conditions", [])
+    risk_level = state.get("analysis_result", {}).get("risk_level")
+    
+    # Safety validation
+    safety_check = HealthSafetyValidator.validate_workout_plan(
+        profile.get("time_availability_minutes", 30),
+        profile.get("current_activity_level", ActivityLevel.MODERATELY_ACTIVE),
+        profile.get("age")
+    )
+    
+    if not safety_check["is_valid"]:
+        logger.warning(f"Workout plan safety concerns: {safety_check['warnings']}")
+
+    try:
+        if (
+            config.WORKOUT_TEMPLATE_PLANNER_ENABLED
+            and risk_level == "low"
+            and is_low_risk_profile("workout", profile, health_conditions, risk_level=risk_level)
+        ):
+            workout_plan = plan_weekly_workouts(profile, safety_check["adjusted_minutes"], safety_check)
+            if config.WORKOUT_TEMPLATE_LLM_ENRICHMENT:
+                enrich_workout_notes(workout_plan, profile)
+            for day in workout_plan:
+                emit_plan_event("workout_day", {"day": day, "warnings": validate_workout_day_safety(day)})
+        else:
+            prompt = build_workout_prompt(profile, health_conditions, safety_check)
+            llm = route_node_llm("workout", profile, health_conditions, risk_level=risk_level)
+
+            # Days are normalized and checked as they stream in, then sorted back into day order
+            workout_plan = []
+            for day in stream_workout_days(prompt, llm):
+                workout_plan.append(day)
+                emit_plan_event("workout_day", {"day": day, "warnings": validate_workout_day_safety(day)})
+            workout_plan.sort(key=lambda day: day.get("day", 0))
         
         # Validate total weekly duration
         total_weekly_minutes = sum(
@@ -254,8 +276,7 @@ IMPORTANT REMINDERS:
         state["safety_notes"].extend(safety_check.get("recommendations", []))
         
         # Add disclaimers
-        state["disclaimers"].append(EXERCISE_DISCLAIMER)
-        state["disclaimers"].append(HEALTH_DISCLAIMER)
+        add_disclaimers(state, "exercise_safety", "general_health")
         
         logger.info(f"Generated safe workout plan with {len(workout_plan)} days")
         
@@ -305,7 +326,7 @@ IMPORTANT REMINDERS:
         
         state["workout_plan"] = fallback_plan
         state["safety_notes"].append("AI generation failed - using ultra-safe fallback plan")
-        state["disclaimers"].append("This is a basic fallback plan. Professional consultation strongly recommended.")
+        add_disclaimers(state, "fallback_workout_plan")
         
         return state
 
@@ -333,22 +354,25 @@ def validate_workout_safety_post_generation(workout_plan: List[Dict]) -> Dict[st
         validation_result["warnings"].append("Insufficient rest days for recovery")
         validation_result["modifications_needed"].append("Add at least one complete rest day")
     
-    # Check individual workout durations
+    # Check individual workout durations and exercises
     for day in workout_plan:
-        if not day.get("rest_day", False) and day.get("total_duration_minutes", 0) > 90:
-            validation_result["warnings"].append(f"Day {day.get('day')} workout duration may be excessive")
+        validation_result["warnings"].extend(validate_workout_day_safety(day))
     
-    # Check for dangerous keywords
-    dangerous_keywords = [
-        "maximum", "extreme", "until failure", "heavy weight", "plyometric jumps",
-        "advanced", "competitive", "maximum heart rate"
-    ]
+    return validation_result
+
+def validate_workout_day_safety(day: Dict) -> List[str]:
+    """
+    Per-day safety checks, usable on each day as soon as it is streamed
+    """
+    warnings = []
     
-    for day in workout_plan:
-        for exercise in day.get("exercises", []):
-            exercise_text = (exercise.get("instructions", "") + " " + exercise.get("name", "")).lower()
-            for keyword in dangerous_keywords:
-                if keyword in exercise_text:
-                    validation_result["warnings"].append(f"Potentially risky exercise detected: {exercise.get('name')}")
+    if not day.get("rest_day", False) and day.get("total_duration_minutes", 0) > 90:
+        warnings.append(f"Day {day.get('day')} workout duration may be excessive")
+    
+    # Check for dangerous keywords
+    for exercise in day.get("exercises", []):
+        exercise_text = exercise.get("instructions", "") + " " + exercise.get("name", "")
+        for keyword in screen_text(exercise_text, "risky_exercise"):
+            warnings.append(f"Potentially risky exercise detected: {exercise.get('name')}")
     
-    return validation_result
\ No newline at end of file
+    return warnings
\ No newline at end of file
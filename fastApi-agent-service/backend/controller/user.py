@@ -1,14 +1,24 @@
-from backend.models.HealthPlan import HealthPlan
+from backend.models.HealthPlan import (
+    HealthPlan, HealthPlanSummaryView, HealthPlanStatusView, HealthPlanChatContextView, HealthPlanContentView
+)
 from fastapi.encoders import jsonable_encoder
-from backend.controller.agent import wellness_orchestrator
+from backend.controller.agent import wellness_orchestrator, derive_plan_weeks
+from backend.controller.agents.plan_modifier import modify_plan_incrementally
+from backend.utils.plan_diff import describe_fragments, parse_modification, targets_plan, apply_plan_patch
+from backend.utils.plan_updates import (
+    progress_update, pause_update, touch_update, plan_version_filter, plan_patch_update
+)
+from backend.utils.plan_events import record_plan_events, list_plan_events, count_plan_events
+from backend.models.PlanEvent import PlanEvent
 from backend.services.user import update_health_plan_status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from beanie import PydanticObjectId
-from backend.utils.health_safety import HealthSafetyValidator, log_health_recommendation
-from backend.constants.enums import HealthPlanStatus
+from backend.utils.health_safety import HealthSafetyValidator, log_health_recommendation, screen_text
+from backend.constants.enums import HealthPlanStatus, PlanEventKind
 import json
 import logging
 from datetime import datetime, timedelta
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
@@ -19,30 +29,26 @@ async def chat_health_plan(plan_id: str, chat_data):
     """
     try:
        
-        health_plan = await HealthPlan.find_one({"_id": PydanticObjectId(plan_id)})
+        health_plan = await HealthPlan.find_one(
+            {"_id": PydanticObjectId(plan_id)}, projection_model=HealthPlanChatContextView
+        )
         if not health_plan:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"success": False, "message": "Health plan not found"},
                 status_code=404
             )
 
         
         if health_plan.status != HealthPlanStatus.ACTIVE:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"success": False, "message": f"Cannot modify {health_plan.status.value} health plan"},
                 status_code=400
             )
 
         
-        user_message = chat_data.message.lower()
-        concerning_keywords = [
-            "chest pain", "severe pain", "can't breathe", "dizzy", "nauseous",
-            "injured", "hurt", "emergency", "hospital", "bleeding", "fainted"
-        ]
-
-        if any(keyword in user_message for keyword in concerning_keywords):
+        if screen_text(chat_data.message, "chat_urgent"):
             logger.warning(f"Concerning symptoms mentioned in chat for plan {plan_id}: {chat_data.message}")
-            return JSONResponse(
+            return ORJSONResponse(
                 {
                     "success": False,
                     "message": "Based on your message, please seek immediate medical attention if you're experiencing concerning symptoms. For non-emergency questions, please consult with your healthcare provider.",
@@ -75,22 +81,54 @@ async def chat_health_plan(plan_id: str, chat_data):
             }
         }
 
-       
-        result_state = await wellness_orchestrator(
-            user_profile={
-                "user_id": str(health_plan.user_id),
-                "age": health_plan.age,
-                "current_activity_level": health_plan.current_activity_level,
-                "primary_goal": health_plan.primary_goal,
-                "time_availability_minutes": health_plan.time_availability_minutes,
-                "preferred_workout_types": health_plan.preferred_workout_types,
-                "available_equipment": health_plan.available_equipment,
-            },
-            health_conditions=health_plan.health_conditions,
-            dietary_restrictions=health_plan.dietary_restrictions,
-            medical_clearance=health_plan.medical_clearance,
-            operation_type="modify_plan"
-        )
+        user_profile = {
+            "user_id": str(health_plan.user_id),
+            "age": health_plan.age,
+            "current_activity_level": health_plan.current_activity_level,
+            "primary_goal": health_plan.primary_goal,
+            "time_availability_minutes": health_plan.time_availability_minutes,
+            "preferred_workout_types": health_plan.preferred_workout_types,
+            "available_equipment": health_plan.available_equipment,
+        }
+
+        # Targeted changes regenerate only the exercises and meals they touch
+        result_state = None
+        plan_content = None
+        if targets_plan(parse_modification(chat_data.message)):
+            plan_content = await HealthPlan.find_one(
+                {"_id": health_plan.id}, projection_model=HealthPlanContentView
+            )
+        if plan_content and (plan_content.workout_plan or plan_content.meal_plan):
+            plan_data = jsonable_encoder(plan_content, exclude={"id"})
+            modification = modify_plan_incrementally(
+                plan_id,
+                plan_data,
+                chat_data.message,
+                user_profile,
+                health_plan.health_conditions,
+                health_plan.dietary_restrictions,
+                derive_weeks=lambda workout_plan, meal_plan: derive_plan_weeks(
+                    workout_plan, meal_plan, user_profile, health_plan.dietary_restrictions,
+                    len(plan_content.weekly_plans) + 1
+                ),
+            )
+            if modification:
+                patch = modification["patch"]
+                patch["applied"] = await save_plan_patch(health_plan.id, plan_data, patch)
+                if patch["operations"] and not patch["applied"]:
+                    patch["warnings"].append(
+                        "Your plan changed while this request was being processed, so these changes were not saved. Please try again."
+                    )
+                result_state = {"plan_modifications": patch, "safety_notes": patch["warnings"]}
+
+        if result_state is None:
+            result_state = await wellness_orchestrator(
+                user_profile=user_profile,
+                health_conditions=health_plan.health_conditions,
+                dietary_restrictions=health_plan.dietary_restrictions,
+                medical_clearance=health_plan.medical_clearance,
+                operation_type="modify_plan"
+            )
 
         
         response_data = {
@@ -109,15 +147,18 @@ async def chat_health_plan(plan_id: str, chat_data):
         )
 
         
-        health_plan.last_accessed_at = datetime.utcnow()
-        await health_plan.save()
+        await record_plan_events([
+            PlanEvent(plan_id=health_plan.id, kind=PlanEventKind.CHAT, role="user", text=chat_data.message),
+            PlanEvent(plan_id=health_plan.id, kind=PlanEventKind.CHAT, role="assistant", text=response_data["response"]),
+        ])
+        await HealthPlan.get_motor_collection().update_one({"_id": health_plan.id}, touch_update())
 
         logger.info(f"Health plan chat response generated for plan {plan_id}")
-        return JSONResponse(response_data, status_code=200)
+        return ORJSONResponse(response_data, status_code=200)
 
     except Exception as e:
         logger.error(f"Error in health plan chat: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "success": False, 
                 "message": "Unable to process your health question at this time. Please consult with healthcare professionals for immediate assistance.",
@@ -127,18 +168,52 @@ async def chat_health_plan(plan_id: str, chat_data):
             status_code=500,
         )
 
-async def get_health_plan_messages(plan_id: str):
+async def save_plan_patch(plan_id: PydanticObjectId, plan_data: dict, patch: dict) -> bool:
+    """
+    Apply a modification patch to the stored plan. The write is filtered on
+    the patch's base version, so a plan changed in the meantime is left
+    alone; returns whether the patch was saved.
+    """
+    if not patch["operations"]:
+        return False
+    try:
+        patched = apply_plan_patch(plan_data, patch)
+        content = HealthPlanContentView.model_validate({**patched, "_id": plan_id}).model_dump(
+            mode="json", include={"workout_plan", "meal_plan", "weekly_plans"}
+        )
+    except ValueError as e:
+        logger.warning(f"Plan {plan_id}: modification patch not applied: {str(e)}")
+        return False
+    result = await HealthPlan.get_motor_collection().update_one(
+        plan_version_filter(plan_id, patch["base_version"]), plan_patch_update(content, patch["version"])
+    )
+    if not result.modified_count:
+        logger.warning(f"Plan {plan_id}: modification patch conflicts with a newer plan version")
+    return bool(result.modified_count)
+
+async def get_health_plan_messages(plan_id: str, cursor: Optional[str] = None, limit: Optional[int] = None):
     """
     Retrieve health plan conversation history with privacy protection
+    Events are returned newest first, one page per call; pass next_cursor back to get the next page
     """
     try:
-        health_plan = await HealthPlan.find_one({"_id": PydanticObjectId(plan_id)})
+        health_plan = await HealthPlan.find_one(
+            {"_id": PydanticObjectId(plan_id)}, projection_model=HealthPlanSummaryView
+        )
         if not health_plan:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"success": False, "message": "Health plan not found"},
                 status_code=404
             )
 
+        try:
+            page = await list_plan_events(health_plan.id, cursor=cursor, limit=limit)
+        except ValueError:
+            return ORJSONResponse(
+                {"success": False, "message": "Invalid cursor"},
+                status_code=400
+            )
+
         
         sanitized_data = {
             "plan_id": str(health_plan.id),
@@ -147,18 +222,31 @@ async def get_health_plan_messages(plan_id: str):
             "last_accessed": health_plan.last_accessed_at.isoformat() if health_plan.last_accessed_at else None,
             "current_week": health_plan.current_week,
             "total_weeks": health_plan.plan_duration_weeks,
-            "progress_notes_count": len(health_plan.progress_notes),
-            "status": health_plan.status.value
+            "progress_notes_count": await count_plan_events(
+                health_plan.id, [PlanEventKind.PROGRESS, PlanEventKind.PAUSE]
+            ),
+            "status": health_plan.status.value,
+            "messages": [
+                {
+                    "kind": event.kind.value,
+                    "role": event.role,
+                    "text": event.text,
+                    "current_week": event.current_week,
+                    "timestamp": event.timestamp.isoformat(),
+                }
+                for event in page["events"]
+            ],
+            "next_cursor": page["next_cursor"],
         }
 
-        return JSONResponse(
+        return ORJSONResponse(
             {"success": True, "data": sanitized_data}, 
             status_code=200
         )
 
     except Exception as e:
         logger.error(f"Error retrieving health plan messages: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             {"success": False, "message": "Error retrieving conversation history"},
             status_code=500
         )
@@ -168,9 +256,11 @@ async def update_health_plan_progress(plan_id: str, progress_data):
     Update health plan progress with comprehensive safety monitoring
     """
     try:
-        health_plan = await HealthPlan.find_one({"_id": PydanticObjectId(plan_id)})
+        health_plan = await HealthPlan.find_one(
+            {"_id": PydanticObjectId(plan_id)}, projection_model=HealthPlanStatusView
+        )
         if not health_plan:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"success": False, "message": "Health plan not found"},
                 status_code=404
             )
@@ -178,7 +268,7 @@ async def update_health_plan_progress(plan_id: str, progress_data):
         
         safety_validation = validate_progress_update_safety(progress_data, health_plan)
         if not safety_validation["is_safe"]:
-            return JSONResponse(
+            return ORJSONResponse(
                 {
                     "success": False,
                     "message": "Safety concerns detected in progress update",
@@ -193,12 +283,10 @@ async def update_health_plan_progress(plan_id: str, progress_data):
         health_plan.current_week = min(progress_data.current_week, health_plan.plan_duration_weeks)
         
        
-        if progress_data.progress_notes:
-            timestamped_notes = [
-                f"[{datetime.utcnow().strftime('%Y-%m-%d %H:%M')}] {note}"
-                for note in progress_data.progress_notes
-            ]
-            health_plan.progress_notes.extend(timestamped_notes)
+        progress_events = [
+            PlanEvent(plan_id=health_plan.id, kind=PlanEventKind.PROGRESS, text=note, current_week=health_plan.current_week)
+            for note in progress_data.progress_notes or []
+        ]
 
        
         if hasattr(progress_data, 'completed_workouts'):
@@ -210,8 +298,11 @@ async def update_health_plan_progress(plan_id: str, progress_data):
             health_plan.status = HealthPlanStatus.COMPLETED
             logger.info(f"Health plan {plan_id} marked as completed")
 
-        health_plan.updated_at = datetime.utcnow()
-        await health_plan.save()
+        await HealthPlan.get_motor_collection().update_one(
+            {"_id": health_plan.id},
+            progress_update(health_plan.current_week, health_plan.status)
+        )
+        await record_plan_events(progress_events)
 
         
         try:
@@ -238,11 +329,11 @@ async def update_health_plan_progress(plan_id: str, progress_data):
         }
 
         logger.info(f"Progress updated for health plan {plan_id}: week {original_week} -> {health_plan.current_week}")
-        return JSONResponse(response_data, status_code=200)
+        return ORJSONResponse(response_data, status_code=200)
 
     except Exception as e:
         logger.error(f"Error updating health plan progress: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             {"success": False, "message": "Error updating progress - please consult healthcare provider"},
             status_code=500
         )
@@ -252,32 +343,41 @@ async def pause_health_plan(plan_id: str, pause_data):
     Safely pause a health plan with proper logging and safety checks
     """
     try:
-        health_plan = await HealthPlan.find_one({"_id": PydanticObjectId(plan_id)})
+        health_plan = await HealthPlan.find_one(
+            {"_id": PydanticObjectId(plan_id)}, projection_model=HealthPlanStatusView
+        )
         if not health_plan:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"success": False, "message": "Health plan not found"},
                 status_code=404
             )
 
         if health_plan.status != HealthPlanStatus.ACTIVE:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"success": False, "message": f"Cannot pause {health_plan.status.value} health plan"},
                 status_code=400
             )
 
         
-        pause_reason = pause_data.reason.lower() if pause_data.reason else ""
-        health_concerns = ["injury", "illness", "pain", "doctor", "medical", "hospital"]
-        
-        if any(concern in pause_reason for concern in health_concerns):
+        if pause_data.reason and screen_text(pause_data.reason, "health_pause"):
             logger.warning(f"Health-related pause for plan {plan_id}: {pause_data.reason}")
-            health_plan.progress_notes.append(f"[PAUSE - HEALTH CONCERN] {pause_data.reason}")
+            pause_note = f"[PAUSE - HEALTH CONCERN] {pause_data.reason}"
         else:
-            health_plan.progress_notes.append(f"[PAUSE] {pause_data.reason or 'User requested pause'}")
+            pause_note = f"[PAUSE] {pause_data.reason or 'User requested pause'}"
 
+        # Only an active plan is paused, even if another request changed it since the read
+        update_result = await HealthPlan.get_motor_collection().update_one(
+            {"_id": health_plan.id, "status": HealthPlanStatus.ACTIVE.value}, pause_update()
+        )
+        if not update_result.matched_count:
+            return ORJSONResponse(
+                {"success": False, "message": "Health plan is no longer active"},
+                status_code=409
+            )
         health_plan.status = HealthPlanStatus.PAUSED
-        health_plan.updated_at = datetime.utcnow()
-        await health_plan.save()
+        await record_plan_events([
+            PlanEvent(plan_id=health_plan.id, kind=PlanEventKind.PAUSE, text=pause_note, current_week=health_plan.current_week)
+        ])
 
         
         try:
@@ -290,7 +390,7 @@ async def pause_health_plan(plan_id: str, pause_data):
             logger.error(f"Error syncing pause with user service: {sync_error}")
 
         logger.info(f"Health plan {plan_id} paused: {pause_data.reason}")
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "success": True,
                 "message": "Health plan paused successfully",
@@ -307,7 +407,7 @@ async def pause_health_plan(plan_id: str, pause_data):
 
     except Exception as e:
         logger.error(f"Error pausing health plan: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             {"success": False, "message": "Error pausing health plan"},
             status_code=500
         )
@@ -335,9 +435,12 @@ def generate_safe_health_response(user_message: str, context: dict, ai_result: d
     
     analysis = ai_result.get("analysis_result", {})
     safety_level = analysis.get("risk_level", "moderate")
+    changed = describe_fragments(ai_result.get("plan_modifications", {}).get("changed_fragments", []))
     
     if safety_level in ["high", "very_high"]:
         specific_guidance = "Based on your health profile, we recommend consulting with healthcare professionals before making any changes to your wellness routine."
+    elif changed:
+        specific_guidance = f"We replaced {changed} in your plan to match your request; the rest of your plan is unchanged. Start any new exercise gently and check new meals against your allergies."
     elif "exercise" in user_message.lower():
         specific_guidance = "For exercise modifications, ensure you maintain proper form, start gradually, and listen to your body. Consider working with a certified fitness professional."
     elif "diet" in user_message.lower() or "nutrition" in user_message.lower():
@@ -365,9 +468,8 @@ def validate_progress_update_safety(progress_data, health_plan) -> dict:
 
    
     if hasattr(progress_data, 'progress_notes') and progress_data.progress_notes:
-        concerning_keywords = ["pain", "injury", "hurt", "dizzy", "nauseous", "exhausted"]
         for note in progress_data.progress_notes:
-            if any(keyword in note.lower() for keyword in concerning_keywords):
+            if screen_text(note, "progress_concern"):
                 validation_result["is_safe"] = False
                 validation_result["concerns"].append(f"Concerning symptom reported: {note}")
                 validation_result["recommendations"].append("Consult healthcare provider before continuing")
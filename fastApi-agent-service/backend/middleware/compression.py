@@ -0,0 +1,226 @@
+import logging
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.config import main as config
+from backend.utils.http_cache import encoded_etag
+from backend.utils.metrics import record_response_compression
+
+try:
+    import zstandard
+except ImportError:  # optional: zstd is offered only when installed
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # optional: br is offered only when installed
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Bodies worth compressing; images, PDFs and the like are already compressed
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml", "image/svg+xml")
+
+
+class GzipEncoder:
+    def __init__(self):
+        self._compressor = zlib.compressobj(config.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        # A sync flush ends each streamed chunk on a byte boundary so the client can decode it right away
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class ZstdEncoder:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=config.COMPRESSION_ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        flush = zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        return self._compressor.compress(data) + self._compressor.flush(flush)
+
+
+class BrotliEncoder:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=config.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.process(data) + (self._compressor.finish() if final else self._compressor.flush())
+
+
+ENCODERS = {"gzip": GzipEncoder}
+if zstandard is not None:
+    ENCODERS["zstd"] = ZstdEncoder
+if brotli is not None:
+    ENCODERS["br"] = BrotliEncoder
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Accept-Encoding as {coding: q}; malformed q-values count as 0"""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate_encoding(header: Optional[str], preference: Iterable[str]) -> Optional[str]:
+    """
+    The content coding to use for a request, or None for identity.
+    Highest q wins; ties go to the first coding in the server preference.
+    """
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in preference:
+        if coding not in ENCODERS:
+            continue
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Negotiated gzip/zstd/br compression for response bodies.
+
+    Pure ASGI rather than BaseHTTPMiddleware so streamed bodies pass through
+    chunk by chunk: each chunk is compressed and flushed as it arrives, so
+    Server-Sent Events reach the client one event at a time. Whole bodies
+    below COMPRESSION_MIN_SIZE, non-text content, responses that already
+    carry a Content-Encoding, Cache-Control: no-transform and HEAD requests
+    are left alone.
+
+    Add it last so it wraps HealthDataSecurityMiddleware and the audit
+    middleware: they then see and decorate the uncompressed response and
+    compression is the final step before the wire.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None, encodings: Optional[Iterable[str]] = None):
+        self.app = app
+        self.minimum_size = config.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        self.encodings = list(encodings or config.COMPRESSION_ENCODINGS)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # HEAD responses carry the GET headers but no body; compressing the empty body would misstate them
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        coding = negotiate_encoding(headers.get("accept-encoding"), self.encodings)
+        await CompressionResponder(self.app, coding, self.minimum_size, headers.get("if-none-match", ""))(
+            scope, receive, send
+        )
+
+
+class CompressionResponder:
+    def __init__(self, app: ASGIApp, coding: Optional[str], minimum_size: int, if_none_match: str = ""):
+        self.app = app
+        self.coding = coding
+        self.minimum_size = minimum_size
+        self.if_none_match = if_none_match
+        self.send: Optional[Send] = None
+        self.start_message: Optional[Message] = None
+        self.declared_length: Optional[int] = None
+        self.start_headers: Optional[MutableHeaders] = None
+        self.buffered: List[bytes] = []
+        self.streaming = False
+        self.encoder = None
+        self.passthrough = False
+        self.started = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    def _compressible(self, headers: Headers) -> bool:
+        if "content-encoding" in headers or "no-transform" in headers.get("cache-control", ""):
+            return False
+        return headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether compression applies
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            compressible = self._compressible(headers) and message["status"] not in (204, 304)
+            if compressible:
+                MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+            elif message["status"] == 304 and self.coding and "etag" in headers:
+                # A 304 names the representation the client revalidated; echo the compressed tag it sent
+                etag = encoded_etag(headers["etag"], self.coding)
+                if etag in self.if_none_match:
+                    MutableHeaders(raw=message["headers"])["ETag"] = etag
+            self.passthrough = self.coding is None or not compressible
+            if headers.get("content-length", "").isdigit():
+                self.declared_length = int(headers["content-length"])
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            size = self.declared_length if self.declared_length is not None else (None if more_body else len(body))
+            if self.passthrough or (size is not None and size < self.minimum_size):
+                self.passthrough = True
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+            self.encoder = ENCODERS[self.coding]()
+            self.start_headers = MutableHeaders(raw=self.start_message["headers"])
+            self.start_headers["Content-Encoding"] = self.coding
+            if "etag" in self.start_headers:
+                self.start_headers["ETag"] = encoded_etag(self.start_headers["etag"], self.coding)
+            self.streaming = size is None
+            if self.streaming:
+                # A true stream (SSE): no length up front, every chunk is flushed as it arrives
+                del self.start_headers["Content-Length"]
+                await self.send(self.start_message)
+        elif self.passthrough:
+            await self.send(message)
+            return
+
+        if self.streaming:
+            await self.send({**message, "body": self._compress(body, final=not more_body)})
+            return
+
+        # Known length: collect the chunks (BaseHTTPMiddleware re-streams whole bodies)
+        # and send one compressed body with its real Content-Length
+        self.buffered.append(body)
+        if more_body:
+            return
+        compressed = self._compress(b"".join(self.buffered), final=True)
+        self.start_headers["Content-Length"] = str(len(compressed))
+        await self.send(self.start_message)
+        await self.send({**message, "body": compressed})
+
+    def _compress(self, body: bytes, final: bool) -> bytes:
+        compressed = self.encoder.compress(body, final)
+        self.bytes_in += len(body)
+        self.bytes_out += len(compressed)
+        if final:
+            record_response_compression(self.coding, self.bytes_in, self.bytes_out)
+        return compressed
@@ -7,6 +7,8 @@ import os
 import logging
 
 from backend.config import main as config
+from backend.utils.health_safety import screen_text
+from backend.utils.json_codec import canonical_json
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +46,7 @@ async def verify_signature(request: Request):
     
     body_bytes = await request.body()
     try:
+        # json.loads keeps every number exactly as sent, which the re-encoded signature depends on
         body_json = json.loads(body_bytes.decode("utf-8")) if body_bytes else {}
     except json.JSONDecodeError:
         logger.warning("Failed to decode request body JSON")
@@ -53,11 +56,11 @@ async def verify_signature(request: Request):
 
     
     if validate == "query":
-        validator = json.dumps(query_params, separators=(',', ':')) + timestamp
+        validator = canonical_json(query_params) + timestamp
     elif validate == "both":
-        validator = json.dumps(query_params, separators=(',', ':')) + json.dumps(body_json, separators=(',', ':')) + timestamp
+        validator = canonical_json(query_params) + canonical_json(body_json) + timestamp
     else: 
-        validator = json.dumps(body_json, separators=(',', ':')) + timestamp
+        validator = canonical_json(body_json) + timestamp
 
    
     key = HMAC_SECRETS.get(origin)
@@ -187,13 +190,8 @@ def validate_health_plan_request(request_data: dict) -> dict:
     
     
     health_conditions = request_data.get("health_conditions", [])
-    high_risk_conditions = [
-        "heart", "cardiac", "diabetes", "blood pressure", "eating disorder",
-        "pregnancy", "surgery", "injury", "medication"
-    ]
-    
     for condition in health_conditions:
-        if any(risk in condition.lower() for risk in high_risk_conditions):
+        if screen_text(condition, "request_health_condition"):
             validation_result["warnings"].append(f"Health condition requires medical consultation: {condition}")
     
     
@@ -0,0 +1,97 @@
+"""
+Move the progress notes embedded in health_plans documents into the
+plan_events time-series collection and drop the embedded array.
+
+Notes written as "[YYYY-MM-DD HH:MM] text" keep their time; other notes
+take the plan's created_at (or the time in its _id). "[PAUSE...]" notes become pause events.
+Each event gets an _id derived from its plan, position and text, and
+only events not already in plan_events are inserted before the plan's
+array is removed. An interrupted run can therefore be re-run: plans
+already moved have no progress_notes left, and a plan whose events were
+written but whose array was not removed gets no duplicates.
+
+    python -m backend.migrations.move_progress_notes [--dry-run]
+"""
+import argparse
+import asyncio
+import hashlib
+import logging
+import re
+from datetime import datetime, timezone
+from typing import List
+
+from beanie import init_beanie
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from backend.config.main import MONGO_URI
+from backend.constants.enums import PlanEventKind
+from backend.models.HealthPlan import HealthPlan
+from backend.models.PlanEvent import PlanEvent
+from backend.utils.plan_events import record_plan_events
+
+logger = logging.getLogger(__name__)
+
+_NOTE_TIME_RE = re.compile(r"^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2})\]\s*")
+
+
+def note_event_id(plan_id: ObjectId, position: int, note: str, timestamp: datetime) -> ObjectId:
+    """
+    The same _id for the same note on every run: the event time in the leading
+    bytes (as ObjectIds have), then a hash of the plan, note position and text
+    """
+    seconds = int(timestamp.replace(tzinfo=timestamp.tzinfo or timezone.utc).timestamp())
+    digest = hashlib.sha256(f"{plan_id}:{position}:{note}".encode()).digest()
+    return ObjectId(seconds.to_bytes(4, "big") + digest[:8])
+
+
+def note_event(plan: dict, note: str, position: int = 0) -> PlanEvent:
+    match = _NOTE_TIME_RE.match(note)
+    timestamp = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M") if match else plan.get("created_at")
+    # Falls back to when the plan's _id was generated so reruns give the same time (and _id)
+    timestamp = timestamp or plan["_id"].generation_time.replace(tzinfo=None)
+    text = note[match.end():] if match else note
+    kind = PlanEventKind.PAUSE if text.startswith("[PAUSE") else PlanEventKind.PROGRESS
+    return PlanEvent(
+        id=note_event_id(plan["_id"], position, note, timestamp),
+        plan_id=plan["_id"], timestamp=timestamp, kind=kind, text=text,
+    )
+
+
+async def missing_events(plan_id: ObjectId, events: List[PlanEvent]) -> List[PlanEvent]:
+    """The events not yet in plan_events (time-series collections do not enforce unique _ids)"""
+    existing = await PlanEvent.get_motor_collection().distinct(
+        "_id", {"plan_id": plan_id, "_id": {"$in": [event.id for event in events]}}
+    )
+    existing = set(existing)
+    return [event for event in events if event.id not in existing]
+
+
+async def migrate(dry_run: bool = False) -> int:
+    database = AsyncIOMotorClient(MONGO_URI)["wellness-agent-service"]
+    await init_beanie(database=database, document_models=[HealthPlan, PlanEvent])
+    plans = HealthPlan.get_motor_collection()
+
+    moved = 0
+    query = {"progress_notes.0": {"$exists": True}}
+    async for plan in plans.find(query, {"progress_notes": 1, "created_at": 1}):
+        events = [note_event(plan, str(note), position) for position, note in enumerate(plan["progress_notes"])]
+        if not dry_run:
+            await record_plan_events(await missing_events(plan["_id"], events))
+            await plans.update_one({"_id": plan["_id"]}, {"$unset": {"progress_notes": ""}})
+        moved += len(events)
+        logger.info(f"Plan {plan['_id']}: {len(events)} notes {'to move' if dry_run else 'moved'}")
+    return moved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    moved = asyncio.run(migrate(args.dry_run))
+    logger.info(f"{moved} progress notes {'to move' if args.dry_run else 'moved'} to plan_events")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Remove the _id and revision_id keys that nested workouts, exercises,
+meals, meal days and plan weeks carried while they were Beanie
+Documents. The embedded models ignore these keys, so the migration only
+reclaims space and can run at any time; re-running it is harmless.
+
+Plans are rewritten in batches with one $set of the cleaned plan arrays
+per plan, filtered on plan_version so a plan changed meanwhile is left
+for the next run.
+
+    python -m backend.migrations.strip_embedded_ids [--batch-size 100] [--dry-run]
+"""
+import argparse
+import asyncio
+import logging
+from typing import Any
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+from backend.config.main import MONGO_URI
+from backend.models.HealthPlan import HealthPlan
+
+logger = logging.getLogger(__name__)
+
+PLAN_FIELDS = ("workout_plan", "meal_plan", "weekly_plans")
+DOCUMENT_KEYS = ("_id", "revision_id")
+
+
+def strip_document_keys(value: Any) -> Any:
+    if isinstance(value, list):
+        return [strip_document_keys(item) for item in value]
+    if isinstance(value, dict):
+        return {key: strip_document_keys(item) for key, item in value.items() if key not in DOCUMENT_KEYS}
+    return value
+
+
+async def migrate(batch_size: int = 100, dry_run: bool = False) -> int:
+    database = AsyncIOMotorClient(MONGO_URI)["wellness-agent-service"]
+    await init_beanie(database=database, document_models=[HealthPlan])
+    plans = HealthPlan.get_motor_collection()
+
+    projection = {field: 1 for field in PLAN_FIELDS}
+    projection["plan_version"] = 1
+    updated = 0
+    batch = []
+    async for plan in plans.find({}, projection):
+        cleaned = {field: strip_document_keys(plan[field]) for field in PLAN_FIELDS if field in plan}
+        if all(cleaned[field] == plan[field] for field in cleaned):
+            continue
+        batch.append(UpdateOne(
+            {"_id": plan["_id"], "plan_version": plan.get("plan_version", {"$exists": False})},
+            {"$set": cleaned},
+        ))
+        if len(batch) >= batch_size:
+            updated += await _flush(plans, batch, dry_run)
+            batch = []
+    updated += await _flush(plans, batch, dry_run)
+    return updated
+
+
+async def _flush(plans, batch: list, dry_run: bool) -> int:
+    if not batch:
+        return 0
+    if dry_run:
+        return len(batch)
+    result = await plans.bulk_write(batch, ordered=False)
+    logger.info(f"Cleaned {result.modified_count} of {len(batch)} plans in this batch")
+    return result.modified_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    updated = asyncio.run(migrate(args.batch_size, args.dry_run))
+    logger.info(f"{updated} plans {'to clean' if args.dry_run else 'cleaned'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,21 @@
 from beanie import Document, PydanticObjectId
 from datetime import datetime, timezone
-from pydantic import Field, validator
+from pydantic import BaseModel, ConfigDict, Field, validator
 from typing import Optional, List, Dict, Any
 from backend.constants.enums import (
     HealthPlanStatus, ActivityLevel, Goal, DietaryRestriction, 
     WorkoutType, IntensityLevel, MealType
 )
 
-class Exercise(Document):
+class EmbeddedModel(BaseModel):
+    """
+    Base for data nested inside a HealthPlan document: plain pydantic, no
+    _id or revision bookkeeping. Keys the model does not define (such as
+    the _id/revision_id older plans stored on every nested item) are dropped.
+    """
+    model_config = ConfigDict(extra="ignore", revalidate_instances="never")
+
+class Exercise(EmbeddedModel):
     """Individual exercise within a workout"""
     name: str
     type: WorkoutType
@@ -19,20 +27,20 @@ class Exercise(Document):
     modifications: str = "" 
     safety_notes: str = ""
     
-class Workout(Document):
+class Workout(EmbeddedModel):
     """Daily workout plan"""
     day: int = Field(ge=1, le=7) 
     workout_name: str
-    total_duration_minutes: int = Field(ge=10, le=120) 
+    total_duration_minutes: int = Field(ge=0, le=120)  # 0 on rest days
     warm_up: str
     exercises: List[Exercise] = []
     cool_down: str
-    intensity_level: IntensityLevel=None
+    intensity_level: Optional[IntensityLevel] = None  # None on rest days
     estimated_calories_burned: int = Field(ge=0, le=1000)
     rest_day: bool = False
     notes: str = ""
 
-class Meal(Document):
+class Meal(EmbeddedModel):
     """Individual meal or snack"""
     name: str
     meal_type: MealType
@@ -40,13 +48,13 @@ class Meal(Document):
     instructions: str
     prep_time_minutes: int = Field(ge=0, le=120)
     servings: int = Field(ge=1, le=8)
-    estimated_calories: int = Field(ge=50, le=800)  
+    estimated_calories: int = Field(ge=50, le=1500)
     macronutrients: Dict[str, Any] = {}  
     dietary_tags: List[DietaryRestriction] = []
     allergen_warnings: List[str] = []
     nutrition_notes: str = ""
 
-class DailyMealPlan(Document):
+class DailyMealPlan(EmbeddedModel):
     """Daily meal planning"""
     day: int = Field(ge=1, le=7)  
     meals: List[Meal] = []
@@ -55,6 +63,15 @@ class DailyMealPlan(Document):
     nutrition_summary: Dict[str, Any] = {}
     special_notes: str = ""
 
+class PlanWeek(EmbeddedModel):
+    """A later week derived from week 1 by the progression engine"""
+    week: int = Field(ge=2, le=12)
+    phase: str = "build"
+    volume_factor: float = Field(1.0, ge=0.5, le=1.5)
+    workout_plan: List[Workout] = []
+    meal_plan: List[DailyMealPlan] = []
+    safety_warnings: List[str] = []
+
 class HealthPlan(Document):
     """Main health plan document"""
     user_id: PydanticObjectId  
@@ -73,11 +90,13 @@ class HealthPlan(Document):
     # Generated Plans
     workout_plan: List[Workout] = []
     meal_plan: List[DailyMealPlan] = []
+    weekly_plans: List[PlanWeek] = []
+    # Bumped by every applied modification patch
+    plan_version: int = Field(1, ge=1)
     
     # Tracking Data
     plan_duration_weeks: int = Field(ge=1, le=12)  
     current_week: int = Field(ge=1, le=12)
-    progress_notes: List[str] = []
     
     # Safety and Compliance
     health_disclaimer_acknowledged: bool = False
@@ -132,4 +151,50 @@ class HealthPlan(Document):
             "status",
             "created_at",
             "primary_goal"
-        ]
\ No newline at end of file
+        ]
+
+# Read models: projections of a HealthPlan for endpoints that need only part of it
+
+class HealthPlanSummaryView(BaseModel):
+    """Plan overview, without the plans"""
+    id: PydanticObjectId = Field(alias="_id")
+    plan_name: str
+    status: HealthPlanStatus
+    current_week: int
+    plan_duration_weeks: int
+    created_at: datetime
+    last_accessed_at: Optional[datetime] = None
+
+class HealthPlanStatusView(BaseModel):
+    """Status and week counters, for the progress and pause endpoints"""
+    id: PydanticObjectId = Field(alias="_id")
+    status: HealthPlanStatus
+    current_week: int
+    plan_duration_weeks: int
+
+class HealthPlanChatContextView(BaseModel):
+    """Profile and safety fields plan chat answers from"""
+    id: PydanticObjectId = Field(alias="_id")
+    user_id: PydanticObjectId
+    plan_name: str
+    status: HealthPlanStatus
+    age: Optional[int] = None
+    current_activity_level: ActivityLevel
+    primary_goal: Goal
+    dietary_restrictions: List[DietaryRestriction] = []
+    health_conditions: List[str] = []
+    preferred_workout_types: List[WorkoutType] = []
+    available_equipment: List[str] = []
+    time_availability_minutes: int
+    plan_duration_weeks: int
+    current_week: int
+    health_disclaimer_acknowledged: bool = False
+    medical_clearance: bool = False
+
+class HealthPlanContentView(BaseModel):
+    """The generated plans, read only when a chat message changes them"""
+    id: PydanticObjectId = Field(alias="_id")
+    workout_plan: List[Workout] = []
+    meal_plan: List[DailyMealPlan] = []
+    weekly_plans: List[PlanWeek] = []
+    plan_version: int = 1
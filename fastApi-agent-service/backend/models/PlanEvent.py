@@ -0,0 +1,31 @@
+from beanie import Document, PydanticObjectId, TimeSeriesConfig, Granularity
+from datetime import datetime
+from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from typing import Optional
+from backend.constants.enums import PlanEventKind
+
+class PlanEvent(Document):
+    """
+    One progress note, pause note or chat message for a plan.
+    Stored in a time-series collection (MongoDB buckets events by plan_id
+    and time), so plan documents no longer grow with their history.
+    """
+    plan_id: PydanticObjectId
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    kind: PlanEventKind
+    text: str
+    role: Optional[str] = None  # "user" or "assistant" for chat messages
+    current_week: Optional[int] = None
+
+    class Settings:
+        name = "plan_events"
+        timeseries = TimeSeriesConfig(
+            time_field="timestamp",
+            meta_field="plan_id",
+            granularity=Granularity.minutes,
+        )
+        indexes = [
+            IndexModel([("plan_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("plan_id", ASCENDING), ("kind", ASCENDING), ("timestamp", DESCENDING)]),
+        ]
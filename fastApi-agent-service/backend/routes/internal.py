@@ -3,6 +3,7 @@ from backend.validations import internal as internal_validations
 from backend.controller import internal as internal_controller
 from backend.middleware.verify_signature import verify_signature, validate_health_plan_request
 from backend.services.user import log_health_data_access
+from backend.utils.health_safety import screen_text
 import logging
 
 logger = logging.getLogger(__name__)
@@ -71,6 +72,41 @@ async def create_health_plan(
             }
         )
 
+@router.post("/create-health-plan/stream")
+async def stream_health_plan(
+    request: Request,
+    health_plan_data: internal_validations.CreateHealthPlan, 
+    signature_verified: dict = Depends(verify_signature)
+):
+    """
+    Create a health plan and stream it as Server-Sent Events
+    
+    Same safety validation as /create-health-plan, but each workout and meal
+    day is sent as soon as it is generated and checked, followed by a final
+    complete event with the full plan payload.
+    """
+    health_validation = validate_health_plan_request(health_plan_data.dict())
+    
+    if not health_validation["is_valid"]:
+        logger.warning(f"Health plan validation failed: {health_validation['errors']}")
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "Health plan request failed safety validation",
+                "errors": health_validation["errors"],
+                "warnings": health_validation.get("warnings", []),
+                "professional_consultation_recommended": True
+            }
+        )
+    
+    log_health_data_access(
+        user_id=str(health_plan_data.user_id),
+        access_type="create_health_plan",
+        data_accessed="full_health_profile"
+    )
+    
+    return await internal_controller.stream_health_plan(health_plan_data)
+
 @router.post("/update-health-plan-progress/{plan_id}")
 async def update_health_plan_progress(
     request: Request,
@@ -276,15 +312,8 @@ async def validate_health_plan_modifications(
         }
         
        
-        unsafe_patterns = [
-            "extreme", "maximum", "no rest", "ignore pain", "push through",
-            "crash diet", "very low calorie", "intense daily", "no breaks"
-        ]
-        
         for change_type, change_details in proposed_changes.items():
-            change_text = str(change_details).lower()
-            
-            if any(pattern in change_text for pattern in unsafe_patterns):
+            if screen_text(str(change_details), "unsafe_modification"):
                 validation_result["rejected_changes"].append({
                     "change_type": change_type,
                     "reason": "Modification contains potentially unsafe patterns",
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from backend.validations import user as user_validations
 from backend.controller import user as user_controller
 from backend.security.jsonwebtoken import get_current_user_health_access, TokenData
 from backend.services.user import log_health_data_access, validate_user_permissions
-from backend.constants.enums import HEALTH_DISCLAIMER, EXERCISE_DISCLAIMER, NUTRITION_DISCLAIMER
+from backend.utils.disclaimers import disclaimer_texts, disclaimer_refs, disclaimer_catalog
+from backend.utils.static_responses import StaticResponse
+from backend.utils.health_safety import screen_text
 import logging
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -49,10 +52,7 @@ async def chat_health_plan(
         
         
         if isinstance(result.body, dict) and result.body.get("success"):
-            result.body["disclaimers"] = [
-                HEALTH_DISCLAIMER,
-                "This AI assistant provides general wellness information only and cannot replace professional medical advice."
-            ]
+            result.body["disclaimers"] = disclaimer_texts(["general_health", "chat_assistant"])
         
         logger.info(f"Health plan chat processed for user {current_user.userId}, plan {plan_id}")
         return result
@@ -77,13 +77,16 @@ async def chat_health_plan(
 async def get_health_plan_messages(
     request: Request,
     plan_id: str,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
     current_user: TokenData = Depends(get_current_user_health_access)
 ):
     """
     Retrieve health plan conversation history with privacy protection
     
     Returns sanitized conversation history ensuring user privacy
-    and appropriate health data handling.
+    and appropriate health data handling. Results are paginated newest
+    first; pass the returned next_cursor as cursor for the next page.
     """
     try:
         
@@ -105,7 +108,7 @@ async def get_health_plan_messages(
             data_accessed=f"health_plan_messages_{plan_id}"
         )
         
-        result = await user_controller.get_health_plan_messages(plan_id)
+        result = await user_controller.get_health_plan_messages(plan_id, cursor=cursor, limit=limit)
         
         logger.info(f"Health plan messages retrieved for user {current_user.userId}, plan {plan_id}")
         return result
@@ -267,15 +270,13 @@ async def resume_health_plan(
                 "Monitor your energy levels and recovery",
                 "Consult healthcare providers for any concerns"
             ],
-            "disclaimers": [HEALTH_DISCLAIMER, EXERCISE_DISCLAIMER, NUTRITION_DISCLAIMER]
+            "disclaimers": disclaimer_texts(["general_health", "exercise_safety", "nutrition_guidance"]),
+            "disclaimer_refs": disclaimer_refs(["general_health", "exercise_safety", "nutrition_guidance"])
         }
         
         
         if resume_data.health_status_update:
-            health_update = resume_data.health_status_update.lower()
-            medical_keywords = ["medication", "surgery", "injury", "diagnosis", "doctor", "medical"]
-            
-            if any(keyword in health_update for keyword in medical_keywords):
+            if screen_text(resume_data.health_status_update, "resume_medical_change"):
                 result["medical_review_recommended"] = True
                 result["message"] = "Health plan resumed with medical review recommended"
                 result["safety_reminders"].append("Consider medical consultation given recent health changes")
@@ -345,10 +346,7 @@ async def submit_health_plan_feedback(
         
         
         if feedback_data.feedback_text:
-            safety_keywords = ["too hard", "painful", "injury", "dangerous", "unsafe"]
-            feedback_lower = feedback_data.feedback_text.lower()
-            
-            if any(keyword in feedback_lower for keyword in safety_keywords):
+            if screen_text(feedback_data.feedback_text, "feedback_safety"):
                 feedback_response["follow_up_recommendations"].append(
                     "Your feedback mentions potential safety concerns. Please consult with healthcare professionals."
                 )
@@ -472,48 +470,37 @@ async def set_emergency_contact(
             detail="Error saving emergency contact information"
         )
 
+def health_disclaimer_content():
+    return {
+        "success": True,
+        **disclaimer_catalog(),
+        "emergency_resources": {
+            "emergency_services": "911 (US)",
+            "poison_control": "1-800-222-1222 (US)",
+            "crisis_text_line": "Text HOME to 741741",
+            "suicide_prevention": "988 (US)"
+        },
+        "professional_resources": {
+            "find_doctor": "https://www.ama-assn.org/go/freida",
+            "find_dietitian": "https://www.eatright.org/find-a-nutrition-expert",
+            "find_fitness_professional": "https://www.acsm.org/get-stay-certified/find-a-certified-professional"
+        }
+    }
+
+HEALTH_DISCLAIMER_RESPONSE = StaticResponse("health_disclaimer", health_disclaimer_content)
+
 @router.get("/health-disclaimer")
-async def get_health_disclaimer():
+async def get_health_disclaimer(request: Request):
     """
     Retrieve comprehensive health disclaimers and safety information
     
     Provides users with important health and safety information
     required for informed consent and safe use of health services.
+    Serves the versioned disclaimer catalog that plan responses reference
+    by id, with a strong ETag so clients revalidate instead of refetching.
     """
     try:
-        disclaimer_response = {
-            "success": True,
-            "disclaimers": {
-                "general_health": HEALTH_DISCLAIMER,
-                "exercise_safety": EXERCISE_DISCLAIMER,
-                "nutrition_guidance": NUTRITION_DISCLAIMER,
-                "ai_limitations": """
-                    AI-generated health recommendations are based on general wellness principles 
-                    and cannot account for individual medical complexities. Always consult with 
-                    qualified healthcare professionals for personalized medical advice, diagnosis, 
-                    or treatment recommendations.
-                """,
-                "emergency_situations": """
-                    If you experience chest pain, severe shortness of breath, dizziness, 
-                    fainting, or other emergency symptoms, seek immediate medical attention. 
-                    Do not rely on AI recommendations for emergency medical situations.
-                """
-            },
-            "emergency_resources": {
-                "emergency_services": "911 (US)",
-                "poison_control": "1-800-222-1222 (US)",
-                "crisis_text_line": "Text HOME to 741741",
-                "suicide_prevention": "988 (US)"
-            },
-            "professional_resources": {
-                "find_doctor": "https://www.ama-assn.org/go/freida",
-                "find_dietitian": "https://www.eatright.org/find-a-nutrition-expert",
-                "find_fitness_professional": "https://www.acsm.org/get-stay-certified/find-a-certified-professional"
-            }
-        }
-        
-        logger.info("Health disclaimers retrieved")
-        return disclaimer_response
+        return HEALTH_DISCLAIMER_RESPONSE.render(request)
         
     except Exception as e:
         logger.error(f"Error retrieving health disclaimers: {str(e)}")
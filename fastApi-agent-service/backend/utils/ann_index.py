@@ -0,0 +1,314 @@
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.constants.enums import DietaryRestriction, IntensityLevel, MealType, WorkoutType
+from backend.utils.embeddings import get_batch_embeddings, to_normalized_matrix
+
+logger = logging.getLogger(__name__)
+
+# Every filterable enum value gets one bit of a per-item uint64 mask
+# (17 workout types + 4 intensities + 6 meal types + 19 restrictions = 46 bits)
+FILTER_FIELDS = {
+    "workout_type": WorkoutType,
+    "intensity": IntensityLevel,
+    "meal_type": MealType,
+    "dietary_tags": DietaryRestriction,
+}
+_BITS: Dict[Tuple[str, str], np.uint64] = {}
+for _field, _enum in FILTER_FIELDS.items():
+    for _member in _enum:
+        _BITS[(_field, _member.value)] = np.uint64(1 << len(_BITS))
+
+
+def _enum_value(value: Any) -> str:
+    return value.value if hasattr(value, "value") else str(value)
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return list(value)
+    return [value]
+
+
+def filter_mask(field: str, values: Any) -> np.uint64:
+    """Bit mask for enum values of one filter field; unknown values are ignored"""
+    mask = np.uint64(0)
+    for value in _as_list(values):
+        mask |= _BITS.get((field, _enum_value(value)), np.uint64(0))
+    return mask
+
+
+def item_mask(metadata: Dict[str, Any]) -> np.uint64:
+    """Bit mask describing one catalog item from its metadata"""
+    mask = np.uint64(0)
+    for field in FILTER_FIELDS:
+        mask |= filter_mask(field, metadata.get(field))
+    return mask
+
+
+def _kmeans(vectors: np.ndarray, clusters: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Spherical k-means on normalized rows; returns normalized centroids"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        counts = np.bincount(assignment, minlength=clusters)
+        empty = counts == 0
+        # Re-seed empty clusters with random points
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = to_normalized_matrix(sums)
+    return centroids
+
+
+class IVFIndex:
+    """
+    In-process inverted-file (IVF) index for cosine similarity over catalog embeddings.
+
+    Vectors are normalized and assigned to the nearest of `nlist` k-means
+    centroids; a search scans only the `nprobe` closest lists. Below
+    `min_train_size` items (or before the first train) search is exact.
+    Inserts are incremental: new items join their nearest existing list,
+    and the centroids are retrained once the index has grown
+    `retrain_growth` times past the size it was trained on.
+
+    Filters take WorkoutType / IntensityLevel / MealType values (match any)
+    and DietaryRestriction values (item must carry all of them).
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        min_train_size: int = 256,
+        retrain_growth: float = 4.0,
+    ):
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.retrain_growth = retrain_growth
+
+        self._lock = threading.RLock()
+        self._size = 0
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._masks = np.zeros(0, dtype=np.uint64)
+        self._assignment = np.zeros(0, dtype=np.int32)
+        self._ids: List[str] = []
+        self._metadata: List[Dict[str, Any]] = []
+        self._positions: Dict[str, int] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    # -- building -------------------------------------------------------------
+
+    def add(self, ids: Sequence[str], embeddings: Any, metadata: Optional[Sequence[Dict[str, Any]]] = None) -> int:
+        """
+        Insert items; ids already in the index are replaced.
+        Returns the number of new items.
+        """
+        vectors = to_normalized_matrix(embeddings)
+        metadata = list(metadata) if metadata is not None else [{} for _ in ids]
+        if vectors.shape[0] != len(ids) or len(metadata) != len(ids):
+            raise ValueError("ids, embeddings and metadata must have the same length")
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match index ({self.dim})")
+
+        with self._lock:
+            added = 0
+            rows = []
+            for item_id, vector, meta in zip(ids, vectors, metadata):
+                position = self._positions.get(item_id)
+                if position is None:
+                    position = self._append_row()
+                    self._positions[item_id] = position
+                    self._ids.append(item_id)
+                    self._metadata.append(meta)
+                    added += 1
+                else:
+                    self._metadata[position] = meta
+                self._vectors[position] = vector
+                self._masks[position] = item_mask(meta)
+                rows.append(position)
+
+            if self._centroids is None or self._size >= self._trained_size * self.retrain_growth:
+                self._train()
+            else:
+                self._assign(np.asarray(rows, dtype=np.int64))
+            return added
+
+    def add_texts(self, ids: Sequence[str], texts: Sequence[str], metadata: Optional[Sequence[Dict[str, Any]]] = None) -> int:
+        """Embed catalog texts with the shared embedding model and insert them"""
+        return self.add(ids, get_batch_embeddings(list(texts)), metadata)
+
+    def _append_row(self) -> int:
+        if self._size == len(self._vectors):
+            capacity = max(64, len(self._vectors) * 2)
+            self._vectors = np.resize(self._vectors, (capacity, self.dim))
+            self._masks = np.resize(self._masks, capacity)
+            self._assignment = np.resize(self._assignment, capacity)
+        self._size += 1
+        return self._size - 1
+
+    def _train(self) -> None:
+        if self._size < self.min_train_size:
+            self._centroids = None
+            self._lists = []
+            self._trained_size = 0
+            return
+        nlist = self.nlist or max(1, int(np.sqrt(self._size)))
+        self._centroids = _kmeans(self._vectors[:self._size], min(nlist, self._size))
+        self._trained_size = self._size
+        self._assignment[:self._size] = np.argmax(self._vectors[:self._size] @ self._centroids.T, axis=1)
+        self._rebuild_lists()
+        logger.info(f"IVF index trained: {self._size} items, {len(self._centroids)} lists")
+
+    def _assign(self, rows: np.ndarray) -> None:
+        if self._centroids is None or not len(rows):
+            return
+        self._assignment[rows] = np.argmax(self._vectors[rows] @ self._centroids.T, axis=1)
+        self._rebuild_lists()
+
+    def _rebuild_lists(self) -> None:
+        assignment = self._assignment[:self._size]
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(len(self._centroids) + 1))
+        self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self._centroids))]
+
+    # -- search ---------------------------------------------------------------
+
+    def search(
+        self,
+        query: Any,
+        k: int = 10,
+        workout_types: Any = None,
+        intensities: Any = None,
+        meal_types: Any = None,
+        dietary_tags: Any = None,
+        nprobe: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Top-k items for one query embedding, best first.
+        Each result is {"id", "score", "metadata"}.
+        """
+        query = to_normalized_matrix(query)[0]
+        with self._lock:
+            if not self._size:
+                return []
+            if self._centroids is None:
+                candidates = np.arange(self._size)
+            else:
+                probe = min(nprobe or self.nprobe, len(self._centroids))
+                nearest = np.argpartition(-(self._centroids @ query), probe - 1)[:probe]
+                candidates = np.concatenate([self._lists[i] for i in nearest])
+
+            candidates = self._filter(candidates, workout_types, intensities, meal_types, dietary_tags)
+            if not len(candidates):
+                return []
+            scores = self._vectors[candidates] @ query
+            k = min(k, len(candidates))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                {"id": self._ids[candidates[i]], "score": float(scores[i]), "metadata": self._metadata[candidates[i]]}
+                for i in top
+            ]
+
+    def _filter(self, candidates: np.ndarray, workout_types, intensities, meal_types, dietary_tags) -> np.ndarray:
+        masks = self._masks[candidates]
+        keep = np.ones(len(candidates), dtype=bool)
+        for field, values in (("workout_type", workout_types), ("intensity", intensities), ("meal_type", meal_types)):
+            if values:
+                keep &= (masks & filter_mask(field, values)) != 0
+        if dietary_tags:
+            required = filter_mask("dietary_tags", dietary_tags)
+            keep &= (masks & required) == required
+        return candidates[keep]
+
+    # -- persistence ----------------------------------------------------------
+
+    def save(self, directory: str) -> None:
+        """Write the index to directory (arrays as .npz, ids and metadata as JSON)"""
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+            arrays = {
+                "vectors": self._vectors[:self._size],
+                "masks": self._masks[:self._size],
+                "assignment": self._assignment[:self._size],
+            }
+            if self._centroids is not None:
+                arrays["centroids"] = self._centroids
+            temporary = os.path.join(directory, "index.tmp.npz")
+            np.savez(temporary, **arrays)
+            os.replace(temporary, os.path.join(directory, "index.npz"))
+
+            state = {
+                "dim": self.dim,
+                "nlist": self.nlist,
+                "nprobe": self.nprobe,
+                "min_train_size": self.min_train_size,
+                "retrain_growth": self.retrain_growth,
+                "trained_size": self._trained_size,
+                "ids": self._ids,
+                "metadata": self._metadata,
+            }
+            temporary = os.path.join(directory, "items.json.tmp")
+            with open(temporary, "w", encoding="utf-8") as items_file:
+                json.dump(state, items_file, default=_enum_value)
+            os.replace(temporary, os.path.join(directory, "items.json"))
+
+    @classmethod
+    def load(cls, directory: str) -> "IVFIndex":
+        with open(os.path.join(directory, "items.json"), encoding="utf-8") as items_file:
+            state = json.load(items_file)
+        index = cls(
+            state["dim"],
+            nlist=state["nlist"],
+            nprobe=state["nprobe"],
+            min_train_size=state["min_train_size"],
+            retrain_growth=state["retrain_growth"],
+        )
+        with np.load(os.path.join(directory, "index.npz")) as arrays:
+            index._vectors = np.ascontiguousarray(arrays["vectors"], dtype=np.float32)
+            index._masks = arrays["masks"].astype(np.uint64)
+            index._assignment = arrays["assignment"].astype(np.int32)
+            index._centroids = arrays["centroids"] if "centroids" in arrays.files else None
+        index._size = len(state["ids"])
+        index._ids = state["ids"]
+        index._metadata = state["metadata"]
+        index._positions = {item_id: position for position, item_id in enumerate(index._ids)}
+        index._trained_size = state["trained_size"]
+        if index._centroids is not None:
+            index._rebuild_lists()
+        return index
+
+
+def build_index(items: Iterable[Dict[str, Any]], text_key: str = "text", dim: Optional[int] = None, **options) -> IVFIndex:
+    """
+    Build an index from catalog items shaped like {"id", text_key, ...filter fields}.
+    Everything except id and text is kept as metadata.
+    """
+    items = list(items)
+    if not items:
+        raise ValueError("Cannot build an index without items")
+    embeddings = get_batch_embeddings([item[text_key] for item in items])
+    index = IVFIndex(dim or len(embeddings[0]), **options)
+    index.add(
+        [item["id"] for item in items],
+        embeddings,
+        [{key: value for key, value in item.items() if key not in ("id", text_key)} for item in items],
+    )
+    return index
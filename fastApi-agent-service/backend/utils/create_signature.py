@@ -4,17 +4,18 @@ import hashlib
 from datetime import datetime
 
 from backend.config import main as config
+from backend.utils.json_codec import canonical_json
 
 
 def create_hmac_signature(body: dict = {}, query: dict = {}, mode: str = "body"):
     timestamp = int(datetime.timestamp(datetime.utcnow()) * 1000)
 
     if mode == "body":
-        message = json.dumps(body, separators=(",", ":")) + str(timestamp)
+        message = canonical_json(body) + str(timestamp)
     elif mode == "query":
-        message = json.dumps(query, separators=(",", ":")) + str(timestamp)
+        message = canonical_json(query) + str(timestamp)
     elif mode == "both":
-        message = json.dumps(query, separators=(",", ":")) + json.dumps(body) + str(timestamp)
+        message = canonical_json(query) + json.dumps(body) + str(timestamp)
     else:
         raise ValueError("Invalid mode for signature creation")
     
@@ -0,0 +1,159 @@
+import bisect
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Tuple
+
+from backend.constants.dietary_lexicon import (
+    COMPOUND_EXCEPTIONS,
+    COMPOUND_TERMS,
+    DIETARY_SAFE_PHRASES,
+    DIETARY_VIOLATIONS,
+)
+from backend.utils.keyword_matcher import KeywordMatcher, normalize_keyword
+
+SAFE_PREFIX = "safe:"
+COMPOUND_EXCEPTION = "compound_exception"
+# A safe phrase clears violations only within its own part of an ingredient line
+_SEGMENT_RE = re.compile(r"[,;()+]|\b(?:and|with|or)\b")
+
+
+def _plural_forms(term: str) -> List[str]:
+    """The term plus plural spellings of its last word"""
+    forms = [term, term + "s", term + "es"]
+    if term.endswith("y") and term[-2:-1] not in ("a", "e", "i", "o", "u"):
+        forms.append(term[:-1] + "ies")
+    return forms
+
+
+def _build_matcher() -> KeywordMatcher:
+    lexicon: Dict[str, List[str]] = {}
+    for restriction, terms in DIETARY_VIOLATIONS.items():
+        lexicon[restriction] = [form for term in terms for form in _plural_forms(term)]
+    for restriction, phrases in DIETARY_SAFE_PHRASES.items():
+        lexicon[SAFE_PREFIX + restriction] = [form for phrase in phrases for form in _plural_forms(phrase)]
+    lexicon[COMPOUND_EXCEPTION] = [form for word in COMPOUND_EXCEPTIONS for form in _plural_forms(word)]
+    return KeywordMatcher(lexicon, whole_words=True, anywhere=COMPOUND_FORMS)
+
+
+COMPOUND_FORMS = frozenset(normalize_keyword(form) for term in COMPOUND_TERMS for form in _plural_forms(term))
+DIETARY_MATCHER = _build_matcher()
+
+
+def _restriction_value(restriction: Any) -> str:
+    return restriction.value if hasattr(restriction, "value") else str(restriction)
+
+
+def _inside_other_word(
+    restriction: str,
+    offset: int,
+    keyword: str,
+    hits: Dict[Tuple[str, int], Tuple[int, str]],
+    exceptions: List[Tuple[int, int]],
+) -> bool:
+    """
+    Whether a compound term hit adds nothing: it sits inside an exception word
+    ("nut" in "nutmeg") or inside a longer term of the same restriction ("nut" in "walnuts").
+    """
+    end = offset + len(keyword)
+    if any(start <= offset and end <= stop for start, stop in exceptions):
+        return True
+    return any(
+        other_restriction == restriction and other_offset < offset and end <= other_offset + len(other_keyword)
+        for (other_restriction, other_offset), (_, other_keyword) in hits.items()
+    )
+
+
+@lru_cache(maxsize=8192)
+def ingredient_violations(ingredient: str) -> Dict[str, Tuple[str, ...]]:
+    """
+    Restrictions an ingredient line breaks, with the terms that break them.
+    Checks every restriction in one scan of the line.
+    """
+    text = ingredient.lower()
+    segment_starts = [0] + [match.end() for match in _SEGMENT_RE.finditer(text)]
+
+    # Longest term per (restriction, offset): "soy sauce" rather than also "soy"
+    hits: Dict[Tuple[str, int], Tuple[int, str]] = {}
+    cleared = set()
+    exceptions: List[Tuple[int, int]] = []
+    for offset, keyword in DIETARY_MATCHER.locate(text):
+        segment = bisect.bisect_right(segment_starts, offset) - 1
+        for category in DIETARY_MATCHER.keyword_categories(keyword):
+            if category == COMPOUND_EXCEPTION:
+                exceptions.append((offset, offset + len(keyword)))
+            elif category.startswith(SAFE_PREFIX):
+                cleared.add((segment, category[len(SAFE_PREFIX):]))
+            elif len(keyword) > len(hits.get((category, offset), (0, ""))[1]):
+                hits[(category, offset)] = (segment, keyword)
+
+    result: Dict[str, Tuple[str, ...]] = {}
+    for (restriction, offset), (segment, keyword) in sorted(hits.items(), key=lambda hit: hit[0][1]):
+        if keyword in COMPOUND_FORMS and _inside_other_word(restriction, offset, keyword, hits, exceptions):
+            continue
+        if (segment, restriction) not in cleared and keyword not in result.get(restriction, ()):
+            result[restriction] = result.get(restriction, ()) + (keyword,)
+    return result
+
+
+def build_ingredient_index(meal_plan: List[Dict[str, Any]]) -> Dict[str, List[Tuple[int, int]]]:
+    """Unique normalized ingredient lines -> (day position, meal position) of every use"""
+    raw: Dict[str, List[Tuple[int, int]]] = {}
+    for day_position, day in enumerate(meal_plan):
+        for meal_position, meal in enumerate(day.get("meals", [])):
+            for ingredient in meal.get("ingredients", []):
+                raw.setdefault(str(ingredient), []).append((day_position, meal_position))
+    # Plans repeat the same lines, so each distinct spelling is normalized once
+    index: Dict[str, List[Tuple[int, int]]] = {}
+    for ingredient, uses in raw.items():
+        key = normalize_keyword(ingredient)
+        if key:
+            index.setdefault(key, []).extend(uses)
+    return index
+
+
+def check_meal_plan_compliance(meal_plan: List[Dict[str, Any]], restrictions: Iterable[Any]) -> Dict[str, Any]:
+    """
+    Check a meal plan against dietary restrictions.
+
+    Builds an index of the plan's unique ingredient lines, scans each line
+    once for every restriction, and reports violations per meal in plan
+    order as "Day N, Meal: Contains term (violates restriction)".
+    """
+    compliance_result = {
+        "is_compliant": True,
+        "violations": [],
+        "warnings": [],
+    }
+
+    requested = []
+    for restriction in restrictions or []:
+        value = _restriction_value(restriction)
+        if value not in DIETARY_VIOLATIONS:
+            compliance_result["warnings"].append(f"No compliance check available for dietary restriction '{value}'")
+        elif DIETARY_VIOLATIONS[value] and value not in requested:
+            requested.append(value)
+    if not requested:
+        return compliance_result
+
+    # (day position, meal position) -> ordered set of (restriction, term)
+    meal_violations: Dict[Tuple[int, int], Dict[Tuple[str, str], None]] = {}
+    for ingredient, uses in build_ingredient_index(meal_plan).items():
+        broken = ingredient_violations(ingredient)
+        pairs = dict.fromkeys((restriction, term) for restriction in requested for term in broken.get(restriction, ()))
+        if not pairs:
+            continue
+        for use in uses:
+            meal_violations.setdefault(use, {}).update(pairs)
+
+    order = {restriction: position for position, restriction in enumerate(requested)}
+    for day_position, meal_position in sorted(meal_violations):
+        day = meal_plan[day_position]
+        meal = day["meals"][meal_position]
+        pairs = sorted(meal_violations[(day_position, meal_position)], key=lambda pair: order[pair[0]])
+        for restriction, term in pairs:
+            compliance_result["violations"].append(
+                f"Day {day.get('day')}, {meal.get('name')}: Contains {term} (violates {restriction})"
+            )
+
+    compliance_result["is_compliant"] = not compliance_result["violations"]
+    return compliance_result
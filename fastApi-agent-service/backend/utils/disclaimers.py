@@ -0,0 +1,50 @@
+import hashlib
+from typing import Dict, Iterable, List
+
+from backend.constants.disclaimers import DISCLAIMERS, PUBLISHED_DISCLAIMERS
+from backend.utils.json_codec import canonical_json
+
+
+def add_disclaimers(state: dict, *disclaimer_ids: str) -> None:
+    """Attach disclaimers to agent state by id, once each, in the order they were first added"""
+    for disclaimer_id in disclaimer_ids:
+        if disclaimer_id not in DISCLAIMERS:
+            raise KeyError(f"Unknown disclaimer: {disclaimer_id}")
+        if disclaimer_id not in state["disclaimers"]:
+            state["disclaimers"].append(disclaimer_id)
+
+
+def disclaimer_texts(disclaimer_ids: Iterable[str]) -> List[str]:
+    """
+    The text of each disclaimer, once. Entries that are not registry ids
+    (free text from plans generated before the registry) pass through as-is.
+    """
+    texts = (DISCLAIMERS[item]["text"] if item in DISCLAIMERS else item for item in disclaimer_ids)
+    return list(dict.fromkeys(texts))
+
+
+def disclaimer_refs(disclaimer_ids: Iterable[str]) -> List[Dict]:
+    """{id, version} references for the registry entries among disclaimer_ids"""
+    return [
+        {"id": item, "version": DISCLAIMERS[item]["version"]}
+        for item in dict.fromkeys(disclaimer_ids) if item in DISCLAIMERS
+    ]
+
+
+def _catalog_version() -> str:
+    """Content hash of the whole registry: changes whenever any id, version or text does"""
+    return hashlib.sha256(canonical_json(DISCLAIMERS).encode()).hexdigest()[:16]
+
+
+CATALOG_VERSION = _catalog_version()
+
+
+def disclaimer_catalog() -> dict:
+    """The catalog served on /api/user/health-disclaimer"""
+    return {
+        "catalog_version": CATALOG_VERSION,
+        # id -> text for the general disclaimers, the shape clients have always read
+        "disclaimers": {item: DISCLAIMERS[item]["text"] for item in PUBLISHED_DISCLAIMERS},
+        # Every entry, so the refs attached to plans can be resolved
+        "catalog": DISCLAIMERS,
+    }
@@ -0,0 +1,151 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.config import main as config
+from backend.utils.embeddings import get_batch_embeddings, get_text_embedding, to_normalized_matrix, similarity_matrix
+from backend.utils.prompt_cache import estimate_tokens
+from backend.utils.token_budget import compact_document, split_document_units
+
+logger = logging.getLogger(__name__)
+
+# What the analyzer needs from a health document
+RISK_QUERIES = [
+    "Exercise safety risks: heart or cardiovascular conditions, blood pressure, chest pain, "
+    "breathing problems, injuries, joint or back problems, surgery, and medications that affect exercise",
+    "Nutrition risks: food allergies and intolerances, blood glucose and diabetes, cholesterol, "
+    "kidney or liver function, dietary restrictions, and medications that interact with food",
+]
+
+# Number of documents whose chunk embeddings are kept in memory
+_MAX_CACHED_DOCUMENTS = 64
+
+_lock = threading.Lock()
+_chunk_cache: "OrderedDict[str, Tuple[List[str], np.ndarray]]" = OrderedDict()
+_query_matrix: Optional[np.ndarray] = None
+
+
+def document_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_document(text: str, chunk_tokens: int, overlap_tokens: int) -> List[str]:
+    """
+    Split document text into chunks of about chunk_tokens, on sentence
+    boundaries, with trailing sentences repeated as overlap.
+    Irrelevant sections (billing, contact, ...) and repeated lines
+    such as page headers are dropped first.
+    """
+    chunks = []
+    current: List[str] = []
+    size = 0
+    seen = set()
+    for unit in split_document_units(text):
+        if unit.lower() in seen:
+            continue
+        seen.add(unit.lower())
+        unit_tokens = estimate_tokens(unit) + 1
+        if current and size + unit_tokens > chunk_tokens:
+            chunks.append(" ".join(current))
+            overlap: List[str] = []
+            overlap_size = 0
+            for previous in reversed(current):
+                previous_tokens = estimate_tokens(previous) + 1
+                if overlap_size + previous_tokens > overlap_tokens:
+                    break
+                overlap.insert(0, previous)
+                overlap_size += previous_tokens
+            current, size = overlap, overlap_size
+        current.append(unit)
+        size += unit_tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _get_query_matrix() -> np.ndarray:
+    global _query_matrix
+    if _query_matrix is None:
+        _query_matrix = to_normalized_matrix([get_text_embedding(query) for query in RISK_QUERIES])
+    return _query_matrix
+
+
+def _get_document_chunks(text: str) -> Tuple[List[str], np.ndarray]:
+    """Chunks and their normalized embedding matrix, cached by document content hash"""
+    key = document_hash(text)
+    with _lock:
+        if key in _chunk_cache:
+            _chunk_cache.move_to_end(key)
+            return _chunk_cache[key]
+
+    chunks = chunk_document(text, config.DOCUMENT_CHUNK_TOKENS, config.DOCUMENT_CHUNK_OVERLAP_TOKENS)
+    if chunks:
+        matrix = to_normalized_matrix(get_batch_embeddings(chunks))
+    else:
+        matrix = np.zeros((0, 0), dtype=np.float32)
+
+    with _lock:
+        _chunk_cache[key] = (chunks, matrix)
+        _chunk_cache.move_to_end(key)
+        while len(_chunk_cache) > _MAX_CACHED_DOCUMENTS:
+            _chunk_cache.popitem(last=False)
+    return chunks, matrix
+
+
+def retrieve_relevant_chunks(text: str, max_tokens: int, top_k: int = None) -> Tuple[str, Dict[str, int]]:
+    """
+    Select the document chunks most relevant to exercise and nutrition
+    risk, up to top_k chunks and max_tokens, returned in document order.
+    Returns the excerpt text and a report in the same shape as
+    token_budget.compact_document. Embedding errors propagate.
+    """
+    top_k = top_k or config.DOCUMENT_RETRIEVAL_TOP_K
+    chunks, matrix = _get_document_chunks(text)
+    report = {
+        "bytes_in": len(text.encode("utf-8")),
+        "tokens_in": estimate_tokens(text),
+        "budget_tokens": max_tokens,
+        "chunks_total": len(chunks),
+    }
+
+    selected: List[int] = []
+    if chunks:
+        # One matmul scores every chunk against every risk query
+        scores = similarity_matrix(_get_query_matrix(), matrix).max(axis=0)
+        k = min(top_k, len(chunks))
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        used = 0
+        for index in candidates[np.argsort(-scores[candidates])]:
+            cost = estimate_tokens(chunks[index]) + 1
+            if used + cost > max_tokens:
+                continue
+            selected.append(int(index))
+            used += cost
+
+    excerpt = "\n".join(chunks[index] for index in sorted(selected))
+    report["chunks_selected"] = len(selected)
+    report["bytes_out"] = len(excerpt.encode("utf-8"))
+    report["tokens_out"] = estimate_tokens(excerpt)
+    report["bytes_dropped"] = report["bytes_in"] - report["bytes_out"]
+    report["tokens_dropped"] = report["tokens_in"] - report["tokens_out"]
+    return excerpt, report
+
+
+def fit_document_to_budget(text: str, max_tokens: int) -> Tuple[str, Dict[str, int]]:
+    """
+    Document retrieval stage for the analyzer prompt.
+    Documents within budget are passed through; larger ones go through
+    chunk retrieval, falling back to extractive compaction when
+    retrieval is disabled or the embedding call fails.
+    """
+    if estimate_tokens(text) <= max_tokens or not config.DOCUMENT_RETRIEVAL_ENABLED:
+        return compact_document(text, max_tokens)
+    try:
+        return retrieve_relevant_chunks(text, max_tokens)
+    except Exception as e:
+        logger.warning(f"Document retrieval failed, using extractive compaction: {e}")
+        return compact_document(text, max_tokens)
@@ -0,0 +1,239 @@
+import hashlib
+import logging
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.config import main as config
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def embedding_key(model: str, kind: str, text: str) -> str:
+    """Content-hash key for one embedding (query and document embeddings differ)"""
+    return hashlib.sha256(f"{model}\0{kind}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Persistent, content-hash keyed embedding cache shared by all workers.
+
+    Layout under `directory`:
+      CURRENT              name of the live generation directory
+      lock                 flock file serializing writers across processes
+      gen-<n>/vectors.npy  preallocated float32 (capacity, dim) .npy, memory-mapped
+      gen-<n>/keys.tsv     append-only "key<TAB>row" index
+
+    Vectors are written into the next free rows before their index lines
+    are appended, so readers only ever see complete rows. Readers map the
+    .npy read-only and pick up new index lines incrementally. When the
+    file is full, compaction copies the newest live rows into a new
+    generation and switches CURRENT atomically (oldest-first eviction).
+    """
+
+    def __init__(self, directory: str, capacity: int, keep_ratio: float = 0.75):
+        self.directory = directory
+        self.capacity = capacity
+        self.keep_ratio = keep_ratio
+        self._lock = threading.RLock()
+        self._generation: Optional[str] = None
+        self._index: Dict[str, int] = {}
+        self._index_offset = 0
+        self._rows = 0
+        self._vectors: Optional[np.ndarray] = None
+        os.makedirs(directory, exist_ok=True)
+
+    # -- public API -------------------------------------------------------
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Cached vectors for the given keys (misses are simply absent)"""
+        with self._lock:
+            self._refresh()
+            if self._vectors is None:
+                return {}
+            found = {}
+            for key in keys:
+                row = self._index.get(key)
+                if row is not None:
+                    found[key] = self._vectors[row]
+            return found
+
+    def put_many(self, items: Iterable[Tuple[str, Sequence[float]]]) -> int:
+        """Store new embeddings; returns the number of rows written"""
+        items = list(items)
+        if not items:
+            return 0
+        with self._lock, self._writer_lock():
+            self._refresh()
+            new = {}
+            for key, vector in items:
+                if key not in self._index:
+                    new[key] = vector
+            if not new:
+                return 0
+
+            matrix = np.asarray(list(new.values()), dtype=np.float32)
+            if self._vectors is None:
+                self._create_generation(1, matrix.shape[1])
+            elif matrix.shape[1] != self._vectors.shape[1]:
+                raise ValueError(f"Embedding dimension {matrix.shape[1]} does not match store ({self._vectors.shape[1]})")
+
+            if self._rows + len(new) > self.capacity:
+                self._compact_locked(reserve=len(new))
+            if self._rows + len(new) > self.capacity:
+                # Batch larger than the whole store: keep what fits
+                overflow = self._rows + len(new) - self.capacity
+                new = dict(list(new.items())[overflow:])
+                matrix = matrix[overflow:]
+
+            start = self._rows
+            writer = np.load(self._path("vectors.npy"), mmap_mode="r+")
+            writer[start:start + len(new)] = matrix
+            writer.flush()
+            del writer
+
+            with open(self._path("keys.tsv"), "a", encoding="utf-8") as index_file:
+                index_file.write("".join(f"{key}\t{start + offset}\n" for offset, key in enumerate(new)))
+                index_file.flush()
+                os.fsync(index_file.fileno())
+
+            self._refresh()
+            return len(new)
+
+    def compact(self) -> None:
+        """Drop orphaned rows and evict the oldest entries down to keep_ratio of capacity"""
+        with self._lock, self._writer_lock():
+            self._refresh()
+            if self._vectors is not None:
+                self._compact_locked(reserve=0)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._index)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._refresh()
+            return {"entries": len(self._index), "rows": self._rows, "capacity": self.capacity}
+
+    # -- internals ------------------------------------------------------------
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, self._generation, name)
+
+    @contextmanager
+    def _writer_lock(self):
+        with open(os.path.join(self.directory, "lock"), "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_current(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.directory, "CURRENT"), encoding="utf-8") as current:
+                return current.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _refresh(self) -> None:
+        """Follow generation switches and load index lines written by other workers"""
+        generation = self._read_current()
+        if generation is None:
+            return
+        if generation != self._generation:
+            self._generation = generation
+            self._vectors = np.load(self._path("vectors.npy"), mmap_mode="r")
+            self._index = {}
+            self._index_offset = 0
+            self._rows = 0
+
+        with open(self._path("keys.tsv"), "rb") as index_file:
+            index_file.seek(self._index_offset)
+            data = index_file.read()
+        complete = data[:data.rfind(b"\n") + 1]
+        for line in complete.decode("utf-8").splitlines():
+            key, row = line.split("\t")
+            row = int(row)
+            self._index[key] = row
+            self._rows = max(self._rows, row + 1)
+        self._index_offset += len(complete)
+
+    def _create_generation(self, number: int, dim: int) -> str:
+        generation = f"gen-{number}"
+        path = os.path.join(self.directory, generation)
+        os.makedirs(path, exist_ok=True)
+        # Preallocated, sparse on disk until rows are written
+        np.lib.format.open_memmap(
+            os.path.join(path, "vectors.npy"), mode="w+", dtype=np.float32, shape=(self.capacity, dim)
+        ).flush()
+        open(os.path.join(path, "keys.tsv"), "w").close()
+        self._switch_generation(generation)
+        return generation
+
+    def _switch_generation(self, generation: str) -> None:
+        temporary = os.path.join(self.directory, "CURRENT.tmp")
+        with open(temporary, "w", encoding="utf-8") as current:
+            current.write(generation)
+            current.flush()
+            os.fsync(current.fileno())
+        os.replace(temporary, os.path.join(self.directory, "CURRENT"))
+        self._refresh()
+
+    def _compact_locked(self, reserve: int) -> None:
+        old_generation = self._generation
+        old_vectors = self._vectors
+        live = sorted(self._index.items(), key=lambda item: item[1])
+        keep = max(min(int(self.capacity * self.keep_ratio), self.capacity - reserve), 0)
+        live = live[-keep:] if keep else []
+
+        number = int(old_generation.split("-")[1]) + 1
+        new_generation = f"gen-{number}"
+        path = os.path.join(self.directory, new_generation)
+        os.makedirs(path, exist_ok=True)
+        vectors = np.lib.format.open_memmap(
+            os.path.join(path, "vectors.npy"), mode="w+", dtype=np.float32, shape=(self.capacity, old_vectors.shape[1])
+        )
+        if live:
+            vectors[:len(live)] = old_vectors[[row for _, row in live]]
+        vectors.flush()
+        del vectors
+        with open(os.path.join(path, "keys.tsv"), "w", encoding="utf-8") as index_file:
+            index_file.write("".join(f"{key}\t{row}\n" for row, (key, _) in enumerate(live)))
+            index_file.flush()
+            os.fsync(index_file.fileno())
+
+        evicted = len(self._index) - len(live)
+        self._switch_generation(new_generation)
+        # Other workers keep their open maps of the old files until they refresh
+        shutil.rmtree(os.path.join(self.directory, old_generation), ignore_errors=True)
+        logger.info(f"Embedding store compacted into {new_generation}: kept {len(live)}, evicted {evicted}")
+
+
+_store: Optional[EmbeddingStore] = None
+_store_lock = threading.Lock()
+
+
+def get_embedding_store(model: str) -> Optional[EmbeddingStore]:
+    """Process-wide store for `model`, or None when the cache is disabled"""
+    global _store
+    if not config.EMBEDDING_CACHE_ENABLED:
+        return None
+    with _store_lock:
+        if _store is None:
+            directory = os.path.join(config.EMBEDDING_CACHE_DIR, model.replace("/", "_"))
+            _store = EmbeddingStore(directory, config.EMBEDDING_CACHE_MAX_ENTRIES)
+        return _store
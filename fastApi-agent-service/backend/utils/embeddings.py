@@ -1,25 +1,61 @@
 from backend.config import main as config
-from typing import List
+import logging
+from typing import List, Sequence, Tuple, Union
 import numpy as np
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
+from backend.utils.embedding_store import embedding_key, get_embedding_store
+
+logger = logging.getLogger(__name__)
 
 embedding_model = GoogleGenerativeAIEmbeddings(
     model="models/embedding-001", 
     google_api_key=config.GEMINI_API_KEY
 )
 
+def _cached_embeddings(texts: List[str], kind: str) -> List[List[float]]:
+    """
+    Embeddings for texts, served from the persistent store where possible.
+    Only unique cache misses go upstream, in batches of EMBEDDING_BATCH_SIZE.
+    """
+    store = get_embedding_store(embedding_model.model)
+    keys = [embedding_key(embedding_model.model, kind, text) for text in texts]
+    cached = store.get_many(keys) if store is not None else {}
+
+    misses = {}
+    for key, text in zip(keys, texts):
+        if key not in cached:
+            misses.setdefault(key, text)
+
+    fetched = {}
+    if misses:
+        miss_keys = list(misses)
+        if kind == "query":
+            vectors = [embedding_model.embed_query(misses[key]) for key in miss_keys]
+        else:
+            vectors = embedding_model.embed_documents(
+                [misses[key] for key in miss_keys], batch_size=config.EMBEDDING_BATCH_SIZE
+            )
+        fetched = dict(zip(miss_keys, vectors))
+        if store is not None:
+            try:
+                store.put_many(fetched.items())
+            except Exception as e:
+                logger.warning(f"Could not persist embeddings: {e}")
+
+    return [fetched[key] if key in fetched else cached[key].tolist() for key in keys]
+
 def get_text_embedding(text: str) -> List[float]:
     """
     Generates an embedding for health-related text content.
     Useful for exercise similarity, meal matching, etc.
     """
-    return embedding_model.embed_query(text)
+    return _cached_embeddings([text], "query")[0]
 
 def get_batch_embeddings(texts: List[str]) -> List[List[float]]:
     """
     Generates embeddings for multiple health content items.
     """
-    return embedding_model.embed_documents(texts)
+    return _cached_embeddings(list(texts), "document")
 
 def calculate_similarity(embedding1: List[float], embedding2: List[float]) -> float:
     """
@@ -37,3 +73,57 @@ def calculate_similarity(embedding1: List[float], embedding2: List[float]) -> fl
         return 0.0
     
     return dot_product / (norm1 * norm2)
+
+
+def to_normalized_matrix(embeddings: Union[Sequence[Sequence[float]], np.ndarray]) -> np.ndarray:
+    """
+    Stack embeddings into a C-contiguous float32 matrix with unit-length rows.
+    Normalize once and reuse the matrix; cosine similarity is then a dot product.
+    Zero vectors stay zero and score 0 against everything.
+    """
+    matrix = np.array(embeddings, dtype=np.float32, ndmin=2, copy=True)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return np.ascontiguousarray(matrix)
+
+def similarity_matrix(queries: np.ndarray, corpus: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of every query row against every corpus row,
+    as a single matmul. Both inputs must come from to_normalized_matrix.
+    Returns a (num_queries, num_corpus) float32 matrix.
+    """
+    return queries @ corpus.T
+
+def top_k_similar(
+    queries: Union[Sequence[float], Sequence[Sequence[float]], np.ndarray],
+    corpus: np.ndarray,
+    k: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k corpus rows for one query or a batch of queries.
+    `corpus` must be a normalized matrix; raw query embeddings are normalized here.
+    Uses argpartition (O(n)) and only sorts the k winners.
+    Returns (indices, scores), each (k,) for a single query or (num_queries, k)
+    for a batch, ordered by descending similarity.
+    """
+    single = np.ndim(queries) == 1
+    scores = similarity_matrix(to_normalized_matrix(queries), corpus)
+
+    k = min(k, corpus.shape[0])
+    if k <= 0:
+        empty = np.empty((scores.shape[0], 0), dtype=np.int64)
+        return (empty[0], empty[0].astype(np.float32)) if single else (empty, empty.astype(np.float32))
+
+    if k < corpus.shape[0]:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(corpus.shape[0]), scores.shape)
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1)
+    indices = np.take_along_axis(candidates, order, axis=1)
+    top_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+    if single:
+        return indices[0], top_scores[0]
+    return indices, top_scores
@@ -4,10 +4,21 @@ from backend.constants.enums import (
     ActivityLevel, Goal, MIN_CALORIES_ADULT, MAX_CALORIES_ADULT,
     MIN_WORKOUT_MINUTES, MAX_WORKOUT_MINUTES
 )
+from backend.constants.safety_lexicon import SAFETY_LEXICON, SAFETY_SCREENS, MATCH_ANYWHERE
+from backend.utils.keyword_matcher import KeywordMatcher
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Compiled once; every keyword screen shares this single-pass matcher
+SAFETY_MATCHER = KeywordMatcher(
+    SAFETY_LEXICON, anywhere=[keyword for category in MATCH_ANYWHERE for keyword in SAFETY_LEXICON[category]]
+)
+
+def screen_text(text: str, screen: str) -> List[str]:
+    """Safety keywords found in text for one of SAFETY_SCREENS"""
+    return SAFETY_MATCHER.matches(text, SAFETY_SCREENS[screen])
+
 class HealthSafetyValidator:
     """Validates health recommendations for safety"""
     
@@ -137,13 +148,8 @@ personalized professional guidance is recommended for optimal health outcomes.
             result["recommendations"].append("Professional supervision recommended")
             
        
-        high_risk_conditions = [
-            "heart disease", "diabetes", "high blood pressure", "eating disorder",
-            "pregnancy", "recent surgery", "joint problems", "back injury"
-        ]
-        
         for condition in health_conditions:
-            if any(risk in condition.lower() for risk in high_risk_conditions):
+            if screen_text(condition, "profile_health_condition"):
                 result["concerns"].append(f"Health condition '{condition}' requires professional guidance")
                 result["recommendations"].append("Medical clearance strongly recommended before starting program")
                 
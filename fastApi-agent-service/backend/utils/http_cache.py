@@ -0,0 +1,37 @@
+import hashlib
+from typing import Optional
+
+# Content codings CompressionMiddleware can apply; each gets its own ETag suffix
+CONTENT_CODINGS = ("gzip", "zstd", "br")
+
+
+def encoded_etag(etag: str, coding: str) -> str:
+    """A strong ETag names one representation, so the compressed one gets its own"""
+    if etag.startswith('"') and etag.endswith('"'):
+        return f'{etag[:-1]}-{coding}"'
+    return etag
+
+
+def strong_etag(body: bytes) -> str:
+    """Strong validator for a response body: the same bytes always get the same tag"""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match check (weak comparison, as RFC 9110 specifies for it).
+    CompressionMiddleware gives each compressed representation its own tag,
+    so a client holding the gzip/zstd/br copy also matches.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {etag} | {encoded_etag(etag, coding) for coding in CONTENT_CODINGS}
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag in candidates:
+            return True
+    return False
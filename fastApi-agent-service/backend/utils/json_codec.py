@@ -0,0 +1,53 @@
+import json
+import re
+from typing import Any, Callable, Optional, Union
+
+import orjson
+
+# orjson serializes these natively where the stdlib would call default= or fail;
+# passing them through keeps the output of both paths the same
+_PASSTHROUGH = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_SUBCLASS
+# The stdlib pads negative exponents to two digits (1e-07), orjson does not (1e-7)
+_NEGATIVE_EXPONENT = re.compile(rb"\de-")
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """
+    Parse JSON with orjson, falling back to json.loads for input only the
+    stdlib accepts (NaN, non-str input), so errors match json.loads. One
+    difference remains: integers beyond 64 bits come back as floats, so
+    anything that must round-trip exactly (signed bodies) uses json.loads.
+    """
+    try:
+        return orjson.loads(data)
+    except (orjson.JSONDecodeError, TypeError):
+        return json.loads(data)
+
+
+def dumps(value: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """Compact JSON text; values orjson rejects (non-str keys, big ints) go through json.dumps"""
+    try:
+        return orjson.dumps(value, default=default, option=_PASSTHROUGH).decode()
+    except TypeError:
+        return json.dumps(value, default=default, separators=(",", ":"), ensure_ascii=False)
+
+
+def canonical_json(value: Any) -> str:
+    """
+    The canonical form signed between services: byte-identical to
+    json.dumps(value, separators=(",", ":")). orjson produces it directly
+    for plain ASCII payloads; anything it would spell differently is
+    re-encoded with the stdlib.
+    """
+    try:
+        encoded = orjson.dumps(value, option=_PASSTHROUGH)
+    except TypeError:
+        return json.dumps(value, separators=(",", ":"))
+    # Spelled differently by the stdlib: anything ensure_ascii escapes (non-ASCII, DEL),
+    # negative exponents and null, which orjson also writes for NaN and Infinity
+    if (
+        not encoded.isascii() or b"\x7f" in encoded or b"null" in encoded
+        or (b"e-" in encoded and _NEGATIVE_EXPONENT.search(encoded))
+    ):
+        return json.dumps(value, separators=(",", ":"))
+    return encoded.decode()
@@ -0,0 +1,172 @@
+import json
+import re
+import logging
+from typing import Any, Tuple
+
+from backend.utils.json_codec import loads
+
+logger = logging.getLogger(__name__)
+
+_CODE_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*")
+_TRAILING_COMMA_RE = re.compile(r",(\s*[\]}])")
+
+
+def strip_code_fences(text: str) -> str:
+    """
+    Remove markdown code fences that LLMs wrap around JSON output
+    """
+    return _CODE_FENCE_RE.sub("", text or "").strip()
+
+
+def extract_json_block(text: str) -> str:
+    """
+    Drop stray prose before and after the JSON payload.
+    Starts at the first '[' or '{' and ends at its matching bracket,
+    or at the end of the text if the payload was truncated.
+    """
+    starts = [i for i in (text.find("["), text.find("{")) if i != -1]
+    if not starts:
+        return text
+    start = min(starts)
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return text[start:]
+
+
+def remove_trailing_commas(text: str) -> str:
+    """
+    Remove commas directly before a closing bracket, e.g. '[1, 2,]'
+    String contents are left untouched.
+    """
+    result = []
+    last = 0
+    for start, end in _string_spans(text):
+        result.append(_TRAILING_COMMA_RE.sub(r"\1", text[last:start]))
+        result.append(text[start:end])
+        last = end
+    result.append(_TRAILING_COMMA_RE.sub(r"\1", text[last:]))
+    return "".join(result)
+
+
+def close_truncated_json(text: str) -> str:
+    """
+    Close a JSON document that was cut off mid-stream.
+    The incomplete trailing element of the outermost open array is
+    dropped and all open arrays/objects are closed, so
+    '[{"day": 1}, {"day": 2, "wor' becomes '[{"day": 1}]' and a partial
+    day never reaches the caller as a real one.
+    """
+    stack = []
+    in_string = False
+    escaped = False
+    # Position right after the last element that was fully closed inside each
+    # open container, keyed by the container's opening position
+    safe_cuts = {}
+
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "[{":
+            stack.append((char, i))
+        elif char in "]}":
+            if stack:
+                safe_cuts.pop(stack.pop()[1], None)
+            if stack:
+                safe_cuts[stack[-1][1]] = i + 1
+        elif char == "," and stack:
+            safe_cuts[stack[-1][1]] = i
+
+    if not stack and not in_string:
+        return text
+
+    # Cut inside the outermost open array (the list of days); without one,
+    # inside the innermost container that has a complete element
+    arrays = [depth for depth, (opener, _) in enumerate(stack) if opener == "["]
+    if arrays:
+        depth = arrays[0]
+    else:
+        depth = max((depth for depth, (_, position) in enumerate(stack) if position in safe_cuts), default=0)
+    open_stack = stack[:depth + 1]
+    position = open_stack[-1][1]
+    cut = safe_cuts.get(position, position + 1)
+    closers = "".join("]" if opener == "[" else "}" for opener, _ in reversed(open_stack))
+    return remove_trailing_commas(text[:cut].rstrip().rstrip(",") + closers)
+
+
+def repair_json_text(text: str) -> Tuple[str, bool]:
+    """
+    Apply tolerant, local repairs to LLM JSON output.
+    Returns the repaired text and whether any repair was needed.
+    """
+    original = (text or "").strip()
+    repaired = strip_code_fences(original)
+    repaired = extract_json_block(repaired)
+    repaired = remove_trailing_commas(repaired)
+    repaired = close_truncated_json(repaired)
+    return repaired, repaired != original
+
+
+def parse_llm_json(text: str) -> Tuple[Any, bool]:
+    """
+    Parse LLM output as JSON, repairing it locally when needed.
+    Returns the parsed value and whether a repair was applied.
+    Raises json.JSONDecodeError if the output cannot be recovered.
+    """
+    try:
+        return loads(text), False
+    except (json.JSONDecodeError, TypeError):
+        pass
+
+    repaired, _ = repair_json_text(text)
+    value = loads(repaired)
+    logger.info("LLM JSON output repaired locally")
+    return value, True
+
+
+def _string_spans(text: str):
+    """Yield (start, end) spans of JSON string literals in text"""
+    in_string = False
+    escaped = False
+    start = 0
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+                yield start, i + 1
+        elif char == '"':
+            in_string = True
+            start = i
+    if in_string:
+        yield start, len(text)
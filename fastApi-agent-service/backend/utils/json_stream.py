@@ -0,0 +1,86 @@
+import json
+import logging
+from typing import Any, List
+
+from backend.utils.json_codec import loads
+from backend.utils.json_repair import remove_trailing_commas
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalArrayParser:
+    """
+    Incremental parser for a streamed top-level JSON array.
+    Feed it chunks of LLM output and it returns each array element
+    as soon as the element's closing bracket arrives, e.g. one
+    workout or meal day at a time while the LLM is still generating.
+    Leading prose or code fences before the '[' are skipped.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._element_start = None
+        self._started = False
+        self.finished = False
+        self.skipped_elements = 0
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume a chunk and return the elements completed by it"""
+        self.text += chunk
+        completed = []
+        text = self.text
+
+        for i in range(self._position, len(text)):
+            if self.finished:
+                break
+            char = text[i]
+
+            if not self._started:
+                if char == "[":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "[{":
+                if self._depth == 1:
+                    self._element_start = i
+                self._depth += 1
+            elif char in "]}":
+                self._depth -= 1
+                if self._depth == 1 and self._element_start is not None:
+                    element = self._load(text[self._element_start:i + 1])
+                    if element is not None:
+                        completed.append(element)
+                    self._element_start = None
+                elif self._depth == 0:
+                    self.finished = True
+
+        self._position = len(text)
+        return completed
+
+    def _load(self, fragment: str):
+        try:
+            return loads(fragment)
+        except json.JSONDecodeError:
+            pass
+        try:
+            return loads(remove_trailing_commas(fragment))
+        except json.JSONDecodeError as e:
+            self.skipped_elements += 1
+            logger.warning(f"Skipping malformed streamed array element: {e}")
+            return None
@@ -0,0 +1,125 @@
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+_SPACE_RE = re.compile(r"[\s\-]+")
+_APOSTROPHES = str.maketrans({"’": "'", "‘": "'", "ʼ": "'"})
+# Characters that match loosely so the text itself only needs lowercasing
+_CHAR_PATTERNS = {" ": r"[\s\-]+", "'": "['’‘ʼ]"}
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Lowercase, straighten apostrophes and collapse whitespace and hyphens"""
+    return _SPACE_RE.sub(" ", keyword.lower().translate(_APOSTROPHES)).strip()
+
+
+def _trie_pattern(node: Dict[str, dict]) -> str:
+    """Regex for a character trie; longer continuations are tried first"""
+    terminal = "" in node
+    branches = [
+        (_CHAR_PATTERNS.get(char) or re.escape(char)) + _trie_pattern(child)
+        for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if terminal:
+        return "(?:" + body + ")?"
+    return body
+
+
+class KeywordMatcher:
+    """
+    Multi-pattern keyword matcher compiled once into a regex trie.
+
+    All keywords are matched in a single scan of the text, overlapping
+    ones included, and reported by category. Keywords must start at a
+    word boundary ("pain" matches "painful" but not "Spain"); with
+    whole_words they must also end at one ("egg" no longer matches "eggplant").
+    Keywords listed in anywhere match inside words as well, like a plain
+    substring check ("diabetes" in "prediabetes", "bread" in "cornbread").
+    """
+
+    def __init__(
+        self, lexicon: Mapping[str, Iterable[str]], whole_words: bool = False, anywhere: Iterable[str] = ()
+    ):
+        self.whole_words = whole_words
+        self._categories: Dict[str, Set[str]] = {}
+        for category, keywords in lexicon.items():
+            for keyword in keywords:
+                self._categories.setdefault(normalize_keyword(keyword), set()).add(category)
+        self._categories.pop("", None)
+        self.categories = frozenset(lexicon)
+        self._anywhere = {normalize_keyword(keyword) for keyword in anywhere}
+
+        trie: Dict[str, dict] = {}
+        for keyword in self._categories:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        # A lookahead reports a match at every position, so overlapping keywords are all seen;
+        # word boundaries are checked per keyword afterwards since anywhere keywords ignore them
+        self._pattern = re.compile(rf"(?=({_trie_pattern(trie)}))")
+
+        # The longest keyword matched at a position also implies every keyword that is a prefix of it,
+        # with whether that prefix ends at a word boundary inside the longer keyword
+        self._implied: Dict[str, List[Tuple[str, Optional[bool]]]] = {}
+        for keyword in self._categories:
+            self._implied[keyword] = [
+                (prefix, None if len(prefix) == len(keyword) else not keyword[len(prefix)].isalnum())
+                for prefix in self._categories if keyword.startswith(prefix)
+            ]
+
+    def _keyword(self, matched: str) -> str:
+        if matched in self._implied:
+            return matched
+        return normalize_keyword(matched)
+
+    def locate(self, text: str) -> List[Tuple[int, str]]:
+        """
+        (offset, keyword) for every keyword occurrence, offsets into text.lower().
+        Keywords that are a prefix of a longer match share its offset.
+        """
+        located = []
+        if not text:
+            return located
+        text = str(text).lower()
+        for match in self._pattern.finditer(text):
+            start, end = match.span(1)
+            starts_word = start == 0 or not _is_word_char(text[start - 1])
+            ends_word = end == len(text) or not _is_word_char(text[end])
+            for keyword, prefix_ends_word in self._implied[self._keyword(match.group(1))]:
+                if keyword in self._anywhere or (starts_word and (
+                    not self.whole_words or (ends_word if prefix_ends_word is None else prefix_ends_word)
+                )):
+                    located.append((start, keyword))
+        return located
+
+    def find(self, text: str) -> Dict[str, List[str]]:
+        """Matched keywords grouped by category, each keyword once in order of appearance"""
+        found: Dict[str, List[str]] = {}
+        seen: Set[str] = set()
+        for _, keyword in self.locate(text):
+            if keyword in seen:
+                continue
+            seen.add(keyword)
+            for category in self._categories[keyword]:
+                found.setdefault(category, []).append(keyword)
+        return found
+
+    def keyword_categories(self, keyword: str) -> Set[str]:
+        return self._categories.get(keyword, set())
+
+    def matches(self, text: str, categories: Optional[Iterable[str]] = None) -> List[str]:
+        """Keywords found in text, limited to the given categories"""
+        found = self.find(text)
+        if categories is not None:
+            found = {category: found[category] for category in categories if category in found}
+        keywords: List[str] = []
+        for category_keywords in found.values():
+            keywords.extend(keyword for keyword in category_keywords if keyword not in keywords)
+        return keywords
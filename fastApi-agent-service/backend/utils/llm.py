@@ -1,22 +1,149 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
 from langchain_google_genai import ChatGoogleGenerativeAI
 from backend.config import main as config
+from backend.utils.llm_resilience import ResilientLLM
+
+logger = logging.getLogger(__name__)
+
+ROUTE_STANDARD = "standard"
+ROUTE_LIGHT = "light"
+
+# Model settings per graph node, each node gets its own output cap and thinking budget
+NODE_MODEL_SETTINGS: Dict[str, Dict] = {
+    "analysis": {
+        "model": config.LLM_ANALYSIS_MODEL,
+        "temperature": config.LLM_ANALYSIS_TEMPERATURE,
+        "max_output_tokens": config.LLM_ANALYSIS_MAX_OUTPUT_TOKENS,
+        "thinking_budget": config.LLM_ANALYSIS_THINKING_BUDGET,
+    },
+    "workout": {
+        "model": config.LLM_WORKOUT_MODEL,
+        "temperature": config.LLM_WORKOUT_TEMPERATURE,
+        "max_output_tokens": config.LLM_WORKOUT_MAX_OUTPUT_TOKENS,
+        "thinking_budget": config.LLM_WORKOUT_THINKING_BUDGET,
+    },
+    "meal": {
+        "model": config.LLM_MEAL_MODEL,
+        "temperature": config.LLM_MEAL_TEMPERATURE,
+        "max_output_tokens": config.LLM_MEAL_MAX_OUTPUT_TOKENS,
+        "thinking_budget": config.LLM_MEAL_THINKING_BUDGET,
+    },
+    "chat": {
+        "model": config.LLM_CHAT_MODEL,
+        "temperature": config.LLM_CHAT_TEMPERATURE,
+        "max_output_tokens": config.LLM_CHAT_MAX_OUTPUT_TOKENS,
+        "thinking_budget": config.LLM_CHAT_THINKING_BUDGET,
+    },
+}
+
+# Simple-profile limits for the light route
+LIGHT_ROUTE_MIN_AGE = 18
+LIGHT_ROUTE_MAX_AGE = 65
+LIGHT_ROUTE_MAX_DIETARY_RESTRICTIONS = 2
+
+_node_llms: Dict[Tuple[str, str], ResilientLLM] = {}
+
+
+def build_chat_model(model: str, temperature: float, max_output_tokens: int, thinking_budget: Optional[int]):
+    """Create the provider client for one model configuration"""
+    return ChatGoogleGenerativeAI(
+        model=model,
+        google_api_key=config.GEMINI_API_KEY,
+        temperature=temperature,
+        max_output_tokens=max_output_tokens,
+        thinking_budget=thinking_budget,
+    )
+
+
+def node_model_settings(node: str, route: str = ROUTE_STANDARD) -> Dict:
+    """Model settings for a node on the given route"""
+    settings = dict(NODE_MODEL_SETTINGS[node])
+    if route == ROUTE_LIGHT:
+        settings["model"] = config.LLM_LIGHT_MODEL
+        # Flash-Lite does not think by default, keep it that way
+        settings["thinking_budget"] = 0
+    return settings
+
+
+def is_low_risk_profile(
+    node: str,
+    profile: Optional[dict] = None,
+    health_conditions: Optional[List[str]] = None,
+    dietary_restrictions: Optional[List[str]] = None,
+    risk_level: Optional[str] = None,
+) -> bool:
+    """
+    Small, simple profiles: no health conditions, an age inside the
+    general adult range, few dietary restrictions (meal node) and a
+    low analysed risk when one is available.
+    """
+    if profile is None:
+        return False
+
+    conditions = [c for c in (health_conditions or []) if c and c.strip().lower() not in ("none", "n/a")]
+    if conditions:
+        return False
+
+    age = profile.get("age")
+    if not age or not LIGHT_ROUTE_MIN_AGE <= age <= LIGHT_ROUTE_MAX_AGE:
+        return False
+
+    if node == "meal" and len(dietary_restrictions or []) > LIGHT_ROUTE_MAX_DIETARY_RESTRICTIONS:
+        return False
+
+    if risk_level and risk_level != "low":
+        return False
+
+    return True
+
+
+def select_model_route(
+    node: str,
+    profile: Optional[dict] = None,
+    health_conditions: Optional[List[str]] = None,
+    dietary_restrictions: Optional[List[str]] = None,
+    risk_level: Optional[str] = None,
+) -> str:
+    """
+    Routing policy: low-risk profiles (see is_low_risk_profile) go to
+    the light model, everything else stays on the standard model.
+    """
+    if not config.LLM_ROUTING_ENABLED:
+        return ROUTE_STANDARD
+    if is_low_risk_profile(node, profile, health_conditions, dietary_restrictions, risk_level):
+        return ROUTE_LIGHT
+    return ROUTE_STANDARD
+
+
+def get_node_llm(node: str, route: str = ROUTE_STANDARD) -> ResilientLLM:
+    """
+    Resilient LLM for a node and route. Instances are cached so each
+    model keeps its own circuit breaker and latency history.
+    """
+    key = (node, route)
+    if key not in _node_llms:
+        settings = node_model_settings(node, route)
+        _node_llms[key] = ResilientLLM(build_chat_model(**settings), name=f"{node}:{settings['model']}")
+        logger.info(f"LLM for {node} ({route}) initialized with {settings['model']}")
+    return _node_llms[key]
+
+
+def route_node_llm(
+    node: str,
+    profile: Optional[dict] = None,
+    health_conditions: Optional[List[str]] = None,
+    dietary_restrictions: Optional[List[str]] = None,
+    risk_level: Optional[str] = None,
+) -> ResilientLLM:
+    """Select the route for a profile and return the matching LLM"""
+    route = select_model_route(node, profile, health_conditions, dietary_restrictions, risk_level)
+    return get_node_llm(node, route)
+
+
+# Main LLM, used for chat
+llm = get_node_llm("chat")
 
-print("config.GEMINI_API_KEY", config.GEMINI_API_KEY)
-
-# Main LLM - Use gemini-2.0-flash (stable and available)
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",  # From your available models list
-    google_api_key=config.GEMINI_API_KEY,
-    temperature=0.3,
-    # max_output_tokens=2048,
-)
-
-# Health-specific LLM
-health_llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",  # From your available models list
-    google_api_key=config.GEMINI_API_KEY,
-    temperature=0.3,
-    # max_output_tokens=4096,
-)
-
-print("LLMs initialized successfully with gemini-2.0-flash-001!")
\ No newline at end of file
+# Health-specific LLM (standard analysis settings)
+health_llm = get_node_llm("analysis")
@@ -0,0 +1,315 @@
+import random
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from google.api_core import exceptions as google_exceptions
+
+from backend.config import main as config
+from backend.utils.prompt_cache import context_cache
+
+logger = logging.getLogger(__name__)
+
+# Provider errors worth retrying, everything else (bad request, auth,
+# safety blocks) fails immediately into the agent fallbacks
+TRANSIENT_ERRORS = (
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+    google_exceptions.BadGateway,
+    google_exceptions.GatewayTimeout,
+    TimeoutError,
+    ConnectionError,
+)
+
+_request_deadline: ContextVar[Optional[float]] = ContextVar("llm_request_deadline", default=None)
+
+_hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="llm-hedge")
+
+
+class LLMUnavailableError(RuntimeError):
+    """Raised without calling the provider while the circuit breaker is open"""
+
+
+class LLMBudgetExceededError(TimeoutError):
+    """Raised when the per-request LLM time budget is used up"""
+
+
+@contextmanager
+def llm_request_budget(seconds: float = None):
+    """
+    Bound the total time all LLM calls of one request may take.
+    Every call made inside the block (including from graph nodes,
+    which inherit the context) derives its deadline from this budget.
+    """
+    seconds = config.LLM_REQUEST_BUDGET_SECONDS if seconds is None else seconds
+    token = _request_deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        try:
+            _request_deadline.reset(token)
+        except ValueError:
+            # Async generators may be closed from another context
+            pass
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left in the current request budget, None if unbounded"""
+    deadline = _request_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def call_timeout() -> float:
+    """Deadline for the next single LLM call"""
+    remaining = remaining_budget()
+    if remaining is None:
+        return config.LLM_CALL_TIMEOUT_SECONDS
+    if remaining <= 0:
+        raise LLMBudgetExceededError("LLM request budget exhausted")
+    return min(config.LLM_CALL_TIMEOUT_SECONDS, remaining)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given retry attempt (1-based)"""
+    ceiling = min(config.LLM_RETRY_MAX_DELAY_SECONDS, config.LLM_RETRY_BASE_DELAY_SECONDS * (2 ** (attempt - 1)))
+    return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+    After `failure_threshold` transient failures in a row the circuit opens
+    and calls fail fast for `reset_seconds`; then a single trial call is let
+    through (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at < self.reset_seconds:
+                return False
+            if self._trial_in_flight:
+                return False
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("LLM circuit breaker closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """
+        End a call that says nothing about provider health (a non-transient
+        error): failures and state are left alone, only a half-open trial
+        slot is freed so the next call can probe instead
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"LLM circuit breaker opened after {self._failures} consecutive failures")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+
+class ResilientLLM:
+    """
+    Wraps a chat model with deadlines, retries, a circuit breaker and
+    hedged requests. Exposes the same invoke/stream interface, so agents
+    keep their existing `except Exception` fallbacks: once retries are
+    exhausted, the budget is spent or the circuit is open, the error
+    propagates and the rule-based fallback plan is used.
+    Retries are owned here, so the client's own retry loop (which ignores
+    deadlines) is limited to a single attempt per call.
+    """
+
+    def __init__(self, llm, name: str):
+        self.llm = llm
+        self.name = name
+        self.breaker = CircuitBreaker(
+            failure_threshold=config.LLM_CIRCUIT_FAILURE_THRESHOLD,
+            reset_seconds=config.LLM_CIRCUIT_RESET_SECONDS,
+        )
+        self.latency = LatencyTracker()
+
+    def __getattr__(self, attribute):
+        return getattr(self.llm, attribute)
+
+    def invoke(self, prompt, **kwargs) -> Any:
+        attempt = 0
+        while True:
+            attempt += 1
+            timeout = call_timeout()
+            self._check_circuit()
+            try:
+                response = self._invoke_hedged(prompt, timeout, **kwargs)
+            except TRANSIENT_ERRORS as e:
+                self.breaker.record_failure()
+                self._wait_before_retry(attempt, e)
+                continue
+            except Exception:
+                # Non-transient errors are the request's fault, not the provider's: neither a failure nor a success
+                self.breaker.release_trial()
+                raise
+            self.breaker.record_success()
+            return response
+
+    def stream(self, prompt, **kwargs) -> Iterator[Any]:
+        """
+        Stream chunks with the same protections as invoke.
+        Retries only happen before the first chunk; once output has been
+        yielded a failure propagates so callers never see duplicated text.
+        """
+        prompt, kwargs = context_cache.prepare(self.llm, prompt, kwargs)
+        attempt = 0
+        while True:
+            attempt += 1
+            timeout = call_timeout()
+            self._check_circuit()
+            deadline = time.monotonic() + timeout
+            started = time.monotonic()
+            yielded = False
+            try:
+                for chunk in self.llm.stream(prompt, timeout=timeout, max_retries=1, **kwargs):
+                    if not yielded:
+                        # First output means the provider is healthy
+                        self.latency.record(time.monotonic() - started)
+                        self.breaker.record_success()
+                    yielded = True
+                    yield chunk
+                    if time.monotonic() > deadline:
+                        raise LLMBudgetExceededError(f"{self.name}: stream exceeded its {timeout:.1f}s deadline")
+            except TRANSIENT_ERRORS as e:
+                if yielded:
+                    raise
+                self.breaker.record_failure()
+                self._wait_before_retry(attempt, e)
+                continue
+            except Exception:
+                if not yielded:
+                    self.breaker.release_trial()
+                raise
+            if not yielded:
+                self.breaker.record_success()
+            return
+
+    def _check_circuit(self) -> None:
+        if not self.breaker.allow_request():
+            raise LLMUnavailableError(f"{self.name}: circuit open, skipping LLM call")
+
+    def _wait_before_retry(self, attempt: int, error: Exception) -> None:
+        if attempt > config.LLM_MAX_RETRIES:
+            logger.error(f"{self.name}: giving up after {attempt} attempts: {error}")
+            raise error
+        delay = backoff_delay(attempt)
+        remaining = remaining_budget()
+        if remaining is not None and remaining <= delay:
+            logger.error(f"{self.name}: no budget left to retry: {error}")
+            raise error
+        logger.warning(f"{self.name}: transient LLM error on attempt {attempt}, retrying in {delay:.2f}s: {error}")
+        time.sleep(delay)
+
+    def _timed_invoke(self, prompt, timeout: float, **kwargs) -> Any:
+        prompt, kwargs = context_cache.prepare(self.llm, prompt, kwargs)
+        started = time.monotonic()
+        response = self.llm.invoke(prompt, timeout=timeout, max_retries=1, **kwargs)
+        self.latency.record(time.monotonic() - started)
+        return response
+
+    def _invoke_hedged(self, prompt, timeout: float, **kwargs) -> Any:
+        """
+        Send a duplicate request when the primary is slower than the
+        configured latency percentile, and return whichever finishes first.
+        Hedging stays off until enough latency samples exist.
+        """
+        hedge_after = None
+        if config.LLM_HEDGE_ENABLED and len(self.latency) >= config.LLM_HEDGE_MIN_SAMPLES:
+            hedge_after = self.latency.percentile(config.LLM_HEDGE_PERCENTILE)
+
+        if hedge_after is None or hedge_after >= timeout:
+            return self._timed_invoke(prompt, timeout, **kwargs)
+
+        started = time.monotonic()
+        primary = _hedge_executor.submit(self._timed_invoke, prompt, timeout, **kwargs)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        logger.info(f"{self.name}: primary call slower than p{config.LLM_HEDGE_PERCENTILE:g} ({hedge_after:.2f}s), hedging")
+        hedge_timeout = max(timeout - (time.monotonic() - started), 1.0)
+        pending = {primary, _hedge_executor.submit(self._timed_invoke, prompt, hedge_timeout, **kwargs)}
+
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=max(timeout - (time.monotonic() - started), 0), return_when=FIRST_COMPLETED)
+            if not done:
+                raise TimeoutError(f"{self.name}: LLM call exceeded its {timeout:.1f}s deadline")
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
@@ -0,0 +1,80 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Any
+
+_lock = threading.Lock()
+_llm_parse_counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+_document_compaction_totals: Dict[str, int] = defaultdict(int)
+_compression_totals: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+# Outcomes recorded for every structured LLM response
+PARSE_OK = "ok"
+PARSE_REPAIRED = "repaired"
+PARSE_FRAGMENT_RETRIED = "fragment_retried"
+PARSE_FAILED = "failed"
+
+
+def record_llm_parse(agent: str, outcome: str) -> None:
+    """
+    Record the outcome of parsing an LLM response for an agent
+    """
+    with _lock:
+        _llm_parse_counts[agent][outcome] += 1
+        _llm_parse_counts[agent]["total"] += 1
+
+
+def get_llm_parse_metrics() -> Dict[str, Any]:
+    """
+    Snapshot of LLM parse outcomes and parse-failure rate per agent
+    """
+    with _lock:
+        snapshot = {}
+        for agent, counts in _llm_parse_counts.items():
+            total = counts.get("total", 0)
+            snapshot[agent] = {
+                **counts,
+                "failure_rate": round(counts.get(PARSE_FAILED, 0) / total, 4) if total else 0.0,
+            }
+        return snapshot
+
+
+def reset_llm_parse_metrics() -> None:
+    """Clear all recorded parse outcomes"""
+    with _lock:
+        _llm_parse_counts.clear()
+
+
+def record_document_compaction(report: Dict[str, int]) -> None:
+    """
+    Accumulate a health-document compaction report (bytes/tokens dropped)
+    """
+    with _lock:
+        _document_compaction_totals["documents"] += 1
+        if report.get("tokens_dropped", 0) > 0:
+            _document_compaction_totals["documents_compacted"] += 1
+        for key in ("bytes_in", "bytes_dropped", "tokens_in", "tokens_dropped"):
+            _document_compaction_totals[key] += report.get(key, 0)
+
+
+def get_document_compaction_metrics() -> Dict[str, int]:
+    """Totals of health-document bytes and tokens dropped to fit the prompt budget"""
+    with _lock:
+        return dict(_document_compaction_totals)
+
+
+def record_response_compression(encoding: str, bytes_in: int, bytes_out: int) -> None:
+    """Accumulate the body bytes of one compressed response"""
+    with _lock:
+        totals = _compression_totals[encoding]
+        totals["responses"] += 1
+        totals["bytes_in"] += bytes_in
+        totals["bytes_out"] += bytes_out
+
+
+def get_response_compression_metrics() -> Dict[str, Any]:
+    """Compressed responses, bytes before/after and ratio per content coding"""
+    with _lock:
+        return {
+            encoding: {**totals, "ratio": round(totals["bytes_out"] / totals["bytes_in"], 4) if totals["bytes_in"] else 0.0}
+            for encoding, totals in _compression_totals.items()
+        }
@@ -0,0 +1,373 @@
+import csv
+import logging
+import os
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FOOD_TABLE_PATH = os.path.join(os.path.dirname(__file__), "../constants/food_composition.csv")
+
+# Column order of the nutrient matrix, per 100 g
+NUTRIENTS = ("kcal", "protein", "carbs", "fat", "fiber")
+
+GRAMS_PER_UNIT = {
+    "g": 1.0, "gram": 1.0, "grams": 1.0,
+    "kg": 1000.0, "kilogram": 1000.0, "kilograms": 1000.0,
+    "oz": 28.35, "ounce": 28.35, "ounces": 28.35,
+    "lb": 453.6, "lbs": 453.6, "pound": 453.6, "pounds": 453.6,
+    "handful": 30.0, "handfuls": 30.0,
+    "pinch": 0.5, "pinches": 0.5, "dash": 0.5, "dashes": 0.5,
+}
+# Volume units as fractions of a US cup (converted with the food's cup weight)
+CUPS_PER_UNIT = {
+    "cup": 1.0, "cups": 1.0, "c": 1.0,
+    "tbsp": 1 / 16, "tablespoon": 1 / 16, "tablespoons": 1 / 16,
+    "tsp": 1 / 48, "teaspoon": 1 / 48, "teaspoons": 1 / 48,
+    "ml": 1 / 240, "milliliter": 1 / 240, "milliliters": 1 / 240,
+    "l": 1000 / 240, "liter": 1000 / 240, "liters": 1000 / 240,
+}
+# Counted units use the food's unit weight
+COUNT_UNITS = {
+    "piece", "pieces", "slice", "slices", "can", "cans", "scoop", "scoops",
+    "clove", "cloves", "fillet", "fillets", "serving", "servings", "stalk", "stalks",
+}
+SIZE_FACTORS = {"small": 0.75, "medium": 1.0, "large": 1.25, "extra large": 1.5}
+DEFAULT_CUP_GRAMS = 240.0
+# Used only for meals with no recognised ingredient and no model estimate
+FALLBACK_MEAL_CALORIES = {"breakfast": 400, "lunch": 550, "dinner": 650, "snack": 200, "pre_workout": 200, "post_workout": 250}
+DEFAULT_UNIT_GRAMS = 100.0
+
+_WORD_NUMBERS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "half": 0.5, "quarter": 0.25}
+_UNICODE_FRACTIONS = {"½": " 1/2", "¼": " 1/4", "¾": " 3/4", "⅓": " 1/3", "⅔": " 2/3", "⅛": " 1/8"}
+
+_NUMBER = r"\d+\s+\d+/\d+|\d+/\d+|\d+(?:\.\d+)?"
+_QUANTITY_RE = re.compile(
+    rf"^\s*(?P<quantity>{_NUMBER}|(?:{'|'.join(_WORD_NUMBERS)})\b)"
+    rf"(?:\s*(?:-|to)\s*(?P<upper>{_NUMBER}))?\s*",
+    re.IGNORECASE,
+)
+_UNIT_RE = re.compile(
+    r"^(?P<size>extra large|small|medium|large)?\s*"
+    rf"(?:(?P<unit>{'|'.join(sorted(list(GRAMS_PER_UNIT) + list(CUPS_PER_UNIT) + list(COUNT_UNITS), key=len, reverse=True))})\b\.?)?\s*(?:of\s+)?",
+    re.IGNORECASE,
+)
+_PARENTHETICAL_RE = re.compile(r"\([^)]*\)")
+_NON_WORD_RE = re.compile(r"[^a-z0-9% ]+")
+
+# Preparation words that do not change what the food is
+_DESCRIPTORS = {
+    "chopped", "diced", "sliced", "minced", "fresh", "frozen", "raw", "steamed", "grilled", "baked",
+    "roasted", "boiled", "organic", "ripe", "small", "medium", "large", "lean", "plain", "unsweetened",
+    "low", "fat", "nonfat", "reduced", "sodium", "shredded", "grated", "mashed", "halved", "cubed",
+    "peeled", "rinsed", "drained", "packed", "heaping", "level", "about", "approximately", "optional",
+    "to", "taste", "for", "garnish", "serving", "of", "and", "or", "with", "the",
+}
+# Seasonings listed without a quantity ("salt to taste") count as zero grams
+_ZERO_WITHOUT_QUANTITY = {"salt", "pepper", "herbs", "spices", "water"}
+
+
+class ParsedIngredient(NamedTuple):
+    quantity: Optional[float]
+    unit: Optional[str]
+    size: float
+    food: str
+
+
+class FoodTable(NamedTuple):
+    names: List[str]
+    nutrients: np.ndarray  # (foods, len(NUTRIENTS)) per 100 g
+    cup_grams: np.ndarray
+    unit_grams: np.ndarray
+    aliases: Dict[str, int]
+
+
+def _parse_number(text: str) -> float:
+    text = text.strip().lower()
+    if text in _WORD_NUMBERS:
+        return float(_WORD_NUMBERS[text])
+    total = 0.0
+    for part in text.split():
+        if "/" in part:
+            numerator, denominator = part.split("/")
+            total += float(numerator) / float(denominator) if float(denominator) else 0.0
+        else:
+            total += float(part)
+    return total
+
+
+def parse_ingredient(text: str) -> ParsedIngredient:
+    """
+    Split an ingredient line such as "1 1/2 cups cooked brown rice" or
+    "6 oz chicken breast, grilled" into quantity, unit, size factor and food text.
+    Ranges ("2-3 eggs") use their midpoint; lines without a quantity get None.
+    """
+    for symbol, replacement in _UNICODE_FRACTIONS.items():
+        text = text.replace(symbol, replacement)
+    text = _PARENTHETICAL_RE.sub(" ", text).split(",")[0].strip()
+
+    quantity = None
+    match = _QUANTITY_RE.match(text)
+    if match:
+        quantity = _parse_number(match.group("quantity"))
+        if match.group("upper"):
+            quantity = (quantity + _parse_number(match.group("upper"))) / 2
+        text = text[match.end():]
+
+    unit_match = _UNIT_RE.match(text)
+    size = SIZE_FACTORS.get((unit_match.group("size") or "").lower(), 1.0)
+    unit = (unit_match.group("unit") or "").lower() or None
+    return ParsedIngredient(quantity, unit, size, text[unit_match.end():].strip())
+
+
+def _singular(word: str) -> str:
+    if len(word) > 3 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("oes", "ches", "shes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def normalize_food_name(text: str) -> str:
+    words = _NON_WORD_RE.sub(" ", text.lower().replace("-", " ")).split()
+    return " ".join(_singular(word) for word in words)
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@lru_cache(maxsize=1)
+def load_food_table(path: str = FOOD_TABLE_PATH) -> FoodTable:
+    """Load the bundled food-composition table (cached for the process)"""
+    names, rows, cup_grams, unit_grams = [], [], [], []
+    aliases: Dict[str, int] = {}
+    with open(path, encoding="utf-8", newline="") as table_file:
+        for record in csv.DictReader(table_file):
+            if not record["name"] or record["name"].startswith("#"):
+                continue
+            index = len(names)
+            names.append(record["name"])
+            rows.append([float(record[column]) for column in NUTRIENTS])
+            cup_grams.append(float(record["cup_g"]) if record["cup_g"] else np.nan)
+            unit_grams.append(float(record["unit_g"]) if record["unit_g"] else np.nan)
+            for alias in [record["name"]] + [a for a in (record["aliases"] or "").split("|") if a]:
+                key = normalize_food_name(alias)
+                if key in aliases and aliases[key] != index:
+                    logger.debug(f"Food alias '{alias}' already maps to {names[aliases[key]]}")
+                    continue
+                aliases[key] = index
+    return FoodTable(
+        names,
+        np.asarray(rows, dtype=np.float64),
+        np.asarray(cup_grams, dtype=np.float64),
+        np.asarray(unit_grams, dtype=np.float64),
+        aliases,
+    )
+
+
+class FoodIndex:
+    """
+    Fuzzy food-name lookup over the table's names and aliases.
+    Tries an exact match, then the longest exact word n-gram, then
+    character-trigram (Dice) similarity for misspellings.
+    """
+
+    def __init__(self, table: FoodTable, min_similarity: float = 0.6):
+        self.table = table
+        self.min_similarity = min_similarity
+        self._keys = list(table.aliases)
+        self._key_trigrams = [_trigrams(key) for key in self._keys]
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for position, grams in enumerate(self._key_trigrams):
+            for gram in grams:
+                self._postings[gram].append(position)
+        self.lookup = lru_cache(maxsize=4096)(self._lookup)
+
+    def _lookup(self, text: str) -> Optional[int]:
+        key = normalize_food_name(text)
+        if not key:
+            return None
+        if key in self.table.aliases:
+            return self.table.aliases[key]
+
+        words = key.split()
+        for size in range(len(words), 0, -1):
+            for start in range(len(words) - size + 1):
+                candidate = " ".join(words[start:start + size])
+                if candidate in self.table.aliases and candidate not in _DESCRIPTORS:
+                    return self.table.aliases[candidate]
+
+        cleaned = " ".join(word for word in words if word not in _DESCRIPTORS) or key
+        grams = _trigrams(cleaned)
+        overlap: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for position in self._postings.get(gram, ()):
+                overlap[position] += 1
+        best, best_score = None, 0.0
+        for position, shared in overlap.items():
+            score = 2 * shared / (len(grams) + len(self._key_trigrams[position]))
+            if score > best_score:
+                best, best_score = position, score
+        if best is not None and best_score >= self.min_similarity:
+            return self.table.aliases[self._keys[best]]
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_food_index() -> FoodIndex:
+    return FoodIndex(load_food_table())
+
+
+def ingredient_grams(parsed: ParsedIngredient, food: int, table: FoodTable) -> float:
+    """Weight in grams of a parsed ingredient line for a table row"""
+    if parsed.quantity is None and table.names[food] in _ZERO_WITHOUT_QUANTITY:
+        return 0.0
+    quantity = (parsed.quantity if parsed.quantity is not None else 1.0) * parsed.size
+    if parsed.unit in GRAMS_PER_UNIT:
+        return quantity * GRAMS_PER_UNIT[parsed.unit]
+    if parsed.unit in CUPS_PER_UNIT:
+        cup = table.cup_grams[food]
+        return quantity * CUPS_PER_UNIT[parsed.unit] * (cup if not np.isnan(cup) else DEFAULT_CUP_GRAMS)
+    unit = table.unit_grams[food]
+    return quantity * (unit if not np.isnan(unit) else DEFAULT_UNIT_GRAMS)
+
+
+def compute_plan_nutrition(meal_plan: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """
+    Per-serving nutrients for every meal of a plan in one vectorized pass.
+
+    Ingredient lines are parsed and looked up in Python (both cached), then
+    all ingredient rows of the plan are weighted and summed with NumPy.
+    Returns (meal_matrix, meal_days, report): meal_matrix is (meals, NUTRIENTS)
+    in plan order, meal_days the day position of each meal. Meals with no
+    recognised ingredient are listed in report["unresolved_meals"] by row.
+    """
+    table = load_food_table()
+    index = get_food_index()
+
+    foods, grams, owners = [], [], []
+    meal_days, servings, unresolved, unmatched = [], [], [], []
+    ingredient_count = 0
+    for day_position, day in enumerate(meal_plan):
+        for meal in day.get("meals", []):
+            meal_id = len(meal_days)
+            meal_days.append(day_position)
+            servings.append(max(int(meal.get("servings") or 1), 1))
+            matched = 0
+            for line in meal.get("ingredients", []):
+                ingredient_count += 1
+                parsed = parse_ingredient(str(line))
+                food = index.lookup(parsed.food)
+                if food is None:
+                    unmatched.append(str(line))
+                    continue
+                foods.append(food)
+                grams.append(ingredient_grams(parsed, food, table))
+                owners.append(meal_id)
+                matched += 1
+            if not matched:
+                unresolved.append(meal_id)
+
+    meal_matrix = np.zeros((len(meal_days), len(NUTRIENTS)))
+    if foods:
+        contributions = table.nutrients[np.asarray(foods)] * (np.asarray(grams) / 100.0)[:, None]
+        np.add.at(meal_matrix, np.asarray(owners), contributions)
+    if meal_days:
+        meal_matrix /= np.asarray(servings, dtype=np.float64)[:, None]
+
+    report = {
+        "ingredients": ingredient_count,
+        "matched": ingredient_count - len(unmatched),
+        "unmatched": unmatched,
+        "unresolved_meals": unresolved,
+    }
+    return meal_matrix, np.asarray(meal_days, dtype=np.int64), report
+
+
+def _fallback_nutrients(meal: Dict[str, Any]) -> List[float]:
+    """Model-provided numbers, or a typical meal of its type when there are none"""
+    calories = meal.get("estimated_calories") or FALLBACK_MEAL_CALORIES.get(meal.get("meal_type"), 400)
+    macros = meal.get("macronutrients") or {}
+    return [
+        float(calories),
+        float(macros.get("protein", calories * 0.20 / 4)),
+        float(macros.get("carbs", calories * 0.50 / 4)),
+        float(macros.get("fats", calories * 0.30 / 9)),
+        float(macros.get("fiber", 0.0)),
+    ]
+
+
+def apply_plan_nutrition(meal_plan: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Write locally computed calories and macros into a meal plan in place:
+    per-meal estimated_calories and macronutrients, per-day
+    total_estimated_calories and nutrition_summary (sums of the rounded
+    meal values, so they always reconcile). Meals whose ingredients are
+    all unrecognised keep the model's numbers or a typical value for
+    their meal type. Returns the coverage report.
+    """
+    meal_matrix, meal_days, report = compute_plan_nutrition(meal_plan)
+    meals = [meal for day in meal_plan for meal in day.get("meals", [])]
+    for row in report["unresolved_meals"]:
+        meal_matrix[row] = _fallback_nutrients(meals[row])
+
+    meal_matrix = np.rint(meal_matrix).astype(np.int64)
+    day_matrix = np.zeros((len(meal_plan), len(NUTRIENTS)), dtype=np.int64)
+    if len(meals):
+        np.add.at(day_matrix, meal_days, meal_matrix)
+
+    for meal, (calories, protein, carbs, fat, fiber) in zip(meals, meal_matrix.tolist()):
+        meal["estimated_calories"] = calories
+        meal["macronutrients"] = {"protein": protein, "carbs": carbs, "fats": fat, "fiber": fiber}
+    for day, (calories, protein, carbs, fat, fiber) in zip(meal_plan, day_matrix.tolist()):
+        day["total_estimated_calories"] = calories
+        day["nutrition_summary"] = {
+            "protein_grams": protein, "carbs_grams": carbs, "fats_grams": fat, "fiber_grams": fiber,
+        }
+
+    if report["unmatched"]:
+        logger.info(
+            f"Nutrition lookup matched {report['matched']}/{report['ingredients']} ingredients; "
+            f"unmatched: {report['unmatched'][:5]}"
+        )
+    return report
+
+
+def _format_quantity(quantity: float) -> str:
+    """Kitchen-friendly number: whole above 10, otherwise to the nearest quarter"""
+    if quantity >= 10:
+        return str(int(round(quantity)))
+    quarters = max(round(quantity * 4), 1) / 4
+    return f"{quarters:g}"
+
+
+def scale_ingredient(line: str, factor: float) -> str:
+    """
+    The ingredient line with its leading quantity (both ends of a range)
+    multiplied by factor: "1 1/2 cups rice" x 2 -> "3 cups rice".
+    Lines without a quantity ("salt to taste") are returned unchanged.
+    """
+    text = str(line)
+    for symbol, replacement in _UNICODE_FRACTIONS.items():
+        text = text.replace(symbol, replacement)
+    match = _QUANTITY_RE.match(text)
+    if not match:
+        return str(line)
+    quantity = _format_quantity(_parse_number(match.group("quantity")) * factor)
+    if match.group("upper"):
+        quantity += f"-{_format_quantity(_parse_number(match.group('upper')) * factor)}"
+    return f"{quantity} {text[match.end():]}"
+
+
+def scale_meal_day_portions(day: Dict[str, Any], factor: float) -> None:
+    """Scale every ingredient quantity of a day in place; recompute with apply_plan_nutrition after"""
+    for meal in day.get("meals", []):
+        meal["ingredients"] = [scale_ingredient(line, factor) for line in meal.get("ingredients", [])]
@@ -0,0 +1,396 @@
+import copy
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.constants.enums import MealType, WorkoutType
+from backend.utils.keyword_matcher import KeywordMatcher
+
+# Plans number days 1-7 starting on Monday
+DAY_NAMES = {
+    "monday": 1, "tuesday": 2, "wednesday": 3, "thursday": 4, "friday": 5, "saturday": 6, "sunday": 7,
+    "tue": 2, "tues": 2, "thu": 4, "thur": 4, "thurs": 4, "fri": 5,
+}
+WEEKEND_DAYS = [6, 7]
+
+MEAL_WORDS = {
+    MealType.BREAKFAST.value: ["breakfast", "brunch"],
+    MealType.LUNCH.value: ["lunch"],
+    MealType.DINNER.value: ["dinner", "supper"],
+    MealType.SNACK.value: ["snack"],
+    MealType.PRE_WORKOUT.value: ["pre workout", "pre workout snack"],
+    MealType.POST_WORKOUT.value: ["post workout", "post workout snack", "recovery meal"],
+}
+
+# How people name workout types in free text
+WORKOUT_WORDS = {
+    WorkoutType.RUNNING.value: ["running", "run", "jog", "jogging", "sprint", "sprints"],
+    WorkoutType.WALKING.value: ["walking", "walk"],
+    WorkoutType.CYCLING.value: ["cycling", "bike", "biking", "spin"],
+    WorkoutType.SWIMMING.value: ["swimming", "swim", "pool"],
+    WorkoutType.HIIT.value: ["hiit", "interval training", "high intensity"],
+    WorkoutType.YOGA.value: ["yoga"],
+    WorkoutType.PILATES.value: ["pilates"],
+    WorkoutType.STRENGTH.value: ["strength", "strength training"],
+    WorkoutType.WEIGHTLIFTING.value: ["weightlifting", "weights", "lifting", "barbell"],
+    WorkoutType.BODYWEIGHT.value: ["bodyweight"],
+    WorkoutType.CARDIO.value: ["cardio"],
+    WorkoutType.FLEXIBILITY.value: ["stretching", "flexibility"],
+    WorkoutType.BALANCE.value: ["balance"],
+    WorkoutType.DANCE.value: ["dance", "dancing"],
+    WorkoutType.MARTIAL_ARTS.value: ["martial arts", "boxing", "kickboxing"],
+    WorkoutType.CROSSFIT.value: ["crossfit"],
+    WorkoutType.SPORTS.value: ["sports"],
+}
+
+# Food groups people exclude by name, mapped to the restriction that removes them
+FOOD_GROUP_RESTRICTIONS = {
+    "dairy": "dairy_free", "milk": "dairy_free", "lactose": "dairy_free", "cheese": "dairy_free",
+    "gluten": "gluten_free", "wheat": "gluten_free",
+    "nut": "nut_free", "nuts": "nut_free", "peanut": "nut_free", "peanuts": "nut_free",
+    "meat": "vegetarian", "egg": "egg_free", "eggs": "egg_free", "soy": "soy_free",
+    "shellfish": "shellfish_free", "seafood": "shellfish_free", "sugar": "low_sugar",
+}
+
+SCOPE_WORDS = {
+    "workout": ["workout", "workouts", "exercise", "exercises", "training", "session", "sessions"],
+    "meal": ["meal", "meals", "food", "recipe", "recipes", "eat", "dish", "menu"],
+}
+
+# Words that mark the next mention as something to take out of the plan
+_REMOVE_CUE_RE = re.compile(
+    r"\b(?:no|not|without|avoid|skip|drop|remove|replace|swap|switch|change|hate|dislike|"
+    r"instead of|allergic to|can't|cannot|don't|dont|stop|less)\b[\w\s']{0,24}$"
+)
+# A removal cue only reaches as far as its clause; "swap the run for a swim" asks for the swim
+_CLAUSE_BREAK_RE = re.compile(
+    r"[,.;:!?]|\b(?:and|but|then|for|with|into)\b"
+    r"|(?<!want )(?<!like )(?<!need )(?<!have )(?<!going )(?<!allergic )\bto\b"
+)
+# Questions about the plan ("can I run more on monday?") go to the chat path, not a targeted edit
+_QUESTION_RE = re.compile(
+    r"^(?:can|could|should|would|will|is|are|am|do|does|did)\s+(?:i|we|my|it|this|that|there|these|those|you)\b"
+    r"|^(?:what|why|how|when|where|which|who)\b|\?\s*$"
+)
+_POLITE_REQUEST_RE = re.compile(r"^(?:(?:can|could|would|will) you|please)\b")
+_CHANGE_VERB_RE = re.compile(
+    r"\b(?:swap|replace|switch|change|substitute|remove|drop|skip|avoid|exclude|take out|cut out|get rid of|"
+    r"move|add|make|give me|use|no|without|instead of|hate|dislike|allergic to|don't|dont|can't eat|stop|"
+    r"want|prefer|rather|would like)\b"
+)
+# Free-form exclusions: "no mushrooms", "without burpees", "allergic to kiwi"
+_EXCLUSION_RE = re.compile(
+    r"\b(?:no|without|avoid|skip|hate|dislike|allergic to|instead of|don't like|dont like|can't eat)"
+    r"\s+(?:any\s+|more\s+|the\s+)?([a-z][a-z\-]{2,})"
+)
+_DAY_NUMBER_RE = re.compile(r"\bday\s+([1-7])\b")
+_STOP_WORDS = {
+    "more", "than", "longer", "time", "days", "day", "meals", "meal", "workouts", "workout", "exercise",
+    "exercises", "thanks", "problem", "need", "way", "one", "later", "earlier",
+}
+
+# Lists whose items are replaced whole in a patch rather than field by field
+ATOMIC_LISTS = {"exercises", "meals"}
+
+
+def _build_vocabulary() -> KeywordMatcher:
+    lexicon: Dict[str, List[str]] = {}
+    for name, day in DAY_NAMES.items():
+        lexicon.setdefault(f"day:{day}", []).append(name)
+    lexicon["day:weekend"] = ["weekend", "weekends"]
+    for meal_type, words in MEAL_WORDS.items():
+        lexicon[f"meal:{meal_type}"] = words + [word + "s" for word in words]
+    for workout_type, words in WORKOUT_WORDS.items():
+        lexicon[f"type:{workout_type}"] = words
+    for scope, words in SCOPE_WORDS.items():
+        lexicon[f"scope:{scope}"] = words
+    return KeywordMatcher(lexicon, whole_words=True)
+
+
+MODIFICATION_VOCABULARY = _build_vocabulary()
+
+
+def _term_pattern(term: str) -> re.Pattern:
+    stem = re.sub(r"(?:es|s)$", "", term) if len(term) > 4 else term
+    return re.compile(rf"\b{re.escape(stem)}(?:s|es)?\b")
+
+
+def _clause_before(text: str, offset: int) -> str:
+    start = 0
+    for match in _CLAUSE_BREAK_RE.finditer(text, 0, offset):
+        start = match.end()
+    return text[start:offset]
+
+
+def is_change_request(text: str) -> bool:
+    """Whether a lower-cased message asks for a change; questions only count when they ask us to make one"""
+    text = text.strip()
+    if _QUESTION_RE.search(text) and not _POLITE_REQUEST_RE.search(text):
+        return False
+    return bool(_CHANGE_VERB_RE.search(text))
+
+
+def parse_modification(message: str) -> Dict[str, Any]:
+    """
+    Work out what a plan change request refers to.
+
+    Returns the days (1-7, Monday first), meal types and workout types it
+    names, which workout types and free-form terms it wants taken out,
+    food groups it excludes (as dietary restrictions), whether it is
+    about workouts, meals or both, and whether it asks for a change at
+    all (requested). Nothing here calls an LLM.
+    """
+    text = message.lower()
+    days: List[int] = []
+    meal_types: List[str] = []
+    preferred_types: List[str] = []
+    excluded_types: List[str] = []
+    scopes = set()
+
+    for offset, keyword in MODIFICATION_VOCABULARY.locate(text):
+        for category in MODIFICATION_VOCABULARY.keyword_categories(keyword):
+            kind, _, value = category.partition(":")
+            if kind == "day":
+                for day in (WEEKEND_DAYS if value == "weekend" else [int(value)]):
+                    if day not in days:
+                        days.append(day)
+            elif kind == "meal" and value not in meal_types:
+                meal_types.append(value)
+                scopes.add("meal")
+            elif kind == "type":
+                scopes.add("workout")
+                removing = _REMOVE_CUE_RE.search(_clause_before(text, offset))
+                target = excluded_types if removing else preferred_types
+                if value not in target:
+                    target.append(value)
+            elif kind == "scope":
+                scopes.add(value)
+    for match in _DAY_NUMBER_RE.finditer(text):
+        if int(match.group(1)) not in days:
+            days.append(int(match.group(1)))
+
+    vocabulary = {word for words in WORKOUT_WORDS.values() for word in words}
+    vocabulary |= {word for words in MEAL_WORDS.values() for word in words}
+    excluded_terms: List[str] = []
+    excluded_restrictions: List[str] = []
+    for match in _EXCLUSION_RE.finditer(text):
+        term = match.group(1)
+        if term in vocabulary or term in _STOP_WORDS or term in DAY_NAMES:
+            continue
+        if term in FOOD_GROUP_RESTRICTIONS:
+            restriction = FOOD_GROUP_RESTRICTIONS[term]
+            if restriction not in excluded_restrictions:
+                excluded_restrictions.append(restriction)
+            scopes.add("meal")
+        elif term not in excluded_terms:
+            excluded_terms.append(term)
+
+    return {
+        "message": message,
+        "days": sorted(days),
+        "meal_types": meal_types,
+        "preferred_types": [value for value in preferred_types if value not in excluded_types],
+        "excluded_types": excluded_types,
+        "excluded_terms": excluded_terms,
+        "excluded_restrictions": excluded_restrictions,
+        "scopes": sorted(scopes),
+        "requested": is_change_request(text),
+    }
+
+
+def targets_plan(modification: Dict[str, Any]) -> bool:
+    """Whether a parsed request can point at specific exercises or meals (see find_affected_fragments)"""
+    return modification["requested"] and bool(
+        modification["excluded_types"] or modification["excluded_terms"] or modification["excluded_restrictions"]
+        or (modification["days"] and "workout" in modification["scopes"])
+        or ((modification["days"] or modification["meal_types"]) and "meal" in modification["scopes"])
+    )
+
+
+def mentions_term(text: str, term: str) -> bool:
+    return bool(_term_pattern(term).search(str(text).lower()))
+
+
+def _meal_text(meal: Dict[str, Any]) -> str:
+    return " ".join([str(meal.get("name", ""))] + [str(item) for item in meal.get("ingredients", [])])
+
+
+def find_affected_fragments(
+    workout_plan: List[Dict[str, Any]],
+    meal_plan: List[Dict[str, Any]],
+    modification: Dict[str, Any],
+    restriction_check=None,
+) -> List[Dict[str, Any]]:
+    """
+    Exercises and meals a modification touches, in plan order.
+
+    Each fragment has its kind ("exercise" or "meal"), the plan day, the
+    list positions, its JSON pointer in the plan and why it was picked.
+    restriction_check(meal, restrictions) -> bool flags meals that break
+    the food groups the modification excludes.
+    """
+    days = set(modification["days"])
+    scopes = set(modification["scopes"])
+    fragments: List[Dict[str, Any]] = []
+
+    def in_scope(day: Dict[str, Any]) -> bool:
+        return not days or day.get("day") in days
+
+    for day_index, day in enumerate(workout_plan):
+        if day.get("rest_day") or not in_scope(day):
+            continue
+        for item_index, exercise in enumerate(day.get("exercises", [])):
+            reason = None
+            if exercise.get("type") in modification["excluded_types"] or any(
+                mentions_term(exercise.get("name", ""), word)
+                for workout_type in modification["excluded_types"] for word in WORKOUT_WORDS.get(workout_type, [])
+            ):
+                reason = "excluded workout type"
+            elif any(mentions_term(exercise.get("name", ""), term) for term in modification["excluded_terms"]):
+                reason = "excluded exercise"
+            elif days and "workout" in scopes and not modification["excluded_types"] and not modification["excluded_terms"]:
+                reason = "day change requested"
+            if reason:
+                fragments.append({
+                    "kind": "exercise", "day": day.get("day"), "day_index": day_index, "item_index": item_index,
+                    "path": f"/workout_plan/{day_index}/exercises/{item_index}",
+                    "current": exercise.get("name"), "reason": reason,
+                })
+
+    targeted_meals = bool(days or modification["meal_types"]) and "meal" in scopes
+    for day_index, day in enumerate(meal_plan):
+        if not in_scope(day):
+            continue
+        for item_index, meal in enumerate(day.get("meals", [])):
+            if modification["meal_types"] and meal.get("meal_type") not in modification["meal_types"]:
+                continue
+            reason = None
+            if any(mentions_term(_meal_text(meal), term) for term in modification["excluded_terms"]):
+                reason = "excluded ingredient"
+            elif restriction_check and modification["excluded_restrictions"] and restriction_check(
+                meal, modification["excluded_restrictions"]
+            ):
+                reason = "excluded food group"
+            elif targeted_meals and not modification["excluded_terms"] and not modification["excluded_restrictions"]:
+                reason = "meal change requested"
+            if reason:
+                fragments.append({
+                    "kind": "meal", "day": day.get("day"), "day_index": day_index, "item_index": item_index,
+                    "path": f"/meal_plan/{day_index}/meals/{item_index}",
+                    "current": meal.get("name"), "reason": reason,
+                })
+    return fragments
+
+
+def _escape_pointer(key: str) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def diff_plan(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """
+    JSON Patch (RFC 6902) operations turning old into new. Objects are
+    compared key by key, equal-length lists item by item; items of
+    ATOMIC_LISTS (a single exercise or meal) are replaced whole.
+    """
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        operations = []
+        for key in old:
+            child = f"{path}/{_escape_pointer(key)}"
+            if key not in new:
+                operations.append({"op": "remove", "path": child})
+            elif key in ATOMIC_LISTS and isinstance(old[key], list) and isinstance(new[key], list) \
+                    and len(old[key]) == len(new[key]):
+                operations.extend(
+                    {"op": "replace", "path": f"{child}/{index}", "value": item}
+                    for index, (before, item) in enumerate(zip(old[key], new[key])) if before != item
+                )
+            else:
+                operations.extend(diff_plan(old[key], new[key], child))
+        operations.extend(
+            {"op": "add", "path": f"{path}/{_escape_pointer(key)}", "value": value}
+            for key, value in new.items() if key not in old
+        )
+        return operations
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        operations = []
+        for index, (before, after) in enumerate(zip(old, new)):
+            operations.extend(diff_plan(before, after, f"{path}/{index}"))
+        return operations
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def build_plan_patch(
+    plan_id: str,
+    base_version: int,
+    operations: List[Dict[str, Any]],
+    fragments: List[Dict[str, Any]],
+    validators: List[str],
+    warnings: List[str],
+) -> Dict[str, Any]:
+    """A versioned patch: applies only to the plan at base_version and produces version base_version + 1"""
+    return {
+        "plan_id": plan_id,
+        "base_version": base_version,
+        "version": base_version + 1,
+        "operations": operations,
+        "changed_fragments": [
+            {key: fragment[key] for key in ("kind", "day", "path", "current", "reason")} for fragment in fragments
+        ],
+        "validators_run": validators,
+        "warnings": warnings,
+    }
+
+
+def _resolve(document: Any, path: str) -> Tuple[Any, str]:
+    parts = [part.replace("~1", "/").replace("~0", "~") for part in path.split("/")[1:]]
+    parent = document
+    for part in parts[:-1]:
+        parent = parent[int(part)] if isinstance(parent, list) else parent[part]
+    return parent, parts[-1]
+
+
+def apply_plan_patch(plan: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply a versioned patch to a plan dict and return the patched copy.
+    Raises ValueError when the plan is not at the patch's base version.
+    """
+    current = plan.get("plan_version", 1)
+    if current != patch["base_version"]:
+        raise ValueError(f"Patch expects plan version {patch['base_version']}, plan is at version {current}")
+
+    patched = copy.deepcopy(plan)
+    for operation in patch["operations"]:
+        parent, key = _resolve(patched, operation["path"])
+        if isinstance(parent, list):
+            index = len(parent) if key == "-" else int(key)
+            if operation["op"] == "add":
+                parent.insert(index, copy.deepcopy(operation["value"]))
+            elif operation["op"] == "remove":
+                del parent[index]
+            else:
+                parent[index] = copy.deepcopy(operation["value"])
+        elif operation["op"] == "remove":
+            del parent[key]
+        else:
+            parent[key] = copy.deepcopy(operation["value"])
+    patched["plan_version"] = patch["version"]
+    return patched
+
+
+def changed_days(fragments: List[Dict[str, Any]], kind: str) -> List[int]:
+    """Plan positions of the days holding fragments of one kind"""
+    return sorted({fragment["day_index"] for fragment in fragments if fragment["kind"] == kind})
+
+
+def describe_fragments(fragments: List[Dict[str, Any]]) -> Optional[str]:
+    if not fragments:
+        return None
+    exercises = sum(1 for fragment in fragments if fragment["kind"] == "exercise")
+    meals = len(fragments) - exercises
+    parts = []
+    if exercises:
+        parts.append(f"{exercises} exercise{'s' if exercises != 1 else ''}")
+    if meals:
+        parts.append(f"{meals} meal{'s' if meals != 1 else ''}")
+    return " and ".join(parts)
@@ -0,0 +1,80 @@
+import base64
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from beanie import PydanticObjectId
+
+from backend.config import main as config
+from backend.constants.enums import PlanEventKind
+from backend.models.PlanEvent import PlanEvent
+
+
+def encode_cursor(event: PlanEvent) -> str:
+    """Opaque pagination cursor: the position of the last event on a page"""
+    raw = f"{event.timestamp.isoformat()}|{event.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, PydanticObjectId]:
+    """Raises ValueError for a cursor that encode_cursor did not produce"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, event_id = raw.split("|")
+        return datetime.fromisoformat(timestamp), PydanticObjectId(event_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def page_size(limit: Optional[int]) -> int:
+    return min(max(limit or config.PLAN_EVENTS_PAGE_SIZE, 1), config.PLAN_EVENTS_MAX_PAGE_SIZE)
+
+
+async def record_plan_events(events: Iterable[PlanEvent]) -> int:
+    """Append events in one batched insert; returns how many were written"""
+    events = list(events)
+    if not events:
+        return 0
+    await PlanEvent.insert_many(events, ordered=False)
+    return len(events)
+
+
+async def list_plan_events(
+    plan_id: PydanticObjectId,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    kinds: Optional[List[PlanEventKind]] = None,
+) -> Dict[str, Any]:
+    """
+    One page of a plan's events, newest first.
+
+    Pages are keyed on (timestamp, _id) rather than skip counts, so each
+    page is a range scan of the plan_id/timestamp index and stays stable
+    while new events are appended. Returns the events and the cursor for
+    the next page (None on the last page).
+    """
+    size = page_size(limit)
+    query: Dict[str, Any] = {"plan_id": plan_id}
+    if kinds:
+        query["kind"] = {"$in": [kind.value for kind in kinds]}
+    if cursor:
+        timestamp, event_id = decode_cursor(cursor)
+        query["$or"] = [
+            {"timestamp": {"$lt": timestamp}},
+            {"timestamp": timestamp, "_id": {"$lt": event_id}},
+        ]
+
+    # One extra event tells whether another page exists
+    events = await PlanEvent.find(query).sort([("timestamp", -1), ("_id", -1)]).limit(size + 1).to_list()
+    has_more = len(events) > size
+    events = events[:size]
+    return {
+        "events": events,
+        "next_cursor": encode_cursor(events[-1]) if has_more else None,
+    }
+
+
+async def count_plan_events(plan_id: PydanticObjectId, kinds: Optional[List[PlanEventKind]] = None) -> int:
+    query: Dict[str, Any] = {"plan_id": plan_id}
+    if kinds:
+        query["kind"] = {"$in": [kind.value for kind in kinds]}
+    return await PlanEvent.find(query).count()
@@ -0,0 +1,280 @@
+import copy
+import logging
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from backend.constants.exercise_catalog import EXERCISE_CATALOG
+from backend.utils.workout_planner import (
+    INTENSITY_ORDER, KCAL_PER_MINUTE, MAX_EXERCISE_MINUTES, MAX_SESSION_MINUTES, MAX_WEEKLY_MINUTES,
+    THEME_TYPES, intensity_cap, resolve_equipment,
+)
+
+logger = logging.getLogger(__name__)
+
+# Progressive overload: exercise minutes grow each week of a block and the
+# last week of every block is a lighter recovery week
+BLOCK_WEEKS = 4
+WEEKLY_RAMP = 0.10
+DELOAD_FACTOR = 0.85
+# Each new block starts a little above the previous one
+BLOCK_STEP = 0.05
+MAX_RAMP = 1.5
+RAMP_STEP = 0.05
+
+# Even weeks swap exercises for catalog alternatives, odd weeks keep week 1's
+SUBSTITUTION_INTERVAL = 2
+
+# Each meal type moves by a different number of days per week so the day combinations change
+MEAL_ROTATION_STEP = {"breakfast": 1, "lunch": 2, "dinner": 3, "snack": 4, "pre_workout": 5, "post_workout": 6}
+
+# DailyMealPlan model bounds
+MIN_DAY_CALORIES = 1200
+MAX_DAY_CALORIES = 3000
+MAX_DAY_WORKOUT_CALORIES = 1000
+
+CATALOG_BY_NAME = {exercise["name"].lower(): exercise for exercise in EXERCISE_CATALOG}
+
+
+def _focus_by_muscle() -> Dict[str, str]:
+    """Most common catalog focus for each target muscle, to place exercises the catalog doesn't know"""
+    counts: Dict[str, Counter] = {}
+    for exercise in EXERCISE_CATALOG:
+        for muscle in exercise["target_muscles"]:
+            counts.setdefault(muscle.lower(), Counter())[exercise["focus"]] += 1
+    return {muscle: counter.most_common(1)[0][0] for muscle, counter in counts.items()}
+
+
+FOCUS_BY_MUSCLE = _focus_by_muscle()
+
+
+def ramp_factor(week: int) -> float:
+    """Exercise-minute multiplier for a week relative to week 1"""
+    block, position = divmod(week - 1, BLOCK_WEEKS)
+    base = 1 + BLOCK_STEP * block
+    if position == BLOCK_WEEKS - 1:
+        return round(base * DELOAD_FACTOR, 2)
+    return round(min(base * (1 + WEEKLY_RAMP * position), MAX_RAMP), 2)
+
+
+def is_deload_week(week: int) -> bool:
+    return week % BLOCK_WEEKS == 0
+
+
+def _exercise_focus(exercise: Dict[str, Any]) -> Optional[str]:
+    known = CATALOG_BY_NAME.get(str(exercise.get("name", "")).lower())
+    if known:
+        return known["focus"]
+    focuses = Counter(
+        FOCUS_BY_MUSCLE[muscle.lower()] for muscle in exercise.get("target_muscles") or []
+        if muscle.lower() in FOCUS_BY_MUSCLE
+    )
+    return focuses.most_common(1)[0][0] if focuses else None
+
+
+def _theme(workout_type: str) -> Optional[str]:
+    for theme, types in THEME_TYPES.items():
+        if workout_type in types:
+            return theme
+    return None
+
+
+def substitutes(
+    exercise: Dict[str, Any],
+    equipment: Set[str],
+    max_intensity: str,
+    exclude_types: Iterable[str] = (),
+) -> List[Dict[str, Any]]:
+    """
+    Catalog alternatives for an exercise: same workout type (or the same
+    theme when none share the type), same focus when it can be told, no
+    harder than the original or the profile cap, doable with the
+    available equipment and not of an excluded type.
+    """
+    exclude_types = set(exclude_types)
+    workout_type = exercise.get("type")
+    intensity = exercise.get("intensity")
+    rank = INTENSITY_ORDER.index(max_intensity)
+    if intensity in INTENSITY_ORDER:
+        rank = min(rank, INTENSITY_ORDER.index(intensity))
+    focus = _exercise_focus(exercise)
+    name = str(exercise.get("name", "")).lower()
+
+    pool = [
+        candidate for candidate in EXERCISE_CATALOG
+        if candidate["name"].lower() != name
+        and INTENSITY_ORDER.index(candidate["intensity"]) <= rank
+        and set(candidate["equipment_needed"]) <= equipment
+        and (focus is None or candidate["focus"] == focus)
+        and candidate["type"] not in exclude_types
+    ]
+    same_type = [candidate for candidate in pool if candidate["type"] == workout_type]
+    if same_type:
+        return same_type
+    theme = _theme(workout_type)
+    return [candidate for candidate in pool if theme and candidate["type"] in THEME_TYPES[theme]]
+
+
+def catalog_exercise(entry: Dict[str, Any], minutes: int) -> Dict[str, Any]:
+    return {
+        "name": entry["name"],
+        "type": entry["type"],
+        "duration_minutes": minutes,
+        "intensity": entry["intensity"],
+        "instructions": entry["instructions"],
+        "target_muscles": list(entry["target_muscles"]),
+        "equipment_needed": list(entry["equipment_needed"]),
+        "modifications": entry["modifications"],
+        "safety_notes": entry["safety_notes"],
+    }
+
+
+def _progress_day(
+    day: Dict[str, Any],
+    factor: float,
+    session_cap: int,
+    rotation: int,
+    equipment: Set[str],
+    max_intensity: str,
+) -> Dict[str, Any]:
+    """One training day scaled by factor, with exercises swapped for catalog alternatives when rotation > 0"""
+    progressed = copy.deepcopy(day)
+    exercises = day.get("exercises") or []
+    if day.get("rest_day", False) or not exercises:
+        return progressed
+
+    base_minutes = sum(exercise.get("duration_minutes", 0) for exercise in exercises)
+    total = day.get("total_duration_minutes", base_minutes)
+    # Warm-up and cool-down stay as they were; only the main block grows
+    fixed = max(total - base_minutes, 0)
+    if factor > 1 and base_minutes:
+        factor = max(min(factor, (max(total, session_cap) - fixed) / base_minutes), 1.0)
+
+    used = {str(exercise.get("name", "")).lower() for exercise in exercises}
+    calories = day.get("estimated_calories_burned", 0)
+    new_exercises = []
+    for exercise in exercises:
+        minutes = exercise.get("duration_minutes", 0)
+        scaled = min(max(round(minutes * factor), 1), MAX_EXERCISE_MINUTES)
+        replacement = copy.deepcopy(exercise)
+        replacement["duration_minutes"] = scaled
+        if rotation:
+            options = [
+                option for option in substitutes(exercise, equipment, max_intensity)
+                if option["name"].lower() not in used
+            ]
+            if options:
+                chosen = options[(rotation - 1) % len(options)]
+                used.add(chosen["name"].lower())
+                replacement = catalog_exercise(chosen, scaled)
+        calories += (
+            KCAL_PER_MINUTE.get(replacement.get("intensity"), KCAL_PER_MINUTE["moderate"]) * scaled
+            - KCAL_PER_MINUTE.get(exercise.get("intensity"), KCAL_PER_MINUTE["moderate"]) * minutes
+        )
+        new_exercises.append(replacement)
+
+    progressed["exercises"] = new_exercises
+    progressed["total_duration_minutes"] = fixed + sum(exercise["duration_minutes"] for exercise in new_exercises)
+    progressed["estimated_calories_burned"] = min(max(int(calories), 0), MAX_DAY_WORKOUT_CALORIES)
+    if day.get("intensity_level"):
+        progressed["intensity_level"] = max(
+            (exercise["intensity"] for exercise in new_exercises if exercise.get("intensity") in INTENSITY_ORDER),
+            key=INTENSITY_ORDER.index, default=day["intensity_level"],
+        )
+    return progressed
+
+
+def progress_workout_week(
+    workout_week: List[Dict[str, Any]],
+    week: int,
+    profile: Dict[str, Any],
+    safety_check: Optional[Dict] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Derive a later week from the week-1 workout plan.
+
+    Exercise minutes follow ramp_factor (never past the session time the
+    safety check allows, MAX_SESSION_MINUTES or MAX_WEEKLY_MINUTES, unless
+    week 1 was already longer), intensity never rises, and even weeks
+    rotate exercises through catalog alternatives. Rest days stay put.
+    """
+    time_available = (
+        (safety_check or {}).get("adjusted_minutes") or profile.get("time_availability_minutes") or MAX_SESSION_MINUTES
+    )
+    session_cap = min(time_available, MAX_SESSION_MINUTES)
+    week_one_minutes = sum(day.get("total_duration_minutes", 0) for day in workout_week if not day.get("rest_day", False))
+    weekly_cap = max(MAX_WEEKLY_MINUTES, week_one_minutes)
+    equipment = resolve_equipment(profile.get("available_equipment"))
+    max_intensity = intensity_cap(profile, safety_check)
+    rotation = week // SUBSTITUTION_INTERVAL if week % SUBSTITUTION_INTERVAL == 0 else 0
+
+    factor = ramp_factor(week)
+    while True:
+        days = [_progress_day(day, factor, session_cap, rotation, equipment, max_intensity) for day in workout_week]
+        weekly = sum(day.get("total_duration_minutes", 0) for day in days if not day.get("rest_day", False))
+        if weekly <= weekly_cap or factor <= 1.0:
+            return days
+        factor = max(round(factor - RAMP_STEP, 2), 1.0)
+
+
+def rotate_meal_week(meal_week: List[Dict[str, Any]], week: int) -> List[Dict[str, Any]]:
+    """
+    Derive a later week's meals by rotating week 1's meals across days,
+    each meal type by its own step. A rotated day outside the daily
+    calorie bounds keeps its week-1 meals.
+    """
+    day_count = len(meal_week)
+    days = []
+    for position, day in enumerate(meal_week):
+        rotated = copy.deepcopy(day)
+        occurrences: Dict[str, int] = {}
+        meals = []
+        for meal in day.get("meals", []):
+            meal_type = meal.get("meal_type")
+            occurrence = occurrences.get(meal_type, 0)
+            occurrences[meal_type] = occurrence + 1
+            step = MEAL_ROTATION_STEP.get(meal_type, 1) * (week - 1)
+            source = meal_week[(position + step) % day_count]
+            same_type = [candidate for candidate in source.get("meals", []) if candidate.get("meal_type") == meal_type]
+            meals.append(copy.deepcopy(same_type[occurrence] if occurrence < len(same_type) else meal))
+        rotated["meals"] = meals
+
+        if all(isinstance(meal.get("estimated_calories"), (int, float)) for meal in meals):
+            calories = int(sum(meal["estimated_calories"] for meal in meals))
+            if not MIN_DAY_CALORIES <= calories <= MAX_DAY_CALORIES:
+                days.append(copy.deepcopy(day))
+                continue
+            rotated["total_estimated_calories"] = calories
+            macros = [meal.get("macronutrients") or {} for meal in meals]
+            if all(isinstance(macro.get(key), (int, float)) for macro in macros for key in ("protein", "carbs", "fats")):
+                rotated["nutrition_summary"] = {
+                    f"{key}_grams": int(sum(macro.get(key, 0) for macro in macros))
+                    for key in ("protein", "carbs", "fats", "fiber")
+                }
+        days.append(rotated)
+    return days
+
+
+def expand_plan_weeks(
+    workout_week: List[Dict[str, Any]],
+    meal_week: List[Dict[str, Any]],
+    profile: Dict[str, Any],
+    weeks: int,
+    safety_check: Optional[Dict] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Weeks 2..weeks derived locally from the week-1 plans, so a multi-week
+    plan costs one generation. Each entry has the week number, its phase
+    ("build" or "deload"), the exercise-minute factor and the derived
+    workout_plan and meal_plan (days numbered 1-7 within the week).
+    """
+    expanded = []
+    for week in range(2, weeks + 1):
+        expanded.append({
+            "week": week,
+            "phase": "deload" if is_deload_week(week) else "build",
+            "volume_factor": ramp_factor(week),
+            "workout_plan": progress_workout_week(workout_week, week, profile, safety_check),
+            "meal_plan": rotate_meal_week(meal_week, week) if meal_week else [],
+        })
+    logger.info(f"Expanded week-1 plan to {weeks} weeks locally")
+    return expanded
@@ -0,0 +1,26 @@
+import logging
+from typing import Any, Dict
+
+from langgraph.config import get_stream_writer
+
+from backend.utils.json_codec import dumps
+
+logger = logging.getLogger(__name__)
+
+
+def emit_plan_event(event: str, data: Dict[str, Any]) -> None:
+    """
+    Emit a progress event from inside a wellness graph node.
+    Events reach consumers of graph.astream(stream_mode="custom");
+    outside a graph run (or without a custom stream) this is a no-op.
+    """
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        return
+    writer({"event": event, "data": data})
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Format a single Server-Sent Events message"""
+    return f"event: {event}\ndata: {dumps(data, default=str)}\n\n"
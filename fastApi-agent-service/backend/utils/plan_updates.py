@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from beanie import PydanticObjectId
+
+from backend.constants.enums import HealthPlanStatus
+
+
+def progress_update(current_week: int, status: HealthPlanStatus, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Update operators for a progress report"""
+    return {"$set": {"current_week": current_week, "status": status.value, "updated_at": now or datetime.utcnow()}}
+
+
+def pause_update(now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Update operators for pausing a plan"""
+    return {"$set": {"status": HealthPlanStatus.PAUSED.value, "updated_at": now or datetime.utcnow()}}
+
+
+def touch_update(now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Update operators for recording a plan access"""
+    return {"$set": {"last_accessed_at": now or datetime.utcnow()}}
+
+
+def plan_version_filter(plan_id: PydanticObjectId, version: int) -> Dict[str, Any]:
+    """Matches the plan only while it is still at version; plans stored before versioning count as version 1"""
+    return {"_id": plan_id, "plan_version": {"$in": [version, None]} if version == 1 else version}
+
+
+def plan_patch_update(content: Dict[str, Any], version: int, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Update operators for storing a patched plan (workout, meal and weekly plans) at its new version"""
+    return {"$set": {**content, "plan_version": version, "updated_at": now or datetime.utcnow()}}
@@ -0,0 +1,257 @@
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import TypeAdapter, ValidationError
+
+from backend.config import main as config
+from backend.constants.enums import (
+    WorkoutType, DietaryRestriction, MIN_CALORIES_ADULT, MAX_CALORIES_ADULT
+)
+from backend.models.HealthPlan import Exercise, Workout, Meal, DailyMealPlan, PlanWeek
+
+logger = logging.getLogger(__name__)
+
+# Spellings the models use for types they do not have
+WORKOUT_TYPE_ALIASES = {
+    "core": "strength",
+    "mobility": "flexibility",
+    "strength_cardio": "hiit",
+    "cardio_strength": "hiit",
+    "cardio_core": "hiit",
+    "core_back": "strength",
+    "dynamic_stretch": "flexibility",
+    "static_stretch": "flexibility",
+}
+INTENSITY_ALIASES = {
+    "moderate-high": "high",
+    "very-high": "very_high",
+    "very high": "very_high",
+    "none": "low",
+}
+# None drops the tag
+DIETARY_TAG_ALIASES = {
+    "gluten_free_option": "gluten_free",
+    "dairy_free_option": "dairy_free",
+    "vegan_option": "vegan",
+    "vegetarian_option": "vegetarian",
+    "check_label_for_specifics": None,
+    "oats_if_granola": None,
+    "dairy_if_whey": None,
+    "nuts_if_almond_milk": None,
+    "eggs_if_mayo": None,
+    "soy_if_burger": None,
+}
+
+WORKOUT_TYPES = {member.value for member in WorkoutType}
+DIETARY_TAGS = {member.value for member in DietaryRestriction}
+
+# Single-meal calorie bounds Node accepts
+MIN_MEAL_CALORIES = 50
+MAX_MEAL_CALORIES = 1500
+
+
+def coerce_workout_type(value: Any) -> Any:
+    if value is None:
+        return value
+    original = str(value).lower().strip()
+    mapped = WORKOUT_TYPE_ALIASES.get(original, original)
+    if mapped not in WORKOUT_TYPES:
+        logger.warning(f"Invalid exercise type '{original}', defaulting to 'strength'")
+        return WorkoutType.STRENGTH.value
+    return mapped
+
+
+def coerce_intensity(value: Any) -> Any:
+    if value is None or value == "":
+        return None
+    original = str(value).lower().strip()
+    return INTENSITY_ALIASES.get(original, original)
+
+
+def coerce_meal_type(value: Any) -> Any:
+    return str(value).lower().strip().replace("-", "_").replace(" ", "_") if value is not None else value
+
+
+def coerce_dietary_tags(value: Any) -> Any:
+    if not isinstance(value, list):
+        return value
+    tags = []
+    for tag in value:
+        text = str(tag).lower().strip()
+        mapped = DIETARY_TAG_ALIASES.get(text, text)
+        if mapped in DIETARY_TAGS:
+            if mapped not in tags:
+                tags.append(mapped)
+        elif text not in DIETARY_TAG_ALIASES:
+            logger.warning(f"Removing invalid dietary tag: {tag}")
+    return tags
+
+
+def coerce_allergens(value: Any) -> Any:
+    """Lower-case allergens, dropping conditional ones such as "dairy_if_whey\""""
+    if not isinstance(value, list):
+        return value
+    allergens = [str(allergen).lower().strip() for allergen in value]
+    return [allergen for allergen in allergens if "_if_" not in allergen and "if " not in allergen]
+
+
+def _clamp(field: str, low: int, high: int) -> Callable[[Any], Any]:
+    def clamp(value: Any) -> Any:
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and not low <= value <= high:
+            logger.warning(f"{field} {value} outside {low}-{high}, clamping")
+            return min(max(value, low), high)
+        return value
+    return clamp
+
+
+# field -> hook, applied in place by the coerce_* passes below
+EXERCISE_HOOKS = {"type": coerce_workout_type, "intensity": coerce_intensity}
+WORKOUT_HOOKS = {"intensity_level": coerce_intensity}
+MEAL_HOOKS = {
+    "meal_type": coerce_meal_type,
+    "dietary_tags": coerce_dietary_tags,
+    "allergen_warnings": coerce_allergens,
+    "estimated_calories": _clamp("Meal calories", MIN_MEAL_CALORIES, MAX_MEAL_CALORIES),
+}
+# Day totals computed from the ingredients are brought into range by scaling portions
+# (meal_plan_generator.fit_meal_day_portions), never by overwriting the number
+MEAL_DAY_HOOKS = {} if config.NUTRITION_LOCAL_ENABLED else {
+    "total_estimated_calories": _clamp("Daily calories", MIN_CALORIES_ADULT, MAX_CALORIES_ADULT),
+}
+
+
+def _apply_hooks(item: Dict[str, Any], hooks: Dict[str, Callable]) -> Dict[str, Any]:
+    for field, hook in hooks.items():
+        if field in item:
+            item[field] = hook(item[field])
+    return item
+
+
+def _drop_rest_day_intensity(item: Dict[str, Any]) -> Dict[str, Any]:
+    # Node rejects an intensity on rest days
+    if item.get("rest_day"):
+        item.pop("intensity_level", None)
+    return item
+
+
+# In-place hook passes: used on streamed days and regenerated fragments, where the
+# item is still being filled in, and ahead of validation on the finished plan
+
+def coerce_exercise(item: Dict[str, Any]) -> Dict[str, Any]:
+    return _apply_hooks(item, EXERCISE_HOOKS)
+
+
+def coerce_workout_day(item: Dict[str, Any]) -> Dict[str, Any]:
+    _drop_rest_day_intensity(_apply_hooks(item, WORKOUT_HOOKS))
+    item.setdefault("exercises", [])
+    for exercise in item["exercises"]:
+        if isinstance(exercise, dict):
+            coerce_exercise(exercise)
+    return item
+
+
+def coerce_meal(item: Dict[str, Any]) -> Dict[str, Any]:
+    return _apply_hooks(item, MEAL_HOOKS)
+
+
+def coerce_meal_day(item: Dict[str, Any]) -> Dict[str, Any]:
+    _apply_hooks(item, MEAL_DAY_HOOKS)
+    for meal in item.get("meals") or []:
+        if isinstance(meal, dict):
+            coerce_meal(meal)
+    return item
+
+
+def coerce_plan_week(item: Dict[str, Any]) -> Dict[str, Any]:
+    for day in item.get("workout_plan") or []:
+        if isinstance(day, dict):
+            coerce_workout_day(day)
+    for day in item.get("meal_plan") or []:
+        if isinstance(day, dict):
+            coerce_meal_day(day)
+    return item
+
+
+class PlanValidator:
+    """
+    A precompiled TypeAdapter for a list of one kind of plan item plus its
+    in-place hook pass. validate() normalizes the items with the hooks,
+    checks the whole list against the stored model in one call and
+    collects all errors with the item's position, so one bad day never
+    hides the others. Items come back as the normalized dicts, failing
+    ones included, for the caller to decide on.
+    """
+
+    def __init__(self, kind: str, model, coerce: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        self.kind = kind
+        self.adapter = TypeAdapter(List[model])
+        self.coerce = coerce
+
+    def normalize(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for item in items:
+            if isinstance(item, dict):
+                self.coerce(item)
+        return items
+
+    def validate(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        self.normalize(items)
+        try:
+            self.adapter.validate_python(items)
+        except ValidationError as e:
+            failures = e.errors(include_url=False)
+        else:
+            return {"items": items, "errors": []}
+
+        errors: List[Dict[str, Any]] = []
+        for error in failures:
+            index = error["loc"][0]
+            item = items[index]
+            errors.append({
+                "kind": self.kind,
+                "index": index,
+                "day": item.get("day") if isinstance(item, dict) else None,
+                "loc": ".".join(str(part) for part in error["loc"][1:]),
+                "message": error["msg"],
+                "type": error["type"],
+            })
+        return {"items": items, "errors": errors}
+
+
+# Compiled once at import
+EXERCISE_VALIDATOR = PlanValidator("exercise", Exercise, coerce_exercise)
+WORKOUT_VALIDATOR = PlanValidator("workout_day", Workout, coerce_workout_day)
+MEAL_VALIDATOR = PlanValidator("meal", Meal, coerce_meal)
+MEAL_DAY_VALIDATOR = PlanValidator("meal_day", DailyMealPlan, coerce_meal_day)
+PLAN_WEEK_VALIDATOR = PlanValidator("plan_week", PlanWeek, coerce_plan_week)
+
+
+def log_validation_errors(errors: List[Dict[str, Any]], source: str) -> None:
+    for error in errors:
+        logger.warning(
+            f"{source}: {error['kind']} {error['index']} (day {error['day']}) {error['loc']}: {error['message']}"
+        )
+
+
+def validate_plan_output(
+    workout_plan: List[Dict[str, Any]],
+    meal_plan: List[Dict[str, Any]],
+    weekly_plans: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Validate a finished plan against the HealthPlan models before it goes
+    to the User Service. Returns the normalized workout_plan, meal_plan
+    and weekly_plans and every error found, each tagged with its item.
+
+    Week 1 is the model's output and is checked against the models. Later
+    weeks are derived from it locally by the progression engine, so they
+    only get the hook pass; checking them too would cost more than
+    everything else here combined.
+    """
+    workouts = WORKOUT_VALIDATOR.validate(workout_plan)
+    meals = MEAL_DAY_VALIDATOR.validate(meal_plan)
+    return {
+        "workout_plan": workouts["items"],
+        "meal_plan": meals["items"],
+        "weekly_plans": PLAN_WEEK_VALIDATOR.normalize(weekly_plans or []),
+        "errors": workouts["errors"] + meals["errors"],
+    }
@@ -0,0 +1,138 @@
+import hashlib
+import logging
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from backend.config import main as config
+
+logger = logging.getLogger(__name__)
+
+# Rough size estimate, good enough for cache eligibility and size reports
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+class CompiledPrompt(str):
+    """
+    Prompt text that remembers its static prefix.
+    Behaves like a plain string everywhere; the LLM layer uses `prefix`
+    and `suffix` to serve the prefix from a provider-side context cache.
+    """
+
+    def __new__(cls, prefix: str, suffix: str, prefix_hash: str):
+        prompt = super().__new__(cls, prefix + suffix)
+        prompt.prefix = prefix
+        prompt.suffix = suffix
+        prompt.prefix_hash = prefix_hash
+        return prompt
+
+    def extend(self, text: str) -> "CompiledPrompt":
+        """Append to the dynamic part, keeping the cacheable prefix"""
+        return CompiledPrompt(self.prefix, self.suffix + text, self.prefix_hash)
+
+
+class PromptTemplate:
+    """
+    A precompiled static prompt prefix, hashed once at import time.
+    Per-request data goes into a short suffix rendered after it, so
+    every request for an agent shares a byte-identical prefix.
+    """
+
+    def __init__(self, name: str, prefix: str):
+        self.name = name
+        self.prefix = prefix.strip() + "\n"
+        self.prefix_hash = hashlib.sha256(self.prefix.encode("utf-8")).hexdigest()[:16]
+        self.prefix_tokens = estimate_tokens(self.prefix)
+
+    def render(self, suffix: str) -> CompiledPrompt:
+        return CompiledPrompt(self.prefix, "\n" + suffix.strip() + "\n", self.prefix_hash)
+
+
+def extend_prompt(prompt: str, text: str) -> str:
+    """Append text to a prompt without losing a compiled prefix"""
+    if isinstance(prompt, CompiledPrompt):
+        return prompt.extend(text)
+    return prompt + text
+
+
+class ContextCacheRegistry:
+    """
+    Maps (model, prefix hash) to a Gemini cached-content resource.
+    Caches are created lazily on first use when LLM_CONTEXT_CACHE_ENABLED
+    is set; prefixes below the provider minimum, or that fail to cache,
+    are remembered and sent inline (Gemini 2.5 still applies implicit
+    prefix caching to those).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (model, prefix hash) -> (cache name or None, monotonic expiry)
+        self._entries: Dict[Tuple[str, str], Tuple[Optional[str], float]] = {}
+        self._client = None
+
+    def prepare(self, llm, prompt: Any, kwargs: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Swap the static prefix for a cached-content reference when one
+        is available. Returns the prompt and call kwargs to send.
+        """
+        if not config.LLM_CONTEXT_CACHE_ENABLED or not isinstance(prompt, CompiledPrompt):
+            return prompt, kwargs
+        if "cached_content" in kwargs:
+            return prompt, kwargs
+
+        model = getattr(llm, "model", None)
+        if not model:
+            return prompt, kwargs
+
+        cache_name = self._get_or_create(model, prompt)
+        if not cache_name:
+            return prompt, kwargs
+        return prompt.suffix, {**kwargs, "cached_content": cache_name}
+
+    def _get_or_create(self, model: str, prompt: CompiledPrompt) -> Optional[str]:
+        key = (model, prompt.prefix_hash)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() < entry[1]:
+                return entry[0]
+
+            cache_name = None
+            if estimate_tokens(prompt.prefix) >= config.LLM_CONTEXT_CACHE_MIN_TOKENS:
+                cache_name = self._create(model, prompt)
+            else:
+                logger.info(f"Prompt prefix {prompt.prefix_hash} too short for explicit context caching")
+            # Recreate a minute before the provider expires the cache
+            self._entries[key] = (cache_name, time.monotonic() + config.LLM_CONTEXT_CACHE_TTL_SECONDS - 60)
+            return cache_name
+
+    def _create(self, model: str, prompt: CompiledPrompt) -> Optional[str]:
+        try:
+            from google.ai import generativelanguage_v1beta as genai
+
+            if self._client is None:
+                self._client = genai.CacheServiceClient(client_options={"api_key": config.GEMINI_API_KEY})
+            cached = self._client.create_cached_content(
+                cached_content=genai.CachedContent(
+                    model=model if model.startswith("models/") else f"models/{model}",
+                    display_name=f"prompt-prefix-{prompt.prefix_hash}",
+                    contents=[genai.Content(role="user", parts=[genai.Part(text=prompt.prefix)])],
+                    ttl=timedelta(seconds=config.LLM_CONTEXT_CACHE_TTL_SECONDS),
+                )
+            )
+            logger.info(f"Created context cache {cached.name} for prompt prefix {prompt.prefix_hash}")
+            return cached.name
+        except Exception as e:
+            logger.warning(f"Context caching unavailable for prompt prefix {prompt.prefix_hash}: {e}")
+            return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+context_cache = ContextCacheRegistry()
@@ -0,0 +1,53 @@
+import logging
+from typing import Callable, List
+
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+
+from backend.config import main as config
+from backend.utils.http_cache import strong_etag, etag_matches
+from backend.utils.json_codec import dumps
+
+logger = logging.getLogger(__name__)
+
+_static_responses: List["StaticResponse"] = []
+
+
+class StaticResponse:
+    """
+    A GET endpoint whose JSON body only changes with the deploy: the body is
+    built and serialized once, kept as bytes with a strong ETag, and served
+    from there. A matching If-None-Match gets a 304 without a body.
+
+    Everything the bodies depend on (SERVICE_VERSION, the disclaimer
+    registry, STATIC_RESPONSE_MAX_AGE) is fixed at import, so they are
+    rebuilt when a new deploy starts, not while a process runs.
+    """
+
+    def __init__(self, name: str, build: Callable[[], dict]):
+        self.name = name
+        self.build = build
+        self.body = b""
+        self.headers = {}
+        _static_responses.append(self)
+
+    def refresh(self) -> None:
+        self.body = dumps(self.build()).encode()
+        self.headers = {
+            "ETag": strong_etag(self.body),
+            "Cache-Control": f"public, max-age={config.STATIC_RESPONSE_MAX_AGE}, must-revalidate",
+        }
+        logger.info(f"Static response {self.name} built ({len(self.body)} bytes, ETag {self.headers['ETag']})")
+
+    def render(self, request: Request) -> Response:
+        if not self.body:
+            self.refresh()
+        if etag_matches(request.headers.get("if-none-match"), self.headers["ETag"]):
+            return Response(status_code=304, headers=self.headers)
+        return Response(content=self.body, media_type=ORJSONResponse.media_type, headers=self.headers)
+
+
+def warm_static_responses() -> None:
+    """Build every static response up front so the first request does not pay for it"""
+    for static_response in _static_responses:
+        static_response.refresh()
@@ -0,0 +1,377 @@
+import json
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+from pydantic import BaseModel
+
+from backend.models.HealthPlan import Workout, DailyMealPlan
+from backend.utils.json_repair import parse_llm_json
+from backend.utils.json_stream import IncrementalArrayParser
+from backend.utils.prompt_cache import extend_prompt
+from backend.utils.metrics import (
+    record_llm_parse, PARSE_OK, PARSE_REPAIRED, PARSE_FRAGMENT_RETRIED, PARSE_FAILED
+)
+
+logger = logging.getLogger(__name__)
+
+# Number of targeted regeneration attempts for a single invalid fragment
+MAX_FRAGMENT_RETRIES = 2
+
+# Keys that only exist for MongoDB or pydantic bookkeeping and are not LLM output
+_SCHEMA_DROP_KEYS = {
+    "title", "default", "example", "examples", "pattern",
+    "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum",
+    "minLength", "maxLength", "minItems", "maxItems",
+}
+_SCHEMA_DROP_PROPERTIES = {"_id", "id", "revision_id"}
+
+# Free-form dict fields on the models get explicit numeric properties,
+# Gemini rejects OBJECT schemas without properties
+_OPEN_OBJECT_PROPERTIES = {
+    "macronutrients": ["protein", "carbs", "fats"],
+    "nutrition_summary": ["protein_grams", "carbs_grams", "fats_grams", "fiber_grams"],
+}
+
+_JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+}
+
+
+def model_response_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Derive an LLM response schema from a HealthPlan model.
+    References are inlined and database-only fields are removed.
+    """
+    schema = model.model_json_schema()
+    definitions = schema.pop("$defs", {})
+    return _clean_schema(schema, definitions)
+
+
+def _clean_schema(schema: Dict[str, Any], definitions: Dict[str, Any], name: str = "") -> Dict[str, Any]:
+    if "$ref" in schema:
+        target = definitions[schema["$ref"].split("/")[-1]]
+        return _clean_schema(target, definitions, name)
+
+    if "anyOf" in schema:
+        options = [option for option in schema["anyOf"] if option.get("type") != "null"]
+        cleaned = _clean_schema(options[0], definitions, name) if options else {"type": "string"}
+        if len(options) < len(schema["anyOf"]):
+            cleaned["nullable"] = True
+        return cleaned
+
+    cleaned = {key: value for key, value in schema.items() if key not in _SCHEMA_DROP_KEYS}
+
+    if cleaned.get("type") == "object":
+        properties = {
+            key: _clean_schema(value, definitions, key)
+            for key, value in schema.get("properties", {}).items()
+            if key not in _SCHEMA_DROP_PROPERTIES
+        }
+        if not properties and name in _OPEN_OBJECT_PROPERTIES:
+            properties = {key: {"type": "number"} for key in _OPEN_OBJECT_PROPERTIES[name]}
+        cleaned.pop("additionalProperties", None)
+        cleaned["properties"] = properties
+        cleaned["required"] = [key for key in schema.get("required", []) if key in properties]
+    elif cleaned.get("type") == "array" and "items" in schema:
+        cleaned["items"] = _clean_schema(schema["items"], definitions, name)
+
+    return cleaned
+
+
+WORKOUT_DAY_SCHEMA = model_response_schema(Workout)
+MEAL_DAY_SCHEMA = model_response_schema(DailyMealPlan)
+
+WORKOUT_PLAN_SCHEMA = {"type": "array", "items": WORKOUT_DAY_SCHEMA}
+MEAL_PLAN_SCHEMA = {"type": "array", "items": MEAL_DAY_SCHEMA}
+
+# Numeric meal fields computed locally from the ingredient lists (backend/utils/nutrition.py)
+COMPUTED_MEAL_FIELDS = ("estimated_calories", "macronutrients")
+COMPUTED_DAY_FIELDS = ("total_estimated_calories", "nutrition_summary")
+
+
+def drop_schema_properties(schema: Dict[str, Any], names) -> Dict[str, Any]:
+    """Copy of an object schema without the given properties"""
+    trimmed = dict(schema)
+    trimmed["properties"] = {key: value for key, value in schema["properties"].items() if key not in names}
+    trimmed["required"] = [key for key in schema.get("required", []) if key not in names]
+    return trimmed
+
+
+_meals_schema = MEAL_DAY_SCHEMA["properties"]["meals"]
+MEAL_DAY_INGREDIENTS_SCHEMA = drop_schema_properties(
+    {
+        **MEAL_DAY_SCHEMA,
+        "properties": {
+            **MEAL_DAY_SCHEMA["properties"],
+            "meals": {**_meals_schema, "items": drop_schema_properties(_meals_schema["items"], COMPUTED_MEAL_FIELDS)},
+        },
+    },
+    COMPUTED_DAY_FIELDS,
+)
+MEAL_PLAN_INGREDIENTS_SCHEMA = {"type": "array", "items": MEAL_DAY_INGREDIENTS_SCHEMA}
+
+# Single plan items, for targeted regeneration of one exercise or meal
+EXERCISE_SCHEMA = WORKOUT_DAY_SCHEMA["properties"]["exercises"]["items"]
+MEAL_SCHEMA = _meals_schema["items"]
+MEAL_INGREDIENTS_SCHEMA = MEAL_DAY_INGREDIENTS_SCHEMA["properties"]["meals"]["items"]
+
+_CONSULTATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "type": {
+            "type": "string",
+            "enum": [
+                "primary_care", "registered_dietitian", "cardiologist", "endocrinologist",
+                "orthopedic", "physical_therapist", "mental_health", "fitness_professional",
+            ],
+        },
+        "priority": {"type": "string"},
+        "reason": {"type": "string"},
+        "before_starting": {"type": "boolean"},
+    },
+    "required": ["type", "priority", "reason", "before_starting"],
+}
+
+HEALTH_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "overall_readiness_level": {"type": "string", "enum": ["low", "moderate", "high"]},
+        "primary_safety_concerns": {"type": "array", "items": {"type": "string"}},
+        "professional_consultations_recommended": {"type": "array", "items": _CONSULTATION_SCHEMA},
+        "safe_starting_recommendations": {
+            "type": "object",
+            "properties": {
+                "exercise_approach": {"type": "string"},
+                "nutrition_approach": {"type": "string"},
+                "monitoring_needed": {"type": "array", "items": {"type": "string"}},
+                "red_flag_symptoms": {"type": "array", "items": {"type": "string"}},
+            },
+            "required": ["exercise_approach", "nutrition_approach"],
+        },
+        "program_modifications": {"type": "array", "items": {"type": "string"}},
+        "estimated_timeline_to_full_program": {"type": "string"},
+        "additional_safety_notes": {"type": "array", "items": {"type": "string"}},
+        "risk_level": {"type": "string", "enum": ["low", "moderate", "high", "very_high"]},
+        "proceed_with_ai_plan": {"type": "boolean"},
+    },
+    "required": [
+        "overall_readiness_level", "primary_safety_concerns",
+        "professional_consultations_recommended", "risk_level", "proceed_with_ai_plan",
+    ],
+}
+
+
+def find_schema_errors(value: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
+    """
+    Structural check of parsed output against a response schema.
+    Only types and required keys are checked, enum values are left
+    to the agent normalizers which map near-miss values.
+    """
+    expected = schema.get("type")
+    if value is None:
+        return [] if schema.get("nullable") else [f"{path}: missing value"]
+
+    python_type = _JSON_TYPES.get(expected)
+    if python_type and (not isinstance(value, python_type) or (expected != "boolean" and isinstance(value, bool))):
+        return [f"{path}: expected {expected}"]
+
+    errors = []
+    if expected == "object":
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{path}.{key}: required field missing")
+        for key, sub_schema in schema.get("properties", {}).items():
+            if key in value:
+                errors.extend(find_schema_errors(value[key], sub_schema, f"{path}.{key}"))
+    elif expected == "array" and "items" in schema:
+        for index, item in enumerate(value):
+            errors.extend(find_schema_errors(item, schema["items"], f"{path}[{index}]"))
+    return errors
+
+
+def invoke_structured(
+    llm,
+    prompt: str,
+    schema: Dict[str, Any],
+    agent: str,
+    expected_days: Optional[int] = None,
+) -> Any:
+    """
+    Invoke the LLM with schema-constrained JSON output.
+    Malformed output is repaired locally first; for day arrays only the
+    invalid or missing days are regenerated through targeted retries.
+    Raises ValueError when the output cannot be recovered.
+    """
+    response = llm.invoke(prompt, response_mime_type="application/json", response_schema=schema)
+
+    try:
+        data, repaired = parse_llm_json(response.content)
+    except json.JSONDecodeError as e:
+        record_llm_parse(agent, PARSE_FAILED)
+        logger.error(f"{agent}: LLM output could not be parsed or repaired: {e}")
+        raise
+
+    if schema.get("type") != "array":
+        errors = find_schema_errors(data, schema)
+        if errors:
+            record_llm_parse(agent, PARSE_FAILED)
+            raise ValueError(f"{agent}: LLM output does not match schema: {errors[:5]}")
+        record_llm_parse(agent, PARSE_REPAIRED if repaired else PARSE_OK)
+        return data
+
+    if not isinstance(data, list):
+        record_llm_parse(agent, PARSE_FAILED)
+        raise ValueError(f"{agent}: expected a JSON array from the LLM")
+
+    data, retried = _regenerate_invalid_days(llm, prompt, data, schema["items"], agent, expected_days)
+    if not data:
+        record_llm_parse(agent, PARSE_FAILED)
+        raise ValueError(f"{agent}: no valid days in LLM output")
+
+    if retried:
+        record_llm_parse(agent, PARSE_FRAGMENT_RETRIED)
+    else:
+        record_llm_parse(agent, PARSE_REPAIRED if repaired else PARSE_OK)
+    return data
+
+
+def stream_structured_days(
+    llm,
+    prompt: str,
+    schema: Dict[str, Any],
+    agent: str,
+    expected_days: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream a schema-constrained day array from the LLM.
+    Each valid day is yielded as soon as its closing bracket arrives;
+    invalid or missing days are regenerated with targeted retries once
+    the stream ends. Days are yielded in arrival order, not day order.
+    Raises ValueError when no valid day could be produced.
+    """
+    day_schema = schema["items"]
+    parser = IncrementalArrayParser()
+    seen = set()
+    invalid = {}
+
+    def classify(day, position):
+        day_number = day.get("day", position) if isinstance(day, dict) else position
+        errors = find_schema_errors(day, day_schema)
+        if errors:
+            invalid[day_number] = errors
+            return None
+        if day_number in seen:
+            return None
+        seen.add(day_number)
+        return day
+
+    position = 0
+    for chunk in llm.stream(prompt, response_mime_type="application/json", response_schema=schema):
+        for day in parser.feed(chunk.content if isinstance(chunk.content, str) else ""):
+            position += 1
+            day = classify(day, position)
+            if day is not None:
+                yield day
+
+    repaired = parser.skipped_elements > 0 or not parser.finished
+    if not seen and not invalid and parser.text:
+        # Nothing streamed as an array, fall back to whole-document repair
+        try:
+            data, _ = parse_llm_json(parser.text)
+        except json.JSONDecodeError:
+            data = None
+        for day in data if isinstance(data, list) else []:
+            position += 1
+            day = classify(day, position)
+            if day is not None:
+                yield day
+
+    if expected_days:
+        for day_number in range(1, expected_days + 1):
+            if day_number not in seen and day_number not in invalid:
+                invalid[day_number] = ["day missing from truncated output"]
+
+    retried = False
+    for day_number, errors in sorted(invalid.items()):
+        if day_number in seen:
+            continue
+        retried = True
+        fragment = _regenerate_day(llm, prompt, day_number, errors, day_schema, agent)
+        if fragment is None:
+            logger.warning(f"{agent}: dropping day {day_number} after {MAX_FRAGMENT_RETRIES} targeted retries")
+            continue
+        seen.add(day_number)
+        yield fragment
+
+    if not seen:
+        record_llm_parse(agent, PARSE_FAILED)
+        raise ValueError(f"{agent}: no valid days in streamed LLM output")
+
+    if retried:
+        record_llm_parse(agent, PARSE_FRAGMENT_RETRIED)
+    else:
+        record_llm_parse(agent, PARSE_REPAIRED if repaired else PARSE_OK)
+
+
+def _regenerate_invalid_days(llm, prompt, days, day_schema, agent, expected_days):
+    """
+    Keep valid days, regenerate invalid or missing ones one at a time
+    """
+    valid = {}
+    invalid = {}
+    for index, day in enumerate(days):
+        day_number = day.get("day", index + 1) if isinstance(day, dict) else index + 1
+        errors = find_schema_errors(day, day_schema)
+        if errors:
+            invalid[day_number] = errors
+        elif day_number not in valid:
+            valid[day_number] = day
+
+    if expected_days:
+        for day_number in range(1, expected_days + 1):
+            if day_number not in valid and day_number not in invalid:
+                invalid[day_number] = ["day missing from truncated output"]
+
+    retried = False
+    for day_number, errors in invalid.items():
+        if day_number in valid:
+            continue
+        retried = True
+        fragment = _regenerate_day(llm, prompt, day_number, errors, day_schema, agent)
+        if fragment is not None:
+            valid[day_number] = fragment
+        else:
+            logger.warning(f"{agent}: dropping day {day_number} after {MAX_FRAGMENT_RETRIES} targeted retries")
+
+    return [valid[day_number] for day_number in sorted(valid)], retried
+
+
+def _regenerate_day(llm, prompt, day_number, errors, day_schema, agent):
+    """Ask the LLM for a single corrected day object"""
+    # The fragment request keeps the original prompt's cacheable prefix
+    fragment_prompt = extend_prompt(
+        prompt,
+        f"\nYour previous response had an invalid or missing entry for day {day_number}:\n"
+        + "\n".join(f"- {error}" for error in errors[:10])
+        + f"\n\nReturn ONLY the JSON object for day {day_number}, not the full plan.",
+    )
+
+    for attempt in range(1, MAX_FRAGMENT_RETRIES + 1):
+        try:
+            response = llm.invoke(fragment_prompt, response_mime_type="application/json", response_schema=day_schema)
+            fragment, _ = parse_llm_json(response.content)
+        except Exception as e:
+            logger.warning(f"{agent}: targeted retry {attempt} for day {day_number} failed: {e}")
+            continue
+
+        if isinstance(fragment, dict) and not find_schema_errors(fragment, day_schema):
+            fragment["day"] = day_number
+            logger.info(f"{agent}: day {day_number} regenerated on targeted retry {attempt}")
+            return fragment
+
+    return None
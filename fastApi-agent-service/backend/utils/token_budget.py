@@ -0,0 +1,127 @@
+import re
+import logging
+from typing import Dict, List, Tuple
+
+from backend.utils.prompt_cache import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Sections of medical paperwork that never matter for exercise or nutrition risk
+IRRELEVANT_SECTION_RE = re.compile(
+    r"\b(billing|insurance|payment|invoice|charges|address|contact|signature|"
+    r"privacy|consent|disclaimer|appointment|scheduling|referring physician|page \d+)\b",
+    re.IGNORECASE,
+)
+
+# Terms that make a sentence relevant to exercise and nutrition safety
+RISK_TERMS_RE = re.compile(
+    r"\b(blood pressure|hypertension|bp|heart|cardiac|cardio\w*|arrhythmia|chest|angina|"
+    r"cholesterol|ldl|hdl|triglycerides?|glucose|a1c|hba1c|diabet\w*|insulin|"
+    r"bmi|weight|obes\w*|kidney|renal|liver|thyroid|anemi\w*|iron|vitamin|"
+    r"asthma|copd|breath\w*|allerg\w*|intoleran\w*|celiac|lactose|"
+    r"pregnan\w*|surgery|surgical|fracture|injur\w*|arthritis|joint|knee|back|spine|"
+    r"osteopor\w*|pain|medications?|prescri\w*|dose|mg|contraindicat\w*|restrict\w*|"
+    r"avoid|diagnos\w*|assessment|impression|recommend\w*|exercise|activity|diet\w*|sodium|sugar)\b",
+    re.IGNORECASE,
+)
+
+_NUMBER_RE = re.compile(r"\d")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_WHITESPACE_RE = re.compile(r"[ \t\f\v]+")
+
+
+def _is_heading(line: str) -> bool:
+    stripped = line.strip()
+    if not stripped or len(stripped) > 60:
+        return False
+    return stripped.endswith(":") or (stripped.isupper() and any(c.isalpha() for c in stripped))
+
+
+def split_document_units(text: str) -> List[str]:
+    """
+    Split document text into sentence-sized units, dropping sections
+    that are irrelevant for exercise and nutrition risk.
+    """
+    units = []
+    skipping = False
+    for raw_line in text.splitlines():
+        line = _WHITESPACE_RE.sub(" ", raw_line).strip()
+        if not line:
+            continue
+        if _is_heading(line):
+            skipping = bool(IRRELEVANT_SECTION_RE.search(line))
+            if not skipping:
+                units.append(line)
+            continue
+        if skipping or IRRELEVANT_SECTION_RE.fullmatch(line):
+            continue
+        units.extend(sentence for sentence in _SENTENCE_SPLIT_RE.split(line) if sentence)
+    return units
+
+
+def _score(unit: str) -> float:
+    """Extractive relevance score: risk-term density, with a bonus for measurements"""
+    terms = len(RISK_TERMS_RE.findall(unit))
+    if not terms:
+        return 0.0
+    bonus = 1.0 if _NUMBER_RE.search(unit) else 0.0
+    return terms + bonus + terms / max(len(unit.split()), 1)
+
+
+def compact_document(text: str, max_tokens: int) -> Tuple[str, Dict[str, int]]:
+    """
+    Fit document text into max_tokens.
+    Irrelevant sections and repeated lines (page headers, footers) are
+    dropped, then the most risk-relevant sentences are kept in their
+    original order until the budget is used.
+    Returns the compacted text and a report of what was dropped.
+    """
+    text = text or ""
+    report = {
+        "bytes_in": len(text.encode("utf-8")),
+        "tokens_in": estimate_tokens(text),
+        "duplicates_dropped": 0,
+        "budget_tokens": max_tokens,
+    }
+
+    if report["tokens_in"] <= max_tokens:
+        compacted = text.strip()
+    else:
+        seen = set()
+        units = []
+        for unit in split_document_units(text):
+            key = unit.lower()
+            if key in seen:
+                report["duplicates_dropped"] += 1
+                continue
+            seen.add(key)
+            units.append(unit)
+
+        scores = [_score(unit) for unit in units]
+        ranked = sorted(range(len(units)), key=lambda index: scores[index], reverse=True)
+        kept = set()
+        used = 0
+        for index in ranked:
+            if scores[index] == 0:
+                break
+            cost = estimate_tokens(units[index]) + 1
+            if used + cost > max_tokens:
+                continue
+            kept.add(index)
+            used += cost
+        compacted = "\n".join(units[index] for index in sorted(kept))
+
+    report["bytes_out"] = len(compacted.encode("utf-8"))
+    report["tokens_out"] = estimate_tokens(compacted)
+    report["bytes_dropped"] = report["bytes_in"] - report["bytes_out"]
+    report["tokens_dropped"] = report["tokens_in"] - report["tokens_out"]
+    return compacted, report
+
+
+def allocate_document_budget(total_budget: int, components: Dict[str, str]) -> Tuple[int, Dict[str, int]]:
+    """
+    Measure the fixed prompt components and return the tokens left for
+    document text along with the per-component token counts.
+    """
+    measured = {name: estimate_tokens(text) for name, text in components.items()}
+    return max(total_budget - sum(measured.values()), 0), measured
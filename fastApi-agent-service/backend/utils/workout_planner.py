@@ -0,0 +1,270 @@
+import re
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+from backend.constants.enums import ActivityLevel, Goal, IntensityLevel, WorkoutType
+from backend.constants.exercise_catalog import COOL_DOWNS, EQUIPMENT_ALIASES, EXERCISE_CATALOG, WARM_UPS
+
+logger = logging.getLogger(__name__)
+
+WEEK_DAYS = 7
+MAX_WEEKLY_MINUTES = 480
+MAX_SESSION_MINUTES = 60
+MIN_SESSION_MINUTES = 10
+# Exercise model bounds
+MAX_EXERCISE_MINUTES = 60
+
+INTENSITY_ORDER = [level.value for level in IntensityLevel]
+
+# Rough energy cost per minute for a general adult
+KCAL_PER_MINUTE = {"low": 4, "moderate": 6, "high": 8, "very_high": 10}
+
+# Equipment that can be improvised at home (a towel for a mat, a chair or stair for a step)
+HOUSEHOLD_EQUIPMENT = {"none", "yoga_mat", "chair"}
+
+# Day themes and the workout types that belong to them
+THEME_TYPES = {
+    "cardio": {
+        WorkoutType.CARDIO.value, WorkoutType.WALKING.value, WorkoutType.RUNNING.value,
+        WorkoutType.CYCLING.value, WorkoutType.SWIMMING.value, WorkoutType.DANCE.value,
+        WorkoutType.HIIT.value, WorkoutType.MARTIAL_ARTS.value, WorkoutType.SPORTS.value,
+    },
+    "strength": {
+        WorkoutType.STRENGTH.value, WorkoutType.WEIGHTLIFTING.value,
+        WorkoutType.BODYWEIGHT.value, WorkoutType.CROSSFIT.value,
+    },
+    "mobility": {
+        WorkoutType.FLEXIBILITY.value, WorkoutType.YOGA.value,
+        WorkoutType.PILATES.value, WorkoutType.BALANCE.value,
+    },
+}
+
+# Weekly theme rotation when the user has no usable preferences
+GOAL_THEMES = {
+    Goal.WEIGHT_MAINTENANCE.value: ["cardio", "strength", "mobility", "cardio", "strength", "cardio"],
+    Goal.GENTLE_WEIGHT_LOSS.value: ["cardio", "strength", "cardio", "mobility", "cardio", "strength"],
+    Goal.MUSCLE_GAIN.value: ["strength", "cardio", "strength", "mobility", "strength", "cardio"],
+    Goal.IMPROVED_FITNESS.value: ["cardio", "strength", "cardio", "strength", "mobility", "cardio"],
+    Goal.GENERAL_WELLNESS.value: ["cardio", "strength", "mobility", "cardio", "strength", "mobility"],
+    Goal.STRESS_REDUCTION.value: ["mobility", "cardio", "mobility", "strength", "mobility", "cardio"],
+}
+
+# Strength days rotate the body-part emphasis
+STRENGTH_FOCUS_ROTATION = [["lower", "core", "upper"], ["upper", "core", "lower"], ["full", "lower", "upper", "core"]]
+
+REST_DAYS_BY_ACTIVITY = {
+    ActivityLevel.SEDENTARY.value: [3, 5, 7],
+    ActivityLevel.LIGHTLY_ACTIVE.value: [4, 7],
+    ActivityLevel.MODERATELY_ACTIVE.value: [4, 7],
+    ActivityLevel.VERY_ACTIVE.value: [7],
+    ActivityLevel.EXTREMELY_ACTIVE.value: [7],
+}
+
+THEME_NAMES = {"cardio": "Cardio", "strength": "Strength", "mobility": "Mobility"}
+
+
+def _value(value: Any) -> Any:
+    return value.value if hasattr(value, "value") else value
+
+
+def resolve_equipment(available_equipment: Optional[List[str]]) -> Set[str]:
+    """Map free-form equipment names onto the catalog's canonical equipment"""
+    resolved = set(HOUSEHOLD_EQUIPMENT)
+    for item in available_equipment or []:
+        text = str(_value(item)).lower().replace("_", " ")
+        for canonical, aliases in EQUIPMENT_ALIASES.items():
+            if any(re.search(rf"\b{re.escape(alias)}\b", text) for alias in aliases):
+                resolved.add(canonical)
+    return resolved
+
+
+def intensity_cap(profile: Dict[str, Any], safety_check: Optional[Dict] = None) -> str:
+    """Highest intensity the planner will schedule for this profile"""
+    activity = _value(profile.get("current_activity_level"))
+    age = profile.get("age")
+    if activity == ActivityLevel.SEDENTARY.value or (age and (age > 65 or age < 18)):
+        return IntensityLevel.LOW.value
+    if activity == ActivityLevel.LIGHTLY_ACTIVE.value or (safety_check and safety_check.get("warnings")):
+        return IntensityLevel.MODERATE.value
+    return IntensityLevel.HIGH.value
+
+
+def _day_themes(profile: Dict[str, Any], training_days: int) -> List[tuple]:
+    """(theme, preferred workout type or None) for each training day"""
+    preferred = []
+    for workout_type in profile.get("preferred_workout_types") or []:
+        workout_type = _value(workout_type)
+        for theme, types in THEME_TYPES.items():
+            if workout_type in types:
+                preferred.append((theme, workout_type))
+    if preferred:
+        # Keep some variety: a strength or mobility day when preferences are all one theme
+        themes = {theme for theme, _ in preferred}
+        if "strength" not in themes:
+            preferred.append(("strength", None))
+        if "mobility" not in themes:
+            preferred.append(("mobility", None))
+        return [preferred[index % len(preferred)] for index in range(training_days)]
+
+    goal = _value(profile.get("primary_goal")) or Goal.GENERAL_WELLNESS.value
+    rotation = GOAL_THEMES.get(goal, GOAL_THEMES[Goal.GENERAL_WELLNESS.value])
+    return [(rotation[index % len(rotation)], None) for index in range(training_days)]
+
+
+def _candidates(theme: str, preferred_type: Optional[str], equipment: Set[str], max_intensity: str) -> List[Dict]:
+    max_rank = INTENSITY_ORDER.index(max_intensity)
+    pool = [
+        exercise for exercise in EXERCISE_CATALOG
+        if exercise["type"] in THEME_TYPES[theme]
+        and INTENSITY_ORDER.index(exercise["intensity"]) <= max_rank
+        and set(exercise["equipment_needed"]) <= equipment
+    ]
+    # Preferred type first, then harder exercises first for the available cap
+    pool.sort(key=lambda exercise: (
+        exercise["type"] != preferred_type,
+        -INTENSITY_ORDER.index(exercise["intensity"]),
+    ))
+    return pool
+
+
+def _round_robin(groups: List[List[Dict]], rotation: int) -> List[Dict]:
+    """Interleave groups, each rotated so repeated themes pick different exercises"""
+    rotated = []
+    for group in groups:
+        if group:
+            shift = rotation % len(group)
+            rotated.append(group[shift:] + group[:shift])
+    ordered = []
+    for position in range(max((len(group) for group in rotated), default=0)):
+        ordered.extend(group[position] for group in rotated if position < len(group))
+    return ordered
+
+
+def _order_exercises(theme: str, pool: List[Dict], occurrence: int) -> List[Dict]:
+    if theme == "strength":
+        focuses = STRENGTH_FOCUS_ROTATION[occurrence % len(STRENGTH_FOCUS_ROTATION)]
+        return _round_robin([[e for e in pool if e["focus"] == focus] for focus in focuses], occurrence)
+    return _round_robin([pool], occurrence)
+
+
+def _fill(ordered: List[Dict], minutes: int) -> List[Dict]:
+    """Take exercises in order until the main block is filled, then spread any remainder"""
+    chosen = []
+    remaining = minutes
+    for exercise in ordered:
+        if remaining < 3:
+            break
+        block = min(exercise["default_minutes"], remaining)
+        chosen.append([exercise, block])
+        remaining -= block
+    for entry in chosen:
+        extra = min(remaining, MAX_EXERCISE_MINUTES - entry[1])
+        entry[1] += extra
+        remaining -= extra
+    return [
+        {
+            "name": exercise["name"],
+            "type": exercise["type"],
+            "duration_minutes": block,
+            "intensity": exercise["intensity"],
+            "instructions": exercise["instructions"],
+            "target_muscles": list(exercise["target_muscles"]),
+            "equipment_needed": list(exercise["equipment_needed"]),
+            "modifications": exercise["modifications"],
+            "safety_notes": exercise["safety_notes"],
+        }
+        for exercise, block in chosen
+    ]
+
+
+def _rest_day(day: int) -> Dict[str, Any]:
+    return {
+        "day": day,
+        "workout_name": "Rest Day",
+        "total_duration_minutes": 0,
+        "warm_up": "None",
+        "exercises": [],
+        "cool_down": "None",
+        "estimated_calories_burned": 0,
+        "rest_day": True,
+        "notes": "Full recovery day - light stretching or a relaxed walk is fine",
+    }
+
+
+def _workout_name(theme: str, exercises: List[Dict], focuses: List[str]) -> str:
+    if theme == "strength":
+        if focuses[0] == "full":
+            return "Strength: Full Body"
+        return f"Strength: {focuses[0].title()} Body & {focuses[1].title()}"
+    if exercises:
+        main = max(exercises, key=lambda exercise: exercise["duration_minutes"])
+        return f"{THEME_NAMES[theme]}: {main['name']}"
+    return THEME_NAMES[theme]
+
+
+def plan_weekly_workouts(
+    profile: Dict[str, Any],
+    session_minutes: int,
+    safety_check: Optional[Dict] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Build a 7-day workout plan from the curated exercise library.
+
+    Honors time availability (capped at MAX_SESSION_MINUTES per session and
+    MAX_WEEKLY_MINUTES per week), available equipment, preferred workout
+    types, an activity-based intensity cap and at least one rest day.
+    Returns days in the same shape as the LLM workout output.
+    """
+    activity = _value(profile.get("current_activity_level")) or ActivityLevel.MODERATELY_ACTIVE.value
+    rest_days = REST_DAYS_BY_ACTIVITY.get(activity, [4, 7])
+    training_days = WEEK_DAYS - len(rest_days)
+
+    session = min(session_minutes, MAX_SESSION_MINUTES, MAX_WEEKLY_MINUTES // training_days)
+    session = max(session, MIN_SESSION_MINUTES)
+    warm_up = cool_down = 5 if session >= 20 else 3
+    main_minutes = session - warm_up - cool_down
+
+    equipment = resolve_equipment(profile.get("available_equipment"))
+    max_intensity = intensity_cap(profile, safety_check)
+    themes = iter(_day_themes(profile, training_days))
+    occurrences: Dict[str, int] = {}
+
+    plan = []
+    for day in range(1, WEEK_DAYS + 1):
+        if day in rest_days:
+            plan.append(_rest_day(day))
+            continue
+
+        theme, preferred_type = next(themes)
+        occurrence = occurrences.get(theme, 0)
+        occurrences[theme] = occurrence + 1
+        pool = _candidates(theme, preferred_type, equipment, max_intensity)
+        if not pool:
+            # Every equipment/intensity combination still has low-intensity walking
+            theme, pool = "cardio", _candidates("cardio", WorkoutType.WALKING.value, equipment, IntensityLevel.LOW.value)
+        focuses = STRENGTH_FOCUS_ROTATION[occurrence % len(STRENGTH_FOCUS_ROTATION)]
+        exercises = _fill(_order_exercises(theme, pool, occurrence), main_minutes)
+
+        total = warm_up + cool_down + sum(exercise["duration_minutes"] for exercise in exercises)
+        intensity = max((exercise["intensity"] for exercise in exercises), key=INTENSITY_ORDER.index, default="low")
+        calories = sum(KCAL_PER_MINUTE[exercise["intensity"]] * exercise["duration_minutes"] for exercise in exercises)
+        calories += 3 * (warm_up + cool_down)
+
+        plan.append({
+            "day": day,
+            "workout_name": _workout_name(theme, exercises, focuses),
+            "total_duration_minutes": total,
+            "warm_up": f"{warm_up} minutes {WARM_UPS[theme]}",
+            "exercises": exercises,
+            "cool_down": f"{cool_down} minutes {COOL_DOWNS[theme]}",
+            "intensity_level": intensity,
+            "estimated_calories_burned": min(calories, 1000),
+            "rest_day": False,
+            "notes": "Work at a pace where you can still talk; stop any exercise that causes pain",
+        })
+
+    logger.info(
+        f"Planned workout week from catalog: {training_days} training days, "
+        f"{session} min sessions, intensity cap {max_intensity}"
+    )
+    return plan
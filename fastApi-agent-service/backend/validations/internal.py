@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field, validator, model_validator
 from typing import List, Optional
 from beanie import PydanticObjectId
 from backend.constants.enums import ActivityLevel, Goal, DietaryRestriction, WorkoutType
+from backend.utils.health_safety import screen_text
 
 class CreateHealthPlan(BaseModel):
     """
@@ -81,15 +82,8 @@ class CreateHealthPlan(BaseModel):
         if not v:
             return v
         
-        high_risk_keywords = [
-            'heart', 'cardiac', 'diabetes', 'blood pressure', 'hypertension',
-            'eating disorder', 'pregnancy', 'surgery', 'injury', 'medication',
-            'depression', 'anxiety', 'arthritis', 'asthma', 'cancer'
-        ]
-        
         for condition in v:
-            condition_lower = condition.lower()
-            if any(keyword in condition_lower for keyword in high_risk_keywords):
+            if screen_text(condition, "plan_health_condition"):
                 # Flag for professional consultation requirement
                 pass
         
@@ -147,16 +141,9 @@ class CreateHealthPlan(BaseModel):
         if not v:
             return v
         
-        concerning_phrases = [
-            'lose weight fast', 'extreme diet', 'crash diet', 'no pain no gain',
-            'until exhaustion', 'ignore pain', 'dangerous', 'risky'
-        ]
-        
-        v_lower = v.lower()
-        for phrase in concerning_phrases:
-            if phrase in v_lower:
-                # Flag concerning content for safety review
-                break
+        if screen_text(v, "unsafe_goal"):
+            # Flag concerning content for safety review
+            pass
         
         return v
 
@@ -202,14 +189,8 @@ class UpdateHealthPlanProgress(BaseModel):
         if not v:
             return v
         
-        concerning_keywords = [
-            'severe pain', 'chest pain', 'can\'t breathe', 'dizzy', 'fainted',
-            'injured', 'bleeding', 'nauseous', 'vomiting', 'emergency'
-        ]
-        
         for note in v:
-            note_lower = note.lower()
-            if any(keyword in note_lower for keyword in concerning_keywords):
+            if screen_text(note, "progress_note_urgent"):
                 # Flag for immediate safety review
                 pass
         
@@ -229,14 +210,8 @@ class UpdateHealthPlanProgress(BaseModel):
         if not v:
             return v
         
-        urgent_keywords = [
-            'chest pain', 'heart', 'breathing', 'dizzy', 'faint', 
-            'severe', 'emergency', 'blood', 'injury', 'hospital'
-        ]
-        
         for issue in v:
-            issue_lower = issue.lower()
-            if any(keyword in issue_lower for keyword in urgent_keywords):
+            if screen_text(issue, "progress_issue_urgent"):
                 # Flag for urgent medical attention
                 pass
         
@@ -266,13 +241,7 @@ class PauseHealthPlan(BaseModel):
         if not v:
             return v
         
-        health_related_keywords = [
-            'injury', 'sick', 'illness', 'doctor', 'hospital', 'pain',
-            'medication', 'surgery', 'health', 'medical', 'tired', 'exhausted'
-        ]
-        
-        v_lower = v.lower()
-        if any(keyword in v_lower for keyword in health_related_keywords):
+        if screen_text(v, "internal_health_pause"):
             # Flag as health-related pause requiring follow-up
             pass
         
@@ -298,14 +267,7 @@ class ChatHealthPlan(BaseModel):
         if not v:
             return v
         
-        emergency_keywords = [
-            'chest pain', 'can\'t breathe', 'heart attack', 'stroke',
-            'severe pain', 'bleeding', 'emergency', 'ambulance',
-            'hospital', 'urgent', 'help', 'fainted', 'unconscious'
-        ]
-        
-        v_lower = v.lower()
-        if any(keyword in v_lower for keyword in emergency_keywords):
+        if screen_text(v, "chat_emergency"):
             # Flag for emergency response protocol
             pass
         
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field, validator
 from typing import Optional, List
 from backend.constants.enums import HealthPlanStatus
+from backend.constants.safety_lexicon import SAFETY_SCREENS
+from backend.utils.health_safety import SAFETY_MATCHER, screen_text
 
 class HealthPlanChat(BaseModel):
     """
@@ -132,20 +134,13 @@ class UpdateHealthProgress(BaseModel):
         if not v:
             return v
         
-        concerning_keywords = [
-            'pain', 'injury', 'hurt', 'sore', 'exhausted', 'tired',
-            'dizzy', 'nauseous', 'sick', 'unwell', 'struggle'
-        ]
-        
         for note in v:
             if note and len(note) > 500:
                 raise ValueError("Individual progress notes must be under 500 characters")
             
-            note_lower = note.lower() if note else ""
-            for keyword in concerning_keywords:
-                if keyword in note_lower:
-                    # Flag for health review
-                    break
+            if note and screen_text(note, "progress_review"):
+                # Flag for health review
+                pass
         
         return v
     
@@ -155,20 +150,13 @@ class UpdateHealthProgress(BaseModel):
         if not v:
             return v
         
-        urgent_keywords = [
-            'chest pain', 'heart', 'breathing difficulty', 'severe pain',
-            'bleeding', 'injury serious', 'fainted', 'dizzy severe'
-        ]
-        
         for concern in v:
             if concern and len(concern) > 500:
                 raise ValueError("Individual concerns must be under 500 characters")
             
-            concern_lower = concern.lower() if concern else ""
-            for keyword in urgent_keywords:
-                if keyword in concern_lower:
-                    # Flag for urgent medical attention
-                    break
+            if concern and screen_text(concern, "progress_concern_urgent"):
+                # Flag for urgent medical attention
+                pass
         
         return v
 
@@ -187,28 +175,16 @@ class PauseHealthPlan(BaseModel):
         if not v or len(v.strip()) < 5:
             raise ValueError("Please provide a clear reason for pausing your health plan")
         
-        # Health-related pause reasons
-        health_keywords = [
-            'injury', 'sick', 'illness', 'doctor', 'medical', 'surgery',
-            'medication', 'health issue', 'not feeling well', 'tired',
-            'exhausted', 'pain', 'recovery'
-        ]
-        
-        # Life circumstance pause reasons
-        life_keywords = [
-            'busy', 'work', 'travel', 'family', 'schedule', 'time',
-            'vacation', 'moving', 'stress', 'overwhelmed'
-        ]
-        
-        reason_lower = v.lower()
+        # One scan categorizes the reason
+        categories = SAFETY_MATCHER.find(v)
         
         # Categorize health-related pauses
-        if any(keyword in reason_lower for keyword in health_keywords):
+        if any(category in categories for category in SAFETY_SCREENS["health_pause"]):
             # Follow up with health guidance
             pass
         
         # Categorize life circumstance pauses
-        elif any(keyword in reason_lower for keyword in life_keywords):
+        elif "life_circumstance" in categories:
             # Offer flexible restart options
             pass
         
@@ -232,13 +208,7 @@ class ResumeHealthPlan(BaseModel):
         if not v:
             return v
         
-        significant_change_keywords = [
-            'new medication', 'surgery', 'injury', 'diagnosis', 'condition',
-            'doctor said', 'medical advice', 'health problem', 'treatment'
-        ]
-        
-        v_lower = v.lower()
-        if any(keyword in v_lower for keyword in significant_change_keywords):
+        if screen_text(v, "medical_change"):
             # Medical review may be recommended before resuming
             pass
         
@@ -277,16 +247,9 @@ class HealthPlanFeedback(BaseModel):
         if not v:
             return v
         
-        safety_concern_keywords = [
-            'too hard', 'too difficult', 'painful', 'injury', 'hurt',
-            'impossible', 'unrealistic', 'dangerous', 'unsafe'
-        ]
-        
-        v_lower = v.lower()
-        for keyword in safety_concern_keywords:
-            if keyword in v_lower:
-                # Flag for safety review and follow-up
-                break
+        if screen_text(v, "feedback_concern"):
+            # Flag for safety review and follow-up
+            pass
         
         return v
 
@@ -0,0 +1,104 @@
+"""
+IVF index vs exact top-k over a synthetic exercise/meal catalog.
+
+Generates clustered embeddings (catalog items are topical, not uniform
+noise) with random enum metadata, then reports build time, query latency
+and recall@k against exact search, with and without filters, plus the
+save/load round trip.
+
+Run from fastApi-agent-service/ (needs a local.env, dummy keys are fine):
+    python -m benchmarks.bench_ann_index --items 20000 --dim 768
+"""
+import argparse
+import logging
+import tempfile
+import time
+
+import numpy as np
+
+from backend.constants.enums import DietaryRestriction, IntensityLevel, MealType, WorkoutType
+from backend.utils.ann_index import IVFIndex
+from backend.utils.embeddings import to_normalized_matrix, top_k_similar
+
+
+def synthetic_catalog(items, dim, topics, rng):
+    centres = rng.standard_normal((topics, dim), dtype=np.float32)
+    vectors = centres[rng.integers(0, topics, items)] + 0.9 * rng.standard_normal((items, dim), dtype=np.float32)
+    workout_types, intensities = list(WorkoutType), list(IntensityLevel)
+    meal_types, restrictions = list(MealType), list(DietaryRestriction)[1:]
+    metadata = []
+    for i in range(items):
+        if i % 2:
+            metadata.append({"workout_type": workout_types[rng.integers(len(workout_types))].value,
+                             "intensity": intensities[rng.integers(len(intensities))].value})
+        else:
+            tags = rng.choice(len(restrictions), 3, replace=False)
+            metadata.append({"meal_type": meal_types[rng.integers(len(meal_types))].value,
+                             "dietary_tags": [restrictions[t].value for t in tags]})
+    return vectors, metadata, centres
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--topics", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16])
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    rng = np.random.default_rng(0)
+    vectors, metadata, centres = synthetic_catalog(args.items, args.dim, args.topics, rng)
+    ids = [f"item-{i}" for i in range(args.items)]
+    queries = centres[rng.integers(0, args.topics, args.queries)] + 0.9 * rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+
+    started = time.perf_counter()
+    index = IVFIndex(args.dim)
+    index.add(ids, vectors, metadata)
+    print(f"build: {args.items} items in {time.perf_counter() - started:.2f} s")
+
+    corpus = to_normalized_matrix(vectors)
+    started = time.perf_counter()
+    exact = [top_k_similar(query, corpus, args.k)[0] for query in queries]
+    exact_ms = (time.perf_counter() - started) / args.queries * 1000
+    print(f"exact (full matmul per query): {exact_ms:.3f} ms/query\n")
+
+    print(f"{'nprobe':>7}{'ms/query':>10}{'speedup':>9}{'recall@k':>10}")
+    for nprobe in args.nprobe:
+        started = time.perf_counter()
+        results = [index.search(query, args.k, nprobe=nprobe) for query in queries]
+        elapsed = (time.perf_counter() - started) / args.queries * 1000
+        recall = np.mean([
+            len({int(r["id"][5:]) for r in result} & set(truth.tolist())) / args.k
+            for result, truth in zip(results, exact)
+        ])
+        print(f"{nprobe:>7}{elapsed:>10.3f}{exact_ms / elapsed:>8.1f}x{recall:>10.3f}")
+
+    started = time.perf_counter()
+    filtered = [index.search(query, args.k, workout_types=[WorkoutType.YOGA, WorkoutType.PILATES],
+                             intensities=IntensityLevel.LOW) for query in queries]
+    print(f"\nfiltered workouts (yoga|pilates, low): {(time.perf_counter() - started) / args.queries * 1000:.3f} ms/query")
+    started = time.perf_counter()
+    index.search(queries[0], args.k, meal_types=MealType.DINNER, dietary_tags=[DietaryRestriction.VEGAN])
+    print(f"filtered meals (dinner, vegan):        {(time.perf_counter() - started) * 1000:.3f} ms/query")
+    assert all(r["metadata"]["workout_type"] in ("yoga", "pilates") for result in filtered for r in result)
+
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        index.save(directory)
+        saved = time.perf_counter() - started
+        started = time.perf_counter()
+        loaded = IVFIndex.load(directory)
+        print(f"\nsave {saved * 1000:.0f} ms, load {(time.perf_counter() - started) * 1000:.0f} ms")
+        assert [r["id"] for r in loaded.search(queries[0], args.k)] == [r["id"] for r in index.search(queries[0], args.k)]
+
+    started = time.perf_counter()
+    extra = rng.standard_normal((100, args.dim), dtype=np.float32)
+    index.add([f"extra-{i}" for i in range(100)], extra, [{"workout_type": "yoga"}] * 100)
+    print(f"incremental insert of 100: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Dietary compliance on multi-week meal plans: ingredient index + one
+compiled scan per unique ingredient vs the nested substring loops.
+
+The baseline is the previous algorithm (restrictions x days x meals x
+keywords, rebuilding each meal's ingredient string per restriction) run
+over the same lexicon. The new checker is timed cold (empty line cache)
+and warm (lines already seen by an earlier plan). Also prints a few lines
+where substring matching and word-boundary matching disagree.
+
+Run from fastApi-agent-service/ (needs a local.env, dummy keys are fine):
+    python -m benchmarks.bench_dietary_compliance --weeks 4 --meals 5
+"""
+import argparse
+import logging
+import random
+import time
+
+from backend.constants.dietary_lexicon import DIETARY_VIOLATIONS
+from backend.constants.enums import DietaryRestriction
+from backend.utils.dietary_compliance import check_meal_plan_compliance, ingredient_violations
+from benchmarks.bench_nutrition import INGREDIENT_LINES
+
+EXTRA_LINES = [
+    "1 tbsp butter", "1 cup unsweetened almond milk", "2 slices gluten-free bread", "1 cup green beans",
+    "1/2 cup eggplant, diced", "1 tbsp low sodium soy sauce", "1 cup cauliflower rice", "3 oz shrimp",
+    "1/4 cup feta cheese", "1 tsp maple syrup", "1 cup oyster mushrooms", "2 tbsp coconut yogurt",
+]
+# Compound words: the allergen is part of the word, or only looks like it is
+COMPOUND_LINES = [
+    "2 slices cornbread", "2 shortbread cookies", "1 cheesecake slice", "1 cup butternut squash",
+    "1/4 tsp nutmeg",
+]
+LINES = INGREDIENT_LINES + EXTRA_LINES + COMPOUND_LINES
+MEAL_TYPES = ["breakfast", "lunch", "dinner", "snack", "post_workout", "snack"]
+
+
+def synthetic_plan(rng, weeks, meals):
+    return [
+        {
+            "day": day,
+            "meals": [
+                {"name": f"{MEAL_TYPES[meal]} {day}", "meal_type": MEAL_TYPES[meal],
+                 "ingredients": rng.sample(LINES, rng.randint(4, 8))}
+                for meal in range(meals)
+            ],
+        }
+        for day in range(1, weeks * 7 + 1)
+    ]
+
+
+def substring_compliance(meal_plan, restrictions):
+    violations = []
+    for restriction in restrictions:
+        for day in meal_plan:
+            for meal in day.get("meals", []):
+                ingredients_text = " ".join(meal.get("ingredients", [])).lower()
+                for keyword in DIETARY_VIOLATIONS[restriction]:
+                    if keyword in ingredients_text:
+                        violations.append(
+                            f"Day {day.get('day')}, {meal.get('name')}: Contains {keyword} (violates {restriction})"
+                        )
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--weeks", type=int, default=4)
+    parser.add_argument("--meals", type=int, default=5)
+    parser.add_argument("--plans", type=int, default=20)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    rng = random.Random(0)
+    plans = [synthetic_plan(rng, args.weeks, args.meals) for _ in range(args.plans)]
+    restrictions = [restriction.value for restriction in DietaryRestriction]
+    ingredients = sum(len(meal["ingredients"]) for day in plans[0] for meal in day["meals"])
+    print(f"{args.plans} plans x {args.weeks * 7} days x {args.meals} meals (~{ingredients} ingredient lines each), "
+          f"{len(restrictions)} restrictions\n")
+
+    started = time.perf_counter()
+    for plan in plans:
+        substring_compliance(plan, restrictions)
+    baseline = (time.perf_counter() - started) / args.plans * 1000
+
+    ingredient_violations.cache_clear()
+    started = time.perf_counter()
+    check_meal_plan_compliance(plans[0], restrictions)
+    cold = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    for plan in plans:
+        check_meal_plan_compliance(plan, restrictions)
+    warm = (time.perf_counter() - started) / args.plans * 1000
+
+    print(f"{'nested substring loops':<32}{baseline:>9.2f} ms/plan")
+    print(f"{'index + compiled scan (cold)':<32}{cold:>9.2f} ms/plan ({baseline / cold:.1f}x)")
+    print(f"{'index + compiled scan (warm)':<32}{warm:>9.2f} ms/plan ({baseline / warm:.1f}x)\n")
+
+    print("substring vs word-boundary matching:")
+    for line in EXTRA_LINES[:6] + COMPOUND_LINES:
+        substring = sorted({r for r in restrictions if any(k in line.lower() for k in DIETARY_VIOLATIONS[r])})
+        print(f"  {line:<34} substring: {', '.join(substring) or '-'}")
+        print(f"  {'':<34} compiled:  {', '.join(sorted(ingredient_violations(line.lower()))) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Nested plan models: lean embedded pydantic models vs the previous Beanie
+Document subclasses, on a 12-week plan.
+
+Builds the plan with the offline fake provider (week 1 generated,
+weeks 2..12 derived locally), then compares validating the stored plan,
+dumping it back and holding validated copies in memory. The Document
+variants are rebuilt here with the same fields, and the stored layout
+for them carries the _id and revision_id every nested item used to
+have. BSON size is the size of the stored plan arrays.
+
+Run from fastApi-agent-service/ (needs a local.env, dummy keys are fine):
+    python -m benchmarks.bench_embedded_models --copies 50
+"""
+import argparse
+import gc
+import logging
+import time
+import tracemalloc
+import typing
+from typing import List
+
+import bson
+from beanie import Document
+from beanie.odm.settings.document import DocumentSettings
+from bson import ObjectId
+from pydantic import BaseModel, create_model
+
+from backend.models.HealthPlan import Exercise, Workout, Meal, DailyMealPlan, PlanWeek, HealthPlanContentView
+from benchmarks.bench_plan_updates import build_document
+
+PLAN_FIELDS = ("workout_plan", "meal_plan", "weekly_plans")
+
+
+def legacy_models():
+    """Document-based copies of the nested plan models, as they were before"""
+    legacy = {}
+
+    def rebuild(annotation):
+        if typing.get_origin(annotation) in (list, List):
+            return List[rebuild(typing.get_args(annotation)[0])]
+        return legacy.get(annotation, annotation)
+
+    for model in (Exercise, Workout, Meal, DailyMealPlan, PlanWeek):
+        fields = {name: (rebuild(field.annotation), field) for name, field in model.model_fields.items()}
+        document = create_model(f"Legacy{model.__name__}", __base__=Document, **fields)
+        # Settings init_beanie would attach; nested documents never get a collection of their own
+        document._document_settings = DocumentSettings()
+        legacy[model] = document
+
+    return create_model(
+        "LegacyPlanContent",
+        __base__=BaseModel,
+        workout_plan=(List[legacy[Workout]], []),
+        meal_plan=(List[legacy[DailyMealPlan]], []),
+        weekly_plans=(List[legacy[PlanWeek]], []),
+    )
+
+
+def with_document_keys(value):
+    """The stored layout of the Document variants: _id and revision_id on every nested object"""
+    if isinstance(value, list):
+        return [with_document_keys(item) for item in value]
+    if isinstance(value, dict):
+        nested = {key: with_document_keys(item) for key, item in value.items()}
+        if "name" in value or "day" in value or "week" in value:
+            nested.update({"_id": None, "revision_id": None})
+        return nested
+    return value
+
+
+def timed(function, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+def retained_kb(factory, copies: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    kept = [factory() for _ in range(copies)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current / copies / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--copies", type=int, default=50)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    document = build_document(0)
+    lean_stored = {"_id": ObjectId(), **{field: document[field] for field in PLAN_FIELDS}}
+    legacy_stored = {field: with_document_keys(document[field]) for field in PLAN_FIELDS}
+    legacy_model = legacy_models()
+
+    variants = [
+        ("Document subclasses", legacy_model, legacy_stored),
+        ("embedded models", HealthPlanContentView, lean_stored),
+    ]
+    print(f"12-week plan, {sum(len(week['workout_plan']) for week in document['weekly_plans']) + 7} workout days\n")
+    print(f"{'nested models':<22}{'validate ms':>12}{'dump ms':>9}{'KB/plan':>9}{'BSON B':>9}")
+    for label, model, stored in variants:
+        instance = model.model_validate(stored)
+        validate_ms = timed(lambda: model.model_validate(stored), args.iterations)
+        dump_ms = timed(lambda: instance.model_dump(), args.iterations)
+        memory_kb = retained_kb(lambda: model.model_validate(stored), args.copies)
+        stored_bytes = len(bson.encode({field: stored[field] for field in PLAN_FIELDS}))
+        print(f"{label:<22}{validate_ms:>12.2f}{dump_ms:>9.2f}{memory_kb:>9.1f}{stored_bytes:>9}")
+
+
+if __name__ == "__main__":
+    main()
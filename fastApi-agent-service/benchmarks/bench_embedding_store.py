@@ -0,0 +1,71 @@
+"""
+Persistent embedding store: warm-start load and lookup cost.
+
+Fills a store with random embeddings, then measures what a freshly
+started worker pays to open it (CURRENT + mmap + key index), the cost of
+cached lookups against a simulated upstream embedding call, and a
+compaction pass when the store overflows.
+
+Run from fastApi-agent-service/ (needs a local.env, dummy keys are fine):
+    python -m benchmarks.bench_embedding_store --entries 50000 --dim 768
+"""
+import argparse
+import logging
+import tempfile
+import time
+
+import numpy as np
+
+from backend.utils.embedding_store import EmbeddingStore, embedding_key
+
+
+def timed(function, repeat=1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--upstream-ms", type=float, default=150.0, help="simulated latency of one upstream batch call")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    rng = np.random.default_rng(0)
+    keys = [embedding_key("models/embedding-001", "document", f"chunk {i}") for i in range(args.entries)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = EmbeddingStore(directory, capacity=args.entries)
+        fill_seconds = 0.0
+        for start in range(0, args.entries, 1000):
+            vectors = rng.standard_normal((min(1000, args.entries - start), args.dim), dtype=np.float32)
+            seconds, _ = timed(lambda: store.put_many(zip(keys[start:start + 1000], vectors)))
+            fill_seconds += seconds
+
+        open_seconds, warm = timed(lambda: len(EmbeddingStore(directory, capacity=args.entries)))
+        fresh = EmbeddingStore(directory, capacity=args.entries)
+        sample = [keys[i] for i in rng.choice(args.entries, args.batch, replace=False)]
+        first_seconds, found = timed(lambda: fresh.get_many(sample))
+        hit_seconds, _ = timed(lambda: fresh.get_many(sample), repeat=50)
+        miss_seconds = args.upstream_ms / 1000
+
+        assert warm == args.entries and len(found) == args.batch
+        print(f"store: {args.entries} x {args.dim} float32 ({args.entries * args.dim * 4 / 2**20:.0f} MiB)")
+        print(f"fill (1000-row appends):      {fill_seconds:8.3f} s")
+        print(f"warm-start open + index load: {open_seconds * 1000:8.1f} ms")
+        print(f"first lookup + index ({args.batch}):   {first_seconds * 1000:8.2f} ms")
+        print(f"cached batch lookup ({args.batch}):    {hit_seconds * 1000:8.3f} ms")
+        print(f"upstream batch call (sim.):   {miss_seconds * 1000:8.1f} ms  ({miss_seconds / hit_seconds:.0f}x slower)")
+
+        overflow = rng.standard_normal((args.batch, args.dim), dtype=np.float32)
+        extra = [embedding_key("models/embedding-001", "document", f"extra {i}") for i in range(args.batch)]
+        compact_seconds, _ = timed(lambda: store.put_many(zip(extra, overflow)))
+        print(f"overflow insert + compaction: {compact_seconds * 1000:8.1f} ms  -> {store.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+JSON serialization: the stdlib json module vs the orjson paths in
+backend/utils/json_codec.py and FastAPI's ORJSONResponse.
+
+Builds a 12-week create_health_plan response with the offline fake
+provider and reports, per operation, the mean time of each encoder:
+- rendering the response body (JSONResponse vs ORJSONResponse)
+- parsing LLM output (json.loads vs json_codec.loads)
+- the canonical JSON signed between services (json.dumps vs
+  canonical_json), checking the bytes are identical for every payload,
+  including ones that take the stdlib fallback
+
+Run from fastApi-agent-service/ (needs a local.env, dummy keys are fine):
+    python -m benchmarks.bench_json_serialization --iterations 200
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from backend.config import main as config
+from backend.utils import llm as llm_module
+from backend.utils.json_codec import loads, canonical_json
+from benchmarks.bench_plan_updates import PROFILE
+from benchmarks.fake_provider import FakeChatModel
+
+
+def plan_response_content() -> dict:
+    from backend.controller.agent import wellness_orchestrator
+    from backend.controller.internal import build_health_plan_response
+
+    llm_module.build_chat_model = FakeChatModel
+    llm_module._node_llms.clear()
+    config.PLAN_DURATION_WEEKS = 12
+    config.WORKOUT_TEMPLATE_PLANNER_ENABLED = False
+    state = asyncio.run(wellness_orchestrator(PROFILE, [], ["vegetarian"]))
+    request = SimpleNamespace(
+        user_id="64b7f0c2a1b2c3d4e5f60718", plan_name=None, age=PROFILE["age"],
+        current_activity_level=PROFILE["current_activity_level"], primary_goal=PROFILE["primary_goal"],
+        dietary_restrictions=["vegetarian"], health_conditions=[], preferred_workout_types=[],
+        available_equipment=PROFILE["available_equipment"], time_availability_minutes=PROFILE["time_availability_minutes"],
+        health_disclaimer_acknowledged=True, medical_clearance=False,
+    )
+    return json.loads(build_health_plan_response(request, state).body)
+
+
+def signature_payloads(content: dict) -> list:
+    """Payloads shaped like the ones services/user.py signs, plus ones that need the stdlib fallback"""
+    now = datetime.utcnow().isoformat()
+    return [
+        {"status": "paused", "current_week": 3, "updated_at": now, "service_origin": "wellness_agent"},
+        {"user_id": "64b7f0c2a1b2c3d4e5f60718", "metrics": {"weight_kg": 67.4, "sleep_hours": 7.5}, "recorded_at": now},
+        {"concern": "Knee pain after squats", "severity": "moderate", "reported_at": now, "plan_id": None},
+        {"plan_id": "64b7f0c2a1b2c3d4e5f60718", "limit": "50"},
+        {"note": "Café au lait, 2 cups ☕", "calories": 1e-7},
+        {"plan_data": content["plan_data"]},
+    ]
+
+
+def timed(function, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    content = plan_response_content()
+    stdlib_body = JSONResponse(content).body
+    orjson_body = ORJSONResponse(content).body
+    llm_output = json.dumps(content["plan_data"]["workout_plan"], indent=2)
+
+    print(f"create_health_plan response: {len(stdlib_body)} B (stdlib), {len(orjson_body)} B (orjson)\n")
+    print(f"{'operation':<34}{'stdlib ms':>11}{'orjson ms':>11}{'speedup':>9}")
+    rows = [
+        ("render plan response", lambda: JSONResponse(content), lambda: ORJSONResponse(content)),
+        (f"parse LLM output ({len(llm_output)} B)", lambda: json.loads(llm_output), lambda: loads(llm_output)),
+    ]
+    for index, payload in enumerate(signature_payloads(content)):
+        rows.append((
+            f"canonical JSON, payload {index + 1} ({len(canonical_json(payload))} B)",
+            lambda payload=payload: json.dumps(payload, separators=(",", ":")),
+            lambda payload=payload: canonical_json(payload),
+        ))
+    for label, stdlib, fast in rows:
+        stdlib_ms = timed(stdlib, args.iterations)
+        fast_ms = timed(fast, args.iterations)
+        print(f"{label:<34}{stdlib_ms:>11.4f}{fast_ms:>11.4f}{stdlib_ms / fast_ms:>8.1f}x")
+
+    mismatches = [
+        index + 1 for index, payload in enumerate(signature_payloads(content))
+        if canonical_json(payload).encode() != json.dumps(payload, separators=(",", ":")).encode()
+    ]
+    print(f"\ncanonical JSON byte-identical to json.dumps: {'yes' if not mismatches else f'NO (payloads {mismatches})'}")
+
+
+if __name__ == "__main__":
+    main()
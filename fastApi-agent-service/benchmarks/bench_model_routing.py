@@ -0,0 +1,103 @@
+"""
+Latency and cost per model route, using the offline fake provider.
+
+Runs the wellness orchestrator over a mix of synthetic profiles twice,
+once with every node on the standard model and once with the routing
+policy enabled, and reports simulated per-request latency and cost.
+
+Run from fastApi-agent-service/ (needs a local.env, dummy keys are fine):
+    python -m benchmarks.bench_model_routing --profiles 200
+"""
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+from collections import defaultdict
+
+from backend.config import main as config
+from backend.utils import llm as llm_module
+from benchmarks.fake_provider import FakeChatModel
+
+
+def synthetic_profiles(count, seed=7):
+    rng = random.Random(seed)
+    conditions_pool = ["hypertension", "type 2 diabetes", "knee arthritis", "asthma"]
+    restrictions_pool = ["vegetarian", "gluten_free", "dairy_free", "nut_free"]
+    profiles = []
+    for index in range(count):
+        simple = rng.random() < 0.6
+        profiles.append({
+            "profile": {
+                "user_id": f"bench-{index}",
+                "age": rng.randint(20, 60) if simple else rng.choice([16, 45, 70, 78]),
+                "gender": rng.choice(["male", "female"]),
+                "weight_kg": rng.randint(55, 100),
+                "height_cm": rng.randint(155, 195),
+                "current_activity_level": rng.choice(["sedentary", "lightly_active", "moderately_active"]),
+                "primary_goal": "general_wellness",
+                "time_availability_minutes": rng.choice([20, 30, 45]),
+            },
+            "health_conditions": [] if simple else rng.sample(conditions_pool, rng.randint(1, 2)),
+            "dietary_restrictions": rng.sample(restrictions_pool, rng.randint(0, 1 if simple else 3)),
+        })
+    return profiles
+
+
+def run(profiles, routing_enabled):
+    from backend.controller.agent import wellness_orchestrator
+
+    config.LLM_ROUTING_ENABLED = routing_enabled
+    llm_module._node_llms.clear()
+    per_route = defaultdict(lambda: {"latency": [], "cost": [], "calls": 0})
+
+    for item in profiles:
+        FakeChatModel.calls.clear()
+        asyncio.run(wellness_orchestrator(
+            item["profile"], item["health_conditions"], item["dietary_restrictions"],
+        ))
+        calls = list(FakeChatModel.calls)
+        models = {call["model"] for call in calls}
+        route = "light" if models == {config.LLM_LIGHT_MODEL} else "standard" if config.LLM_LIGHT_MODEL not in models else "mixed"
+        bucket = per_route[route]
+        bucket["latency"].append(sum(call["latency_seconds"] for call in calls))
+        bucket["cost"].append(sum(call["cost_usd"] for call in calls))
+        bucket["calls"] += len(calls)
+    return per_route
+
+
+def report(title, per_route):
+    print(f"\n{title}")
+    print(f"{'route':<10}{'requests':>10}{'calls':>8}{'p50 s':>9}{'p95 s':>9}{'$/request':>12}")
+    all_latency, all_cost = [], []
+    for route, bucket in sorted(per_route.items()):
+        latency = sorted(bucket["latency"])
+        all_latency += latency
+        all_cost += bucket["cost"]
+        print(
+            f"{route:<10}{len(latency):>10}{bucket['calls']:>8}"
+            f"{statistics.median(latency):>9.2f}{latency[int(0.95 * (len(latency) - 1))]:>9.2f}"
+            f"{statistics.mean(bucket['cost']):>12.5f}"
+        )
+    all_latency.sort()
+    print(
+        f"{'all':<10}{len(all_latency):>10}{'':>8}{statistics.median(all_latency):>9.2f}"
+        f"{all_latency[int(0.95 * (len(all_latency) - 1))]:>9.2f}{statistics.mean(all_cost):>12.5f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=100)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    llm_module.build_chat_model = FakeChatModel
+    profiles = synthetic_profiles(args.profiles)
+
+    report("All nodes on the standard model", run(profiles, routing_enabled=False))
+    report("Routing policy enabled", run(profiles, routing_enabled=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Local meal nutrition: ingredient parsing, food lookup and the vectorized
+per-plan calorie/macro pass.
+
+Builds 7-day plans from realistic ingredient lines (including misspelled
+and unknown foods), then reports table load time, cold vs cached lookup
+throughput, time per plan for apply_plan_nutrition and ingredient coverage.
+
+Run from fastApi-agent-service/ (needs a local.env, dummy keys are fine):
+    python -m benchmarks.bench_nutrition --plans 200
+"""
+import argparse
+import copy
+import logging
+import random
+import time
+
+from backend.utils.nutrition import apply_plan_nutrition, get_food_index, load_food_table, parse_ingredient
+
+INGREDIENT_LINES = [
+    "1 cup rolled oats", "1/2 cup blueberries", "1 tbsp honey", "2 large eggs", "2 slices whole grain toast",
+    "1 medium banana", "1 tbsp peanut butter", "6 oz grilled chicken breast", "1 cup cooked brown rice",
+    "2 cups steamed broccoli", "150 g salmon fillet", "1 1/2 cups cooked quinoa", "1 tbsp extra virgin olive oil",
+    "3/4 cup plain greek yogurt", "1/4 cup granola", "1 can tuna in water", "2 cups mixed greens",
+    "1/2 avocado", "1 cup cherry tomatoes", "100g firm tofu", "1 cup cooked lentils", "1 small sweet potato",
+    "2 tbsp hummus", "1 oz almonds", "1 apple", "1 cup unsweetened almond milk", "1 scoop whey protein powder",
+    "2 cloves garlic, minced", "1/2 cup diced onion", "1 tsp cumin", "salt and pepper to taste",
+    "1 cup brocolli", "4 oz lean ground turkey", "1 whole wheat tortilla", "1/4 cup salsa",
+    "1 cup spinach (fresh)", "2 tbsp chia seeds", "1 cup cooked whole wheat pasta", "1/2 cup marinara sauce",
+    "1 serving dragonfruit smoothie", "1 portion quinoa salad",
+]
+MEAL_TYPES = ["breakfast", "lunch", "dinner", "snack"]
+
+
+def synthetic_plan(rng):
+    return [
+        {
+            "day": day,
+            "meals": [
+                {"name": f"Meal {meal}", "meal_type": meal_type, "servings": 1,
+                 "ingredients": rng.sample(INGREDIENT_LINES, rng.randint(3, 7))}
+                for meal, meal_type in enumerate(MEAL_TYPES)
+            ],
+        }
+        for day in range(1, 8)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plans", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    rng = random.Random(0)
+    plans = [synthetic_plan(rng) for _ in range(args.plans)]
+
+    started = time.perf_counter()
+    table = load_food_table()
+    index = get_food_index()
+    print(f"load: {len(table.names)} foods, {len(table.aliases)} names in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    foods = [parse_ingredient(line).food for line in INGREDIENT_LINES]
+    started = time.perf_counter()
+    matched = sum(index._lookup(food) is not None for food in foods)
+    cold_us = (time.perf_counter() - started) / len(foods) * 1e6
+    started = time.perf_counter()
+    for _ in range(100):
+        for food in foods:
+            index.lookup(food)
+    cached_us = (time.perf_counter() - started) / (100 * len(foods)) * 1e6
+    print(f"lookup: {cold_us:.1f} us uncached, {cached_us:.2f} us cached, {matched}/{len(foods)} lines matched")
+
+    runs = [copy.deepcopy(plan) for plan in plans]
+    started = time.perf_counter()
+    reports = [apply_plan_nutrition(plan) for plan in runs]
+    per_plan_ms = (time.perf_counter() - started) / args.plans * 1000
+    ingredients = sum(report["ingredients"] for report in reports)
+    coverage = sum(report["matched"] for report in reports) / ingredients
+    print(f"apply_plan_nutrition: {per_plan_ms:.2f} ms per 7-day plan ({ingredients / args.plans:.0f} ingredients), "
+          f"coverage {coverage:.1%}")
+
+    day = runs[0][0]
+    print(f"\nday 1: {day['total_estimated_calories']} kcal, {day['nutrition_summary']}")
+    for meal in day["meals"]:
+        print(f"  {meal['meal_type']:<10}{meal['estimated_calories']:>6} kcal  {meal['ingredients']}")
+
+
+if __name__ == "__main__":
+    main()
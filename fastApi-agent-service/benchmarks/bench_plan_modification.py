@@ -0,0 +1,100 @@
+"""
+Plan modifications: full regeneration vs regenerating only the touched
+fragments, using the offline fake provider.
+
+Generates one plan, then runs each change request both ways - the full
+wellness orchestrator, as chat used to, and modify_plan_incrementally -
+and reports simulated LLM latency and cost, the fragments replaced and
+the size of the patch against the size of the whole plan.
+
+Run from fastApi-agent-service/ (needs a local.env, dummy keys are fine):
+    python -m benchmarks.bench_plan_modification --weeks 4
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+from backend.config import main as config
+from backend.utils import llm as llm_module
+from benchmarks.fake_provider import FakeChatModel
+
+PROFILE = {
+    "user_id": "bench",
+    "age": 35,
+    "gender": "female",
+    "weight_kg": 68,
+    "height_cm": 168,
+    "current_activity_level": "moderately_active",
+    "primary_goal": "general_wellness",
+    "time_availability_minutes": 45,
+    "available_equipment": ["dumbbells", "yoga mat"],
+}
+
+REQUESTS = [
+    "No squats please",
+    "Can you swap Tuesday's dinner?",
+    "Replace the eggs in my breakfasts",
+    "No dairy on the weekend",
+]
+
+
+def llm_totals():
+    return (
+        sum(call["latency_seconds"] for call in FakeChatModel.calls),
+        sum(call["cost_usd"] for call in FakeChatModel.calls),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--weeks", type=int, default=4)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    from backend.controller.agent import wellness_orchestrator, derive_plan_weeks
+    from backend.controller.agents.plan_modifier import modify_plan_incrementally
+
+    llm_module.build_chat_model = FakeChatModel
+    llm_module._node_llms.clear()
+    config.PLAN_DURATION_WEEKS = args.weeks
+    config.WORKOUT_TEMPLATE_PLANNER_ENABLED = False
+
+    state = asyncio.run(wellness_orchestrator(PROFILE, [], []))
+    plan = {
+        "workout_plan": state["workout_plan"],
+        "meal_plan": state["meal_plan"],
+        "weekly_plans": state["weekly_plans"],
+        "plan_version": 1,
+    }
+    plan_bytes = len(json.dumps(plan, default=str))
+
+    FakeChatModel.calls.clear()
+    asyncio.run(wellness_orchestrator(PROFILE, [], [], operation_type="modify_plan"))
+    full_latency, full_cost = llm_totals()
+
+    print(f"{args.weeks}-week plan, {plan_bytes} bytes as JSON\n")
+    print(f"{'request':<36}{'mode':<13}{'LLM s':>8}{'$':>10}{'local ms':>10}{'changed':>9}{'bytes':>9}")
+    for message in REQUESTS:
+        print(f"{message:<36}{'full':<13}{full_latency:>8.2f}{full_cost:>10.5f}{'':>10}{'all':>9}{plan_bytes:>9}")
+        FakeChatModel.calls.clear()
+        started = time.perf_counter()
+        result = modify_plan_incrementally(
+            "bench", plan, message, PROFILE, [], [],
+            derive_weeks=lambda workout_plan, meal_plan: derive_plan_weeks(
+                workout_plan, meal_plan, PROFILE, [], len(plan["weekly_plans"]) + 1
+            ),
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        latency, cost = llm_totals()
+        if result is None:
+            print(f"{'':<36}{'incremental':<13}{'falls back to full regeneration':>56}")
+            continue
+        patch = result["patch"]
+        print(f"{'':<36}{'incremental':<13}{latency:>8.2f}{cost:>10.5f}{elapsed_ms:>10.1f}"
+              f"{len(patch['changed_fragments']):>9}{len(json.dumps(patch, default=str)):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Multi-week plans: one week-1 generation plus local progression vs one
+LLM generation per week, using the offline fake provider.
+
+Runs the wellness orchestrator once per profile (week 1 from the LLM or
+the catalog planner, weeks 2..N expanded locally and checked by the
+per-week validators) and reports simulated LLM latency and cost against
+the same generation repeated for every week. Also prints the weekly
+volume and the exercises on the first training day of one plan.
+
+Run from fastApi-agent-service/ (needs a local.env, dummy keys are fine):
+    python -m benchmarks.bench_plan_progression --weeks 12 --profiles 20
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from backend.config import main as config
+from backend.utils import llm as llm_module
+from backend.utils.plan_progression import expand_plan_weeks
+from benchmarks.fake_provider import FakeChatModel
+
+PROFILE = {
+    "user_id": "bench",
+    "age": 35,
+    "gender": "female",
+    "weight_kg": 68,
+    "height_cm": 168,
+    "current_activity_level": "moderately_active",
+    "primary_goal": "general_wellness",
+    "time_availability_minutes": 45,
+    "available_equipment": ["dumbbells", "yoga mat"],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--weeks", type=int, default=12)
+    parser.add_argument("--profiles", type=int, default=20)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    from backend.controller.agent import wellness_orchestrator
+
+    llm_module.build_chat_model = FakeChatModel
+    llm_module._node_llms.clear()
+    config.PLAN_DURATION_WEEKS = args.weeks
+    # LLM workout generation, so both plans come from the model
+    config.WORKOUT_TEMPLATE_PLANNER_ENABLED = False
+
+    latency = cost = 0.0
+    state = None
+    for index in range(args.profiles):
+        FakeChatModel.calls.clear()
+        state = asyncio.run(wellness_orchestrator({**PROFILE, "user_id": f"bench-{index}"}, [], ["vegetarian"]))
+        # The health analysis is the first call and runs once either way
+        calls = FakeChatModel.calls[1:]
+        latency += sum(call["latency_seconds"] for call in calls)
+        cost += sum(call["cost_usd"] for call in calls)
+    latency /= args.profiles
+    cost /= args.profiles
+
+    started = time.perf_counter()
+    for _ in range(args.profiles):
+        expand_plan_weeks(state["workout_plan"], state["meal_plan"], PROFILE, args.weeks)
+    local_ms = (time.perf_counter() - started) / args.profiles * 1000
+
+    print(f"{args.profiles} profiles, {args.weeks}-week plans\n")
+    print(f"{'':<34}{'LLM s':>9}{'$/plan':>10}{'local ms':>10}")
+    print(f"{'one generation per week':<34}{latency * args.weeks:>9.2f}{cost * args.weeks:>10.5f}{'':>10}")
+    print(f"{'week 1 + local progression':<34}{latency:>9.2f}{cost:>10.5f}{local_ms:>10.2f}\n")
+
+    weeks = [{"week": 1, "phase": "-", "volume_factor": 1.0, "workout_plan": state["workout_plan"],
+              "safety_warnings": []}] + state["weekly_plans"]
+    print(f"{'week':<6}{'phase':<8}{'factor':>7}{'minutes':>9}  first training day")
+    for week in weeks:
+        minutes = sum(day["total_duration_minutes"] for day in week["workout_plan"] if not day.get("rest_day"))
+        first = next(day for day in week["workout_plan"] if not day.get("rest_day"))
+        exercises = ", ".join(f"{e['name']} {e['duration_minutes']}m" for e in first["exercises"])
+        print(f"{week['week']:<6}{week['phase']:<8}{week['volume_factor']:>7.2f}{minutes:>9}  {exercises}"
+              f"{'  ' + '; '.join(week['safety_warnings']) if week['safety_warnings'] else ''}")
+
+
+if __name__ == "__main__":
+    main()
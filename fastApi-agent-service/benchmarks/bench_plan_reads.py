@@ -0,0 +1,97 @@
+"""
+Plan reads: full HealthPlan documents vs the projection read models in
+backend/models/HealthPlan.py, on a 12-week plan document.
+
+Reports the BSON reply size of each read model against the full
+document and the client-side decode time. With --mongo-uri it inserts
+the document into a scratch database (dropped afterwards) and times
+find_one for the full document and for each projection.
+
+Run from fastApi-agent-service/ (needs a local.env, dummy keys are fine):
+    python -m benchmarks.bench_plan_reads --notes 150
+    python -m benchmarks.bench_plan_reads --mongo-uri mongodb://localhost:27017 --iterations 500
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+import bson
+
+from benchmarks.bench_plan_updates import build_document, project
+
+
+def read_models():
+    from backend.models.HealthPlan import (
+        HealthPlanSummaryView, HealthPlanStatusView, HealthPlanChatContextView, HealthPlanContentView
+    )
+    return [
+        ("summary", HealthPlanSummaryView),
+        ("status", HealthPlanStatusView),
+        ("chat context", HealthPlanChatContextView),
+        ("plan content", HealthPlanContentView),
+    ]
+
+
+def decode_ms(reply: dict, iterations: int) -> float:
+    encoded = bson.encode(reply)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        bson.decode(encoded)
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+async def round_trips(uri: str, document: dict, iterations: int) -> dict:
+    """Mean find_one ms for the full document and each read model"""
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from beanie import init_beanie
+    from backend.models.HealthPlan import HealthPlan
+
+    client = AsyncIOMotorClient(uri)
+    await init_beanie(database=client["wellness-agent-bench"], document_models=[HealthPlan])
+    await HealthPlan.get_motor_collection().insert_one(document)
+    plan_filter = {"_id": document["_id"]}
+
+    async def timed(projection_model=None):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await HealthPlan.find_one(plan_filter, projection_model=projection_model)
+        return (time.perf_counter() - started) / iterations * 1000
+
+    try:
+        timings = {"full document": await timed()}
+        for name, view in read_models():
+            timings[name] = await timed(view)
+        return timings
+    finally:
+        await client.drop_database("wellness-agent-bench")
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notes", type=int, default=150)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--mongo-uri", default=None)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    document = build_document(args.notes)
+    full_bytes = len(bson.encode(document))
+    print(f"12-week plan document, {args.notes} progress notes\n")
+    print(f"{'read':<16}{'reply B':>10}{'of full':>9}{'decode ms':>11}")
+    print(f"{'full document':<16}{full_bytes:>10}{'100%':>9}{decode_ms(document, args.iterations):>11.3f}")
+    for name, view in read_models():
+        reply = project(document, view)
+        reply_bytes = len(bson.encode(reply))
+        print(f"{name:<16}{reply_bytes:>10}{reply_bytes / full_bytes:>9.1%}{decode_ms(reply, args.iterations):>11.3f}")
+
+    if args.mongo_uri:
+        timings = asyncio.run(round_trips(args.mongo_uri, document, args.iterations))
+        print(f"\n{'read':<16}{'find_one ms':>12}")
+        for name, elapsed_ms in timings.items():
+            print(f"{name:<16}{elapsed_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Plan writes: full-document save() vs projected reads and targeted update
+operators, on a 12-week plan document.
+
+Builds a realistic plan document (week 1 from the offline fake provider,
+weeks 2..12 derived locally, a long progress-note history embedded the
+way plans stored it before plan_events) and reports, for the progress,
+pause and chat endpoints, the BSON bytes each path moves (the read reply
+plus the write commands, including the plan_events insert) and the
+client-side BSON encode/decode time. With --mongo-uri it also times real round trips
+against a scratch database, which is dropped afterwards.
+
+Run from fastApi-agent-service/ (needs a local.env, dummy keys are fine):
+    python -m benchmarks.bench_plan_updates --notes 150
+    python -m benchmarks.bench_plan_updates --mongo-uri mongodb://localhost:27017 --iterations 200
+"""
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+import bson
+from bson import ObjectId
+
+from backend.config import main as config
+from backend.constants.enums import HealthPlanStatus
+from backend.utils import llm as llm_module
+from backend.utils.plan_updates import progress_update, pause_update, touch_update
+from benchmarks.fake_provider import FakeChatModel
+
+PROFILE = {
+    "user_id": "bench",
+    "age": 35,
+    "gender": "female",
+    "weight_kg": 68,
+    "height_cm": 168,
+    "current_activity_level": "moderately_active",
+    "primary_goal": "general_wellness",
+    "time_availability_minutes": 45,
+    "available_equipment": ["dumbbells", "yoga mat"],
+}
+
+
+def build_document(notes: int) -> dict:
+    from backend.controller.agent import wellness_orchestrator
+
+    llm_module.build_chat_model = FakeChatModel
+    llm_module._node_llms.clear()
+    config.PLAN_DURATION_WEEKS = 12
+    config.WORKOUT_TEMPLATE_PLANNER_ENABLED = False
+    state = asyncio.run(wellness_orchestrator(PROFILE, [], ["vegetarian"]))
+    now = datetime.utcnow()
+    return {
+        "_id": ObjectId(),
+        "user_id": ObjectId(),
+        "plan_name": "12 Week General Wellness Plan",
+        "status": HealthPlanStatus.ACTIVE.value,
+        "age": PROFILE["age"],
+        "current_activity_level": PROFILE["current_activity_level"],
+        "primary_goal": PROFILE["primary_goal"],
+        "dietary_restrictions": ["vegetarian"],
+        "health_conditions": [],
+        "preferred_workout_types": [],
+        "available_equipment": PROFILE["available_equipment"],
+        "time_availability_minutes": PROFILE["time_availability_minutes"],
+        "workout_plan": state["workout_plan"],
+        "meal_plan": state["meal_plan"],
+        "weekly_plans": state["weekly_plans"],
+        "plan_version": 1,
+        "plan_duration_weeks": 12,
+        "current_week": 3,
+        "progress_notes": [
+            f"[{now:%Y-%m-%d %H:%M}] Week {index // 12 + 1}: finished the session, felt good, slept well"
+            for index in range(notes)
+        ],
+        "health_disclaimer_acknowledged": True,
+        "medical_clearance": False,
+        "created_at": now,
+        "updated_at": now,
+        "last_accessed_at": None,
+    }
+
+
+def project(document: dict, view) -> dict:
+    fields = {field.alias or name for name, field in view.model_fields.items()}
+    return {key: value for key, value in document.items() if key in fields}
+
+
+def endpoint_cases(document: dict):
+    """(endpoint, old read, old writes, new read, new writes) as BSON documents"""
+    from backend.models.HealthPlan import HealthPlanStatusView, HealthPlanChatContextView
+
+    plan_filter = {"_id": document["_id"]}
+    replace = {"update": "health_plans", "updates": [{"q": plan_filter, "u": document}]}
+
+    def update(operators, extra_filter=None):
+        return {"update": "health_plans", "updates": [{"q": {**plan_filter, **(extra_filter or {})}, "u": operators}]}
+
+    def events(*items):
+        return {"insert": "plan_events", "documents": [
+            {"_id": ObjectId(), "plan_id": document["_id"], "timestamp": datetime.utcnow(), **item} for item in items
+        ]}
+
+    return [
+        ("progress", document, [replace], project(document, HealthPlanStatusView), [
+            update(progress_update(4, HealthPlanStatus.ACTIVE)),
+            events({"kind": "progress", "text": "Week 4: all sessions done", "current_week": 4}),
+        ]),
+        ("pause", document, [replace], project(document, HealthPlanStatusView), [
+            update(pause_update(), {"status": HealthPlanStatus.ACTIVE.value}),
+            events({"kind": "pause", "text": "[PAUSE] Travelling", "current_week": 3}),
+        ]),
+        ("chat", document, [replace], project(document, HealthPlanChatContextView), [
+            events({"kind": "chat", "role": "user", "text": "How much water should I drink?"},
+                   {"kind": "chat", "role": "assistant", "text": "Aim for about 8 glasses a day. " * 10}),
+            update(touch_update()),
+        ]),
+    ]
+
+
+def codec_ms(read: dict, writes: list, iterations: int) -> float:
+    reply = bson.encode(read)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        bson.decode(reply)
+        for write in writes:
+            bson.encode(write)
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+async def round_trips(uri: str, document: dict, iterations: int) -> dict:
+    """Mean ms per request for each endpoint, old path vs new path"""
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from beanie import init_beanie
+    from backend.models.HealthPlan import HealthPlan, HealthPlanStatusView, HealthPlanChatContextView
+    from backend.models.PlanEvent import PlanEvent
+
+    client = AsyncIOMotorClient(uri)
+    database = client["wellness-agent-bench"]
+    await init_beanie(database=database, document_models=[HealthPlan, PlanEvent])
+    collection = HealthPlan.get_motor_collection()
+    events = PlanEvent.get_motor_collection()
+    await collection.insert_one(document)
+    plan_filter = {"_id": document["_id"]}
+
+    async def old_path(_):
+        plan = await HealthPlan.find_one(plan_filter)
+        plan.updated_at = datetime.utcnow()
+        await plan.save()
+
+    async def new_progress(_):
+        await HealthPlan.find_one(plan_filter, projection_model=HealthPlanStatusView)
+        await collection.update_one(plan_filter, progress_update(3, HealthPlanStatus.ACTIVE))
+        await events.insert_many([{"plan_id": document["_id"], "timestamp": datetime.utcnow(), "kind": "progress", "text": "note"}])
+
+    async def new_pause(_):
+        await HealthPlan.find_one(plan_filter, projection_model=HealthPlanStatusView)
+        await collection.update_one(plan_filter, pause_update())
+        await events.insert_many([{"plan_id": document["_id"], "timestamp": datetime.utcnow(), "kind": "pause", "text": "note"}])
+
+    async def new_chat(_):
+        await HealthPlan.find_one(plan_filter, projection_model=HealthPlanChatContextView)
+        await events.insert_many([
+            {"plan_id": document["_id"], "timestamp": datetime.utcnow(), "kind": "chat", "role": role, "text": "message"}
+            for role in ("user", "assistant")
+        ])
+        await collection.update_one(plan_filter, touch_update())
+
+    async def timed(step):
+        started = time.perf_counter()
+        for index in range(iterations):
+            await step(index)
+        return (time.perf_counter() - started) / iterations * 1000
+
+    try:
+        old_ms = await timed(old_path)
+        return {
+            "progress": (old_ms, await timed(new_progress)),
+            "pause": (old_ms, await timed(new_pause)),
+            "chat": (old_ms, await timed(new_chat)),
+        }
+    finally:
+        await client.drop_database("wellness-agent-bench")
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notes", type=int, default=150)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--mongo-uri", default=None)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    document = build_document(args.notes)
+    print(f"12-week plan document: {len(bson.encode(document))} BSON bytes, {args.notes} progress notes\n")
+    print(f"{'endpoint':<10}{'path':<26}{'read B':>9}{'write B':>9}{'total B':>9}{'codec ms':>10}")
+    for endpoint, old_read, old_writes, new_read, new_writes in endpoint_cases(document):
+        for label, read, writes in (("find_one + save()", old_read, old_writes),
+                                    ("projection + operators", new_read, new_writes)):
+            read_bytes, write_bytes = len(bson.encode(read)), sum(len(bson.encode(write)) for write in writes)
+            print(f"{endpoint:<10}{label:<26}{read_bytes:>9}{write_bytes:>9}{read_bytes + write_bytes:>9}"
+                  f"{codec_ms(read, writes, args.iterations):>10.3f}")
+            endpoint = ""
+
+    if args.mongo_uri:
+        timings = asyncio.run(round_trips(args.mongo_uri, document, args.iterations))
+        print(f"\n{'endpoint':<10}{'save() ms':>11}{'update ms':>11}")
+        for endpoint, (old_ms, new_ms) in timings.items():
+            print(f"{endpoint:<10}{old_ms:>11.2f}{new_ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
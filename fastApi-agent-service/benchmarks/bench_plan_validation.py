@@ -0,0 +1,173 @@
+"""
+Plan output checks: the validation stage in backend/utils/plan_validation.py
+(hook pass over every week, one compiled TypeAdapter check of week 1) vs
+the hand-rolled normalization loops it replaced (normalize_workout_data,
+normalize_meal_plan_data and the final loop in build_health_plan_response),
+on a 12-week plan.
+
+The plan comes from the offline fake provider and is then roughened the
+way LLM output arrives (type and intensity aliases, "_option" dietary
+tags, conditional allergens, out-of-range calories). The legacy loops
+only ever covered week 1; they are timed on week 1 and, for a like for
+like figure, on every week. Reports ms per plan and how many problems
+each path surfaces: the loops log and move on, validation returns every
+error with its item.
+
+Run from fastApi-agent-service/ (needs a local.env, dummy keys are fine):
+    python -m benchmarks.bench_plan_validation --iterations 50
+"""
+import argparse
+import copy
+import logging
+import time
+
+from backend.constants.enums import MIN_CALORIES_ADULT, MAX_CALORIES_ADULT
+from backend.utils.plan_validation import validate_plan_output
+from benchmarks.bench_plan_updates import build_document
+
+
+# The normalization removed from the generators, kept as it was for comparison
+
+def legacy_normalize_workout_data(workout_plan):
+    workout_type_map = {
+        'core': 'strength', 'mobility': 'flexibility', 'strength_cardio': 'hiit', 'cardio_strength': 'hiit',
+        'cardio_core': 'hiit', 'core_back': 'strength', 'dynamic_stretch': 'flexibility', 'static_stretch': 'flexibility'
+    }
+    intensity_map = {'moderate-high': 'high', 'very-high': 'very_high', 'none': 'low', 'very high': 'very_high'}
+    valid_types = [
+        'cardio', 'strength', 'flexibility', 'yoga', 'pilates', 'hiit', 'walking', 'swimming', 'bodyweight', 'balance',
+        'running', 'cycling', 'weightlifting', 'crossfit', 'dance', 'martial_arts', 'sports'
+    ]
+    for day in workout_plan:
+        if 'intensity_level' in day and day['intensity_level']:
+            original = str(day['intensity_level']).lower()
+            day['intensity_level'] = intensity_map.get(original, original)
+        if day.get('rest_day', False) and 'intensity_level' in day:
+            del day['intensity_level']
+        for exercise in day.get('exercises', []):
+            if 'type' in exercise:
+                original = str(exercise['type']).lower()
+                mapped_type = workout_type_map.get(original, original)
+                exercise['type'] = mapped_type if mapped_type in valid_types else 'strength'
+    return workout_plan
+
+
+def legacy_normalize_meal_plan_data(meal_plan):
+    dietary_tag_map = {
+        'gluten_free_option': 'gluten_free', 'dairy_free_option': 'dairy_free', 'vegan_option': 'vegan',
+        'vegetarian_option': 'vegetarian', 'check_label_for_specifics': None, 'oats_if_granola': None,
+        'dairy_if_whey': None, 'nuts_if_almond_milk': None, 'eggs_if_mayo': None, 'soy_if_burger': None
+    }
+    valid_dietary_tags = [
+        'none', 'vegetarian', 'vegan', 'gluten_free', 'dairy_free', 'nut_free', 'low_sodium', 'diabetic_friendly',
+        'heart_healthy', 'soy_free', 'egg_free', 'shellfish_free', 'low_sugar', 'keto', 'low_carb', 'high_protein',
+        'mediterranean', 'paleo', 'whole30'
+    ]
+    for day in meal_plan:
+        for meal in day.get('meals', []):
+            if 'dietary_tags' in meal:
+                cleaned_tags = []
+                for tag in meal['dietary_tags']:
+                    tag_lower = str(tag).lower().strip()
+                    if tag_lower in dietary_tag_map:
+                        mapped_tag = dietary_tag_map[tag_lower]
+                        if mapped_tag and mapped_tag not in cleaned_tags:
+                            cleaned_tags.append(mapped_tag)
+                    elif tag_lower in valid_dietary_tags and tag_lower not in cleaned_tags:
+                        cleaned_tags.append(tag_lower)
+                meal['dietary_tags'] = cleaned_tags
+            if 'estimated_calories' in meal:
+                meal['estimated_calories'] = min(max(meal['estimated_calories'], 50), 1500)
+            if 'allergen_warnings' in meal:
+                meal['allergen_warnings'] = [
+                    str(allergen).lower().strip() for allergen in meal['allergen_warnings']
+                    if not any(cond in str(allergen).lower().strip() for cond in ['_if_', 'if '])
+                ]
+        if 'total_estimated_calories' in day:
+            day['total_estimated_calories'] = min(max(day['total_estimated_calories'], MIN_CALORIES_ADULT), MAX_CALORIES_ADULT)
+    return meal_plan
+
+
+def legacy_final_loop(workout_plan):
+    for day in workout_plan:
+        if day.get('rest_day', False) and 'intensity_level' in day:
+            del day['intensity_level']
+        if 'exercises' not in day:
+            day['exercises'] = []
+
+
+def legacy(workout_plan, meal_plan, weekly_plans):
+    legacy_normalize_workout_data(workout_plan)
+    legacy_normalize_meal_plan_data(meal_plan)
+    legacy_final_loop(workout_plan)
+    for week in weekly_plans:
+        legacy_normalize_workout_data(week["workout_plan"])
+        legacy_normalize_meal_plan_data(week["meal_plan"])
+        legacy_final_loop(week["workout_plan"])
+
+
+def roughen(plan: dict) -> dict:
+    """LLM-style deviations the normalization exists for"""
+    aliases = ["core", "mobility", "cardio_core", "stretching"]
+    for week in [plan] + plan["weekly_plans"]:
+        for index, day in enumerate(week["workout_plan"]):
+            if day.get("rest_day"):
+                day["intensity_level"] = "none"
+            for position, exercise in enumerate(day.get("exercises", [])):
+                exercise["type"] = aliases[(index + position) % len(aliases)]
+                exercise["intensity"] = "moderate-high" if position % 2 else exercise.get("intensity")
+        for index, day in enumerate(week["meal_plan"]):
+            for position, meal in enumerate(day.get("meals", [])):
+                meal["dietary_tags"] = list(meal.get("dietary_tags", [])) + ["vegetarian_option", "check_label_for_specifics"]
+                meal["allergen_warnings"] = list(meal.get("allergen_warnings", [])) + ["dairy_if_whey"]
+                if position == 0 and index % 3 == 0:
+                    meal["estimated_calories"] = 1800
+    return plan
+
+
+def timed(function, plans) -> float:
+    started = time.perf_counter()
+    for plan in plans:
+        function(plan)
+    return (time.perf_counter() - started) / len(plans) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    document = build_document(0)
+    plan = roughen({field: document[field] for field in ("workout_plan", "meal_plan", "weekly_plans")})
+    weeks = len(plan["weekly_plans"]) + 1
+
+    def copies():
+        return [copy.deepcopy(plan) for _ in range(args.iterations)]
+
+    results = [
+        ("loops, week 1", timed(lambda p: legacy(p["workout_plan"], p["meal_plan"], []), copies()), "-"),
+        (f"loops, {weeks} weeks", timed(lambda p: legacy(p["workout_plan"], p["meal_plan"], p["weekly_plans"]), copies()), "-"),
+    ]
+    errors = validate_plan_output(**copy.deepcopy(plan))["errors"]
+    results.append((
+        f"hooks + check, {weeks} wk",
+        timed(lambda p: validate_plan_output(p["workout_plan"], p["meal_plan"], p["weekly_plans"]), copies()),
+        str(len(errors)),
+    ))
+
+    print(f"{weeks}-week plan, {sum(len(week['workout_plan']) for week in [plan] + plan['weekly_plans'])} workout days\n")
+    print(f"{'path':<24}{'ms/plan':>9}{'errors':>8}")
+    for label, elapsed_ms, found in results:
+        print(f"{label:<24}{elapsed_ms:>9.2f}{found:>8}")
+
+    by_location = {}
+    for error in errors:
+        key = (error["kind"], error["loc"].split(".")[-1], error["type"])
+        by_location[key] = by_location.get(key, 0) + 1
+    for (kind, field, kind_of_error), count in sorted(by_location.items()):
+        print(f"  {count:>4} x {kind} {field}: {kind_of_error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Response compression: identity vs each content coding CompressionMiddleware
+can negotiate, on a 12-week create_health_plan response (offline fake provider).
+
+For the whole JSON body it reports the bytes on the wire and the time
+spent in the middleware (measured in-process through the ASGI stack) and
+in the client's decoder. For the SSE variant it replays the plan as one
+event per day, flushed per event the way the middleware streams them.
+End-to-end latency to the User Service is then modelled per link as
+middleware + RTT + wire bytes / bandwidth + decode.
+
+Run from fastApi-agent-service/ (needs a local.env, dummy keys are fine):
+    python -m benchmarks.bench_response_compression --iterations 50 --rtt-ms 1
+"""
+import argparse
+import asyncio
+import logging
+import time
+import zlib
+
+from backend.middleware.compression import CompressionMiddleware, ENCODERS
+from backend.utils.json_codec import dumps
+from backend.utils.plan_stream import format_sse
+from benchmarks.bench_json_serialization import plan_response_content
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Mbit/s: same-host container network, in-region, cross-region
+LINKS = [("1 Gbit/s", 1000), ("100 Mbit/s", 100), ("20 Mbit/s", 20)]
+
+
+def decoder(coding):
+    if coding == "gzip":
+        return zlib.decompressobj(31).decompress
+    if coding == "zstd":
+        return zstandard.ZstdDecompressor().decompressobj().decompress
+    if coding == "br":
+        return brotli.Decompressor().process
+    return lambda data: data
+
+
+def body_app(chunks, media_type):
+    """ASGI app sending the given body chunks; one chunk with a length, several as a stream"""
+    async def app(scope, receive, send):
+        headers = [(b"content-type", media_type.encode())]
+        if len(chunks) == 1:
+            headers.append((b"content-length", str(len(chunks[0])).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for index, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": index < len(chunks) - 1})
+    return app
+
+
+async def through_middleware(app, coding):
+    """Body chunks as they leave the middleware for a request accepting `coding`"""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            sent.append(message.get("body", b""))
+
+    accept = coding or "identity"
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept.encode())]}
+    await app(scope, receive, send)
+    return sent
+
+
+def measure(chunks, media_type, coding, iterations):
+    app = CompressionMiddleware(body_app(chunks, media_type), minimum_size=1024)
+    asyncio.run(through_middleware(app, coding))
+    started = time.perf_counter()
+    for _ in range(iterations):
+        sent = asyncio.run(through_middleware(app, coding))
+    middleware_ms = (time.perf_counter() - started) / iterations * 1000
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        decode = decoder(coding)
+        decoded = b"".join(decode(chunk) for chunk in sent)
+    decode_ms = (time.perf_counter() - started) / iterations * 1000
+    assert decoded == b"".join(chunks), f"{coding} round trip changed the body"
+    return sum(len(chunk) for chunk in sent), middleware_ms, decode_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--rtt-ms", type=float, default=1.0)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    content = plan_response_content()
+    body = dumps(content).encode()
+    plan = content["plan_data"]
+    events = [format_sse("workout_day", {"day": day}).encode() for day in plan["workout_plan"]]
+    events += [format_sse("meal_day", {"day": day}).encode() for day in plan["meal_plan"]]
+    events.append(format_sse("complete", content).encode())
+
+    codings = [None] + [coding for coding in ("zstd", "br", "gzip") if coding in ENCODERS]
+    for label, chunks, media_type in (
+        ("create_health_plan JSON", [body], "application/json"),
+        (f"create_health_plan SSE ({len(events)} events)", events, "text/event-stream"),
+    ):
+        print(f"{label}: {sum(len(chunk) for chunk in chunks)} B")
+        header = f"{'coding':<10}{'wire B':>9}{'ratio':>7}{'mw ms':>8}{'decode ms':>10}"
+        print(header + "".join(f"{name + ' ms':>16}" for name, _ in LINKS))
+        identity_bytes = None
+        for coding in codings:
+            wire_bytes, middleware_ms, decode_ms = measure(chunks, media_type, coding, args.iterations)
+            identity_bytes = identity_bytes or wire_bytes
+            latencies = [
+                middleware_ms + args.rtt_ms + wire_bytes * 8 / (mbit * 1000) + decode_ms
+                for _, mbit in LINKS
+            ]
+            print(
+                f"{coding or 'identity':<10}{wire_bytes:>9}{wire_bytes / identity_bytes:>7.1%}"
+                f"{middleware_ms:>8.2f}{decode_ms:>10.2f}" + "".join(f"{latency:>16.2f}" for latency in latencies)
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
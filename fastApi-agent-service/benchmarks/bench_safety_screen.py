@@ -0,0 +1,103 @@
+"""
+Safety keyword screening: one compiled matcher pass vs per-screen substring scans.
+
+The baseline is what each screen used to do on its own: lowercase the text
+and run `any(keyword in text for keyword in keywords)` over its list. The
+matcher scans once and reports every category. Texts are chat messages,
+progress notes and generated workout/meal plan days.
+
+Run from fastApi-agent-service/ (needs a local.env, dummy keys are fine):
+    python -m benchmarks.bench_safety_screen --repeat 2000
+"""
+import argparse
+import json
+import logging
+import time
+
+from backend.constants.safety_lexicon import SAFETY_LEXICON, SAFETY_SCREENS
+from backend.utils.health_safety import SAFETY_MATCHER, screen_text
+
+CHAT_MESSAGES = [
+    "Can I swap Thursday's run for a swim? My knees have been a bit sore after the hill session.",
+    "I felt dizzy and nauseous halfway through the HIIT workout yesterday, should I keep going?",
+    "What's a good vegetarian replacement for the chicken in the lunch bowl on day 3?",
+    "Work has been really busy this week and I keep missing the evening workouts, any tips?",
+    "I had chest pain during the stair climb and had to sit down for a while",
+    "Is it ok to do the yoga session in the morning instead of the evening?",
+    "My doctor changed my blood pressure medication last week, does the plan need adjusting?",
+    "I want to lose weight fast for a wedding, can we make the diet more extreme?",
+]
+PROGRESS_NOTES = [
+    "Completed all 4 workouts, energy was good, slept well most nights",
+    "Lower back pain after deadlifts, skipped Friday",
+    "Exhausted by Wednesday, struggled to finish the cardio day",
+    "Really enjoying the meal plan, feeling less tired in the afternoons",
+]
+PLAN_TEXT = json.dumps({
+    "day": 2,
+    "workout_name": "Strength: Lower Body & Core",
+    "exercises": [
+        {"name": "Bodyweight Squats", "instructions": "Stand with feet shoulder-width apart, sit back and down, "
+                                                      "keep your chest up and knees over toes, push through your heels to stand."},
+        {"name": "Glute Bridges", "instructions": "Lie on your back with knees bent, squeeze your glutes and lift "
+                                                  "your hips, hold for a breath and lower slowly."},
+        {"name": "Dead Bug", "instructions": "Keep your lower back pressed into the mat while extending opposite arm "
+                                             "and leg; stop if you feel any pain."},
+    ],
+    "meals": [
+        {"name": "Greek Yogurt Parfait", "ingredients": ["3/4 cup greek yogurt", "1/2 cup berries", "1/4 cup granola"]},
+        {"name": "Chicken Quinoa Bowl", "ingredients": ["150 g chicken breast", "1 cup quinoa", "2 cups spinach"]},
+    ],
+})
+TEXTS = CHAT_MESSAGES + PROGRESS_NOTES + [PLAN_TEXT]
+# Conditions written as one word still hit the condition screens, as the substring checks did
+WORD_PROBES = [
+    ("Diagnosed with osteoarthritis in both knees", "plan_health_condition"),
+    ("My GP says I'm prediabetic, prediabetes runs in the family", "profile_health_condition"),
+    ("Prediabetes, on metformin", "request_health_condition"),
+    ("Sometimes I skip the evening session", "life_circumstance"),
+]
+
+
+def screen_keywords(screen):
+    return [keyword for category in SAFETY_SCREENS[screen] for keyword in SAFETY_LEXICON[category]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    screens = {screen: screen_keywords(screen) for screen in SAFETY_SCREENS}
+    chars = sum(len(text) for text in TEXTS)
+    print(f"{len(TEXTS)} texts, {chars} chars, {len(screens)} screens, "
+          f"{sum(len(keywords) for keywords in SAFETY_LEXICON.values())} lexicon entries\n")
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        for text in TEXTS:
+            lowered = text.lower()
+            for keywords in screens.values():
+                any(keyword in lowered for keyword in keywords)
+    naive = (time.perf_counter() - started) / (args.repeat * len(TEXTS)) * 1e6
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        for text in TEXTS:
+            SAFETY_MATCHER.find(text)
+    compiled = (time.perf_counter() - started) / (args.repeat * len(TEXTS)) * 1e6
+
+    print(f"{'all screens, substring scans':<34}{naive:>8.1f} us/text")
+    print(f"{'all categories, one matcher pass':<34}{compiled:>8.1f} us/text ({naive / compiled:.1f}x)\n")
+
+    for text in TEXTS[:len(CHAT_MESSAGES)]:
+        print(f"{text[:60]:<62}{sorted(SAFETY_MATCHER.find(text))}")
+
+    print()
+    for text, screen in WORD_PROBES:
+        print(f"{text[:52]:<54}{screen:<26}{screen_text(text, screen)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Pairwise calculate_similarity loop vs the matrix similarity API.
+
+Builds random corpora of 10k and 100k embeddings and times top-k
+retrieval with the per-pair loop against to_normalized_matrix +
+top_k_similar, for a single query and for a batch of queries.
+
+Run from fastApi-agent-service/ (needs a local.env, dummy keys are fine):
+    python -m benchmarks.bench_similarity --dim 768 --k 10
+"""
+import argparse
+import time
+
+import numpy as np
+
+from backend.utils.embeddings import calculate_similarity, to_normalized_matrix, top_k_similar
+
+
+def pairwise_top_k(query, corpus, k):
+    scores = [calculate_similarity(query, vector) for vector in corpus]
+    return sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:k]
+
+
+def timed(function, repeat=1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'vectors':>9}{'pairwise s':>12}{'normalize s':>13}{'matrix s':>10}{'speedup':>9}{'batch/query s':>15}")
+    for size in args.sizes:
+        corpus = rng.standard_normal((size, args.dim), dtype=np.float32)
+        queries = rng.standard_normal((args.batch, args.dim), dtype=np.float32)
+        # The pairwise API takes Python lists, as callers hold them today
+        corpus_lists = corpus.tolist()
+        query_list = queries[0].tolist()
+
+        pairwise_seconds, expected = timed(lambda: pairwise_top_k(query_list, corpus_lists, args.k))
+        normalize_seconds, matrix = timed(lambda: to_normalized_matrix(corpus))
+        matrix_seconds, (indices, _) = timed(lambda: top_k_similar(queries[0], matrix, args.k), repeat=20)
+        batch_seconds, (batch_indices, _) = timed(lambda: top_k_similar(queries, matrix, args.k), repeat=5)
+
+        assert list(indices) == expected, "matrix top-k disagrees with the pairwise loop"
+        assert list(batch_indices[0]) == expected
+        print(
+            f"{size:>9}{pairwise_seconds:>12.3f}{normalize_seconds:>13.3f}{matrix_seconds:>10.4f}"
+            f"{pairwise_seconds / matrix_seconds:>8.0f}x{batch_seconds / args.batch:>15.5f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Static endpoints: building and serializing the body on every hit vs the
+precomputed bytes of backend/utils/static_responses.py, for /, the terms
+of service and the health disclaimer catalog.
+
+Times the work per request up to a rendered response object (no
+network). The rebuild column is what FastAPI does with a returned dict:
+jsonable_encoder, then ORJSONResponse. The static columns cover a fresh
+fetch and a revalidation that gets a 304.
+
+Run from fastApi-agent-service/ (needs a local.env, dummy keys are fine):
+    python -m benchmarks.bench_static_responses --iterations 20000
+"""
+import argparse
+import logging
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from starlette.requests import Request
+
+from backend.app import ROOT_RESPONSE, TERMS_OF_SERVICE_RESPONSE
+from backend.routes.user import HEALTH_DISCLAIMER_RESPONSE
+
+
+def request(headers=None) -> Request:
+    raw = [(name.encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def timed(function, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'endpoint':<20}{'bytes':>7}{'rebuild µs':>12}{'static µs':>11}{'304 µs':>9}{'speedup':>9}")
+    for static_response in (ROOT_RESPONSE, TERMS_OF_SERVICE_RESPONSE, HEALTH_DISCLAIMER_RESPONSE):
+        static_response.refresh()
+        fresh = request()
+        revalidate = request({"if-none-match": static_response.headers["ETag"]})
+        assert static_response.render(revalidate).status_code == 304
+
+        rebuild_us = timed(lambda: ORJSONResponse(jsonable_encoder(static_response.build())), args.iterations)
+        static_us = timed(lambda: static_response.render(fresh), args.iterations)
+        not_modified_us = timed(lambda: static_response.render(revalidate), args.iterations)
+        print(
+            f"{static_response.name:<20}{len(static_response.body):>7}{rebuild_us:>12.2f}"
+            f"{static_us:>11.2f}{not_modified_us:>9.2f}{rebuild_us / static_us:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Offline stand-in for the Gemini chat model used by the benchmarks.
+
+FakeChatModel answers with well-formed plan JSON chosen from the prompt,
+and reports simulated latency and token usage from MODEL_PROFILES instead
+of sleeping, so benchmarks run in seconds without an API key.
+"""
+import json
+import threading
+
+# Rough public list prices (USD per 1M tokens) and throughput per model
+MODEL_PROFILES = {
+    "gemini-2.5-flash": {
+        "input_price": 0.30,
+        "output_price": 2.50,
+        "first_token_seconds": 0.60,
+        "output_tokens_per_second": 180,
+    },
+    "gemini-2.5-flash-lite": {
+        "input_price": 0.10,
+        "output_price": 0.40,
+        "first_token_seconds": 0.30,
+        "output_tokens_per_second": 400,
+    },
+}
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class Message:
+    def __init__(self, content):
+        self.content = content
+
+
+def workout_day(day):
+    rest = day == 7
+    return {
+        "day": day,
+        "workout_name": "Rest Day" if rest else "Full Body Basics",
+        "total_duration_minutes": 0 if rest else 30,
+        "warm_up": "5 minutes of brisk walking",
+        "exercises": [] if rest else [{
+            "name": "Bodyweight Squats", "type": "strength", "duration_minutes": 10,
+            "sets": 3, "reps": "10-12", "rest_seconds": 60, "intensity": "moderate",
+            "instructions": "Keep your chest up and knees over toes",
+            "modifications": "Use a chair for support", "safety_notes": "Stop if you feel knee pain",
+            "target_muscles": ["quadriceps", "glutes"], "equipment_needed": [],
+        }],
+        "cool_down": "5 minutes of stretching",
+        "intensity_level": "moderate",
+        "estimated_calories_burned": 0 if rest else 150,
+        "rest_day": rest,
+        "notes": "",
+    }
+
+
+def meal_day(day):
+    def meal(name, meal_type, calories):
+        return {
+            "name": name, "meal_type": meal_type,
+            "ingredients": ["1 cup rolled oats", "2 eggs", "1 cup milk", "1 banana"],
+            "instructions": "Cook and serve", "prep_time_minutes": 10, "servings": 1,
+            "estimated_calories": calories,
+            "macronutrients": {"protein": 25, "carbs": 60, "fats": 15},
+            "dietary_tags": [], "allergen_warnings": ["eggs", "milk"], "nutrition_notes": "",
+        }
+
+    return {
+        "day": day,
+        "meals": [meal("Oat Bowl", "breakfast", 500), meal("Grain Bowl", "lunch", 650), meal("Stir Fry", "dinner", 700)],
+        "total_estimated_calories": 1850,
+        "daily_water_goal_glasses": 8,
+        "nutrition_summary": {"protein_grams": 95, "carbs_grams": 210, "fats_grams": 60, "fiber_grams": 30},
+        "special_notes": "",
+    }
+
+
+def replacement_exercise():
+    return {
+        "name": "Resistance Band Rows", "type": "strength", "duration_minutes": 10,
+        "sets": 3, "reps": "12", "rest_seconds": 60, "intensity": "low",
+        "instructions": "Pull the band towards your ribs and squeeze your shoulder blades",
+        "modifications": "Use a lighter band", "safety_notes": "Keep your back straight",
+        "target_muscles": ["back", "biceps"], "equipment_needed": ["resistance_bands"],
+    }
+
+
+def replacement_meal():
+    return {
+        "name": "Lentil Vegetable Soup", "meal_type": "dinner",
+        "ingredients": ["1 cup cooked lentils", "1 cup mixed vegetables", "1 tbsp olive oil", "1 slice whole wheat bread"],
+        "instructions": "Simmer and serve", "prep_time_minutes": 20, "servings": 1,
+        "estimated_calories": 650,
+        "macronutrients": {"protein": 28, "carbs": 85, "fats": 18},
+        "dietary_tags": ["vegetarian"], "allergen_warnings": ["gluten"], "nutrition_notes": "",
+    }
+
+
+def health_analysis(prompt):
+    conditions = "Self-Reported Health Conditions: None reported" not in prompt
+    return {
+        "overall_readiness_level": "moderate" if conditions else "high",
+        "primary_safety_concerns": ["Self-reported health conditions"] if conditions else [],
+        "professional_consultations_recommended": [{
+            "type": "primary_care", "priority": "medium" if conditions else "low",
+            "reason": "Routine check before starting", "before_starting": conditions,
+        }],
+        "safe_starting_recommendations": {
+            "exercise_approach": "Start gradually", "nutrition_approach": "Balanced whole foods",
+            "monitoring_needed": [], "red_flag_symptoms": [],
+        },
+        "program_modifications": [],
+        "estimated_timeline_to_full_program": "2-4 weeks",
+        "additional_safety_notes": [],
+        "risk_level": "moderate" if conditions else "low",
+        "proceed_with_ai_plan": True,
+    }
+
+
+def fake_response(prompt: str) -> str:
+    """Pick a payload by the role the prompt assigns to the model"""
+    # Targeted replacements list one slot per fragment
+    slots = prompt.count('"replace":')
+    if "Replace only the exercises" in prompt:
+        return json.dumps({"exercises": [replacement_exercise() for _ in range(slots)]})
+    if "Replace only the meals" in prompt:
+        return json.dumps({"meals": [replacement_meal() for _ in range(slots)]})
+    if "certified fitness professional" in prompt:
+        return json.dumps([workout_day(day) for day in range(1, 8)])
+    if "registered dietitian" in prompt:
+        return json.dumps([meal_day(day) for day in range(1, 8)])
+    return json.dumps(health_analysis(prompt))
+
+
+class FakeChatModel:
+    """
+    Drop-in for ChatGoogleGenerativeAI with invoke/stream.
+    Every call is appended to `calls` with simulated latency and cost.
+    """
+
+    calls = []
+    _lock = threading.Lock()
+
+    def __init__(self, model, temperature=None, max_output_tokens=None, thinking_budget=None, **kwargs):
+        self.model = model
+        self.temperature = temperature
+        self.max_output_tokens = max_output_tokens
+        self.thinking_budget = thinking_budget
+
+    def _record(self, prompt, text):
+        profile = MODEL_PROFILES[self.model]
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(text)
+        # A negative budget means dynamic thinking, assume a typical 1k tokens
+        thinking_tokens = 1024 if (self.thinking_budget or 0) < 0 else (self.thinking_budget or 0)
+        generated = output_tokens + thinking_tokens
+        call = {
+            "model": self.model,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "thinking_tokens": thinking_tokens,
+            "latency_seconds": profile["first_token_seconds"] + generated / profile["output_tokens_per_second"],
+            "cost_usd": (input_tokens * profile["input_price"] + generated * profile["output_price"]) / 1_000_000,
+        }
+        with self._lock:
+            FakeChatModel.calls.append(call)
+
+    def invoke(self, prompt, **kwargs):
+        text = fake_response(prompt)
+        self._record(prompt, text)
+        return Message(text)
+
+    def stream(self, prompt, **kwargs):
+        text = fake_response(prompt)
+        self._record(prompt, text)
+        for start in range(0, len(text), 64):
+            yield Message(text[start:start + 64])
@@ -0,0 +1,77 @@
+"""
+Prompt-size report per agent.
+
+For each agent prompt, shows the static prefix and dynamic suffix sizes
+and the input tokens sent per request before (whole prompt re-sent every
+time) and after prefix caching (prefix served from the context cache,
+only the suffix sent uncached).
+
+Run from fastApi-agent-service/ (needs a local.env, dummy keys are fine):
+    python -m benchmarks.prompt_size_report
+"""
+import logging
+import statistics
+import timeit
+
+from backend.config import main as config
+from backend.utils.health_safety import HealthSafetyValidator
+from backend.utils.prompt_cache import estimate_tokens
+from backend.controller.agents.health_analyzer import ANALYSIS_PROMPT, build_analysis_prompt
+from backend.controller.agents.workout_plan_generator import WORKOUT_PROMPT, build_workout_prompt
+from backend.controller.agents.meal_plan_generator import MEAL_PROMPT, build_meal_prompt, calculate_safe_calorie_target
+from benchmarks.bench_model_routing import synthetic_profiles
+
+# Gemini bills cached input tokens at a quarter of the regular input price
+CACHED_TOKEN_PRICE_RATIO = 0.25
+
+
+def agent_prompts(item):
+    profile = item["profile"]
+    conditions = item["health_conditions"]
+    restrictions = item["dietary_restrictions"]
+    profile_safety = HealthSafetyValidator.validate_user_profile_safety({**profile, "health_conditions": conditions})
+    workout_check = HealthSafetyValidator.validate_workout_plan(
+        profile["time_availability_minutes"], profile["current_activity_level"], profile["age"]
+    )
+    calorie_check = HealthSafetyValidator.validate_calorie_target(calculate_safe_calorie_target(profile), profile["age"])
+    return {
+        "health_analyzer": lambda: build_analysis_prompt(profile, conditions, False, profile_safety),
+        "workout_generator": lambda: build_workout_prompt(profile, conditions, workout_check),
+        "meal_generator": lambda: build_meal_prompt(profile, restrictions, conditions, calorie_check),
+    }
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    profiles = synthetic_profiles(200)
+    templates = {"health_analyzer": ANALYSIS_PROMPT, "workout_generator": WORKOUT_PROMPT, "meal_generator": MEAL_PROMPT}
+
+    print(f"{'agent':<18}{'prefix tok':>11}{'suffix tok':>11}{'before tok':>11}{'after tok':>10}{'billed':>9}{'cacheable':>11}{'render us':>11}")
+    for agent, template in templates.items():
+        suffix_tokens, full_tokens, render_times = [], [], []
+        for item in profiles:
+            build = agent_prompts(item)[agent]
+            prompt = build()
+            suffix_tokens.append(estimate_tokens(prompt.suffix))
+            full_tokens.append(estimate_tokens(prompt))
+            render_times.append(timeit.timeit(build, number=20) / 20 * 1e6)
+
+        suffix = statistics.mean(suffix_tokens)
+        before = statistics.mean(full_tokens)
+        # Effective billed input tokens with the prefix served from cache
+        billed = suffix + template.prefix_tokens * CACHED_TOKEN_PRICE_RATIO
+        cacheable = template.prefix_tokens >= config.LLM_CONTEXT_CACHE_MIN_TOKENS
+        print(
+            f"{agent:<18}{template.prefix_tokens:>11}{suffix:>11.0f}{before:>11.0f}{suffix:>10.0f}"
+            f"{billed:>9.0f}{'yes' if cacheable else 'no':>11}{statistics.mean(render_times):>11.1f}"
+        )
+
+    print(
+        f"\nbefore = whole prompt sent per request, after = uncached suffix tokens, "
+        f"billed = suffix + prefix at {CACHED_TOKEN_PRICE_RATIO:g}x (cached price)."
+        f"\ncacheable = prefix meets LLM_CONTEXT_CACHE_MIN_TOKENS ({config.LLM_CONTEXT_CACHE_MIN_TOKENS})."
+    )
+
+
+if __name__ == "__main__":
+    main()